@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for hub/repo config loading with and without the config cache.
+
+Seeds a throwaway hub with one repo, then times `load_hub_config` and
+`load_repo_config` when every call re-parses (cache invalidated before each
+call) versus when unchanged files are served from the cache.
+
+Usage: python scripts/bench_config_load.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from codex_autorunner.bootstrap import seed_hub_files  # noqa: E402
+from codex_autorunner.core.config import (  # noqa: E402
+    invalidate_config_cache,
+    load_hub_config,
+    load_repo_config,
+)
+
+
+def _age_tree(root: Path, seconds: float = 10.0) -> None:
+    # Files modified within the last second are never cached.
+    stamp = time.time() - seconds
+    for path in root.rglob("*"):
+        if path.is_file():
+            os.utime(path, (stamp, stamp))
+
+
+def _time_per_call(fn: Callable[[], object], iterations: int, *, cold: bool) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            invalidate_config_cache()
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hub_root = Path(tmp) / "hub"
+        hub_root.mkdir()
+        seed_hub_files(hub_root, force=True)
+        repo_root = hub_root / "worktrees" / "repo"
+        (repo_root / ".git").mkdir(parents=True)
+        _age_tree(hub_root)
+
+        cases = {
+            "load_hub_config": lambda: load_hub_config(hub_root),
+            "load_repo_config": lambda: load_repo_config(repo_root, hub_root),
+        }
+        print(f"{'call':<18} {'uncached':>12} {'cached':>12} {'speedup':>9}")
+        for name, fn in cases.items():
+            cold = _time_per_call(fn, args.iterations, cold=True)
+            warm = _time_per_call(fn, args.iterations, cold=False)
+            print(
+                f"{name:<18} {cold * 1e3:>10.3f}ms {warm * 1e3:>10.3f}ms "
+                f"{cold / warm:>8.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,12 +5,13 @@ import dataclasses
 import json
 import logging
 import re
-from typing import Any, AsyncIterator, Iterable, Optional
+from typing import Any, AsyncIterator, Collection, Iterable, Optional
 
 import httpx
 
 from ...core.logging_utils import log_event
 from ...core.sse import SSEEvent, parse_sse_lines
+from .event_hub import OpenCodeEventHub
 
 _MAX_INVALID_JSON_PREVIEW_BYTES = 512
 
@@ -40,7 +41,8 @@ class OpenCodeProtocolError(Exception):
         self.body_preview = body_preview
 
 
-def _normalize_sse_event(event: SSEEvent) -> SSEEvent:
+def _normalize_sse_payload(event: SSEEvent) -> tuple[SSEEvent, Any]:
+    """Normalize ``event`` and also return its parsed JSON payload."""
     event_type = event.event
     raw_data = event.data or ""
     payload_obj: Optional[dict[str, Any]] = None
@@ -69,11 +71,14 @@ def _normalize_sse_event(event: SSEEvent) -> SSEEvent:
             event_type = payload_type
         raw_data = json.dumps(payload_obj)
 
-    return SSEEvent(
-        event=event_type,
-        data=raw_data,
-        id=event.id,
-        retry=event.retry,
+    return (
+        SSEEvent(
+            event=event_type,
+            data=raw_data,
+            id=event.id,
+            retry=event.retry,
+        ),
+        payload_obj,
     )
 
 
@@ -99,8 +104,13 @@ class OpenCodeClient:
             int(max_text_chars) if isinstance(max_text_chars, int) else None
         )
         self._max_text_chars_cache: Optional[int] = None
+        self._event_hubs: dict[Optional[str], OpenCodeEventHub] = {}
 
     async def close(self) -> None:
+        hubs = list(self._event_hubs.values())
+        self._event_hubs.clear()
+        for hub in hubs:
+            await hub.aclose()
         await self._client.aclose()
 
     async def detect_api_shape(self) -> OpenCodeApiProfile:
@@ -583,7 +593,58 @@ class OpenCodeClient:
         ready_event: Optional[asyncio.Event] = None,
         paths: Optional[Iterable[str]] = None,
     ) -> AsyncIterator[SSEEvent]:
+        """Open a dedicated event stream.
+
+        Turns should prefer :meth:`subscribe_events`, which shares one stream.
+        """
+        async for sse, _payload in self._event_stream(
+            directory=directory, ready_event=ready_event, paths=paths
+        ):
+            yield sse
+
+    def subscribe_events(
+        self,
+        *,
+        directory: Optional[str] = None,
+        session_ids: Optional[Collection[str]] = None,
+        ready_event: Optional[asyncio.Event] = None,
+        reconnect_if_idle_for: Optional[float] = None,
+    ) -> AsyncIterator[SSEEvent]:
+        """Events for ``session_ids`` from the shared stream of ``directory``.
+
+        ``session_ids`` is checked per event, so a set the caller keeps adding
+        to works; ``None`` subscribes to every event. With
+        ``reconnect_if_idle_for`` the shared connection is re-established
+        first if it has not delivered anything for that many seconds.
+        """
+        hub = self._event_hubs.get(directory)
+        if hub is None:
+
+            def _open(
+                ready: asyncio.Event, last_event_id: Optional[str]
+            ) -> AsyncIterator[tuple[SSEEvent, Any]]:
+                return self._event_stream(
+                    directory=directory,
+                    ready_event=ready,
+                    last_event_id=last_event_id,
+                )
+
+            hub = OpenCodeEventHub(_open, logger=self._logger)
+            self._event_hubs[directory] = hub
+        if reconnect_if_idle_for is not None:
+            hub.request_reconnect(reconnect_if_idle_for)
+        return hub.subscribe(session_ids=session_ids, ready_event=ready_event)
+
+    async def _event_stream(
+        self,
+        *,
+        directory: Optional[str] = None,
+        ready_event: Optional[asyncio.Event] = None,
+        paths: Optional[Iterable[str]] = None,
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[tuple[SSEEvent, Any]]:
         params = self._dir_params(directory)
+        headers = {"Last-Event-ID": last_event_id} if last_event_id else None
 
         if paths is not None:
             event_paths = list(paths)
@@ -602,13 +663,13 @@ class OpenCodeClient:
         for path in event_paths:
             try:
                 async with self._client.stream(
-                    "GET", path, params=params, timeout=None
+                    "GET", path, params=params, headers=headers, timeout=None
                 ) as response:
                     response.raise_for_status()
                     if ready_event is not None:
                         ready_event.set()
                     async for sse in parse_sse_lines(response.aiter_lines()):
-                        yield _normalize_sse_event(sse)
+                        yield _normalize_sse_payload(sse)
                 return
             except httpx.HTTPStatusError as exc:
                 last_error = exc
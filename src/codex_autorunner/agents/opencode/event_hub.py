@@ -0,0 +1,256 @@
+"""One shared OpenCode event subscription per server and directory.
+
+``opencode serve`` publishes the events of every session on a single SSE
+endpoint. Instead of each turn opening its own ``/event`` stream and filtering
+it, :class:`OpenCodeEventHub` keeps one upstream connection while anyone is
+subscribed, parses each event once and routes it by session id into per-turn
+queues. Reconnects (with ``Last-Event-ID`` resume) are handled here, so turns
+only see an error once the stream cannot be re-established.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Any, AsyncIterator, Callable, Collection, Optional, Union
+
+import httpx
+
+from ...core.logging_utils import log_event
+from .events import SSEEvent
+from .runtime import extract_session_id
+
+# Opens one upstream connection: ``(ready_event, last_event_id)`` -> stream of
+# normalized events paired with their parsed JSON payload.
+StreamOpener = Callable[
+    [asyncio.Event, Optional[str]], AsyncIterator[tuple[SSEEvent, Any]]
+]
+
+_RECONNECT_BACKOFF_SECONDS = (0.5, 1.0, 2.0, 5.0)
+# Consecutive connections without a single event before subscribers are failed.
+_MAX_FAILED_CONNECTIONS = 4
+
+_QueueItem = Union[SSEEvent, BaseException, None]
+
+
+class _Subscriber:
+    def __init__(self, session_ids: Optional[Collection[str]]) -> None:
+        # Checked on every event, so callers may pass a set they keep growing.
+        self.session_ids = session_ids
+        self.queue: asyncio.Queue[_QueueItem] = asyncio.Queue()
+
+    def wants(self, session_id: Optional[str]) -> bool:
+        # Untagged events go to everyone, like an unfiltered stream.
+        if session_id is None or self.session_ids is None:
+            return True
+        return session_id in self.session_ids
+
+
+class OpenCodeEventHub:
+    def __init__(
+        self, open_stream: StreamOpener, *, logger: Optional[logging.Logger] = None
+    ) -> None:
+        self._open_stream = open_stream
+        self._logger = logger or logging.getLogger(__name__)
+        self._subscribers: set[_Subscriber] = set()
+        self._ready_waiters: list[asyncio.Event] = []
+        self._connected = False
+        self._reader: Optional[asyncio.Task[None]] = None
+        self._connection: Optional[asyncio.Task[None]] = None
+        self._connection_events = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_event_id: Optional[str] = None
+        self._last_event_at: Optional[float] = None
+        self.connections = 0
+        self.events = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(
+        self,
+        *,
+        session_ids: Optional[Collection[str]] = None,
+        ready_event: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[SSEEvent]:
+        """Yield events of ``session_ids`` (all events when ``None``).
+
+        ``ready_event`` is set once the upstream stream is connected, so the
+        caller can send its prompt without missing the first events.
+        """
+        self._bind_loop()
+        subscriber = _Subscriber(session_ids)
+        self._subscribers.add(subscriber)
+        if ready_event is not None:
+            if self._connected:
+                ready_event.set()
+            else:
+                self._ready_waiters.append(ready_event)
+        self._ensure_reader()
+        try:
+            while True:
+                item = await subscriber.queue.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self._subscribers.discard(subscriber)
+            if ready_event is not None and ready_event in self._ready_waiters:
+                self._ready_waiters.remove(ready_event)
+            if not self._subscribers:
+                self._stop_reader()
+
+    def request_reconnect(self, min_idle_seconds: float) -> bool:
+        """Drop the upstream connection if it has been silent that long.
+
+        Used when a turn stalls: a healthy stream that is merely quiet for
+        that session is left alone.
+        """
+        connection = self._connection
+        if connection is None or connection.done():
+            return False
+        last = self._last_event_at
+        if last is not None and time.monotonic() - last < min_idle_seconds:
+            return False
+        log_event(
+            self._logger,
+            logging.INFO,
+            "opencode.events.reconnect_requested",
+            idle_seconds=None if last is None else time.monotonic() - last,
+            subscribers=len(self._subscribers),
+        )
+        connection.cancel()
+        return True
+
+    async def aclose(self) -> None:
+        reader = self._reader
+        self._stop_reader()
+        if reader is not None:
+            with suppress(asyncio.CancelledError, Exception):
+                await reader
+        self._finish(None)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Queues and tasks cannot outlive their event loop.
+        self._subscribers.clear()
+        self._ready_waiters.clear()
+        self._reader = None
+        self._connection = None
+        self._connected = False
+        self._loop = loop
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.ensure_future(self._run())
+
+    def _stop_reader(self) -> None:
+        reader, self._reader = self._reader, None
+        if reader is not None and not reader.done():
+            reader.cancel()
+        self._connected = False
+
+    async def _run(self) -> None:
+        failed_connections = 0
+        last_error: Optional[Exception] = None
+        while self._subscribers:
+            connection = asyncio.ensure_future(self._consume())
+            self._connection = connection
+            try:
+                await asyncio.wait({connection})
+            except asyncio.CancelledError:
+                connection.cancel()
+                with suppress(asyncio.CancelledError, Exception):
+                    await connection
+                raise
+            finally:
+                self._connection = None
+                self._connected = False
+            if connection.cancelled():
+                # Reconnect requested; resume right away.
+                failed_connections = 0
+                continue
+            exc = connection.exception()
+            if exc is not None and not isinstance(exc, Exception):
+                raise exc
+            last_error = exc
+            if exc is not None and _is_fatal(exc):
+                break
+            if self._connection_events:
+                failed_connections = 0
+            else:
+                failed_connections += 1
+            if failed_connections >= _MAX_FAILED_CONNECTIONS:
+                break
+            backoff = _RECONNECT_BACKOFF_SECONDS[
+                min(failed_connections, len(_RECONNECT_BACKOFF_SECONDS) - 1)
+            ]
+            log_event(
+                self._logger,
+                logging.WARNING,
+                "opencode.events.reconnecting",
+                backoff_seconds=backoff,
+                failed_connections=failed_connections,
+                subscribers=len(self._subscribers),
+                exc=last_error,
+            )
+            await asyncio.sleep(backoff)
+        self._finish(last_error)
+
+    async def _consume(self) -> None:
+        ready = asyncio.Event()
+        watcher = asyncio.ensure_future(self._announce_ready(ready))
+        stream = self._open_stream(ready, self._last_event_id)
+        self.connections += 1
+        self._connection_events = 0
+        try:
+            async for sse, payload in stream:
+                self._connection_events += 1
+                self._dispatch(sse, payload)
+        finally:
+            watcher.cancel()
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                with suppress(Exception):
+                    await aclose()
+
+    async def _announce_ready(self, ready: asyncio.Event) -> None:
+        await ready.wait()
+        self._connected = True
+        waiters, self._ready_waiters = self._ready_waiters, []
+        for waiter in waiters:
+            waiter.set()
+
+    def _dispatch(self, sse: SSEEvent, payload: Any) -> None:
+        self.events += 1
+        self._last_event_at = time.monotonic()
+        if sse.id:
+            self._last_event_id = sse.id
+        session_id = extract_session_id(payload)
+        for subscriber in self._subscribers:
+            if subscriber.wants(session_id):
+                subscriber.queue.put_nowait(sse)
+
+    def _finish(self, error: Optional[BaseException]) -> None:
+        """End every subscription, raising ``error`` in them when given."""
+        waiters, self._ready_waiters = self._ready_waiters, []
+        for waiter in waiters:
+            waiter.set()
+        for subscriber in self._subscribers:
+            subscriber.queue.put_nowait(error)
+
+
+def _is_fatal(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return 400 <= exc.response.status_code < 500
+    return False
+
+
+__all__ = ["OpenCodeEventHub", "StreamOpener"]
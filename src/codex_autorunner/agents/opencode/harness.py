@@ -232,7 +232,9 @@ class OpenCodeHarness(AgentHarness):
         self, workspace_root: Path, conversation_id: str, turn_id: str
     ) -> AsyncIterator[str]:
         client = await self._supervisor.get_client(workspace_root)
-        async for event in client.stream_events(directory=str(workspace_root)):
+        async for event in client.subscribe_events(
+            directory=str(workspace_root), session_ids={conversation_id}
+        ):
             payload = event.data
             try:
                 parsed = json.loads(payload) if payload else {}
@@ -1681,10 +1681,26 @@ async def collect_opencode_output(
     async def _reject_question(request_id: str) -> None:
         await client.reject_question(request_id)
 
+    subscriptions = 0
+
     def _stream_factory() -> AsyncIterator[SSEEvent]:
+        nonlocal subscriptions
+        subscriptions += 1
         return cast(
             AsyncIterator[SSEEvent],
-            client.stream_events(directory=workspace_path, ready_event=ready_event),
+            client.subscribe_events(
+                directory=workspace_path,
+                # Watched subagent sessions are added while the turn runs and
+                # their first events may precede the parent's tool update, so
+                # those turns read every event and filter below.
+                session_ids=None if progress_session_ids is not None else {session_id},
+                ready_event=ready_event,
+                # A stall resubscribe also re-establishes the shared stream,
+                # unless it is still delivering events for other sessions.
+                reconnect_if_idle_for=(
+                    stall_timeout_seconds if subscriptions > 1 else None
+                ),
+            ),
         )
 
     async def _fetch_session() -> Any:
@@ -11,7 +11,12 @@ from typing import Any, Mapping, Optional, Sequence
 import httpx
 
 from ...core.logging_utils import log_event
-from ...core.supervisor_utils import evict_lru_handle_locked, pop_idle_handles_locked
+from ...core.supervisor_utils import (
+    WarmSparePool,
+    WarmWorkspaceProvider,
+    evict_lru_handle_locked,
+    pop_idle_handles_locked,
+)
 from ...core.utils import infer_home_from_workspace, subprocess_env
 from ...workspace import canonical_workspace_root, workspace_id_for_path
 from .client import OpenCodeClient
@@ -38,9 +43,14 @@ class OpenCodeHandle:
     started: bool = False
     last_used_at: float = 0.0
     active_turns: int = 0
+    # Warm-spare state; see WarmSparePool.
+    warm: bool = False
+    warmed_at: float = 0.0
 
 
-class OpenCodeSupervisor:
+class OpenCodeSupervisor(WarmSparePool[OpenCodeHandle]):
+    _event_prefix = "opencode"
+
     def __init__(
         self,
         command: Sequence[str],
@@ -56,6 +66,8 @@ class OpenCodeSupervisor:
         subagent_models: Optional[Mapping[str, str]] = None,
         session_stall_timeout_seconds: Optional[float] = None,
         max_text_chars: Optional[int] = None,
+        warm_spares: int = 0,
+        warm_workspaces: Optional[WarmWorkspaceProvider] = None,
     ) -> None:
         self._command = [str(arg) for arg in command]
         self._logger = logger or logging.getLogger(__name__)
@@ -72,6 +84,11 @@ class OpenCodeSupervisor:
         self._base_url = base_url
         self._subagent_models = subagent_models or {}
         self._max_text_chars = max_text_chars
+        self._init_warm_pool(
+            warm_spares=warm_spares,
+            warm_workspaces=warm_workspaces,
+            max_handles=max_handles,
+        )
         self._handles: dict[str, OpenCodeHandle] = {}
         self._lock: Optional[asyncio.Lock] = None
 
@@ -85,11 +102,14 @@ class OpenCodeSupervisor:
         handle = await self._ensure_handle(workspace_id, canonical_root)
         await self._ensure_started(handle)
         handle.last_used_at = time.monotonic()
+        handle.warm = False
+        self._recent_workspaces.touch(workspace_id, canonical_root)
         if handle.client is None:
             raise OpenCodeSupervisorError("OpenCode client not initialized")
         return handle.client
 
     async def close_all(self) -> None:
+        await self._cancel_prewarm()
         async with self._get_lock():
             handles = list(self._handles.values())
             self._handles = {}
@@ -208,37 +228,52 @@ class OpenCodeSupervisor:
             if evicted is not None:
                 evicted_id = evicted.workspace_id
                 handles_to_close.append(evicted)
-            handle = OpenCodeHandle(
-                workspace_id=workspace_id,
-                workspace_root=workspace_root,
-                process=None,
-                client=None,
-                base_url=None,
-                health_info=None,
-                version=None,
-                openapi_spec=None,
-                start_lock=asyncio.Lock(),
-                stdout_task=None,
-                last_used_at=time.monotonic(),
-            )
+            handle = self._new_handle_locked(workspace_id, workspace_root, spare=False)
             self._handles[workspace_id] = handle
-        for handle in handles_to_close:
+        for closing in handles_to_close:
             await self._close_handle(
-                handle,
+                closing,
                 reason=(
-                    "max_handles" if handle.workspace_id == evicted_id else "idle_ttl"
+                    "max_handles" if closing.workspace_id == evicted_id else "idle_ttl"
                 ),
             )
+        if handles_to_close:
+            self._schedule_prewarm()
         return handle
 
-    async def _ensure_started(self, handle: OpenCodeHandle) -> None:
+    def _pool_lock(self) -> asyncio.Lock:
+        return self._get_lock()
+
+    def _new_handle_locked(
+        self, workspace_id: str, workspace_root: Path, *, spare: bool
+    ) -> OpenCodeHandle:
+        return OpenCodeHandle(
+            workspace_id=workspace_id,
+            workspace_root=workspace_root,
+            process=None,
+            client=None,
+            base_url=None,
+            health_info=None,
+            version=None,
+            openapi_spec=None,
+            start_lock=asyncio.Lock(),
+            stdout_task=None,
+            last_used_at=0.0 if spare else time.monotonic(),
+            warm=spare,
+        )
+
+    async def _ensure_started(
+        self, handle: OpenCodeHandle, *, warm: bool = False
+    ) -> None:
         async with handle.start_lock:
             if handle.started and handle.process and handle.process.returncode is None:
                 return
             if self._base_url:
                 await self._ensure_started_base_url(handle)
-            else:
-                await self._start_process(handle)
+                return
+            started_at = time.monotonic()
+            await self._start_process(handle)
+            self._spawn_latency.record(time.monotonic() - started_at, warm=warm)
 
     async def _ensure_started_base_url(self, handle: OpenCodeHandle) -> None:
         base_url = self._base_url
@@ -490,14 +525,19 @@ class OpenCodeSupervisor:
         return self._lock
 
     def _pop_idle_handles_locked(self) -> list[OpenCodeHandle]:
-        return pop_idle_handles_locked(
+        handles = pop_idle_handles_locked(
             self._handles,
             self._idle_ttl_seconds,
             self._logger,
             "opencode",
-            last_used_at_getter=lambda h: h.last_used_at,
+            last_used_at_getter=lambda h: h.warmed_at if h.warm else h.last_used_at,
             should_skip_prune=lambda h: h.active_turns > 0,
         )
+        for handle in handles:
+            self._recent_workspaces.mark_pruned(
+                handle.workspace_id, self._idle_ttl_seconds or 0.0
+            )
+        return handles
 
     def _evict_lru_handle_locked(self) -> Optional[OpenCodeHandle]:
         return evict_lru_handle_locked(
@@ -506,6 +546,7 @@ class OpenCodeSupervisor:
             self._logger,
             "opencode",
             last_used_at_getter=lambda h: h.last_used_at or 0.0,
+            is_spare=lambda h: h.warm,
         )
 
 
@@ -14,6 +14,7 @@ from .core.config import (
     DEFAULT_HUB_CONFIG,
     REPO_OVERRIDE_FILENAME,
     ConfigError,
+    invalidate_config_cache,
     resolve_hub_config_data,
 )
 from .core.state import RunnerState, save_state
@@ -87,6 +88,7 @@ def write_hub_config(hub_root: Path, force: bool = False) -> Path:
             f,
             sort_keys=False,
         )
+    invalidate_config_cache()
     return config_path
 
 
@@ -1,19 +1,41 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import logging
+import os
 import re
 import shutil
+import sqlite3
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, Literal, Optional
 
 from .git_utils import git_branch, git_head_sha
+from .locks import file_lock
 from .state import now_iso
 from .utils import atomic_write
 
+logger = logging.getLogger(__name__)
+
 ArchiveStatus = Literal["complete", "partial", "failed"]
 
+# Snapshot files are hardlinks into a content-addressed store shared by all
+# snapshots of a base repo, so unchanged run artifacts and logs cost no space.
+BLOB_DIRNAME = "blobs"
+# Held while pruning blobs and while a snapshot links them, so a prune never
+# deletes a blob an archive in progress has just found in the store.
+_BLOB_LOCK_FILENAME = "blobs.lock"
+_HASH_CHUNK_BYTES = 1024 * 1024
+_SQLITE_HEADER = b"SQLite format 3\x00"
+_SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+_LOG_SUFFIX = ".log"
+# Unreferenced blobs younger than this may belong to an archive in progress.
+_BLOB_PRUNE_MIN_AGE_SECONDS = 3600.0
+
 
 @dataclass(frozen=True)
 class ArchiveResult:
@@ -27,6 +49,8 @@ class ArchiveResult:
     latest_flow_run_id: Optional[str]
     missing_paths: tuple[str, ...]
     skipped_symlinks: tuple[str, ...]
+    deduplicated_files: int = 0
+    stored_bytes: int = 0
 
 
 def _snapshot_timestamp() -> str:
@@ -51,21 +75,202 @@ def _is_within(root: Path, target: Path) -> bool:
         return False
 
 
-def _copy_file(src: Path, dest: Path, stats: dict[str, int]) -> None:
+class _BlobStore:
+    """Content-addressed file store with a stat-keyed digest cache.
+
+    Files whose size, mtime and inode are unchanged since the last archive of
+    the same worktree are linked without being read again.
+    """
+
+    def __init__(self, root: Path, cache_name: str) -> None:
+        self.root = root
+        self._index_path = root / f".index-{cache_name}.json"
+        self._index: dict[str, dict[str, object]] = {}
+        self._dirty = False
+        self.deduplicated_files = 0
+        self.stored_bytes = 0
+        try:
+            loaded = json.loads(self._index_path.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict):
+                self._index = loaded
+        except (OSError, ValueError):
+            pass
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _temp_path(self) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f".tmp-{os.getpid()}-{time.monotonic_ns()}"
+
+    def _commit(self, tmp: Path, digest: str, size: int) -> Path:
+        blob = self._blob_path(digest)
+        if blob.exists():
+            tmp.unlink()
+            self.deduplicated_files += 1
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        # Blobs are shared by every snapshot that links them.
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, blob)
+        self.stored_bytes += size
+        return blob
+
+    def add_file(self, src: Path) -> Path:
+        st = src.stat()
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+        cached = self._index.get(str(src))
+        if cached and cached.get("sig") == signature:
+            blob = self._blob_path(str(cached["digest"]))
+            if blob.exists():
+                self.deduplicated_files += 1
+                return blob
+        # Hash while copying so the blob always matches its digest, even if
+        # the source changes underneath us.
+        tmp = self._temp_path()
+        digest = hashlib.sha256()
+        try:
+            with src.open("rb") as reader, tmp.open("wb") as writer:
+                while chunk := reader.read(_HASH_CHUNK_BYTES):
+                    digest.update(chunk)
+                    writer.write(chunk)
+            shutil.copystat(src, tmp)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
+        hexdigest = digest.hexdigest()
+        self._index[str(src)] = {"sig": signature, "digest": hexdigest}
+        self._dirty = True
+        return self._commit(tmp, hexdigest, st.st_size)
+
+    def add_owned(self, tmp: Path) -> Path:
+        """Move a temp file produced for this archive into the store."""
+        digest = hashlib.sha256()
+        with tmp.open("rb") as reader:
+            while chunk := reader.read(_HASH_CHUNK_BYTES):
+                digest.update(chunk)
+        return self._commit(tmp, digest.hexdigest(), tmp.stat().st_size)
+
+    def new_temp(self) -> Path:
+        return self._temp_path()
+
+    def save_index(self) -> None:
+        if not self._dirty:
+            return
+        live = {
+            key: value
+            for key, value in self._index.items()
+            if self._blob_path(str(value.get("digest"))).exists()
+        }
+        atomic_write(self._index_path, json.dumps(live, sort_keys=True))
+
+
+def _place(blob: Path, dest: Path) -> None:
     dest.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dest)
+    try:
+        os.link(blob, dest)
+    except OSError:
+        # Cross-device or link-limited filesystems fall back to a copy.
+        shutil.copy2(blob, dest)
+
+
+def _is_sqlite_file(path: Path) -> bool:
+    if path.suffix not in _SQLITE_SUFFIXES:
+        return False
+    try:
+        with path.open("rb") as handle:
+            return handle.read(len(_SQLITE_HEADER)) == _SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def _backup_sqlite(src: Path, dest: Path) -> None:
+    """Capture a consistent copy of a (possibly live, WAL-mode) database."""
+    source = sqlite3.connect(f"{src.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        target = sqlite3.connect(dest)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+
+def _gzip_file(src: Path, dest: Path) -> None:
+    with src.open("rb") as reader, dest.open("wb") as raw:
+        # mtime=0 keeps identical logs byte-identical so they deduplicate.
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as writer:
+            shutil.copyfileobj(reader, writer, _HASH_CHUNK_BYTES)
+
+
+def _copy_file(
+    src: Path,
+    dest: Path,
+    stats: dict[str, int],
+    blobs: _BlobStore,
+    *,
+    compress_logs: bool = False,
+) -> None:
+    if _is_sqlite_file(src):
+        tmp = blobs.new_temp()
+        try:
+            _backup_sqlite(src, tmp)
+            blob = blobs.add_owned(tmp)
+        except sqlite3.Error as exc:
+            logger.warning("SQLite backup of %s failed, copying file: %s", src, exc)
+            tmp.unlink(missing_ok=True)
+            blob = blobs.add_file(src)
+    elif compress_logs and src.suffix == _LOG_SUFFIX:
+        tmp = blobs.new_temp()
+        try:
+            _gzip_file(src, tmp)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
+        blob = blobs.add_owned(tmp)
+        dest = dest.with_name(dest.name + ".gz")
+    else:
+        blob = blobs.add_file(src)
+    _place(blob, dest)
     stats["file_count"] += 1
     stats["total_bytes"] += dest.stat().st_size
 
 
+def prune_archive_blobs(base_repo_root: Path) -> int:
+    """Delete stored blobs no snapshot links to any more; returns the count.
+
+    Callers must hold the archive blob lock of ``base_repo_root``.
+    """
+    blob_root = base_repo_root / ".codex-autorunner" / "archive" / BLOB_DIRNAME
+    if not blob_root.is_dir():
+        return 0
+    cutoff = time.time() - _BLOB_PRUNE_MIN_AGE_SECONDS
+    removed = 0
+    for shard in blob_root.iterdir():
+        if not shard.is_dir():
+            continue
+        for blob in shard.iterdir():
+            try:
+                st = blob.stat()
+                if st.st_nlink <= 1 and st.st_ctime < cutoff:
+                    blob.unlink()
+                    removed += 1
+            except OSError:
+                continue
+    return removed
+
+
 def _copy_tree(
     src_dir: Path,
     dest_dir: Path,
     worktree_root: Path,
     stats: dict[str, int],
+    blobs: _BlobStore,
     *,
     visited: set[Path],
     skipped_symlinks: list[str],
+    compress_logs: bool = False,
 ) -> None:
     real_dir = src_dir.resolve()
     if real_dir in visited:
@@ -79,8 +284,10 @@ def _copy_tree(
                 dest_dir / child.name,
                 worktree_root,
                 stats,
+                blobs,
                 visited=visited,
                 skipped_symlinks=skipped_symlinks,
+                compress_logs=compress_logs,
             )
         try:
             shutil.copystat(src_dir, dest_dir, follow_symlinks=False)
@@ -95,9 +302,11 @@ def _copy_entry(
     dest: Path,
     worktree_root: Path,
     stats: dict[str, int],
+    blobs: _BlobStore,
     *,
     visited: set[Path],
     skipped_symlinks: list[str],
+    compress_logs: bool = False,
 ) -> bool:
     if src.is_symlink():
         try:
@@ -114,12 +323,14 @@ def _copy_entry(
                 dest,
                 worktree_root,
                 stats,
+                blobs,
                 visited=visited,
                 skipped_symlinks=skipped_symlinks,
+                compress_logs=compress_logs,
             )
             return True
         if resolved.is_file():
-            _copy_file(resolved, dest, stats)
+            _copy_file(resolved, dest, stats, blobs, compress_logs=compress_logs)
             return True
         return False
 
@@ -129,13 +340,15 @@ def _copy_entry(
             dest,
             worktree_root,
             stats,
+            blobs,
             visited=visited,
             skipped_symlinks=skipped_symlinks,
+            compress_logs=compress_logs,
         )
         return True
 
     if src.is_file():
-        _copy_file(src, dest, stats)
+        _copy_file(src, dest, stats, blobs, compress_logs=compress_logs)
         return True
 
     return False
@@ -218,6 +431,7 @@ def archive_worktree_snapshot(
     snapshot_id: Optional[str] = None,
     head_sha: Optional[str] = None,
     source_path: Optional[Path | str] = None,
+    compress_logs: bool = False,
 ) -> ArchiveResult:
     base_repo_root = base_repo_root.resolve()
     worktree_repo_root = worktree_repo_root.resolve()
@@ -233,107 +447,122 @@ def archive_worktree_snapshot(
         / snapshot_id
     )
     snapshot_root.mkdir(parents=True, exist_ok=False)
+    archive_root = base_repo_root / ".codex-autorunner" / "archive"
+    with file_lock(archive_root / _BLOB_LOCK_FILENAME):
+        try:
+            prune_archive_blobs(base_repo_root)
+        except OSError as exc:
+            logger.warning("Pruning archive blobs failed: %s", exc)
+        blobs = _BlobStore(
+            archive_root / BLOB_DIRNAME,
+            worktree_repo_id,
+        )
 
-    source_root = worktree_repo_root / ".codex-autorunner"
-    curated: list[tuple[Path, Path]] = [
-        (source_root / "workspace", snapshot_root / "workspace"),
-        (source_root / "tickets", snapshot_root / "tickets"),
-        (source_root / "runs", snapshot_root / "runs"),
-        (source_root / "flows", snapshot_root / "flows"),
-        (source_root / "flows.db", snapshot_root / "flows.db"),
-        (source_root / "config.yml", snapshot_root / "config" / "config.yml"),
-        (source_root / "state.sqlite3", snapshot_root / "state" / "state.sqlite3"),
-        (
-            source_root / "codex-autorunner.log",
-            snapshot_root / "logs" / "codex-autorunner.log",
-        ),
-        (
-            source_root / "codex-server.log",
-            snapshot_root / "logs" / "codex-server.log",
-        ),
-    ]
+        source_root = worktree_repo_root / ".codex-autorunner"
+        curated: list[tuple[Path, Path]] = [
+            (source_root / "workspace", snapshot_root / "workspace"),
+            (source_root / "tickets", snapshot_root / "tickets"),
+            (source_root / "runs", snapshot_root / "runs"),
+            (source_root / "flows", snapshot_root / "flows"),
+            (source_root / "flows.db", snapshot_root / "flows.db"),
+            (source_root / "config.yml", snapshot_root / "config" / "config.yml"),
+            (source_root / "state.sqlite3", snapshot_root / "state" / "state.sqlite3"),
+            (
+                source_root / "codex-autorunner.log",
+                snapshot_root / "logs" / "codex-autorunner.log",
+            ),
+            (
+                source_root / "codex-server.log",
+                snapshot_root / "logs" / "codex-server.log",
+            ),
+        ]
 
-    stats = {"file_count": 0, "total_bytes": 0}
-    copied_paths: list[str] = []
-    missing_paths: list[str] = []
-    skipped_symlinks: list[str] = []
-    visited: set[Path] = set()
-    created_at = now_iso()
-    meta_path = snapshot_root / "META.json"
-    summary: dict[str, object] = {}
+        stats = {"file_count": 0, "total_bytes": 0}
+        copied_paths: list[str] = []
+        missing_paths: list[str] = []
+        skipped_symlinks: list[str] = []
+        visited: set[Path] = set()
+        created_at = now_iso()
+        meta_path = snapshot_root / "META.json"
+        summary: dict[str, object] = {}
 
-    try:
-        for src, dest in curated:
-            rel = src.relative_to(source_root)
-            if not src.exists() and not src.is_symlink():
-                missing_paths.append(str(rel))
-                continue
-            copied = _copy_entry(
-                src,
-                dest,
-                worktree_repo_root,
-                stats,
-                visited=visited,
+        try:
+            for src, dest in curated:
+                rel = src.relative_to(source_root)
+                if not src.exists() and not src.is_symlink():
+                    missing_paths.append(str(rel))
+                    continue
+                copied = _copy_entry(
+                    src,
+                    dest,
+                    worktree_repo_root,
+                    stats,
+                    blobs,
+                    visited=visited,
+                    skipped_symlinks=skipped_symlinks,
+                    compress_logs=compress_logs,
+                )
+                if copied:
+                    copied_paths.append(str(rel))
+
+            flow_run_count, latest_flow_run_id = _flow_summary(snapshot_root / "flows")
+            status: ArchiveStatus = "complete" if not missing_paths else "partial"
+            summary = {
+                "file_count": stats["file_count"],
+                "total_bytes": stats["total_bytes"],
+                "flow_run_count": flow_run_count,
+                "latest_flow_run_id": latest_flow_run_id,
+                "deduplicated_files": blobs.deduplicated_files,
+                "stored_bytes": blobs.stored_bytes,
+            }
+            meta = _build_meta(
+                snapshot_id=snapshot_id,
+                created_at=created_at,
+                status=status,
+                base_repo_id=base_repo_id,
+                worktree_repo_id=worktree_repo_id,
+                worktree_of=worktree_of,
+                branch=branch_name,
+                head_sha=resolved_head_sha,
+                source_path=(
+                    Path(source_path) if source_path is not None else worktree_repo_root
+                ),
+                copied_paths=copied_paths,
+                missing_paths=missing_paths,
                 skipped_symlinks=skipped_symlinks,
+                summary=summary,
+                note=note,
             )
-            if copied:
-                copied_paths.append(str(rel))
-
-        flow_run_count, latest_flow_run_id = _flow_summary(snapshot_root / "flows")
-        status: ArchiveStatus = "complete" if not missing_paths else "partial"
-        summary = {
-            "file_count": stats["file_count"],
-            "total_bytes": stats["total_bytes"],
-            "flow_run_count": flow_run_count,
-            "latest_flow_run_id": latest_flow_run_id,
-        }
-        meta = _build_meta(
-            snapshot_id=snapshot_id,
-            created_at=created_at,
-            status=status,
-            base_repo_id=base_repo_id,
-            worktree_repo_id=worktree_repo_id,
-            worktree_of=worktree_of,
-            branch=branch_name,
-            head_sha=resolved_head_sha,
-            source_path=(
-                Path(source_path) if source_path is not None else worktree_repo_root
-            ),
-            copied_paths=copied_paths,
-            missing_paths=missing_paths,
-            skipped_symlinks=skipped_symlinks,
-            summary=summary,
-            note=note,
-        )
-        atomic_write(meta_path, json.dumps(meta, indent=2) + "\n")
-    except Exception as exc:
-        summary = {
-            "file_count": stats["file_count"],
-            "total_bytes": stats["total_bytes"],
-            "flow_run_count": 0,
-            "latest_flow_run_id": None,
-        }
-        meta = _build_meta(
-            snapshot_id=snapshot_id,
-            created_at=created_at,
-            status="failed",
-            base_repo_id=base_repo_id,
-            worktree_repo_id=worktree_repo_id,
-            worktree_of=worktree_of,
-            branch=branch_name,
-            head_sha=resolved_head_sha,
-            source_path=(
-                Path(source_path) if source_path is not None else worktree_repo_root
-            ),
-            copied_paths=copied_paths,
-            missing_paths=missing_paths,
-            skipped_symlinks=skipped_symlinks,
-            summary=summary,
-            note=note,
-            error=str(exc),
-        )
-        atomic_write(meta_path, json.dumps(meta, indent=2) + "\n")
-        raise
+            atomic_write(meta_path, json.dumps(meta, indent=2) + "\n")
+            blobs.save_index()
+        except Exception as exc:
+            summary = {
+                "file_count": stats["file_count"],
+                "total_bytes": stats["total_bytes"],
+                "flow_run_count": 0,
+                "latest_flow_run_id": None,
+            }
+            meta = _build_meta(
+                snapshot_id=snapshot_id,
+                created_at=created_at,
+                status="failed",
+                base_repo_id=base_repo_id,
+                worktree_repo_id=worktree_repo_id,
+                worktree_of=worktree_of,
+                branch=branch_name,
+                head_sha=resolved_head_sha,
+                source_path=(
+                    Path(source_path) if source_path is not None else worktree_repo_root
+                ),
+                copied_paths=copied_paths,
+                missing_paths=missing_paths,
+                skipped_symlinks=skipped_symlinks,
+                summary=summary,
+                note=note,
+                error=str(exc),
+            )
+            atomic_write(meta_path, json.dumps(meta, indent=2) + "\n")
+            raise
 
     return ArchiveResult(
         snapshot_id=snapshot_id,
@@ -346,4 +575,6 @@ def archive_worktree_snapshot(
         latest_flow_run_id=latest_flow_run_id,
         missing_paths=tuple(missing_paths),
         skipped_symlinks=tuple(skipped_symlinks),
+        deduplicated_files=blobs.deduplicated_files,
+        stored_bytes=blobs.stored_bytes,
     )
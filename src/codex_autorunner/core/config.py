@@ -1,12 +1,28 @@
+import copy
 import dataclasses
 import ipaddress
 import json
 import logging
 import os
 import shlex
+import threading
+import time
+from collections import OrderedDict
 from os import PathLike
 from pathlib import Path
-from typing import IO, Any, Dict, List, Mapping, Optional, Tuple, Type, Union, cast
+from typing import (
+    IO,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import yaml
 
@@ -18,20 +34,10 @@ logger = logging.getLogger("codex_autorunner.core.config")
 
 DOTENV_AVAILABLE = True
 try:
-    from dotenv import dotenv_values, load_dotenv
+    from dotenv import dotenv_values
 except ModuleNotFoundError:  # pragma: no cover
     DOTENV_AVAILABLE = False
 
-    def load_dotenv(
-        dotenv_path: Optional[Union[str, PathLike[str]]] = None,
-        stream: Optional[IO[str]] = None,
-        verbose: bool = False,
-        override: bool = False,
-        interpolate: bool = True,
-        encoding: Optional[str] = None,
-    ) -> bool:
-        return False
-
     def dotenv_values(
         dotenv_path: Optional[Union[str, PathLike[str]]] = None,
         stream: Optional[IO[str]] = None,
@@ -73,6 +79,7 @@ def _default_app_server_section() -> Dict[str, Any]:
         "auto_restart": True,
         "max_handles": 20,
         "idle_ttl_seconds": 3600,
+        "warm_spares": 0,
         "turn_timeout_seconds": 28800,
         "turn_stall_timeout_seconds": 60,
         "turn_stall_poll_interval_seconds": 2,
@@ -228,6 +235,7 @@ def _default_usage_section() -> Dict[str, Any]:
         "cache_scope": "global",
         "global_cache_root": None,
         "repo_cache_path": ".codex-autorunner/usage/usage_series_cache.json",
+        "parse_workers": None,
     }
 
 
@@ -630,6 +638,8 @@ DEFAULT_HUB_CONFIG: Dict[str, Any] = {
         # Include the hub root itself as a manifest repo entry (path: ".").
         "include_root_repo": False,
         "repo_server_inherit": True,
+        # Gzip *.log files when archiving a worktree snapshot.
+        "archive_compress_logs": False,
         # Where to pull system updates from (defaults to main upstream)
         "update_repo_url": "https://github.com/Git-on-my-level/codex-autorunner.git",
         "update_repo_ref": "main",
@@ -664,21 +674,23 @@ __all__ = [
 ]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class LogConfig:
     path: Path
     max_bytes: int
     backup_count: int
+    # Write through the shared background log writer (see logging_utils).
+    queued: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class StaticAssetsConfig:
     cache_root: Path
     max_cache_entries: int
     max_cache_age_days: Optional[int]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerDocChatPromptConfig:
     max_chars: int
     message_max_chars: int
@@ -686,14 +698,14 @@ class AppServerDocChatPromptConfig:
     recent_summary_max_chars: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerSpecIngestPromptConfig:
     max_chars: int
     message_max_chars: int
     spec_excerpt_max_chars: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerAutorunnerPromptConfig:
     max_chars: int
     message_max_chars: int
@@ -701,14 +713,14 @@ class AppServerAutorunnerPromptConfig:
     prev_run_max_chars: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerPromptsConfig:
     doc_chat: AppServerDocChatPromptConfig
     spec_ingest: AppServerSpecIngestPromptConfig
     autorunner: AppServerAutorunnerPromptConfig
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerClientConfig:
     max_message_bytes: int
     oversize_preview_bytes: int
@@ -718,18 +730,19 @@ class AppServerClientConfig:
     restart_backoff_jitter_ratio: float
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerOutputConfig:
     policy: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class AppServerConfig:
     command: List[str]
     state_root: Path
     auto_restart: Optional[bool]
     max_handles: Optional[int]
     idle_ttl_seconds: Optional[int]
+    warm_spares: int
     turn_timeout_seconds: Optional[float]
     turn_stall_timeout_seconds: Optional[float]
     turn_stall_poll_interval_seconds: Optional[float]
@@ -740,13 +753,13 @@ class AppServerConfig:
     prompts: AppServerPromptsConfig
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class OpenCodeConfig:
     session_stall_timeout_seconds: Optional[float]
     max_text_chars: Optional[int]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class PmaConfig:
     enabled: bool
     default_agent: str
@@ -767,11 +780,12 @@ class PmaConfig:
     reactive_origin_blocklist: List[str] = dataclasses.field(default_factory=list)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class UsageConfig:
     cache_scope: str
     global_cache_root: Path
     repo_cache_path: Path
+    parse_workers: Optional[int] = None
 
 
 @dataclasses.dataclass(frozen=True)
@@ -796,7 +810,7 @@ class TemplatesConfig:
     repos: List[TemplateRepoConfig]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class RepoConfig:
     raw: Dict[str, Any]
     root: Path
@@ -857,7 +871,7 @@ class RepoConfig:
         return None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class HubConfig:
     raw: Dict[str, Any]
     root: Path
@@ -873,6 +887,7 @@ class HubConfig:
     auto_init_missing: bool
     include_root_repo: bool
     repo_server_inherit: bool
+    archive_compress_logs: bool
     update_repo_url: str
     update_repo_ref: str
     update_skip_checks: bool
@@ -920,9 +935,92 @@ def _merge_defaults(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str
     return merged
 
 
+# A file modified this shortly before it was read may be rewritten again
+# within the same timestamp tick without changing its signature, so nothing
+# derived from such a file is cached until it is older than this.
+_CONFIG_RACY_WINDOW_NS = 1_000_000_000
+_MAX_CACHED_CONFIGS = 256
+# Environment variables read while building configs (``~`` expansion, usage).
+_CONFIG_ENV_KEYS = ("HOME", "CODEX_HOME")
+
+FileSignature = Tuple[int, int, int]
+
+_CONFIG_CACHE_LOCK = threading.Lock()
+_YAML_CACHE: "OrderedDict[Path, Tuple[FileSignature, Dict[str, Any]]]" = OrderedDict()
+_HUB_CONFIG_CACHE: "OrderedDict[Path, Tuple[Tuple[object, ...], HubConfig]]" = (
+    OrderedDict()
+)
+_REPO_CONFIG_CACHE: "OrderedDict[Tuple[Path, Path], Tuple[Dict[str, Any], Tuple[object, ...], RepoConfig]]" = (OrderedDict())
+_DOTENV_CACHE: "OrderedDict[Path, Tuple[FileSignature, Dict[str, str]]]" = OrderedDict()
+
+
+def _file_signature(path: Path) -> Optional[FileSignature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _is_racy(signature: Optional[FileSignature]) -> bool:
+    return signature is not None and (
+        time.time_ns() - signature[0] < _CONFIG_RACY_WINDOW_NS
+    )
+
+
+def _config_inputs_signature(paths: List[Path]) -> Optional[Tuple[object, ...]]:
+    """Signature of every file a config is built from, or None if uncacheable."""
+    signatures = []
+    for path in paths:
+        signature = _file_signature(path)
+        if _is_racy(signature):
+            return None
+        signatures.append(signature)
+    return (
+        tuple(signatures),
+        tuple(os.environ.get(key) for key in _CONFIG_ENV_KEYS),
+    )
+
+
+def _cache_put(cache: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _MAX_CACHED_CONFIGS:
+        cache.popitem(last=False)
+
+
+def invalidate_config_cache() -> None:
+    """Drop cached configs; call after writing any config or override file.
+
+    Cached entries are also re-validated against file signatures on every
+    load, so this only matters for writes that could keep a file's signature.
+    """
+    with _CONFIG_CACHE_LOCK:
+        _YAML_CACHE.clear()
+        _HUB_CONFIG_CACHE.clear()
+        _REPO_CONFIG_CACHE.clear()
+        _DOTENV_CACHE.clear()
+
+
+_ConfigT = TypeVar("_ConfigT", "HubConfig", "RepoConfig")
+
+
+def _with_private_raw(config: _ConfigT) -> _ConfigT:
+    # ``raw`` is a plain dict callers may mutate; never hand out the cached one.
+    return dataclasses.replace(config, raw=copy.deepcopy(config.raw))
+
+
 def _load_yaml_dict(path: Path) -> Dict[str, Any]:
-    if not path.exists():
+    signature = _file_signature(path)
+    if signature is None:
         return {}
+    key = path.absolute()
+    with _CONFIG_CACHE_LOCK:
+        cached = _YAML_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            _YAML_CACHE.move_to_end(key)
+            # Callers merge into and mutate the result.
+            return copy.deepcopy(cached[1])
     try:
         data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
     except yaml.YAMLError as exc:
@@ -931,6 +1029,9 @@ def _load_yaml_dict(path: Path) -> Dict[str, Any]:
         raise ConfigError(f"Failed to read config file {path}: {exc}") from exc
     if not isinstance(data, dict):
         raise ConfigError(f"Config file must be a mapping: {path}")
+    if not _is_racy(signature):
+        with _CONFIG_CACHE_LOCK:
+            _cache_put(_YAML_CACHE, key, (signature, copy.deepcopy(data)))
     return data
 
 
@@ -967,6 +1068,7 @@ def update_override_templates(repo_root: Path, repos: List[Dict[str, Any]]) -> N
     templates["repos"] = list(repos or [])
     rendered = yaml.safe_dump(data, sort_keys=False).rstrip() + "\n"
     atomic_write(override_path, rendered)
+    invalidate_config_cache()
 
 
 def load_root_defaults(root: Path) -> Dict[str, Any]:
@@ -1167,6 +1269,8 @@ def _parse_app_server_config(
     idle_ttl_seconds = int(idle_ttl_raw) if idle_ttl_raw is not None else None
     if idle_ttl_seconds is not None and idle_ttl_seconds <= 0:
         idle_ttl_seconds = None
+    warm_spares_raw = cfg.get("warm_spares", defaults.get("warm_spares"))
+    warm_spares = max(0, int(warm_spares_raw)) if warm_spares_raw is not None else 0
     turn_timeout_raw = cfg.get(
         "turn_timeout_seconds", defaults.get("turn_timeout_seconds")
     )
@@ -1247,6 +1351,7 @@ def _parse_app_server_config(
         auto_restart=auto_restart,
         max_handles=max_handles,
         idle_ttl_seconds=idle_ttl_seconds,
+        warm_spares=warm_spares,
         turn_timeout_seconds=turn_timeout_seconds,
         turn_stall_timeout_seconds=turn_stall_timeout_seconds,
         turn_stall_poll_interval_seconds=turn_stall_poll_interval_seconds,
@@ -1424,10 +1529,13 @@ def _parse_usage_config(
         root,
         scope="usage.repo_cache_path",
     )
+    parse_workers_raw = cfg.get("parse_workers", defaults.get("parse_workers"))
+    parse_workers = int(parse_workers_raw) if parse_workers_raw else None
     return UsageConfig(
         cache_scope=cache_scope,
         global_cache_root=global_cache_root,
         repo_cache_path=repo_cache_path,
+        parse_workers=parse_workers,
     )
 
 
@@ -1556,14 +1664,44 @@ def load_dotenv_for_root(root: Path) -> None:
         ]
 
         for candidate in candidates:
-            if candidate.exists():
-                # Prefer repo-local .env over inherited process env to avoid stale keys
-                # (common when running via launchd/daemon or with a global shell export).
-                load_dotenv(dotenv_path=candidate, override=True)
+            # Prefer repo-local .env over inherited process env to avoid stale keys
+            # (common when running via launchd/daemon or with a global shell export).
+            os.environ.update(_dotenv_file_values(candidate))
     except OSError as exc:
         logger.debug("Failed to load .env file: %s", exc)
 
 
+def _dotenv_file_values(path: Path) -> Dict[str, str]:
+    """Values of a .env file, parsed once per file signature."""
+    if not DOTENV_AVAILABLE:
+        return {}
+    signature = _file_signature(path)
+    if signature is None:
+        return {}
+    key = path.absolute()
+    with _CONFIG_CACHE_LOCK:
+        cached = _DOTENV_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            _DOTENV_CACHE.move_to_end(key)
+            return cached[1]
+    values = {
+        str(name): str(value)
+        for name, value in dotenv_values(path, interpolate=False).items()
+        if name and value is not None
+    }
+    if any("$" in value for value in values.values()):
+        # Interpolated values depend on the environment; never cache them.
+        return {
+            str(name): str(value)
+            for name, value in dotenv_values(path).items()
+            if name and value is not None
+        }
+    if not _is_racy(signature):
+        with _CONFIG_CACHE_LOCK:
+            _cache_put(_DOTENV_CACHE, key, (signature, values))
+    return values
+
+
 def _parse_dotenv_fallback(path: Path) -> Dict[str, str]:
     env: Dict[str, str] = {}
     try:
@@ -1698,12 +1836,45 @@ def _resolve_hub_config_path(start: Path) -> Path:
     return config_path
 
 
+def _load_hub_config_at(config_path: Path) -> HubConfig:
+    """Build the hub config at ``config_path``, served from the config cache.
+
+    Entries are keyed by the resolved path and re-validated against the
+    signatures of the hub config, root config/override files and dotenv
+    files. The dotenv files are applied to the environment on every call, and
+    each caller gets its own copy of ``raw``.
+    """
+    key = config_path.resolve()
+    root = key.parent.parent
+    load_dotenv_for_root(root)
+    signature = _config_inputs_signature(
+        [
+            key,
+            root / ROOT_CONFIG_FILENAME,
+            root / ROOT_OVERRIDE_FILENAME,
+            root / ".env",
+            root / ".codex-autorunner" / ".env",
+        ]
+    )
+    if signature is not None:
+        with _CONFIG_CACHE_LOCK:
+            cached = _HUB_CONFIG_CACHE.get(key)
+            if cached is not None and cached[0] == signature:
+                _HUB_CONFIG_CACHE.move_to_end(key)
+                return _with_private_raw(cached[1])
+    merged = load_hub_config_data(config_path)
+    _validate_hub_config(merged, root=root)
+    hub = _build_hub_config(config_path, merged)
+    if signature is None:
+        return hub
+    with _CONFIG_CACHE_LOCK:
+        _cache_put(_HUB_CONFIG_CACHE, key, (signature, hub))
+    return _with_private_raw(hub)
+
+
 def load_hub_config(start: Path) -> HubConfig:
     """Load the nearest hub config walking upward from the provided path."""
-    config_path = _resolve_hub_config_path(start)
-    merged = load_hub_config_data(config_path)
-    _validate_hub_config(merged, root=config_path.parent.parent.resolve())
-    return _build_hub_config(config_path, merged)
+    return _load_hub_config_at(_resolve_hub_config_path(start))
 
 
 def _resolve_hub_path_for_repo(repo_root: Path, hub_path: Optional[Path]) -> Path:
@@ -1724,13 +1895,42 @@ def _resolve_hub_path_for_repo(repo_root: Path, hub_path: Optional[Path]) -> Pat
 def derive_repo_config(
     hub: HubConfig, repo_root: Path, *, load_env: bool = True
 ) -> RepoConfig:
+    """Repo config derived from ``hub``, cached per hub root and repo root.
+
+    A cached entry is reused only while ``hub.raw`` is unchanged. The dotenv
+    files are applied on every call when ``load_env`` is set.
+    """
+    resolved_root = repo_root.resolve()
     if load_env:
         load_dotenv_for_root(repo_root)
+    key = (hub.root, resolved_root)
+    signature = _config_inputs_signature(
+        [
+            resolved_root / REPO_OVERRIDE_FILENAME,
+            resolved_root / ".env",
+            resolved_root / ".codex-autorunner" / ".env",
+        ]
+    )
+    if signature is not None:
+        with _CONFIG_CACHE_LOCK:
+            cached = _REPO_CONFIG_CACHE.get(key)
+            if cached is not None and cached[1] == signature and cached[0] == hub.raw:
+                _REPO_CONFIG_CACHE.move_to_end(key)
+                return _with_private_raw(cached[2])
     merged = derive_repo_config_data(hub.raw, repo_root)
     merged["mode"] = "repo"
     merged["version"] = CONFIG_VERSION
     _validate_repo_config(merged, root=repo_root)
-    return _build_repo_config(repo_root / CONFIG_FILENAME, merged)
+    repo_config = _build_repo_config(repo_root / CONFIG_FILENAME, merged)
+    if signature is None:
+        return repo_config
+    with _CONFIG_CACHE_LOCK:
+        _cache_put(
+            _REPO_CONFIG_CACHE,
+            key,
+            (copy.deepcopy(hub.raw), signature, repo_config),
+        )
+    return _with_private_raw(repo_config)
 
 
 def _resolve_repo_root(start: Path) -> Path:
@@ -1747,9 +1947,7 @@ def load_repo_config(start: Path, hub_path: Optional[Path] = None) -> RepoConfig
     """Load a repo config by deriving it from the nearest hub config."""
     repo_root = _resolve_repo_root(start)
     hub_config_path = _resolve_hub_path_for_repo(repo_root, hub_path)
-    hub_config = load_hub_config_data(hub_config_path)
-    _validate_hub_config(hub_config, root=hub_config_path.parent.parent.resolve())
-    hub = _build_hub_config(hub_config_path, hub_config)
+    hub = _load_hub_config_at(hub_config_path)
     return derive_repo_config(hub, repo_root)
 
 
@@ -1857,6 +2055,7 @@ def _build_repo_config(config_path: Path, cfg: Dict[str, Any]) -> RepoConfig:
             backup_count=int(
                 log_cfg.get("backup_count", DEFAULT_REPO_CONFIG["log"]["backup_count"])
             ),
+            queued=bool(log_cfg.get("queued", False)),
         ),
         server_log=LogConfig(
             path=root
@@ -1872,6 +2071,7 @@ def _build_repo_config(config_path: Path, cfg: Dict[str, Any]) -> RepoConfig:
                     DEFAULT_REPO_CONFIG["server_log"]["backup_count"],
                 )
             ),
+            queued=bool(server_log_cfg.get("queued", log_cfg.get("queued", False))),
         ),
         voice=voice_cfg,
         static_assets=_parse_static_assets_config(
@@ -1942,6 +2142,7 @@ def _build_hub_config(config_path: Path, cfg: Dict[str, Any]) -> HubConfig:
         auto_init_missing=bool(hub_cfg["auto_init_missing"]),
         include_root_repo=bool(hub_cfg.get("include_root_repo", False)),
         repo_server_inherit=bool(hub_cfg.get("repo_server_inherit", True)),
+        archive_compress_logs=bool(hub_cfg.get("archive_compress_logs", False)),
         update_repo_url=str(hub_cfg.get("update_repo_url", "")),
         update_repo_ref=str(hub_cfg.get("update_repo_ref", "main")),
         update_skip_checks=update_skip_checks,
@@ -1969,6 +2170,7 @@ def _build_hub_config(config_path: Path, cfg: Dict[str, Any]) -> HubConfig:
             path=log_path,
             max_bytes=int(log_cfg["max_bytes"]),
             backup_count=int(log_cfg["backup_count"]),
+            queued=bool(log_cfg.get("queued", False)),
         ),
         server_log=LogConfig(
             path=server_log_path,
@@ -1976,6 +2178,7 @@ def _build_hub_config(config_path: Path, cfg: Dict[str, Any]) -> HubConfig:
             backup_count=int(
                 server_log_cfg.get("backup_count", log_cfg["backup_count"])
             ),
+            queued=bool(server_log_cfg.get("queued", log_cfg.get("queued", False))),
         ),
         static_assets=_parse_static_assets_config(
             cfg.get("static_assets"), root, DEFAULT_HUB_CONFIG["static_assets"]
@@ -2043,7 +2246,7 @@ def _validate_app_server_config(cfg: Dict[str, Any]) -> None:
     ):
         if not isinstance(app_server_cfg.get("auto_restart"), bool):
             raise ConfigError("app_server.auto_restart must be boolean or null")
-    for key in ("max_handles", "idle_ttl_seconds"):
+    for key in ("max_handles", "idle_ttl_seconds", "warm_spares"):
         if key in app_server_cfg and app_server_cfg.get(key) is not None:
             if not isinstance(app_server_cfg.get(key), int):
                 raise ConfigError(f"app_server.{key} must be an integer or null")
@@ -2220,6 +2423,14 @@ def _validate_usage_config(cfg: Dict[str, Any], *, root: Path) -> None:
             )
         except ConfigPathError as exc:
             raise ConfigError(str(exc)) from exc
+    parse_workers = usage_cfg.get("parse_workers")
+    if parse_workers is not None:
+        if (
+            not isinstance(parse_workers, int)
+            or isinstance(parse_workers, bool)
+            or parse_workers < 0
+        ):
+            raise ConfigError("usage.parse_workers must be an integer >= 0 or null")
 
 
 def _validate_agents_config(cfg: Dict[str, Any]) -> None:
@@ -2502,6 +2713,8 @@ def _validate_repo_config(cfg: Dict[str, Any], *, root: Path) -> None:
     for key in ("max_bytes", "backup_count"):
         if not isinstance(log_cfg.get(key, 0), int):
             raise ConfigError(f"log.{key} must be an integer")
+    if not isinstance(log_cfg.get("queued", False), bool):
+        raise ConfigError("log.queued must be boolean if provided")
     server_log_cfg = cfg.get("server_log", {})
     if server_log_cfg is not None and not isinstance(server_log_cfg, dict):
         raise ConfigError("server_log section must be a mapping or null")
@@ -2518,6 +2731,8 @@ def _validate_repo_config(cfg: Dict[str, Any], *, root: Path) -> None:
         for key in ("max_bytes", "backup_count"):
             if key in server_log_cfg and not isinstance(server_log_cfg.get(key), int):
                 raise ConfigError(f"server_log.{key} must be an integer")
+        if not isinstance(server_log_cfg.get("queued", False), bool):
+            raise ConfigError("server_log.queued must be boolean if provided")
     voice_cfg = cfg.get("voice", {})
     if voice_cfg is not None and not isinstance(voice_cfg, dict):
         raise ConfigError("voice section must be a mapping if provided")
@@ -2563,6 +2778,8 @@ def _validate_hub_config(cfg: Dict[str, Any], *, root: Path) -> None:
         hub_cfg.get("repo_server_inherit"), bool
     ):
         raise ConfigError("hub.repo_server_inherit must be boolean")
+    if not isinstance(hub_cfg.get("archive_compress_logs", False), bool):
+        raise ConfigError("hub.archive_compress_logs must be boolean")
     if "update_repo_url" in hub_cfg and not isinstance(
         hub_cfg.get("update_repo_url"), str
     ):
@@ -2580,6 +2797,8 @@ def _validate_hub_config(cfg: Dict[str, Any], *, root: Path) -> None:
     for key in ("max_bytes", "backup_count"):
         if not isinstance(log_cfg.get(key, 0), int):
             raise ConfigError(f"hub.log.{key} must be an integer")
+    if not isinstance(log_cfg.get("queued", False), bool):
+        raise ConfigError("hub.log.queued must be boolean if provided")
     server = cfg.get("server")
     if not isinstance(server, dict):
         raise ConfigError("server section must be a mapping")
@@ -2608,6 +2827,8 @@ def _validate_hub_config(cfg: Dict[str, Any], *, root: Path) -> None:
         for key in ("max_bytes", "backup_count"):
             if key in server_log_cfg and not isinstance(server_log_cfg.get(key), int):
                 raise ConfigError(f"server_log.{key} must be an integer")
+        if not isinstance(server_log_cfg.get("queued", False), bool):
+            raise ConfigError("server_log.queued must be boolean if provided")
     _validate_static_assets_config(cfg, scope="hub")
     _validate_housekeeping_config(cfg)
     _validate_telegram_bot_config(cfg)
@@ -9,6 +9,7 @@ from ..git_utils import run_git
 from ..lifecycle_events import LifecycleEventEmitter
 from ..utils import find_repo_root
 from .definition import FlowDefinition
+from .event_broadcaster import get_flow_event_broadcaster
 from .models import FlowEvent, FlowRunRecord, FlowRunStatus
 from .runtime import FlowRuntime
 from .store import FlowStore
@@ -43,11 +44,14 @@ class FlowController:
         artifacts_root: Path,
         durable: bool = False,
         hub_root: Optional[Path] = None,
+        event_batch_size: int = 0,
     ):
         self.definition = definition
         self.db_path = db_path
         self.artifacts_root = artifacts_root
-        self.store = FlowStore(db_path, durable=durable)
+        self.store = FlowStore(
+            db_path, durable=durable, event_batch_size=event_batch_size
+        )
         self._event_listeners: Set[Callable[[FlowEvent], None]] = set()
         self._lifecycle_event_listeners: Set[
             Callable[[str, str, str, dict, str], None]
@@ -329,28 +333,16 @@ class FlowController:
     async def stream_events(
         self, run_id: str, after_seq: Optional[int] = None
     ) -> AsyncGenerator[FlowEvent, None]:
-        last_seq = after_seq
-
-        while True:
-            events = self.store.get_events(
-                run_id=run_id,
-                after_seq=last_seq,
-                limit=100,
-            )
-
-            for event in events:
-                yield event
-                last_seq = event.seq
-
-            record = self.store.get_flow_run(run_id)
-            if (
-                record
-                and (record.status.is_terminal() or record.status.is_paused())
-                and not events
-            ):
-                break
-
-            await asyncio.sleep(0.5)
+        """Stream events until the run is terminal or paused.
+
+        Subscribers share a per-database broadcaster, so new rows are pushed to
+        every open stream of a run instead of each stream polling SQLite.
+        """
+        broadcaster = get_flow_event_broadcaster(self.db_path)
+        async for event in broadcaster.stream(
+            run_id, store=self.store, after_seq=after_seq
+        ):
+            yield event
 
     def get_events(
         self, run_id: str, after_seq: Optional[int] = None
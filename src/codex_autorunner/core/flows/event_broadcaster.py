@@ -0,0 +1,326 @@
+"""Push-based fan-out of flow events to stream subscribers.
+
+Every flows.db gets at most one :class:`FlowEventBroadcaster` per process. A
+single watcher thread per database notices new commits -- via
+``PRAGMA data_version`` for writes made by flow worker subprocesses and via an
+in-process nudge from :class:`FlowStore` -- and loads new rows once per watched
+run. All subscribers of that run are then served from a shared in-memory tail
+instead of polling SQLite independently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncGenerator, Deque, Dict, List, Optional, Tuple
+
+from .models import FlowEvent, FlowRunStatus
+
+if TYPE_CHECKING:
+    from .store import FlowStore
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SECONDS = 0.25
+DEFAULT_TAIL_SIZE = 512
+KEEPALIVE_SECONDS = 15.0
+IDLE_LINGER_SECONDS = 5.0
+CATCH_UP_PAGE_SIZE = 100
+
+_Waiter = Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]
+
+
+@dataclass
+class _RunTail:
+    events: Deque[FlowEvent] = field(default_factory=deque)
+    primed: bool = False
+    # The tail holds every event of the run with seq > base_seq.
+    base_seq: int = 0
+    last_seq: int = 0
+    status: Optional[FlowRunStatus] = None
+    version: int = 0
+    subscribers: int = 0
+    waiters: List[_Waiter] = field(default_factory=list)
+
+
+def _wake_future(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class FlowEventBroadcaster:
+    """Shares one watcher and one event tail per run across all subscribers."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        tail_size: int = DEFAULT_TAIL_SIZE,
+    ) -> None:
+        self.db_path = db_path
+        self._poll_interval = poll_interval
+        self._tail_size = max(1, tail_size)
+        self._lock = threading.Lock()
+        self._runs: Dict[str, _RunTail] = {}
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh_count = 0
+
+    def notify(self) -> None:
+        """Wake the watcher immediately (called after in-process commits)."""
+        self._wakeup.set()
+
+    def subscriber_count(self, run_id: str) -> int:
+        with self._lock:
+            tail = self._runs.get(run_id)
+            return tail.subscribers if tail else 0
+
+    async def stream(
+        self,
+        run_id: str,
+        store: "FlowStore",
+        after_seq: Optional[int] = None,
+    ) -> AsyncGenerator[FlowEvent, None]:
+        """Yield events for ``run_id`` until the run is terminal or paused.
+
+        ``store`` is only used for the initial snapshot and for catching up
+        subscribers whose cursor is older than the shared tail.
+        """
+        tail = self._acquire(run_id)
+        cursor = after_seq
+        try:
+            if not tail.primed:
+                self._prime(run_id, tail, store)
+            while True:
+                with self._lock:
+                    version = tail.version
+                    status = tail.status
+                    events = self._events_after(tail, cursor)
+                    base_seq = tail.base_seq
+                if events is None:
+                    events = store.get_events(
+                        run_id=run_id, after_seq=cursor, limit=CATCH_UP_PAGE_SIZE
+                    )
+                    if not events:
+                        # Rows older than the tail disappeared (e.g. compaction);
+                        # continue from the tail.
+                        cursor = base_seq
+                    for event in events:
+                        yield event
+                        cursor = event.seq
+                    continue
+                for event in events:
+                    yield event
+                    cursor = event.seq
+                if events:
+                    continue
+                if status is not None and (status.is_terminal() or status.is_paused()):
+                    break
+                await self._wait(tail, version, KEEPALIVE_SECONDS)
+        finally:
+            self._release(run_id)
+
+    def _events_after(
+        self, tail: _RunTail, cursor: Optional[int]
+    ) -> Optional[List[FlowEvent]]:
+        position = cursor if cursor is not None else 0
+        if position < tail.base_seq:
+            return None
+        newer: List[FlowEvent] = []
+        for event in reversed(tail.events):
+            if event.seq <= position:
+                break
+            newer.append(event)
+        newer.reverse()
+        return newer
+
+    def _acquire(self, run_id: str) -> _RunTail:
+        with self._lock:
+            tail = self._runs.get(run_id)
+            if tail is None:
+                tail = _RunTail()
+                self._runs[run_id] = tail
+            tail.subscribers += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._watch,
+                    name=f"flow-events-{self.db_path.parent.name}",
+                    daemon=True,
+                )
+                self._thread.start()
+        return tail
+
+    def _release(self, run_id: str) -> None:
+        waiters: List[_Waiter] = []
+        with self._lock:
+            tail = self._runs.get(run_id)
+            if tail is None:
+                return
+            tail.subscribers -= 1
+            if tail.subscribers <= 0:
+                waiters = tail.waiters
+                tail.waiters = []
+                self._runs.pop(run_id, None)
+        self._dispatch(waiters)
+
+    def _prime(self, run_id: str, tail: _RunTail, store: "FlowStore") -> None:
+        last_seq, _ = store.get_last_event_meta(run_id)
+        record = store.get_flow_run(run_id)
+        with self._lock:
+            if not tail.primed:
+                tail.base_seq = last_seq or 0
+                tail.last_seq = tail.base_seq
+                tail.status = record.status if record else None
+                tail.primed = True
+        # Force one refresh so commits racing with the snapshot are picked up.
+        self._wakeup.set()
+
+    async def _wait(self, tail: _RunTail, seen_version: int, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if tail.version != seen_version:
+                return
+            tail.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                try:
+                    tail.waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def _dispatch(self, waiters: List[_Waiter]) -> None:
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake_future, future)
+            except RuntimeError:
+                # Subscriber loop already closed.
+                pass
+
+    def _watch(self) -> None:
+        from .store import FlowStore
+
+        store = FlowStore(self.db_path)
+        last_data_version: Optional[int] = None
+        idle_since: Optional[float] = None
+        try:
+            while True:
+                woke = self._wakeup.wait(self._poll_interval)
+                self._wakeup.clear()
+                with self._lock:
+                    watched = {
+                        run_id: tail.last_seq
+                        for run_id, tail in self._runs.items()
+                        if tail.primed
+                    }
+                    if not self._runs:
+                        if idle_since is None:
+                            idle_since = time.monotonic()
+                        elif time.monotonic() - idle_since >= IDLE_LINGER_SECONDS:
+                            self._thread = None
+                            return
+                        continue
+                    idle_since = None
+                if not watched:
+                    continue
+                try:
+                    conn = store._get_conn()
+                    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                    if not woke and data_version == last_data_version:
+                        continue
+                    last_data_version = data_version
+                    self._refresh(store, watched)
+                except Exception as exc:
+                    _logger.warning(
+                        "Flow event watcher failed for %s: %s", self.db_path, exc
+                    )
+        finally:
+            store.close()
+
+    def _refresh(self, store: "FlowStore", watched: Dict[str, int]) -> None:
+        self.refresh_count += 1
+        conn = store._get_conn()
+        placeholders = ", ".join("?" for _ in watched)
+        fetched: Dict[str, List[FlowEvent]] = {}
+        # One read transaction gives a consistent snapshot: a terminal status is
+        # never observed without the events written before it.
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute(
+                f"SELECT id, status FROM flow_runs WHERE id IN ({placeholders})",
+                list(watched),
+            ).fetchall()
+            statuses = {row["id"]: FlowRunStatus(row["status"]) for row in rows}
+            for run_id, last_seq in watched.items():
+                fetched[run_id] = store.get_events(run_id=run_id, after_seq=last_seq)
+        finally:
+            conn.execute("COMMIT")
+
+        waiters: List[_Waiter] = []
+        with self._lock:
+            for run_id in watched:
+                tail = self._runs.get(run_id)
+                if tail is None:
+                    continue
+                events = fetched.get(run_id) or []
+                status = statuses.get(run_id)
+                changed = bool(events) or status != tail.status
+                for event in events:
+                    if event.seq <= tail.last_seq:
+                        continue
+                    tail.events.append(event)
+                    tail.last_seq = event.seq
+                while len(tail.events) > self._tail_size:
+                    dropped = tail.events.popleft()
+                    tail.base_seq = dropped.seq
+                tail.status = status
+                if changed:
+                    tail.version += 1
+                    waiters.extend(tail.waiters)
+                    tail.waiters = []
+        self._dispatch(waiters)
+
+
+_BROADCASTERS: Dict[str, FlowEventBroadcaster] = {}
+_BROADCASTERS_LOCK = threading.Lock()
+
+
+def _registry_key(db_path: Path) -> str:
+    return os.path.abspath(os.fspath(db_path))
+
+
+def get_flow_event_broadcaster(db_path: Path) -> FlowEventBroadcaster:
+    """Return the process-wide broadcaster for ``db_path``."""
+    key = _registry_key(db_path)
+    with _BROADCASTERS_LOCK:
+        broadcaster = _BROADCASTERS.get(key)
+        if broadcaster is None:
+            broadcaster = FlowEventBroadcaster(Path(key))
+            _BROADCASTERS[key] = broadcaster
+        return broadcaster
+
+
+def notify_flow_store_change(db_path: Path) -> None:
+    """Nudge the broadcaster for ``db_path`` if anyone is subscribed."""
+    broadcaster = _BROADCASTERS.get(_registry_key(db_path))
+    if broadcaster is not None:
+        broadcaster.notify()
+
+
+__all__ = [
+    "FlowEventBroadcaster",
+    "get_flow_event_broadcaster",
+    "notify_flow_store_change",
+]
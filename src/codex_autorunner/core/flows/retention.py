@@ -0,0 +1,122 @@
+"""Retention policy for the per-repo ``flow_events`` table.
+
+Finished runs have their high-frequency events folded into summary rows, and
+runs that finished long enough ago are moved into compressed per-run archives
+that :class:`FlowStore` still serves through ``get_events``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from .models import FlowRunRecord
+from .store import FlowStore
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 14.0
+
+
+@dataclasses.dataclass(frozen=True)
+class FlowEventRetentionPolicy:
+    compact_finished_runs: bool = True
+    # None disables archival.
+    archive_after_days: Optional[float] = DEFAULT_ARCHIVE_AFTER_DAYS
+    vacuum: bool = False
+    dry_run: bool = False
+
+
+@dataclasses.dataclass
+class FlowEventRetentionReport:
+    runs_compacted: int = 0
+    events_folded: int = 0
+    runs_archived: int = 0
+    events_archived: int = 0
+    db_bytes_before: int = 0
+    db_bytes_after: int = 0
+    errors: List[Dict[str, Any]] = dataclasses.field(default_factory=list)
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return max(0, self.db_bytes_before - self.db_bytes_after)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = dataclasses.asdict(self)
+        payload["reclaimed_bytes"] = self.reclaimed_bytes
+        return payload
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _finished_at(record: FlowRunRecord) -> Optional[datetime]:
+    return _parse_iso(record.finished_at) or _parse_iso(record.created_at)
+
+
+def apply_flow_event_retention(
+    store: FlowStore,
+    policy: Optional[FlowEventRetentionPolicy] = None,
+    *,
+    now: Optional[datetime] = None,
+) -> FlowEventRetentionReport:
+    """Compact and archive events of finished runs according to ``policy``."""
+    policy = policy or FlowEventRetentionPolicy()
+    now = now or datetime.now(timezone.utc)
+    archive_cutoff = (
+        now - timedelta(days=policy.archive_after_days)
+        if policy.archive_after_days is not None
+        else None
+    )
+    report = FlowEventRetentionReport(db_bytes_before=store.used_bytes())
+
+    for record in store.list_flow_runs():
+        if not record.status.is_terminal():
+            continue
+        retention = store.get_event_retention(record.id) or {}
+        finished = _finished_at(record)
+        archived_at = _parse_iso(retention.get("archived_at"))
+        if archived_at is not None and (finished is None or finished <= archived_at):
+            # Archived, and not resumed or re-run since.
+            continue
+        archive = (
+            archive_cutoff is not None
+            and finished is not None
+            and finished <= archive_cutoff
+        )
+        try:
+            if policy.compact_finished_runs and not retention.get("compacted_at"):
+                report.runs_compacted += 1
+                if not policy.dry_run:
+                    report.events_folded += store.compact_run_events(record.id)
+            if archive:
+                report.runs_archived += 1
+                if not policy.dry_run:
+                    report.events_archived += store.archive_run_events(record.id)
+        except Exception as exc:
+            _logger.warning("Flow event retention failed for %s: %s", record.id, exc)
+            report.errors.append({"run_id": record.id, "error": str(exc)})
+
+    if policy.vacuum and not policy.dry_run:
+        store.vacuum()
+    report.db_bytes_after = store.used_bytes()
+    return report
+
+
+__all__ = [
+    "DEFAULT_ARCHIVE_AFTER_DAYS",
+    "FlowEventRetentionPolicy",
+    "FlowEventRetentionReport",
+    "apply_flow_event_retention",
+]
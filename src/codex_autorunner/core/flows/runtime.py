@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import logging
 import uuid
@@ -7,7 +8,7 @@ from .definition import FlowDefinition, StepFn, StepFn2, StepFn3
 from .failure_diagnostics import ensure_failure_payload
 from .models import FlowEvent, FlowEventType, FlowRunRecord, FlowRunStatus
 from .reasons import ensure_reason_summary
-from .store import FlowStore, now_iso
+from .store import BATCHABLE_EVENT_TYPES, FlowStore, now_iso
 
 _logger = logging.getLogger(__name__)
 
@@ -50,6 +51,16 @@ class FlowRuntime:
         data: Optional[Dict[str, Any]] = None,
         step_id: Optional[str] = None,
     ) -> None:
+        if event_type in BATCHABLE_EVENT_TYPES and self.store.event_batching_enabled:
+            self.store.enqueue_event(
+                event_id=str(uuid.uuid4()),
+                run_id=run_id,
+                event_type=event_type,
+                data=data or {},
+                step_id=step_id,
+                on_persisted=self._notify_listener,
+            )
+            return
         event = self.store.create_event(
             event_id=str(uuid.uuid4()),
             run_id=run_id,
@@ -57,12 +68,26 @@ class FlowRuntime:
             data=data or {},
             step_id=step_id,
         )
+        self._notify_listener(event)
+
+    def _notify_listener(self, event: FlowEvent) -> None:
         if self.emit_event:
             try:
                 self.emit_event(event)
             except Exception as e:
                 _logger.exception("Error emitting event: %s", e)
 
+    def _compact_finished_run(self, record: FlowRunRecord) -> None:
+        # Streams are done once the run is terminal; fold its delta events now
+        # instead of waiting for a manual retention pass. Runs in a worker
+        # thread: long runs have many rows to rewrite.
+        if not record.status.is_terminal():
+            return
+        try:
+            self.store.compact_run_events(record.id)
+        except Exception as exc:
+            _logger.warning("Failed to compact events of run %s: %s", record.id, exc)
+
     async def run_flow(
         self,
         run_id: str,
@@ -146,6 +171,7 @@ class FlowRuntime:
                     if not next_steps and record.current_step:
                         next_steps = {record.current_step}
 
+            await asyncio.to_thread(self._compact_finished_run, record)
             return record
 
         except Exception as e:
@@ -183,6 +209,7 @@ class FlowRuntime:
                 ) from e
             record = updated
             self._emit_lifecycle("flow_failed", "", run_id, {"error": str(e)})
+            await asyncio.to_thread(self._compact_finished_run, record)
             return record
 
     async def _execute_step(
@@ -251,6 +278,9 @@ class FlowRuntime:
                 # Backwards-compatible call for older StepFn implementations.
                 outcome = await cast(StepFn2, step_fn)(record, record.input_data)
 
+            # Step boundary: make every batched event of this step durable.
+            self.store.flush_events()
+
             if outcome.output:
                 record.state.update(outcome.output)
 
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import gzip
 import json
 import logging
+import os
 import sqlite3
 import threading
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, cast
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, cast
 
 from ..sqlite_utils import SQLITE_PRAGMAS, SQLITE_PRAGMAS_DURABLE
 from ..time_utils import now_iso
+from .event_broadcaster import notify_flow_store_change
 from .models import (
     FlowArtifact,
     FlowEvent,
@@ -20,15 +25,107 @@ from .models import (
 
 _logger = logging.getLogger(__name__)
 
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = 4
 UNSET = object()
 
+# High-frequency event types that may be written behind via enqueue_event().
+BATCHABLE_EVENT_TYPES = frozenset(
+    {
+        FlowEventType.STEP_PROGRESS,
+        FlowEventType.AGENT_STREAM_DELTA,
+        FlowEventType.APP_SERVER_EVENT,
+        FlowEventType.DIFF_UPDATED,
+        FlowEventType.TOKEN_USAGE,
+        FlowEventType.TOOL_CALL,
+        FlowEventType.TOOL_RESULT,
+    }
+)
+DEFAULT_EVENT_BATCH_SIZE = 64
+DEFAULT_EVENT_BATCH_INTERVAL_SECONDS = 0.05
+# A failed group commit is retried with backoff; after the last attempt each
+# event is written on its own so one bad event cannot hold back the rest.
+_EVENT_FLUSH_MAX_ATTEMPTS = 5
+_EVENT_FLUSH_BACKOFF_SECONDS = 0.05
+_EVENT_FLUSH_MAX_BACKOFF_SECONDS = 2.0
+
+# Archived runs keep their events as gzip'd JSONL next to flows.db.
+EVENT_ARCHIVE_DIRNAME = "flow_event_archive"
+_ARCHIVE_CACHE_SIZE = 8
+
+# Scopes of the materialized per-run diff stats (flow_diff_stats.scope).
+DIFF_STATS_SCOPE_RUN = "run"
+DIFF_STATS_SCOPE_TICKET = "ticket"
+DIFF_STATS_SCOPE_DISPATCH = "dispatch"
+_DIFF_STAT_FIELDS = ("insertions", "deletions", "files_changed")
+
+# Delta-style app-server notifications that can be folded into one event.
+_APP_SERVER_DELTA_METHODS = frozenset(
+    {
+        "item/agentMessage/delta",
+        "turn/streamDelta",
+        "outputDelta",
+        "item/reasoning/summaryTextDelta",
+    }
+)
+
+_COMPACTABLE_EVENT_TYPES = frozenset(
+    {
+        FlowEventType.AGENT_STREAM_DELTA.value,
+        FlowEventType.APP_SERVER_EVENT.value,
+        FlowEventType.STEP_PROGRESS.value,
+    }
+)
+
+EventPersistedCallback = Callable[[FlowEvent], None]
+# (event_id, run_id, event_type, timestamp, data as JSON, step_id, callback);
+# data is serialized when the event is queued so a bad payload fails its caller.
+_PendingEvent = Tuple[
+    str,
+    str,
+    FlowEventType,
+    str,
+    str,
+    Optional[str],
+    Optional[EventPersistedCallback],
+]
+
 
 class FlowStore:
-    def __init__(self, db_path: Path, durable: bool = False):
+    def __init__(
+        self,
+        db_path: Path,
+        durable: bool = False,
+        *,
+        event_batch_size: int = 0,
+        event_batch_interval: float = DEFAULT_EVENT_BATCH_INTERVAL_SECONDS,
+    ):
+        """Open a flow store.
+
+        ``event_batch_size > 0`` enables write-behind batching: events passed to
+        :meth:`enqueue_event` are group-committed once ``event_batch_size``
+        events are pending or ``event_batch_interval`` seconds have passed,
+        whichever comes first. Any synchronous write or event read flushes the
+        pending batch first, so ordering and read-your-writes are preserved.
+        """
         self.db_path = db_path
         self._durable = durable
         self._local: threading.local = threading.local()
+        self._event_batch_size = max(0, int(event_batch_size))
+        self._event_batch_interval = max(0.0, float(event_batch_interval))
+        self._pending_events: List[_PendingEvent] = []
+        self._pending_cond = threading.Condition()
+        # Serializes event writes so batched and synchronous events keep order.
+        self._event_write_lock = threading.RLock()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_stop = False
+        self._archive_cache: OrderedDict[str, Tuple[float, List[FlowEvent]]] = (
+            OrderedDict()
+        )
+        self._archive_cache_lock = threading.Lock()
+
+    @property
+    def event_batching_enabled(self) -> bool:
+        return self._event_batch_size > 0
 
     def __enter__(self) -> FlowStore:
         self.initialize()
@@ -136,6 +233,47 @@ class FlowStore:
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_flow_artifacts_run_id ON flow_artifacts(run_id)"
         )
+        self._create_retention_schema(conn)
+        self._create_diff_stats_schema(conn)
+
+    def _create_retention_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS flow_event_retention (
+                run_id TEXT PRIMARY KEY,
+                compacted_at TEXT,
+                folded_events INTEGER NOT NULL DEFAULT 0,
+                archived_at TEXT,
+                archive_path TEXT,
+                archived_events INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (run_id) REFERENCES flow_runs(id) ON DELETE CASCADE
+            )
+        """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flow_events_run_type "
+            "ON flow_events(run_id, event_type, seq)"
+        )
+
+    def _create_diff_stats_schema(self, conn: sqlite3.Connection) -> None:
+        # Running totals of DIFF_UPDATED events, maintained as they are
+        # written: one "run" row per run, one row per ticket (summed) and one
+        # per dispatch seq (the latest event wins).
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS flow_diff_stats (
+                run_id TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                insertions INTEGER NOT NULL DEFAULT 0,
+                deletions INTEGER NOT NULL DEFAULT 0,
+                files_changed INTEGER NOT NULL DEFAULT 0,
+                events INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (run_id, scope, key),
+                FOREIGN KEY (run_id) REFERENCES flow_runs(id) ON DELETE CASCADE
+            )
+        """
+        )
 
     def _ensure_schema_version(self, conn: sqlite3.Connection) -> None:
         result = conn.execute("SELECT version FROM schema_info").fetchone()
@@ -187,6 +325,36 @@ class FlowStore:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_flow_events_run_id ON flow_events(run_id, seq)"
             )
+        elif version == 3:
+            self._create_retention_schema(conn)
+        elif version == 4:
+            self._create_diff_stats_schema(conn)
+            self._backfill_diff_stats(conn)
+
+    def _backfill_diff_stats(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            "SELECT run_id, data FROM flow_events WHERE event_type = ? ORDER BY seq",
+            (FlowEventType.DIFF_UPDATED.value,),
+        ).fetchall()
+        for row in rows:
+            try:
+                data = json.loads(row["data"] or "{}")
+            except Exception:
+                continue
+            _apply_diff_stats(conn, row["run_id"], data)
+        archived_runs = conn.execute(
+            "SELECT run_id FROM flow_event_retention WHERE archive_path IS NOT NULL"
+        ).fetchall()
+        for row in archived_runs:
+            run_id = row["run_id"]
+            try:
+                events = self._archived_events(run_id) or []
+            except Exception as exc:
+                _logger.warning("Failed to read event archive of %s: %s", run_id, exc)
+                continue
+            for event in events:
+                if event.event_type == FlowEventType.DIFF_UPDATED:
+                    _apply_diff_stats(conn, run_id, event.data)
 
     def create_flow_run(
         self,
@@ -210,6 +378,7 @@ class FlowStore:
             metadata=metadata or {},
         )
 
+        self.flush_events()
         with self.transaction() as conn:
             conn.execute(
                 """
@@ -275,6 +444,8 @@ class FlowStore:
 
         params.append(run_id)
 
+        # Status changes must never become visible ahead of earlier events.
+        self.flush_events()
         with self.transaction() as conn:
             conn.execute(
                 f"UPDATE flow_runs SET {', '.join(updates)} WHERE id = ?",
@@ -283,13 +454,15 @@ class FlowStore:
             row = conn.execute(
                 "SELECT * FROM flow_runs WHERE id = ?", (run_id,)
             ).fetchone()
-            if row is None:
-                return None
-            return self._row_to_flow_run(row)
+        notify_flow_store_change(self.db_path)
+        if row is None:
+            return None
+        return self._row_to_flow_run(row)
 
     def set_stop_requested(
         self, run_id: str, stop_requested: bool
     ) -> Optional[FlowRunRecord]:
+        self.flush_events()
         with self.transaction() as conn:
             conn.execute(
                 "UPDATE flow_runs SET stop_requested = ? WHERE id = ?",
@@ -305,6 +478,7 @@ class FlowStore:
     def update_current_step(
         self, run_id: str, current_step: str
     ) -> Optional[FlowRunRecord]:
+        self.flush_events()
         with self.transaction() as conn:
             conn.execute(
                 "UPDATE flow_runs SET current_step = ? WHERE id = ?",
@@ -357,6 +531,7 @@ class FlowStore:
         self, run_id: str, superseded_by: str
     ) -> Optional[FlowRunRecord]:
         now = now_iso()
+        self.flush_events()
         with self.transaction() as conn:
             existing = conn.execute(
                 "SELECT metadata FROM flow_runs WHERE id = ? AND status = ?",
@@ -402,31 +577,226 @@ class FlowStore:
         data: Optional[Dict[str, Any]] = None,
         step_id: Optional[str] = None,
     ) -> FlowEvent:
-        timestamp = now_iso()
+        """Persist an event immediately, committing any pending batch with it."""
+        pending: _PendingEvent = (
+            event_id,
+            run_id,
+            event_type,
+            now_iso(),
+            json.dumps(data or {}),
+            step_id,
+            None,
+        )
+        with self._event_write_lock:
+            batch = self._drain_pending_events()
+            try:
+                events = self._write_events(batch + [pending])
+            except Exception:
+                self._requeue_pending_events(batch)
+                raise
+        return events[-1]
 
-        with self.transaction() as conn:
-            conn.execute(
-                """
-                INSERT INTO flow_events (id, run_id, event_type, timestamp, data, step_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event_id,
-                    run_id,
-                    event_type.value,
-                    timestamp,
-                    json.dumps(data or {}),
-                    step_id,
-                ),
+    def enqueue_event(
+        self,
+        event_id: str,
+        run_id: str,
+        event_type: FlowEventType,
+        data: Optional[Dict[str, Any]] = None,
+        step_id: Optional[str] = None,
+        on_persisted: Optional[EventPersistedCallback] = None,
+    ) -> None:
+        """Queue an event for a group commit when batching is enabled.
+
+        Falls back to :meth:`create_event` when batching is disabled. ``data``
+        is serialized right away, so a payload that is not JSON-serializable
+        raises here and never reaches the batch.
+        ``on_persisted`` is called with the stored event (including its seq)
+        once it has been committed, possibly from the background flusher thread.
+        """
+        if not self.event_batching_enabled:
+            event = self.create_event(
+                event_id=event_id,
+                run_id=run_id,
+                event_type=event_type,
+                data=data,
+                step_id=step_id,
             )
-            row = conn.execute(
-                "SELECT * FROM flow_events WHERE id = ?", (event_id,)
-            ).fetchone()
+            if on_persisted is not None:
+                on_persisted(event)
+            return
+        pending: _PendingEvent = (
+            event_id,
+            run_id,
+            event_type,
+            now_iso(),
+            json.dumps(data or {}),
+            step_id,
+            on_persisted,
+        )
+        with self._pending_cond:
+            self._pending_events.append(pending)
+            self._ensure_flusher()
+            self._pending_cond.notify()
 
-        if row is None:
-            raise RuntimeError("Failed to persist flow event")
+    def flush_events(self) -> List[FlowEvent]:
+        """Commit pending batched events now (e.g. at step boundaries).
 
-        return self._row_to_flow_event(row)
+        If the write fails the batch is put back at the head of the queue, so
+        nothing is lost and a later flush retries it in order.
+        """
+        if not self._pending_events:
+            return []
+        with self._event_write_lock:
+            batch = self._drain_pending_events()
+            if not batch:
+                return []
+            try:
+                return self._write_events(batch)
+            except Exception:
+                self._requeue_pending_events(batch)
+                raise
+
+    def _drain_pending_events(self) -> List[_PendingEvent]:
+        with self._pending_cond:
+            batch = self._pending_events
+            self._pending_events = []
+            return batch
+
+    def _requeue_pending_events(self, batch: List[_PendingEvent]) -> None:
+        # Caller holds self._event_write_lock, so no newer batch was written.
+        if not batch:
+            return
+        with self._pending_cond:
+            self._pending_events[:0] = batch
+
+    def _flush_events_individually(self) -> None:
+        """Write pending events one transaction each, dropping any that fail.
+
+        Last resort after group commits keep failing. Events that cannot be
+        stored are logged as errors; their ``on_persisted`` never fires.
+        """
+        with self._event_write_lock:
+            batch = self._drain_pending_events()
+            for pending in batch:
+                try:
+                    self._write_events([pending])
+                except Exception as exc:
+                    _logger.error(
+                        "Dropped flow event %s (%s) for run %s: %s",
+                        pending[0],
+                        pending[2].value,
+                        pending[1],
+                        exc,
+                    )
+
+    def _write_events(self, batch: List[_PendingEvent]) -> List[FlowEvent]:
+        events: List[FlowEvent] = []
+        with self.transaction() as conn:
+            for event_id, run_id, event_type, timestamp, data_json, step_id, _ in batch:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO flow_events (id, run_id, event_type, timestamp, data, step_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        event_id,
+                        run_id,
+                        event_type.value,
+                        timestamp,
+                        data_json,
+                        step_id,
+                    ),
+                )
+                seq = cursor.lastrowid
+                if seq is None:
+                    raise RuntimeError("Failed to persist flow event")
+                data = json.loads(data_json)
+                if event_type == FlowEventType.DIFF_UPDATED:
+                    _apply_diff_stats(conn, run_id, data)
+                events.append(
+                    FlowEvent(
+                        seq=seq,
+                        id=event_id,
+                        run_id=run_id,
+                        event_type=event_type,
+                        timestamp=timestamp,
+                        data=data,
+                        step_id=step_id,
+                    )
+                )
+
+        notify_flow_store_change(self.db_path)
+        for pending, event in zip(batch, events):
+            callback = pending[-1]
+            if callback is None:
+                continue
+            try:
+                callback(event)
+            except Exception as exc:
+                _logger.exception("Error in flow event callback: %s", exc)
+        return events
+
+    def _ensure_flusher(self) -> None:
+        # Caller holds self._pending_cond.
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._flusher_stop = False
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="flow-event-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        failures = 0
+        try:
+            while True:
+                with self._pending_cond:
+                    while not self._pending_events and not self._flusher_stop:
+                        self._pending_cond.wait()
+                    if self._flusher_stop and not self._pending_events:
+                        return
+                    deadline = time.monotonic() + self._event_batch_interval
+                    while (
+                        not self._flusher_stop
+                        and len(self._pending_events) < self._event_batch_size
+                    ):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._pending_cond.wait(remaining)
+                try:
+                    self.flush_events()
+                    failures = 0
+                except Exception as exc:
+                    failures += 1
+                    if failures >= _EVENT_FLUSH_MAX_ATTEMPTS:
+                        _logger.warning(
+                            "Failed to flush batched flow events %d times, "
+                            "writing them one by one: %s",
+                            failures,
+                            exc,
+                        )
+                        self._flush_events_individually()
+                        failures = 0
+                        continue
+                    _logger.warning(
+                        "Failed to flush batched flow events (attempt %d): %s",
+                        failures,
+                        exc,
+                    )
+                    backoff = min(
+                        _EVENT_FLUSH_BACKOFF_SECONDS * 2 ** (failures - 1),
+                        _EVENT_FLUSH_MAX_BACKOFF_SECONDS,
+                    )
+                    deadline = time.monotonic() + backoff
+                    with self._pending_cond:
+                        while not self._flusher_stop:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._pending_cond.wait(remaining)
+        finally:
+            self._close_thread_conn()
 
     def get_events(
         self,
@@ -434,6 +804,7 @@ class FlowStore:
         after_seq: Optional[int] = None,
         limit: Optional[int] = None,
     ) -> List[FlowEvent]:
+        self.flush_events()
         conn = self._get_conn()
         query = "SELECT * FROM flow_events WHERE run_id = ?"
         params: List[Any] = [run_id]
@@ -449,7 +820,12 @@ class FlowStore:
             params.append(limit)
 
         rows = conn.execute(query, params).fetchall()
-        return [self._row_to_flow_event(row) for row in rows]
+        return self._with_archived_events(
+            run_id,
+            [self._row_to_flow_event(row) for row in rows],
+            after_seq=after_seq,
+            limit=limit,
+        )
 
     def get_events_by_types(
         self,
@@ -462,6 +838,7 @@ class FlowStore:
         """Return events for a run filtered to specific event types."""
         if not event_types:
             return []
+        self.flush_events()
         conn = self._get_conn()
         placeholders = ", ".join("?" for _ in event_types)
         query = f"""
@@ -482,7 +859,13 @@ class FlowStore:
             params.append(limit)
 
         rows = conn.execute(query, params).fetchall()
-        return [self._row_to_flow_event(row) for row in rows]
+        return self._with_archived_events(
+            run_id,
+            [self._row_to_flow_event(row) for row in rows],
+            event_types=event_types,
+            after_seq=after_seq,
+            limit=limit,
+        )
 
     def get_events_by_type(
         self,
@@ -496,13 +879,54 @@ class FlowStore:
             run_id, [event_type], after_seq=after_seq, limit=limit
         )
 
+    def get_diff_stats(self, run_id: str) -> Dict[str, int]:
+        """Totals of all DIFF_UPDATED events of a run."""
+        stats = self._get_diff_stats(run_id, DIFF_STATS_SCOPE_RUN)
+        return stats.get("", _empty_diff_stats())
+
+    def get_diff_stats_by_ticket(self, run_id: str) -> Dict[str, Dict[str, int]]:
+        """Summed DIFF_UPDATED stats of a run keyed by ``ticket_id``."""
+        return self._get_diff_stats(run_id, DIFF_STATS_SCOPE_TICKET)
+
+    def get_diff_stats_by_dispatch_seq(self, run_id: str) -> Dict[int, Dict[str, int]]:
+        """Latest DIFF_UPDATED stats of a run keyed by ``dispatch_seq``."""
+        return {
+            int(key): stats
+            for key, stats in self._get_diff_stats(
+                run_id, DIFF_STATS_SCOPE_DISPATCH
+            ).items()
+        }
+
+    def _get_diff_stats(self, run_id: str, scope: str) -> Dict[str, Dict[str, int]]:
+        self.flush_events()
+        rows = (
+            self._get_conn()
+            .execute(
+                """
+                SELECT key, insertions, deletions, files_changed
+                FROM flow_diff_stats
+                WHERE run_id = ? AND scope = ?
+                """,
+                (run_id, scope),
+            )
+            .fetchall()
+        )
+        return {
+            row["key"]: {field: int(row[field]) for field in _DIFF_STAT_FIELDS}
+            for row in rows
+        }
+
     def get_last_event_meta(self, run_id: str) -> tuple[Optional[int], Optional[str]]:
+        self.flush_events()
         conn = self._get_conn()
         row = conn.execute(
             "SELECT seq, timestamp FROM flow_events WHERE run_id = ? ORDER BY seq DESC LIMIT 1",
             (run_id,),
         ).fetchone()
         if row is None:
+            archived = self._archived_events(run_id)
+            if archived:
+                return archived[-1].seq, archived[-1].timestamp
             return None, None
         return row["seq"], row["timestamp"]
 
@@ -511,6 +935,7 @@ class FlowStore:
     ) -> Optional[int]:
         if not event_types:
             return None
+        self.flush_events()
         conn = self._get_conn()
         placeholders = ", ".join("?" for _ in event_types)
         params = [run_id, *[t.value for t in event_types]]
@@ -525,12 +950,17 @@ class FlowStore:
             params,
         ).fetchone()
         if row is None:
+            archived = self._archived_events(run_id)
+            if archived is not None:
+                matches = _select_events(archived, event_types=event_types)
+                return matches[-1].seq if matches else None
             return None
         return cast(int, row["seq"])
 
     def get_last_event_by_type(
         self, run_id: str, event_type: FlowEventType
     ) -> Optional[FlowEvent]:
+        self.flush_events()
         conn = self._get_conn()
         row = conn.execute(
             """
@@ -543,6 +973,10 @@ class FlowStore:
             (run_id, event_type.value),
         ).fetchone()
         if row is None:
+            archived = self._archived_events(run_id)
+            if archived is not None:
+                matches = _select_events(archived, event_types=[event_type])
+                return matches[-1] if matches else None
             return None
         return self._row_to_flow_event(row)
 
@@ -553,6 +987,7 @@ class FlowStore:
 
         This is intentionally lightweight to support UI polling endpoints.
         """
+        self.flush_events()
         conn = self._get_conn()
         query = """
             SELECT seq, data
@@ -566,11 +1001,26 @@ class FlowStore:
         query += " ORDER BY seq DESC LIMIT ?"
         params.append(limit)
         rows = conn.execute(query, params).fetchall()
+        datas: List[Any] = []
         for row in rows:
             try:
-                data = json.loads(row["data"] or "{}")
+                datas.append(json.loads(row["data"] or "{}"))
             except Exception:
-                data = {}
+                datas.append({})
+        if len(datas) < limit:
+            # Archived events all precede the live ones.
+            archived = self._archived_events(run_id)
+            if archived:
+                progress = _select_events(
+                    archived,
+                    event_types=[FlowEventType.STEP_PROGRESS],
+                    after_seq=after_seq,
+                )
+                remaining = limit - len(datas)
+                datas.extend(event.data for event in reversed(progress[-remaining:]))
+        for data in datas:
+            if not isinstance(data, dict):
+                continue
             current_ticket = data.get("current_ticket")
             if isinstance(current_ticket, str) and current_ticket.strip():
                 return current_ticket.strip()
@@ -593,6 +1043,7 @@ class FlowStore:
             metadata=metadata or {},
         )
 
+        self.flush_events()
         with self.transaction() as conn:
             conn.execute(
                 """
@@ -630,9 +1081,242 @@ class FlowStore:
 
     def delete_flow_run(self, run_id: str) -> bool:
         """Delete a flow run and its events/artifacts (cascading)."""
+        archive_path = self._archive_path_for(run_id)
+        self.flush_events()
         with self.transaction() as conn:
             cursor = conn.execute("DELETE FROM flow_runs WHERE id = ?", (run_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        if archive_path is not None:
+            self._drop_archive_cache(run_id)
+            try:
+                archive_path.unlink(missing_ok=True)
+            except OSError as exc:
+                _logger.warning(
+                    "Failed to remove event archive %s: %s", archive_path, exc
+                )
+        return deleted
+
+    def get_event_retention(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Return compaction/archive bookkeeping for a run, if any."""
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT * FROM flow_event_retention WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {key: row[key] for key in row.keys()}
+
+    def compact_run_events(self, run_id: str) -> int:
+        """Fold runs of consecutive high-frequency events into summary rows.
+
+        Agent stream deltas and delta-style app-server notifications (per
+        turn/item) and step_progress events (per current ticket) collapse into
+        their last row, which keeps its seq and carries the merged payload plus
+        ``compacted_count``. Any other event closes every open group, so the
+        replayed timeline keeps its order around tool calls and item updates.
+        The two delta streams mirror each other and may interleave within one
+        turn. Returns the number of rows removed.
+        """
+        self.flush_events()
+        folded = 0
+        with self.transaction() as conn:
+            rows = conn.execute(
+                """
+                SELECT seq, event_type, data, step_id
+                FROM flow_events
+                WHERE run_id = ?
+                ORDER BY seq ASC
+                """,
+                (run_id,),
+            ).fetchall()
+            open_groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+            open_keys: Dict[str, Tuple[Any, ...]] = {}
+            groups: List[Tuple[str, List[Tuple[int, Dict[str, Any]]]]] = []
+
+            def close_groups() -> None:
+                groups.extend(open_groups.items())
+                open_groups.clear()
+                open_keys.clear()
+
+            for row in rows:
+                event_type = row["event_type"]
+                if event_type in _COMPACTABLE_EVENT_TYPES:
+                    try:
+                        data = json.loads(row["data"] or "{}")
+                    except Exception:
+                        data = None
+                else:
+                    data = None
+                key = (
+                    _compaction_key(event_type, row["step_id"], data)
+                    if isinstance(data, dict)
+                    else None
+                )
+                if key is None:
+                    close_groups()
+                    continue
+                if open_keys.get(event_type) != key:
+                    # Only a new stream of the same turn may open alongside.
+                    if event_type in open_keys or any(
+                        open_key[0] != key[0] for open_key in open_keys.values()
+                    ):
+                        close_groups()
+                    open_keys[event_type] = key
+                    open_groups[event_type] = []
+                open_groups[event_type].append((row["seq"], cast(Dict[str, Any], data)))
+            close_groups()
+
+            for event_type, members in groups:
+                if len(members) < 2:
+                    continue
+                keep_seq = members[-1][0]
+                merged = _merge_compacted(event_type, [data for _, data in members])
+                conn.execute(
+                    "UPDATE flow_events SET data = ? WHERE seq = ?",
+                    (json.dumps(merged), keep_seq),
+                )
+                drop = [seq for seq, _ in members[:-1]]
+                for start in range(0, len(drop), 500):
+                    chunk = drop[start : start + 500]
+                    conn.execute(
+                        f"DELETE FROM flow_events WHERE seq IN ({', '.join('?' for _ in chunk)})",
+                        chunk,
+                    )
+                folded += len(drop)
+            conn.execute(
+                """
+                INSERT INTO flow_event_retention (run_id, compacted_at, folded_events)
+                VALUES (?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    compacted_at = excluded.compacted_at,
+                    folded_events = flow_event_retention.folded_events
+                        + excluded.folded_events
+                """,
+                (run_id, now_iso(), folded),
+            )
+        return folded
+
+    def archive_run_events(self, run_id: str) -> int:
+        """Move a run's live events into a compressed per-run archive.
+
+        The events stay readable through :meth:`get_events` and friends. A run
+        that gained events after an earlier archive (resumed or re-run) has
+        them appended to its archive. Returns the number of newly archived
+        events.
+        """
+        self.flush_events()
+        rows = (
+            self._get_conn()
+            .execute(
+                "SELECT * FROM flow_events WHERE run_id = ? ORDER BY seq ASC",
+                (run_id,),
+            )
+            .fetchall()
+        )
+        if not rows:
+            return 0
+        live = [self._row_to_flow_event(row) for row in rows]
+        previous = self._archived_events(run_id) or []
+        events = _merge_event_lists(previous, live)
+        archive_dir = self.db_path.parent / EVENT_ARCHIVE_DIRNAME
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        archive_name = f"{run_id}.jsonl.gz"
+        archive_path = archive_dir / archive_name
+        tmp_path = archive_dir / f".{archive_name}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+            for event in events:
+                handle.write(json.dumps(event.model_dump(mode="json")))
+                handle.write("\n")
+        os.replace(tmp_path, archive_path)
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM flow_events WHERE run_id = ? AND seq <= ?",
+                (run_id, live[-1].seq),
+            )
+            conn.execute(
+                """
+                INSERT INTO flow_event_retention
+                    (run_id, archived_at, archive_path, archived_events)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    archived_at = excluded.archived_at,
+                    archive_path = excluded.archive_path,
+                    archived_events = excluded.archived_events
+                """,
+                (run_id, now_iso(), archive_name, len(events)),
+            )
+        self._drop_archive_cache(run_id)
+        return len(live)
+
+    def used_bytes(self) -> int:
+        """Bytes of the database file currently holding live pages."""
+        conn = self._get_conn()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return int(page_size) * max(0, int(page_count) - int(freelist))
+
+    def vacuum(self) -> None:
+        self.flush_events()
+        self._get_conn().execute("VACUUM")
+
+    def _archive_path_for(self, run_id: str) -> Optional[Path]:
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT archive_path FROM flow_event_retention WHERE run_id = ?",
+            (run_id,),
+        ).fetchone()
+        if row is None or not row["archive_path"]:
+            return None
+        return self.db_path.parent / EVENT_ARCHIVE_DIRNAME / str(row["archive_path"])
+
+    def _archived_events(self, run_id: str) -> Optional[List[FlowEvent]]:
+        archive_path = self._archive_path_for(run_id)
+        if archive_path is None:
+            return None
+        try:
+            mtime = archive_path.stat().st_mtime
+        except OSError:
+            _logger.warning("Event archive missing for run %s", run_id)
+            return []
+        with self._archive_cache_lock:
+            cached = self._archive_cache.get(run_id)
+            if cached is not None and cached[0] == mtime:
+                self._archive_cache.move_to_end(run_id)
+                return cached[1]
+        events: List[FlowEvent] = []
+        with gzip.open(archive_path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    events.append(FlowEvent.model_validate_json(line))
+        with self._archive_cache_lock:
+            self._archive_cache[run_id] = (mtime, events)
+            while len(self._archive_cache) > _ARCHIVE_CACHE_SIZE:
+                self._archive_cache.popitem(last=False)
+        return events
+
+    def _with_archived_events(
+        self,
+        run_id: str,
+        live: List[FlowEvent],
+        *,
+        event_types: Optional[List[FlowEventType]] = None,
+        after_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[FlowEvent]:
+        """Merge a run's archived events into ``live`` rows selected alike."""
+        archived = self._archived_events(run_id)
+        if not archived:
+            return live
+        selected = _select_events(
+            archived, event_types=event_types, after_seq=after_seq, limit=limit
+        )
+        merged = _merge_event_lists(selected, live)
+        return merged[:limit] if limit is not None else merged
+
+    def _drop_archive_cache(self, run_id: str) -> None:
+        with self._archive_cache_lock:
+            self._archive_cache.pop(run_id, None)
 
     def _row_to_flow_run(self, row: sqlite3.Row) -> FlowRunRecord:
         return FlowRunRecord(
@@ -672,6 +1356,159 @@ class FlowStore:
         )
 
     def close(self) -> None:
+        flusher = self._flusher
+        if flusher is not None:
+            with self._pending_cond:
+                self._flusher_stop = True
+                self._pending_cond.notify_all()
+            if flusher is not threading.current_thread():
+                flusher.join(timeout=5)
+            self._flusher = None
+        try:
+            self.flush_events()
+        except Exception as exc:
+            _logger.warning("Failed to flush batched flow events: %s", exc)
+            self._flush_events_individually()
+        self._close_thread_conn()
+
+    def _close_thread_conn(self) -> None:
         if hasattr(self._local, "conn"):
             self._local.conn.close()
             del self._local.conn
+
+
+def _empty_diff_stats() -> Dict[str, int]:
+    return {field: 0 for field in _DIFF_STAT_FIELDS}
+
+
+def _diff_stat_value(data: Dict[str, Any], field: str) -> int:
+    try:
+        return int(data.get(field) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _apply_diff_stats(
+    conn: sqlite3.Connection, run_id: str, data: Dict[str, Any]
+) -> None:
+    """Fold one DIFF_UPDATED payload into ``flow_diff_stats``."""
+    if not isinstance(data, dict):
+        return
+    values = tuple(_diff_stat_value(data, field) for field in _DIFF_STAT_FIELDS)
+    keys: List[Tuple[str, str]] = [(DIFF_STATS_SCOPE_RUN, "")]
+    ticket_id = data.get("ticket_id")
+    if isinstance(ticket_id, str) and ticket_id.strip():
+        keys.append((DIFF_STATS_SCOPE_TICKET, ticket_id))
+    for scope, key in keys:
+        conn.execute(
+            """
+            INSERT INTO flow_diff_stats
+                (run_id, scope, key, insertions, deletions, files_changed, events)
+            VALUES (?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT(run_id, scope, key) DO UPDATE SET
+                insertions = flow_diff_stats.insertions + excluded.insertions,
+                deletions = flow_diff_stats.deletions + excluded.deletions,
+                files_changed = flow_diff_stats.files_changed
+                    + excluded.files_changed,
+                events = flow_diff_stats.events + 1
+            """,
+            (run_id, scope, key, *values),
+        )
+    try:
+        dispatch_seq = int(data.get("dispatch_seq") or 0)
+    except (TypeError, ValueError):
+        dispatch_seq = 0
+    if dispatch_seq > 0:
+        conn.execute(
+            """
+            INSERT INTO flow_diff_stats
+                (run_id, scope, key, insertions, deletions, files_changed, events)
+            VALUES (?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT(run_id, scope, key) DO UPDATE SET
+                insertions = excluded.insertions,
+                deletions = excluded.deletions,
+                files_changed = excluded.files_changed,
+                events = flow_diff_stats.events + 1
+            """,
+            (run_id, DIFF_STATS_SCOPE_DISPATCH, str(dispatch_seq), *values),
+        )
+
+
+def _select_events(
+    events: List[FlowEvent],
+    *,
+    event_types: Optional[List[FlowEventType]] = None,
+    after_seq: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[FlowEvent]:
+    wanted = set(event_types) if event_types is not None else None
+    selected = [
+        event
+        for event in events
+        if (wanted is None or event.event_type in wanted)
+        and (after_seq is None or event.seq > after_seq)
+    ]
+    if limit is not None:
+        selected = selected[:limit]
+    return selected
+
+
+def _merge_event_lists(
+    first: List[FlowEvent], second: List[FlowEvent]
+) -> List[FlowEvent]:
+    """Events of both lists ordered by seq; ``second`` wins on equal seqs."""
+    by_seq = {event.seq: event for event in first}
+    by_seq.update((event.seq, event) for event in second)
+    return [by_seq[seq] for seq in sorted(by_seq)]
+
+
+def _compaction_key(
+    event_type: str, step_id: Optional[str], data: Dict[str, Any]
+) -> Optional[Tuple[Any, ...]]:
+    # The first element scopes the group: delta groups of the two event types
+    # may stay open together only while they share it.
+    if event_type == FlowEventType.AGENT_STREAM_DELTA.value:
+        if not isinstance(data.get("delta"), str):
+            return None
+        return (
+            ("turn", step_id, data.get("turn_id")),
+            data.get("method"),
+            data.get("part_type"),
+            data.get("item_id"),
+        )
+    if event_type == FlowEventType.STEP_PROGRESS.value:
+        return (("progress", step_id), data.get("current_ticket"))
+    if event_type == FlowEventType.APP_SERVER_EVENT.value:
+        message = data.get("message")
+        if not isinstance(message, dict):
+            return None
+        method = message.get("method")
+        params = message.get("params")
+        if method not in _APP_SERVER_DELTA_METHODS or not isinstance(params, dict):
+            return None
+        if not isinstance(params.get("delta"), str):
+            return None
+        return (
+            ("turn", step_id, data.get("turn_id")),
+            method,
+            params.get("itemId") or params.get("item_id"),
+        )
+    return None
+
+
+def _merge_compacted(event_type: str, datas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged = dict(datas[-1])
+    if event_type == FlowEventType.AGENT_STREAM_DELTA.value:
+        merged["delta"] = "".join(str(data.get("delta") or "") for data in datas)
+    elif event_type == FlowEventType.APP_SERVER_EVENT.value:
+        message = dict(merged["message"])
+        params = dict(message["params"])
+        params["delta"] = "".join(
+            str(data["message"]["params"].get("delta") or "") for data in datas
+        )
+        message["params"] = params
+        merged["message"] = message
+    merged["compacted_count"] = sum(
+        int(data.get("compacted_count") or 1) for data in datas
+    )
+    return merged
@@ -4,7 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Optional, Protocol
 
-from ...tickets.files import list_ticket_paths, ticket_is_done
+from ...tickets.files import list_ticket_paths
+from ...tickets.index import ticket_index_for
 from .models import FlowEventType, FlowRunRecord
 from .store import FlowStore
 from .worker_process import (
@@ -59,15 +60,8 @@ def _ticket_dir(repo_root: Path) -> Path:
 
 
 def ticket_progress(repo_root: Path) -> dict[str, int]:
-    ticket_dir = _ticket_dir(repo_root)
-    ticket_paths = list_ticket_paths(ticket_dir)
-    total = len(ticket_paths)
-    done = 0
-    if total:
-        for path in ticket_paths:
-            if ticket_is_done(path):
-                done += 1
-    return {"done": done, "total": total}
+    ticket_index = ticket_index_for(_ticket_dir(repo_root))
+    return {"done": ticket_index.done_count, "total": ticket_index.total_count}
 
 
 def bootstrap_check(
@@ -2,9 +2,26 @@
 Centralized Git utilities for consistent git operations across the codebase.
 """
 
+import dataclasses
+import os
+import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from .utils import subprocess_env
 
@@ -74,37 +91,18 @@ def git_available(repo_root: Path) -> bool:
 
 def git_head_sha(repo_root: Path) -> Optional[str]:
     """Get the current HEAD SHA, or None if unavailable."""
-    try:
-        proc = run_git(["rev-parse", "HEAD"], repo_root)
-    except GitError:
-        return None
-    sha = (proc.stdout or "").strip()
-    return sha if proc.returncode == 0 and sha else None
+    return git_query_service().head_sha(repo_root)
 
 
 def git_branch(repo_root: Path) -> Optional[str]:
     """Get the current branch name, or None if detached HEAD or unavailable."""
-    try:
-        proc = run_git(["rev-parse", "--abbrev-ref", "HEAD"], repo_root)
-    except GitError:
-        return None
-    branch = (proc.stdout or "").strip()
-    if proc.returncode != 0 or not branch:
-        return None
-    if branch == "HEAD":
-        return None
-    return branch
+    return git_query_service().branch(repo_root)
 
 
 def git_is_clean(repo_root: Path) -> bool:
     """Check if the working tree has no uncommitted changes."""
-    try:
-        proc = run_git(["status", "--porcelain"], repo_root, check=False)
-    except GitError:
-        return False
-    if proc.returncode != 0:
-        return False
-    return not bool((proc.stdout or "").strip())
+    status = git_query_service().status(repo_root)
+    return status is not None and status.is_clean
 
 
 def git_ls_files(repo_root: Path) -> List[str]:
@@ -160,54 +158,30 @@ def git_status_porcelain(repo_root: Path) -> Optional[str]:
     Returns:
         The status output as a string, or None on error
     """
-    try:
-        proc = run_git(["status", "--porcelain"], repo_root)
-    except GitError:
-        return None
-    if proc.returncode != 0:
-        return None
-    return (proc.stdout or "").strip()
+    status = git_query_service().status(repo_root)
+    return status.porcelain if status is not None else None
 
 
-def git_upstream_status(repo_root: Path) -> Optional[dict]:
+def git_upstream_status(repo_root: Path, *, max_age: float = 0.0) -> Optional[dict]:
     """
     Get upstream tracking status for the current branch.
 
+    Ahead/behind counts only move with refs, so callers that just checked the
+    work tree can pass ``max_age`` to reuse that status.
+
     Returns:
         Dict with has_upstream, ahead, behind, or None if git is unavailable.
     """
-    if not git_available(repo_root):
+    if not (repo_root / ".git").exists():
         return None
-    try:
-        proc = run_git(
-            ["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"],
-            repo_root,
-            check=False,
-        )
-    except GitError:
+    status = git_query_service().status(repo_root, max_age=max_age)
+    if status is None:
         return None
-    if proc.returncode != 0:
-        return {"has_upstream": False, "ahead": 0, "behind": 0}
-    proc = run_git(
-        ["rev-list", "--left-right", "--count", "HEAD...@{u}"],
-        repo_root,
-        check=False,
-    )
-    if proc.returncode != 0:
-        return {"has_upstream": True, "ahead": 0, "behind": 0}
-    raw = (proc.stdout or "").strip()
-    ahead = 0
-    behind = 0
-    if raw:
-        parts = raw.split()
-        if len(parts) >= 2:
-            try:
-                ahead = int(parts[0])
-                behind = int(parts[1])
-            except ValueError:
-                ahead = 0
-                behind = 0
-    return {"has_upstream": True, "ahead": ahead, "behind": behind}
+    return {
+        "has_upstream": status.upstream is not None,
+        "ahead": status.ahead,
+        "behind": status.behind,
+    }
 
 
 def git_default_branch(repo_root: Path) -> Optional[str]:
@@ -294,3 +268,455 @@ def git_diff_stats(
         "deletions": deletions,
         "files_changed": files_changed,
     }
+
+
+# Repeated status/HEAD queries are served from here instead of forking git
+# each time; see GitQueryService.
+# Callers pass this as ``max_age`` when a status taken moments ago by the same
+# operation is good enough, so back-to-back checks run ``git status`` once.
+GIT_STATUS_REUSE_SECONDS = 1.0
+_GIT_QUERY_MAX_ENTRIES = 512
+_STATUS_AHEAD_BEHIND_RE = re.compile(r"(ahead|behind) (\d+)")
+
+_StatSignature = Optional[Tuple[int, int, int]]
+_T = TypeVar("_T")
+
+
+@dataclasses.dataclass(frozen=True)
+class GitStatus:
+    """Parsed ``git status --porcelain --branch`` of a work tree."""
+
+    branch: Optional[str]
+    # Configured upstream (e.g. ``origin/main``); None if unset or gone.
+    upstream: Optional[str]
+    ahead: int
+    behind: int
+    # ``git status --porcelain`` output, stripped.
+    porcelain: str
+
+    @property
+    def is_clean(self) -> bool:
+        return not self.porcelain
+
+
+@dataclasses.dataclass
+class GitCommandStats:
+    """Per-command counters of a :class:`GitQueryService`."""
+
+    calls: int = 0
+    runs: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class _QueryResult:
+    signature: Tuple[object, ...]
+    started_at: float
+    value: Any
+
+
+@dataclasses.dataclass(frozen=True)
+class _InFlight:
+    signature: Tuple[object, ...]
+    started_at: float
+    future: "Future[Any]"
+
+
+def resolve_git_dir(repo_root: Path) -> Optional[Path]:
+    """The git dir of the work tree at ``repo_root``, following ``.git`` files."""
+    dot_git = repo_root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    # Worktrees have a ``.git`` file pointing at their git dir.
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:") :].strip())
+    return git_dir if git_dir.is_absolute() else (repo_root / git_dir).resolve()
+
+
+def _stat_signature(path: Path) -> _StatSignature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    # Git replaces refs and the index by renaming a lock file over them, so
+    # the inode changes even when a rewrite keeps the mtime and size.
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _common_dir(git_dir: Path) -> Path:
+    try:
+        content = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    common = Path(content)
+    return common if common.is_absolute() else (git_dir / common).resolve()
+
+
+def _refs_signature(git_dir: Path) -> Tuple[object, ...]:
+    """Changes whenever HEAD, the branch it points at or packed refs move."""
+    common = _common_dir(git_dir)
+    head_path = git_dir / "HEAD"
+    try:
+        head = head_path.read_text(encoding="utf-8").strip()
+    except OSError:
+        head = ""
+    ref_signature: _StatSignature = None
+    if head.startswith("ref:"):
+        ref_signature = _stat_signature(common / head[len("ref:") :].strip())
+    return (
+        head,
+        _stat_signature(head_path),
+        ref_signature,
+        _stat_signature(common / "packed-refs"),
+        # Repositories using the reftable backend keep every ref in here.
+        _stat_signature(common / "reftable" / "tables.list"),
+    )
+
+
+def _worktree_signature(git_dir: Path) -> Tuple[object, ...]:
+    # FETCH_HEAD is rewritten by every fetch, which may move the upstream.
+    return _refs_signature(git_dir) + (
+        _stat_signature(git_dir / "index"),
+        _stat_signature(git_dir / "FETCH_HEAD"),
+    )
+
+
+def parse_git_status(output: str) -> GitStatus:
+    """Parse ``git status --porcelain --branch`` output."""
+    header, _, porcelain = output.partition("\n")
+    if not header.startswith("## "):
+        # No branch header; treat the whole output as entries.
+        header, porcelain = "", output
+    head = header[len("## ") :]
+    info = ""
+    if head.endswith("]") and " [" in head:
+        head, info = head[:-1].split(" [", 1)
+    for prefix in ("No commits yet on ", "Initial commit on "):
+        if head.startswith(prefix):
+            head = head[len(prefix) :]
+    branch: Optional[str]
+    upstream: Optional[str]
+    if not head or head.startswith("HEAD (no branch)"):
+        branch, upstream = None, None
+    else:
+        branch, _, upstream_name = head.partition("...")
+        upstream = upstream_name or None
+    if info == "gone":
+        upstream = None
+    counts = dict(
+        (name, int(value)) for name, value in _STATUS_AHEAD_BEHIND_RE.findall(info)
+    )
+    return GitStatus(
+        branch=branch,
+        upstream=upstream,
+        ahead=counts.get("ahead", 0),
+        behind=counts.get("behind", 0),
+        porcelain=porcelain.strip(),
+    )
+
+
+def _run_head_sha(repo_root: Path) -> Optional[str]:
+    try:
+        proc = run_git(["rev-parse", "HEAD"], repo_root)
+    except GitError:
+        return None
+    sha = (proc.stdout or "").strip()
+    return sha if proc.returncode == 0 and sha else None
+
+
+def _run_branch(repo_root: Path) -> Optional[str]:
+    try:
+        proc = run_git(["rev-parse", "--abbrev-ref", "HEAD"], repo_root)
+    except GitError:
+        return None
+    branch = (proc.stdout or "").strip()
+    if proc.returncode != 0 or not branch:
+        return None
+    if branch == "HEAD":
+        return None
+    return branch
+
+
+def _run_status(repo_root: Path) -> Optional[GitStatus]:
+    try:
+        proc = run_git(["status", "--porcelain", "--branch"], repo_root)
+    except GitError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return parse_git_status(proc.stdout or "")
+
+
+class GitQueryService:
+    """Cached, coalescing front end for read-only git queries.
+
+    HEAD and branch lookups are cached until HEAD, the checked-out ref or the
+    packed refs change on disk. ``git status`` also depends on unstaged edits,
+    which leave no trace in the git dir, so its results are only reused within
+    the ``max_age`` a caller accepts (default: always run). Identical queries
+    that are already running are joined instead of forking git again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[Tuple[str, Path], _QueryResult]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Path], _InFlight] = {}
+        self._stats: Dict[str, GitCommandStats] = {}
+
+    def head_sha(self, repo_root: Path) -> Optional[str]:
+        return self._query("rev-parse HEAD", repo_root, _run_head_sha, max_age=None)
+
+    def branch(self, repo_root: Path) -> Optional[str]:
+        return self._query(
+            "rev-parse --abbrev-ref HEAD", repo_root, _run_branch, max_age=None
+        )
+
+    def status(self, repo_root: Path, *, max_age: float = 0.0) -> Optional[GitStatus]:
+        """Status of ``repo_root``, reusing a result at most ``max_age`` old."""
+        return self._query("status", repo_root, _run_status, max_age=max_age)
+
+    def stats(self) -> Dict[str, GitCommandStats]:
+        with self._lock:
+            return {
+                command: dataclasses.replace(entry)
+                for command, entry in self._stats.items()
+            }
+
+    def invalidate(self, repo_root: Optional[Path] = None) -> None:
+        with self._lock:
+            if repo_root is None:
+                self._results.clear()
+                return
+            root = repo_root.absolute()
+            for key in [key for key in self._results if key[1] == root]:
+                del self._results[key]
+
+    def _query(
+        self,
+        command: str,
+        repo_root: Path,
+        run: Callable[[Path], _T],
+        *,
+        max_age: Optional[float],
+    ) -> _T:
+        # ``max_age=None``: the result only depends on refs and stays valid
+        # until they change; otherwise it also depends on the work tree.
+        key = (command, repo_root.absolute())
+        git_dir = resolve_git_dir(repo_root)
+        sign: Optional[Callable[[Path], Tuple[object, ...]]] = None
+        signature: Optional[Tuple[object, ...]] = None
+        if git_dir is not None:
+            sign = _refs_signature if max_age is None else _worktree_signature
+            signature = sign(git_dir)
+        now = time.monotonic()
+
+        def reusable(other: Tuple[object, ...], started_at: float) -> bool:
+            if signature is None or other != signature:
+                return False
+            return max_age is None or now - started_at <= max_age
+
+        with self._lock:
+            stats = self._stats.setdefault(command, GitCommandStats())
+            stats.calls += 1
+            cached = self._results.get(key)
+            if cached is not None and reusable(cached.signature, cached.started_at):
+                stats.cache_hits += 1
+                self._results.move_to_end(key)
+                return cast(_T, cached.value)
+            flight = self._inflight.get(key)
+            if flight is not None and reusable(flight.signature, flight.started_at):
+                stats.coalesced += 1
+                joined = flight.future
+            else:
+                joined = None
+                flight = _InFlight(signature or (), now, Future())
+                if signature is not None:
+                    self._inflight[key] = flight
+        if joined is not None:
+            return cast(_T, joined.result())
+
+        started = time.perf_counter()
+        try:
+            value = run(repo_root)
+        except BaseException as exc:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.future.set_exception(exc)
+            raise
+        elapsed = time.perf_counter() - started
+        if sign is not None and git_dir is not None and max_age is not None:
+            # ``git status`` refreshes the index itself; sign afterwards so
+            # that its own write does not invalidate the result.
+            signature = sign(git_dir)
+        with self._lock:
+            stats.runs += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+            if signature is not None:
+                self._results[key] = _QueryResult(signature, now, value)
+                self._results.move_to_end(key)
+                while len(self._results) > _GIT_QUERY_MAX_ENTRIES:
+                    self._results.popitem(last=False)
+        flight.future.set_result(value)
+        return value
+
+
+_SERVICE: Optional[GitQueryService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def git_query_service() -> GitQueryService:
+    """The process-wide :class:`GitQueryService` used by the helpers above."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = GitQueryService()
+        return _SERVICE
+
+
+class GitObjectReader:
+    """Long-lived ``git cat-file --batch-check`` / ``--batch`` pair for a repo.
+
+    Resolving revisions and reading objects through it costs a pipe round
+    trip instead of a process spawn per lookup. Each process is started on
+    first use and restarted once if it died; a closed reader never starts
+    another. Not for paths containing newlines.
+    """
+
+    def __init__(self, repo_root: Path) -> None:
+        self.repo_root = repo_root
+        self._lock = threading.Lock()
+        self._closed = False
+        self._check_proc: Optional[subprocess.Popen[bytes]] = None
+        self._batch_proc: Optional[subprocess.Popen[bytes]] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def info(self, rev: str) -> Optional[Tuple[str, str, int]]:
+        """``(sha, type, size)`` of ``rev``, or ``None`` if it does not exist."""
+        with self._lock:
+            header = self._request("--batch-check", rev)
+        return _parse_batch_header(header)
+
+    def read(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """``(sha, type, content)`` of ``rev``, or ``None`` if it does not exist."""
+        with self._lock:
+            header = self._request("--batch", rev)
+            parsed = _parse_batch_header(header)
+            if parsed is None:
+                return None
+            sha, obj_type, size = parsed
+            proc = self._batch_proc
+            assert proc is not None and proc.stdout is not None
+            content = _read_exact(proc.stdout, size + 1)[:size]
+        return sha, obj_type, content
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for proc in (self._check_proc, self._batch_proc):
+                if proc is not None:
+                    _stop_process(proc)
+            self._check_proc = None
+            self._batch_proc = None
+
+    def _request(self, mode: str, rev: str) -> str:
+        if "\n" in rev or not rev.strip():
+            raise ValueError(f"unsupported git revision: {rev!r}")
+        for attempt in range(2):
+            proc = self._process(mode)
+            assert proc.stdin is not None and proc.stdout is not None
+            try:
+                proc.stdin.write(rev.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = b""
+            if line:
+                return line.decode("utf-8", errors="replace").rstrip("\n")
+            # The process exited; start a fresh one and retry once.
+            self._forget(mode)
+            if attempt:
+                break
+        raise GitError(f"git cat-file {mode} exited unexpectedly")
+
+    def _process(self, mode: str) -> subprocess.Popen[bytes]:
+        if self._closed:
+            raise GitError("git object reader is closed")
+        proc = self._check_proc if mode == "--batch-check" else self._batch_proc
+        if proc is not None and proc.poll() is None:
+            return proc
+        try:
+            proc = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=str(self.repo_root),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=subprocess_env(),
+            )
+        except FileNotFoundError as exc:
+            raise GitError("git binary not found", returncode=127) from exc
+        if mode == "--batch-check":
+            self._check_proc = proc
+        else:
+            self._batch_proc = proc
+        return proc
+
+    def _forget(self, mode: str) -> None:
+        if mode == "--batch-check":
+            proc, self._check_proc = self._check_proc, None
+        else:
+            proc, self._batch_proc = self._batch_proc, None
+        if proc is not None:
+            _stop_process(proc)
+
+
+def _parse_batch_header(header: str) -> Optional[Tuple[str, str, int]]:
+    # "<sha> <type> <size>", or "<rev> missing" / "<rev> ambiguous".
+    if header.endswith((" missing", " ambiguous")):
+        return None
+    parts = header.split(" ")
+    if len(parts) != 3:
+        return None
+    try:
+        return parts[0], parts[1], int(parts[2])
+    except ValueError:
+        return None
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise GitError("git cat-file --batch output truncated")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _stop_process(proc: "subprocess.Popen[bytes]") -> None:
+    try:
+        if proc.stdin is not None:
+            proc.stdin.close()
+        proc.wait(timeout=2)
+    except Exception:
+        proc.kill()
+    finally:
+        if proc.stdout is not None:
+            proc.stdout.close()
@@ -8,6 +8,7 @@ import shutil
 import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -24,20 +25,27 @@ from ..tickets.outbox import set_lifecycle_emitter
 from .archive import archive_worktree_snapshot, build_snapshot_id
 from .config import HubConfig, RepoConfig, derive_repo_config, load_hub_config
 from .git_utils import (
+    GIT_STATUS_REUSE_SECONDS,
     GitError,
     git_available,
     git_branch,
     git_default_branch,
     git_head_sha,
     git_is_clean,
+    git_query_service,
     git_upstream_status,
+    resolve_git_dir,
     run_git,
 )
+from .hub_snapshot_cache import HubSnapshotCache, path_signature
 from .lifecycle_events import (
     LifecycleEvent,
     LifecycleEventEmitter,
     LifecycleEventStore,
     LifecycleEventType,
+    LifecycleLatencyStats,
+    add_lifecycle_wakeup_listener,
+    remove_lifecycle_wakeup_listener,
 )
 from .locks import DEFAULT_RUNNER_CMD_HINTS, assess_lock, process_alive
 from .pma_dispatch_interceptor import PmaDispatchInterceptor
@@ -55,6 +63,13 @@ from .utils import atomic_write, is_within, subprocess_env
 
 logger = logging.getLogger("codex_autorunner.hub")
 
+# Lifecycle events emitted in this process wake the processor immediately;
+# writes from flow worker subprocesses are noticed via the database's data
+# version, checked every LIFECYCLE_WATCH_INTERVAL_SECONDS. A full poll still
+# runs every LIFECYCLE_FALLBACK_POLL_SECONDS in case a wakeup is missed.
+LIFECYCLE_WATCH_INTERVAL_SECONDS = 0.5
+LIFECYCLE_FALLBACK_POLL_SECONDS = 60.0
+
 BackendFactoryBuilder = Callable[[Path, RepoConfig], BackendFactory]
 AppServerSupervisorFactoryBuilder = Callable[[RepoConfig], AppServerSupervisorFactory]
 BackendOrchestratorBuilder = Callable[[Path, RepoConfig], BackendOrchestratorProtocol]
@@ -170,6 +185,48 @@ def read_lock_status(lock_path: Path) -> LockStatus:
     return LockStatus.LOCKED_STALE
 
 
+REPO_SNAPSHOT_MAX_WORKERS = 8
+# ``git status`` also reports unstaged edits, which touch neither the index
+# nor HEAD, so a cached cleanliness result is re-checked at least this often.
+REPO_GIT_STATUS_TTL_SECONDS = 10.0
+
+
+def _runner_state_signature(record: DiscoveryRecord) -> Tuple[object, ...]:
+    if not record.initialized:
+        return (False,)
+    db_path = record.absolute_path / ".codex-autorunner" / "state.sqlite3"
+    return (
+        True,
+        path_signature(db_path),
+        path_signature(db_path.with_name(db_path.name + "-wal")),
+    )
+
+
+def _git_signature(record: DiscoveryRecord) -> Tuple[object, ...]:
+    if not record.exists_on_disk:
+        return (False,)
+    git_dir = resolve_git_dir(record.absolute_path)
+    if git_dir is None:
+        return (True, None)
+    return (
+        True,
+        path_signature(git_dir / "index"),
+        path_signature(git_dir / "HEAD"),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class _RepoProbe:
+    """Expensive parts of a RepoSnapshot and the signatures they were read at."""
+
+    path: Path
+    state_signature: Tuple[object, ...]
+    runner_state: Optional[RunnerState]
+    git_signature: Tuple[object, ...]
+    is_clean: Optional[bool]
+    git_checked_at: float
+
+
 def load_hub_state(state_path: Path, hub_root: Path) -> HubState:
     if not state_path.exists():
         return HubState(last_scan_at=None, repos=[])
@@ -312,10 +369,20 @@ class HubSupervisor:
         self._list_cache_at: Optional[float] = None
         self._list_cache: Optional[List[RepoSnapshot]] = None
         self._list_lock = threading.Lock()
+        self._repo_probes: Dict[str, _RepoProbe] = {}
+        # Guards _repo_probes only; never held while a probe runs git or
+        # reads a state DB. Probes run on pool threads and outside _list_lock.
+        self._repo_probes_lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._probe_executor: Optional[ThreadPoolExecutor] = None
         self._lifecycle_emitter = LifecycleEventEmitter(hub_config.root)
         self._lifecycle_task_lock = threading.Lock()
         self._lifecycle_stop_event = threading.Event()
+        self._lifecycle_wakeup = threading.Event()
+        self._lifecycle_latency = LifecycleLatencyStats()
         self._lifecycle_thread: Optional[threading.Thread] = None
+        # Per-repo flow state behind PMA hub snapshots and the hub dashboard.
+        self.snapshot_cache = HubSnapshotCache()
         self._dispatch_interceptor_task: Optional[asyncio.Task] = None
         self._dispatch_interceptor_stop_event: Optional[threading.Event] = None
         self._dispatch_interceptor_thread: Optional[threading.Thread] = None
@@ -359,8 +426,10 @@ class HubSupervisor:
                     return self._list_cache
             manifest, records = self._manifest_records(manifest_only=True)
             snapshots = self._build_snapshots(records)
+            changed = snapshots != self.state.repos
             self.state = HubState(last_scan_at=self.state.last_scan_at, repos=snapshots)
-            save_hub_state(self.state_path, self.state, self.hub_config.root)
+            if changed:
+                save_hub_state(self.state_path, self.state, self.hub_config.root)
             self._list_cache = snapshots
             self._list_cache_at = time.monotonic()
             return snapshots
@@ -842,6 +911,7 @@ class HubSupervisor:
                 snapshot_id=snapshot_id,
                 head_sha=head_sha,
                 source_path=entry.path,
+                compress_logs=self.hub_config.archive_compress_logs,
             )
         except Exception as exc:
             logger.exception(
@@ -1013,7 +1083,7 @@ class HubSupervisor:
         upstream = None
         if exists_on_disk and git_available(repo_root):
             clean = git_is_clean(repo_root)
-            upstream = git_upstream_status(repo_root)
+            upstream = git_upstream_status(repo_root, max_age=GIT_STATUS_REUSE_SECONDS)
         worktrees = []
         if repo.kind == "base":
             worktrees = [
@@ -1071,7 +1141,7 @@ class HubSupervisor:
         if repo_root.exists() and git_available(repo_root):
             if not git_is_clean(repo_root) and not force:
                 raise ValueError("Repo has uncommitted changes; use force to remove")
-            upstream = git_upstream_status(repo_root)
+            upstream = git_upstream_status(repo_root, max_age=GIT_STATUS_REUSE_SECONDS)
             if (
                 upstream
                 and upstream.get("has_upstream")
@@ -1147,16 +1217,106 @@ class HubSupervisor:
         return manifest, records
 
     def _build_snapshots(self, records: List[DiscoveryRecord]) -> List[RepoSnapshot]:
+        now = time.monotonic()
+        stale = [record for record in records if self._repo_probe_is_stale(record, now)]
+        if len(stale) > 1:
+            # Refresh stale repos (state DB reads, git forks) concurrently; the
+            # loop below then only reuses the fresh probes.
+            list(self._get_probe_executor().map(self._repo_probe, stale))
+        live_ids = {record.repo.id for record in records}
+        with self._repo_probes_lock:
+            for repo_id in [key for key in self._repo_probes if key not in live_ids]:
+                self._repo_probes.pop(repo_id, None)
         snapshots: List[RepoSnapshot] = []
         for record in records:
             snapshots.append(self._snapshot_from_record(record))
         return snapshots
 
+    def _get_probe_executor(self) -> ThreadPoolExecutor:
+        with self._probe_lock:
+            if self._probe_executor is None:
+                self._probe_executor = ThreadPoolExecutor(
+                    max_workers=REPO_SNAPSHOT_MAX_WORKERS,
+                    thread_name_prefix="hub-repo-snapshot",
+                )
+            return self._probe_executor
+
+    def _repo_probe_is_stale(self, record: DiscoveryRecord, now: float) -> bool:
+        with self._repo_probes_lock:
+            probe = self._repo_probes.get(record.repo.id)
+        return (
+            probe is None
+            or probe.path != record.absolute_path
+            or probe.state_signature != _runner_state_signature(record)
+            or probe.git_signature != _git_signature(record)
+            or now - probe.git_checked_at >= REPO_GIT_STATUS_TTL_SECONDS
+        )
+
+    def _repo_probe(self, record: DiscoveryRecord) -> _RepoProbe:
+        """Runner state and git cleanliness of ``record``, reusing whatever
+        part of the previous probe is still valid."""
+        repo_path = record.absolute_path
+        with self._repo_probes_lock:
+            stored = self._repo_probes.get(record.repo.id)
+        previous = stored
+        if previous is not None and previous.path != repo_path:
+            previous = None
+        now = time.monotonic()
+        # The state signature is taken before reading so that a concurrent
+        # write only causes an extra refresh, never a stale entry.
+        state_signature = _runner_state_signature(record)
+        if previous is not None and previous.state_signature == state_signature:
+            runner_state = previous.runner_state
+        else:
+            runner_state = None
+            if record.initialized:
+                runner_state = load_state(
+                    repo_path / ".codex-autorunner" / "state.sqlite3"
+                )
+        git_signature = _git_signature(record)
+        if (
+            previous is not None
+            and previous.git_signature == git_signature
+            and now - previous.git_checked_at < REPO_GIT_STATUS_TTL_SECONDS
+        ):
+            is_clean = previous.is_clean
+            git_checked_at = previous.git_checked_at
+        else:
+            is_clean = None
+            if record.exists_on_disk and (repo_path / ".git").exists():
+                # The probe's git_checked_at TTL is the only cache layer here;
+                # reusing a service result too would stack the two ages.
+                status = git_query_service().status(repo_path, max_age=0)
+                is_clean = status.is_clean if status is not None else None
+                # ``git status`` refreshes the index itself; sign afterwards
+                # so that its own write does not invalidate the result.
+                git_signature = _git_signature(record)
+            git_checked_at = now
+        probe = _RepoProbe(
+            path=repo_path,
+            state_signature=state_signature,
+            runner_state=runner_state,
+            git_signature=git_signature,
+            is_clean=is_clean,
+            git_checked_at=git_checked_at,
+        )
+        with self._repo_probes_lock:
+            # Only replace what this probe started from: if the entry was
+            # dropped (_snapshot_for_repo) or refreshed meanwhile, keep that.
+            if self._repo_probes.get(record.repo.id) is stored:
+                self._repo_probes[record.repo.id] = probe
+        return probe
+
     def _snapshot_for_repo(self, repo_id: str) -> RepoSnapshot:
         _, records = self._manifest_records(manifest_only=True)
         record = next((r for r in records if r.repo.id == repo_id), None)
         if not record:
             raise ValueError(f"Repo {repo_id} not found in manifest")
+        # Callers just changed this repo; do not trust its cached probe or
+        # git status (work-tree edits leave the index/HEAD signature as is).
+        with self._repo_probes_lock:
+            self._repo_probes.pop(repo_id, None)
+        git_query_service().invalidate(record.absolute_path)
         snapshot = self._snapshot_from_record(record)
         self.list_repos(use_cache=False)
         return snapshot
@@ -1181,24 +1341,59 @@ class HubSupervisor:
         events = self.lifecycle_store.get_unprocessed(limit=100)
         if not events:
             return
-        for event in events:
-            try:
-                self._process_lifecycle_event(event)
-            except Exception as exc:
-                logger.exception(
-                    "Failed to process lifecycle event %s: %s", event.event_id, exc
-                )
+        processed_ids: list[str] = []
+        try:
+            for event in events:
+                try:
+                    if self._handle_lifecycle_event(event):
+                        processed_ids.append(event.event_id)
+                except Exception as exc:
+                    logger.exception(
+                        "Failed to process lifecycle event %s: %s", event.event_id, exc
+                    )
+        finally:
+            self.lifecycle_store.mark_processed_many(processed_ids)
+
+    def lifecycle_metrics(self) -> Dict[str, Any]:
+        """Event-to-reaction latency of processed lifecycle events."""
+        return self._lifecycle_latency.to_dict()
 
     def _start_lifecycle_event_processor(self) -> None:
         if self._lifecycle_thread is not None:
             return
+        add_lifecycle_wakeup_listener(self.hub_config.root, self._lifecycle_wakeup.set)
 
         def _process_loop():
-            while not self._lifecycle_stop_event.wait(5.0):
-                try:
-                    self.process_lifecycle_events()
-                except Exception:
-                    logger.exception("Error in lifecycle event processor")
+            try:
+                monitor = self.lifecycle_store.change_monitor()
+            except Exception:
+                logger.exception("Lifecycle change monitor unavailable")
+                monitor = None
+            last_poll = time.monotonic()
+            # Pick up anything emitted while the hub was down.
+            self._lifecycle_wakeup.set()
+            try:
+                while not self._lifecycle_stop_event.is_set():
+                    woke = self._lifecycle_wakeup.wait(LIFECYCLE_WATCH_INTERVAL_SECONDS)
+                    if self._lifecycle_stop_event.is_set():
+                        break
+                    self._lifecycle_wakeup.clear()
+                    try:
+                        due = (
+                            woke
+                            or (monitor is not None and monitor.changed())
+                            or time.monotonic() - last_poll
+                            >= LIFECYCLE_FALLBACK_POLL_SECONDS
+                        )
+                        if not due:
+                            continue
+                        last_poll = time.monotonic()
+                        self.process_lifecycle_events()
+                    except Exception:
+                        logger.exception("Error in lifecycle event processor")
+            finally:
+                if monitor is not None:
+                    monitor.close()
 
         self._lifecycle_thread = threading.Thread(
             target=_process_loop, daemon=True, name="lifecycle-event-processor"
@@ -1208,7 +1403,11 @@ class HubSupervisor:
     def _stop_lifecycle_event_processor(self) -> None:
         if self._lifecycle_thread is None:
             return
+        remove_lifecycle_wakeup_listener(
+            self.hub_config.root, self._lifecycle_wakeup.set
+        )
         self._lifecycle_stop_event.set()
+        self._lifecycle_wakeup.set()
         self._lifecycle_thread.join(timeout=2.0)
         self._lifecycle_thread = None
 
@@ -1216,6 +1415,11 @@ class HubSupervisor:
         self._stop_lifecycle_event_processor()
         self._stop_dispatch_interceptor()
         set_lifecycle_emitter(None)
+        self.snapshot_cache.close()
+        with self._probe_lock:
+            executor, self._probe_executor = self._probe_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def _wire_outbox_lifecycle(self) -> None:
         if not self.hub_config.pma.enabled:
@@ -1477,11 +1681,17 @@ class HubSupervisor:
         return True
 
     def _process_lifecycle_event(self, event: LifecycleEvent) -> None:
+        if self._handle_lifecycle_event(event):
+            self.lifecycle_store.mark_processed(event.event_id)
+
+    def _handle_lifecycle_event(self, event: LifecycleEvent) -> bool:
+        """Act on ``event``; return True once it needs no further attention."""
         if event.processed:
-            return
+            return False
         event_id = event.event_id
         if not event_id:
-            return
+            return False
+        self.snapshot_cache.invalidate(event.repo_id)
 
         decision = "skip"
         processed = False
@@ -1555,32 +1765,27 @@ class HubSupervisor:
                         event, reason=event.event_type.value
                     )
 
-        if processed:
-            self.lifecycle_store.mark_processed(event_id)
-            self.lifecycle_store.prune_processed(keep_last=50)
-
+        latency = self._lifecycle_latency.record_event(event) if processed else None
         logger.info(
-            "Lifecycle event processed: event_id=%s type=%s repo_id=%s run_id=%s decision=%s processed=%s",
+            "Lifecycle event processed: event_id=%s type=%s repo_id=%s run_id=%s decision=%s processed=%s latency_ms=%s",
             event.event_id,
             event.event_type.value,
             event.repo_id,
             event.run_id,
             decision,
             processed,
+            int(latency * 1000) if latency is not None else None,
         )
+        return processed
 
     def _snapshot_from_record(self, record: DiscoveryRecord) -> RepoSnapshot:
         repo_path = record.absolute_path
         lock_path = repo_path / ".codex-autorunner" / "lock"
         lock_status = read_lock_status(lock_path)
 
-        runner_state: Optional[RunnerState] = None
-        if record.initialized:
-            runner_state = load_state(repo_path / ".codex-autorunner" / "state.sqlite3")
-
-        is_clean: Optional[bool] = None
-        if record.exists_on_disk and git_available(repo_path):
-            is_clean = git_is_clean(repo_path)
+        probe = self._repo_probe(record)
+        runner_state = probe.runner_state
+        is_clean = probe.is_clean
 
         status = self._derive_status(record, lock_status, runner_state)
         last_run_id = runner_state.last_run_id if runner_state else None
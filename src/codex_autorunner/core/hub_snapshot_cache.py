@@ -0,0 +1,279 @@
+"""Per-repo cache behind hub snapshots (PMA prompts and the hub dashboard).
+
+Each entry remembers the files it was derived from (``flows.db`` and its WAL,
+the ticket directory and ticket files, dispatch and reply history dirs) plus a
+caller supplied token, e.g. the ids of pending lifecycle events for the repo.
+An entry is reused while those ``stat`` signatures and the token are
+unchanged; stale entries are recomputed in parallel on a small thread pool.
+
+Every recompute that changes a payload bumps a generation counter, so
+consumers such as PMA can ask which repos changed since their last look.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HUB_SNAPSHOT_MAX_WORKERS = 8
+# Entries that depend on live processes (running flows check worker health)
+# are only trusted for this long even when no watched file changed.
+HUB_SNAPSHOT_VOLATILE_TTL_SECONDS = 5.0
+
+PathSignature = Optional[Tuple[int, int]]
+
+
+def path_signature(path: Path) -> PathSignature:
+    """``(mtime_ns, size)`` of ``path``, or ``None`` when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedRepoState:
+    """Result of one per-repo computation."""
+
+    payload: Dict[str, Any]
+    watch_paths: Tuple[Path, ...] = ()
+    volatile: bool = False
+
+
+@dataclasses.dataclass
+class _Entry:
+    token: Hashable
+    state: CachedRepoState
+    signatures: Tuple[PathSignature, ...]
+    computed_at: float
+    changed_generation: int
+
+
+@dataclasses.dataclass
+class HubSnapshotCacheStats:
+    hits: int = 0
+    misses: int = 0
+    refresh_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refresh_seconds": round(self.refresh_seconds, 3),
+        }
+
+
+RepoJob = Tuple[Hashable, Callable[[], CachedRepoState]]
+
+
+class HubSnapshotCache:
+    def __init__(
+        self,
+        *,
+        max_workers: int = HUB_SNAPSHOT_MAX_WORKERS,
+        volatile_ttl_seconds: float = HUB_SNAPSHOT_VOLATILE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_workers = max(1, max_workers)
+        self._volatile_ttl = volatile_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._removed: Dict[Tuple[str, str], int] = {}
+        self._cursors: Dict[Tuple[str, str], int] = {}
+        self._generation = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = HubSnapshotCacheStats()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def collect(
+        self, namespace: str, jobs: Mapping[str, RepoJob]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return the payload of every repo in ``jobs``, recomputing stale ones.
+
+        ``jobs`` maps repo ids to ``(token, compute)``. Repos of ``namespace``
+        missing from ``jobs`` are dropped and reported as removed.
+        """
+        now = self._clock()
+        results: Dict[str, Dict[str, Any]] = {}
+        stale: Dict[str, Tuple[Path, ...]] = {}
+        with self._lock:
+            for repo_id, (token, _compute) in jobs.items():
+                entry = self._entries.get((namespace, repo_id))
+                if entry is not None and self._is_fresh(entry, token, now):
+                    results[repo_id] = entry.state.payload
+                    self._stats.hits += 1
+                else:
+                    stale[repo_id] = entry.state.watch_paths if entry else ()
+            for key in [
+                key
+                for key in self._entries
+                if key[0] == namespace and key[1] not in jobs
+            ]:
+                self._entries.pop(key, None)
+                self._generation += 1
+                self._removed[key] = self._generation
+        if not stale:
+            return results
+
+        started = self._clock()
+        computed = self._compute(stale, jobs)
+        with self._lock:
+            self._stats.misses += len(stale)
+            self._stats.refresh_seconds += self._clock() - started
+            for repo_id, (token, state, signatures) in computed.items():
+                key = (namespace, repo_id)
+                previous = self._entries.get(key)
+                if previous is not None and previous.state.payload == state.payload:
+                    changed_generation = previous.changed_generation
+                else:
+                    self._generation += 1
+                    changed_generation = self._generation
+                self._removed.pop(key, None)
+                self._entries[key] = _Entry(
+                    token=token,
+                    state=state,
+                    signatures=signatures,
+                    computed_at=started,
+                    changed_generation=changed_generation,
+                )
+                results[repo_id] = state.payload
+        return results
+
+    def peek_changes(self, namespace: str, consumer: str) -> Dict[str, Any]:
+        """Describe what changed in ``namespace`` since ``consumer``'s cursor.
+
+        ``since`` is ``None`` until the consumer first acknowledges; everything
+        is new then. The cursor only moves on :meth:`acknowledge_changes`, so a
+        snapshot that is never delivered does not swallow its changes.
+        """
+        with self._lock:
+            since = self._cursors.get((namespace, consumer))
+            floor = since if since is not None else -1
+            changed = sorted(
+                repo_id
+                for (ns, repo_id), entry in self._entries.items()
+                if ns == namespace and entry.changed_generation > floor
+            )
+            removed = sorted(
+                repo_id
+                for (ns, repo_id), generation in self._removed.items()
+                if ns == namespace and generation > floor
+            )
+            return {
+                "since": since,
+                "generation": self._generation,
+                "changed_repos": changed,
+                "removed_repos": removed,
+            }
+
+    def acknowledge_changes(
+        self, namespace: str, consumer: str, generation: int
+    ) -> None:
+        """Advance ``consumer``'s cursor to ``generation`` (never backwards)."""
+        with self._lock:
+            key = (namespace, consumer)
+            current = self._cursors.get(key)
+            if current is None or generation > current:
+                self._cursors[key] = generation
+
+    def invalidate(self, repo_id: Optional[str] = None) -> None:
+        """Force a recompute of ``repo_id`` (or of everything) on next use."""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if repo_id is None or key[1] == repo_id:
+                    entry.computed_at = float("-inf")
+                    entry.signatures = ()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            payload = self._stats.to_dict()
+            payload["entries"] = len(self._entries)
+            payload["generation"] = self._generation
+        return payload
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_fresh(self, entry: _Entry, token: Hashable, now: float) -> bool:
+        if entry.token != token:
+            return False
+        if entry.state.volatile and now - entry.computed_at >= self._volatile_ttl:
+            return False
+        if len(entry.signatures) != len(entry.state.watch_paths):
+            return False
+        return all(
+            path_signature(path) == signature
+            for path, signature in zip(entry.state.watch_paths, entry.signatures)
+        )
+
+    def _compute(
+        self, stale: Mapping[str, Tuple[Path, ...]], jobs: Mapping[str, RepoJob]
+    ) -> Dict[str, Tuple[Hashable, CachedRepoState, Tuple[PathSignature, ...]]]:
+        def _run(
+            repo_id: str,
+        ) -> Tuple[Hashable, CachedRepoState, Tuple[PathSignature, ...]]:
+            token, compute = jobs[repo_id]
+            # Sign before computing where the paths are already known, so a
+            # write racing the computation causes one extra refresh instead
+            # of a stale entry.
+            previous_paths = stale[repo_id]
+            signatures = tuple(path_signature(path) for path in previous_paths)
+            state = compute()
+            if state.watch_paths != previous_paths:
+                signatures = tuple(path_signature(path) for path in state.watch_paths)
+            return token, state, signatures
+
+        computed: Dict[
+            str, Tuple[Hashable, CachedRepoState, Tuple[PathSignature, ...]]
+        ] = {}
+        repo_ids = list(stale)
+        if len(repo_ids) == 1:
+            outcomes: Dict[str, Callable[[], Any]] = {
+                repo_ids[0]: lambda: _run(repo_ids[0])
+            }
+        else:
+            executor = self._get_executor()
+            outcomes = {
+                repo_id: executor.submit(_run, repo_id).result for repo_id in repo_ids
+            }
+        for repo_id, outcome in outcomes.items():
+            try:
+                computed[repo_id] = outcome()
+            except Exception as exc:
+                logger.warning("Hub snapshot refresh failed for %s: %s", repo_id, exc)
+        return computed
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="hub-snapshot",
+                )
+            return self._executor
+
+
+__all__ = [
+    "CachedRepoState",
+    "HUB_SNAPSHOT_MAX_WORKERS",
+    "HUB_SNAPSHOT_VOLATILE_TTL_SECONDS",
+    "HubSnapshotCache",
+    "HubSnapshotCacheStats",
+    "path_signature",
+]
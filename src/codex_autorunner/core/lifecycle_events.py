@@ -2,19 +2,26 @@ from __future__ import annotations
 
 import json
 import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from .locks import file_lock
-from .utils import atomic_write
+from .sqlite_utils import connect_sqlite, open_sqlite
 
 logger = logging.getLogger(__name__)
 
 LIFECYCLE_EVENTS_FILENAME = "lifecycle_events.json"
+LIFECYCLE_EVENTS_DB_FILENAME = "lifecycle_events.sqlite3"
 LIFECYCLE_EVENTS_LOCK_SUFFIX = ".lock"
+LIFECYCLE_EVENTS_SCHEMA_VERSION = 1
+# Processed events kept for inspection; older ones are pruned automatically.
+DEFAULT_KEEP_PROCESSED = 50
 
 
 class LifecycleEventType(str, Enum):
@@ -46,135 +53,364 @@ class LifecycleEvent:
 
 
 def default_lifecycle_events_path(hub_root: Path) -> Path:
+    """Path of the legacy JSON event file (imported into the database once)."""
     return hub_root / ".codex-autorunner" / LIFECYCLE_EVENTS_FILENAME
 
 
+def default_lifecycle_events_db_path(hub_root: Path) -> Path:
+    return hub_root / ".codex-autorunner" / LIFECYCLE_EVENTS_DB_FILENAME
+
+
+def _event_from_entry(entry: Any) -> Optional[LifecycleEvent]:
+    if not isinstance(entry, dict):
+        return None
+    event_type_str = entry.get("event_type")
+    if not isinstance(event_type_str, str):
+        return None
+    try:
+        event_type = LifecycleEventType(event_type_str)
+    except ValueError:
+        return None
+    event_id_raw = entry.get("event_id")
+    event_id = str(event_id_raw) if isinstance(event_id_raw, str) else ""
+    origin_raw = entry.get("origin")
+    origin = (
+        str(origin_raw).strip()
+        if isinstance(origin_raw, str) and origin_raw.strip()
+        else "system"
+    )
+    data = entry.get("data", {})
+    if isinstance(data, str):
+        data = json.loads(data)
+    return LifecycleEvent(
+        event_type=event_type,
+        repo_id=str(entry.get("repo_id", "")),
+        run_id=str(entry.get("run_id", "")),
+        data=dict(data or {}),
+        origin=origin,
+        timestamp=str(entry.get("timestamp", "")),
+        processed=bool(entry.get("processed", False)),
+        event_id=event_id,
+    )
+
+
+_WAKEUP_LISTENERS: dict[str, list[Callable[[], None]]] = {}
+_WAKEUP_LOCK = threading.Lock()
+
+
+def add_lifecycle_wakeup_listener(hub_root: Path, callback: Callable[[], None]) -> None:
+    """Call ``callback`` whenever this process appends a lifecycle event."""
+    key = str(default_lifecycle_events_db_path(hub_root).resolve())
+    with _WAKEUP_LOCK:
+        _WAKEUP_LISTENERS.setdefault(key, []).append(callback)
+
+
+def remove_lifecycle_wakeup_listener(
+    hub_root: Path, callback: Callable[[], None]
+) -> None:
+    key = str(default_lifecycle_events_db_path(hub_root).resolve())
+    with _WAKEUP_LOCK:
+        listeners = [cb for cb in _WAKEUP_LISTENERS.get(key, []) if cb != callback]
+        if listeners:
+            _WAKEUP_LISTENERS[key] = listeners
+        else:
+            _WAKEUP_LISTENERS.pop(key, None)
+
+
+def _notify_lifecycle_wakeup(db_path: Path) -> None:
+    with _WAKEUP_LOCK:
+        listeners = list(_WAKEUP_LISTENERS.get(str(db_path.resolve()), []))
+    for callback in listeners:
+        try:
+            callback()
+        except Exception as exc:
+            logger.debug("Lifecycle wakeup listener failed: %s", exc)
+
+
+class LifecycleChangeMonitor:
+    """Detects commits to the lifecycle database made by other connections.
+
+    ``PRAGMA data_version`` only reads the WAL index, so polling it is cheap
+    enough to notice events written by flow worker subprocesses promptly.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._conn = connect_sqlite(db_path)
+        self._version = self._read_version()
+
+    def _read_version(self) -> int:
+        return int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def changed(self) -> bool:
+        version = self._read_version()
+        if version == self._version:
+            return False
+        self._version = version
+        return True
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+@dataclass
+class LifecycleLatencyStats:
+    """Event-to-reaction latency of lifecycle event processing."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: Optional[float] = None
+
+    def record_event(self, event: LifecycleEvent) -> Optional[float]:
+        try:
+            emitted = datetime.fromisoformat(event.timestamp.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if emitted.tzinfo is None:
+            emitted = emitted.replace(tzinfo=timezone.utc)
+        seconds = max(0.0, (datetime.now(timezone.utc) - emitted).total_seconds())
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+        return seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_seconds": self.total_seconds / self.count if self.count else None,
+            "max_seconds": self.max_seconds if self.count else None,
+            "last_seconds": self.last_seconds,
+        }
+
+
 class LifecycleEventStore:
-    def __init__(self, hub_root: Path) -> None:
-        self._path = default_lifecycle_events_path(hub_root)
+    """Append-only SQLite store of hub lifecycle events.
+
+    Unprocessed events are found through a ``(processed, seq)`` index and
+    processed events beyond ``keep_processed`` are pruned as they are marked,
+    so appends and lookups cost the same regardless of history. WAL mode lets
+    the hub and flow worker processes write without serializing on one file.
+    """
+
+    def __init__(
+        self, hub_root: Path, *, keep_processed: int = DEFAULT_KEEP_PROCESSED
+    ) -> None:
+        self._path = default_lifecycle_events_db_path(hub_root)
+        self._legacy_path = default_lifecycle_events_path(hub_root)
+        self._keep_processed = keep_processed
+        self._initialized = False
+        self._init_lock = threading.Lock()
 
     @property
     def path(self) -> Path:
         return self._path
 
-    def _lock_path(self) -> Path:
-        return self._path.with_suffix(LIFECYCLE_EVENTS_LOCK_SUFFIX)
-
-    def load(self, *, ensure_exists: bool = True) -> list[LifecycleEvent]:
-        with file_lock(self._lock_path()):
-            if not self._path.exists():
-                return []
-            try:
-                raw = self._path.read_text(encoding="utf-8")
-            except OSError as exc:
-                logger.warning(
-                    "Failed to read lifecycle events at %s: %s", self._path, exc
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with open_sqlite(self._path) as conn:
+            if not self._initialized:
+                with self._init_lock:
+                    if not self._initialized:
+                        self._ensure_schema(conn)
+                        self._import_legacy(conn)
+                        self._initialized = True
+            yield conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_info (version INTEGER NOT NULL)"
+            )
+            if conn.execute("SELECT version FROM schema_info").fetchone() is None:
+                conn.execute(
+                    "INSERT INTO schema_info (version) VALUES (?)",
+                    (LIFECYCLE_EVENTS_SCHEMA_VERSION,),
+                )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lifecycle_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT NOT NULL UNIQUE,
+                    event_type TEXT NOT NULL,
+                    repo_id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    origin TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    processed INTEGER NOT NULL DEFAULT 0
                 )
-                return []
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_lifecycle_events_processed
+                    ON lifecycle_events(processed, seq)
+                """
+            )
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        if not self._legacy_path.exists():
+            return
+        with file_lock(self._legacy_path.with_suffix(LIFECYCLE_EVENTS_LOCK_SUFFIX)):
             try:
-                data = json.loads(raw)
-            except json.JSONDecodeError as exc:
+                raw = json.loads(self._legacy_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return
+            except (OSError, json.JSONDecodeError) as exc:
                 logger.warning(
-                    "Failed to parse lifecycle events at %s: %s", self._path, exc
+                    "Failed to read lifecycle events at %s: %s", self._legacy_path, exc
                 )
-                return []
-            if not isinstance(data, list):
-                logger.warning("Lifecycle events data is not a list: %s", self._path)
-                return []
-            events: list[LifecycleEvent] = []
-            for entry in data:
+                raw = []
+            events = []
+            for entry in raw if isinstance(raw, list) else []:
                 try:
-                    if not isinstance(entry, dict):
-                        continue
-                    event_type_str = entry.get("event_type")
-                    if not isinstance(event_type_str, str):
-                        continue
-                    try:
-                        event_type = LifecycleEventType(event_type_str)
-                    except ValueError:
-                        continue
-                    event_id_raw = entry.get("event_id")
-                    event_id = (
-                        str(event_id_raw) if isinstance(event_id_raw, str) else ""
-                    )
-                    if not event_id:
-                        import uuid
-
-                        event_id = str(uuid.uuid4())
-                    origin_raw = entry.get("origin")
-                    origin = (
-                        str(origin_raw).strip()
-                        if isinstance(origin_raw, str) and origin_raw.strip()
-                        else "system"
-                    )
-                    event = LifecycleEvent(
-                        event_type=event_type,
-                        repo_id=str(entry.get("repo_id", "")),
-                        run_id=str(entry.get("run_id", "")),
-                        data=dict(entry.get("data", {})),
-                        origin=origin,
-                        timestamp=str(entry.get("timestamp", "")),
-                        processed=bool(entry.get("processed", False)),
-                        event_id=event_id,
-                    )
-                    events.append(event)
+                    event = _event_from_entry(entry)
                 except Exception as exc:
                     logger.debug("Failed to parse lifecycle event entry: %s", exc)
                     continue
-            return events
+                if event is not None:
+                    events.append(event)
+            with conn:
+                self._insert(conn, events)
+            try:
+                self._legacy_path.unlink()
+            except OSError as exc:
+                logger.debug("Failed to remove %s: %s", self._legacy_path, exc)
+            logger.info(
+                "Imported %d lifecycle events from %s", len(events), self._legacy_path
+            )
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, events: Iterable[LifecycleEvent]) -> None:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO lifecycle_events (
+                event_id, event_type, repo_id, run_id, data, origin, timestamp,
+                processed
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    event.event_id,
+                    event.event_type.value,
+                    event.repo_id,
+                    event.run_id,
+                    json.dumps(event.data),
+                    event.origin,
+                    event.timestamp,
+                    int(event.processed),
+                )
+                for event in events
+            ],
+        )
+
+    @staticmethod
+    def _rows_to_events(rows: Iterable[sqlite3.Row]) -> list[LifecycleEvent]:
+        events: list[LifecycleEvent] = []
+        for row in rows:
+            try:
+                event = _event_from_entry(dict(row))
+            except Exception as exc:
+                logger.debug("Failed to parse lifecycle event row: %s", exc)
+                continue
+            if event is not None:
+                events.append(event)
+        return events
+
+    def load(self, *, ensure_exists: bool = True) -> list[LifecycleEvent]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM lifecycle_events ORDER BY seq"
+            ).fetchall()
+        return self._rows_to_events(rows)
 
     def save(self, events: list[LifecycleEvent]) -> None:
-        with file_lock(self._lock_path()):
-            self._save_unlocked(events)
-
-    def _save_unlocked(self, events: list[LifecycleEvent]) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        data = [
-            {
-                "event_id": event.event_id,
-                "event_type": event.event_type.value,
-                "repo_id": event.repo_id,
-                "run_id": event.run_id,
-                "data": event.data,
-                "origin": event.origin,
-                "timestamp": event.timestamp,
-                "processed": event.processed,
-            }
-            for event in events
-        ]
-        atomic_write(self._path, json.dumps(data, indent=2) + "\n")
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM lifecycle_events")
+            self._insert(conn, events)
 
     def append(self, event: LifecycleEvent) -> None:
-        events = self.load(ensure_exists=False)
-        events.append(event)
-        self.save(events)
+        with self._connect() as conn, conn:
+            self._insert(conn, [event])
+        _notify_lifecycle_wakeup(self._path)
+
+    def change_monitor(self) -> LifecycleChangeMonitor:
+        with self._connect():
+            pass
+        return LifecycleChangeMonitor(self._path)
 
     def mark_processed(self, event_id: str) -> Optional[LifecycleEvent]:
         if not event_id:
             return None
-        events = self.load(ensure_exists=False)
-        updated = None
-        for event in events:
-            if event.event_id == event_id:
-                event.processed = True
-                updated = event
-                break
-        if updated:
-            self.save(events)
-        return updated
+        with self._connect() as conn, conn:
+            row = conn.execute(
+                "SELECT * FROM lifecycle_events WHERE event_id = ?", (event_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE lifecycle_events SET processed = 1 WHERE seq = ?",
+                (row["seq"],),
+            )
+            self._prune(conn, self._keep_processed)
+        events = self._rows_to_events([row])
+        if not events:
+            return None
+        events[0].processed = True
+        return events[0]
+
+    def mark_processed_many(self, event_ids: Iterable[str]) -> int:
+        """Mark a batch of events processed in one transaction."""
+        ids = [(event_id,) for event_id in event_ids if event_id]
+        if not ids:
+            return 0
+        with self._connect() as conn, conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                UPDATE lifecycle_events SET processed = 1
+                 WHERE event_id = ? AND processed = 0
+                """,
+                ids,
+            )
+            marked = conn.total_changes - before
+            self._prune(conn, self._keep_processed)
+        return marked
 
     def get_unprocessed(self, *, limit: int = 100) -> list[LifecycleEvent]:
-        events = self.load(ensure_exists=False)
-        unprocessed = [e for e in events if not e.processed]
-        return unprocessed[:limit]
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT * FROM lifecycle_events
+                 WHERE processed = 0
+                 ORDER BY seq
+                 LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+        return self._rows_to_events(rows)
 
     def prune_processed(self, *, keep_last: int = 100) -> None:
-        events = self.load(ensure_exists=False)
-        unprocessed = [e for e in events if not e.processed]
-        processed = [e for e in events if e.processed]
-        if len(processed) > keep_last:
-            processed = processed[-keep_last:]
-        self.save(unprocessed + processed)
+        with self._connect() as conn, conn:
+            self._prune(conn, keep_last)
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, keep_last: int) -> None:
+        conn.execute(
+            """
+            DELETE FROM lifecycle_events
+             WHERE processed = 1
+               AND seq <= (
+                   SELECT seq FROM lifecycle_events
+                    WHERE processed = 1
+                    ORDER BY seq DESC
+                    LIMIT 1 OFFSET ?
+               )
+            """,
+            (max(0, keep_last),),
+        )
 
 
 class LifecycleEventEmitter:
@@ -286,7 +522,12 @@ class LifecycleEventEmitter:
 __all__ = [
     "LifecycleEventType",
     "LifecycleEvent",
+    "LifecycleChangeMonitor",
     "LifecycleEventStore",
     "LifecycleEventEmitter",
+    "LifecycleLatencyStats",
+    "add_lifecycle_wakeup_listener",
+    "default_lifecycle_events_db_path",
     "default_lifecycle_events_path",
+    "remove_lifecycle_wakeup_listener",
 ]
@@ -1,9 +1,13 @@
+import atexit
 import collections
 import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
-from typing import Any, Mapping, Optional, OrderedDict
+from typing import Any, Dict, Mapping, Optional, OrderedDict, Set, Tuple
 
 from .config import LogConfig
 from .request_context import get_conversation_id, get_request_id
@@ -24,12 +28,234 @@ _SENSITIVE_FIELD_PARTS = (
     "token",
 )
 _MAX_LOG_STRING = 200
+# Records buffered for the background log writer before new ones are dropped.
+_LOG_QUEUE_MAX_RECORDS = 10_000
+_LOG_FLUSH_TIMEOUT_SECONDS = 5.0
+
+_QueuedRecord = Optional[Tuple[logging.Handler, logging.LogRecord]]
+
+
+class _LogPipeline:
+    """Background thread writing queued records to their file handlers.
+
+    Shared by every queued logger, so disk stalls and rotations happen off the
+    caller's thread (often the event loop). When the queue is full, records
+    are dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, max_records: int = _LOG_QUEUE_MAX_RECORDS) -> None:
+        self._queue: "queue.Queue[_QueuedRecord]" = queue.Queue(maxsize=max_records)
+        self._lock = threading.Lock()
+        # Guards writer start/stop; never held by the writer itself, so stop()
+        # can join under it and a new writer never overlaps the old one.
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # Queued record counts per handler, so a detached handler can be
+        # closed once its last record is written.
+        self._queued_by_handler: Dict[logging.Handler, int] = {}
+        self._closing: Set[logging.Handler] = set()
+        # Drops not yet reported, per handler: the warning goes to the log
+        # file that lost the records.
+        self._unreported_drops: Dict[logging.Handler, int] = {}
+        self.dropped = 0
+        self.written = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        self._ensure_thread()
+        with self._lock:
+            self._queued_by_handler[handler] = (
+                self._queued_by_handler.get(handler, 0) + 1
+            )
+        try:
+            self._queue.put_nowait((handler, record))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported_drops[handler] = (
+                    self._unreported_drops.get(handler, 0) + 1
+                )
+                close = self._release(handler)
+            if close:
+                handler.close()
+
+    def close_when_drained(self, handler: logging.Handler) -> None:
+        """Close ``handler`` after its queued records are written, without waiting."""
+        with self._lock:
+            if self._queued_by_handler.get(handler):
+                self._closing.add(handler)
+                return
+            self._unreported_drops.pop(handler, None)
+        handler.close()
+
+    def flush(self, timeout: float = _LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait until every queued record is written; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                thread = self._thread
+                remaining = deadline - time.monotonic()
+                if thread is None or not thread.is_alive() or remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = _LOG_FLUSH_TIMEOUT_SECONDS) -> None:
+        """Flush and stop the writer; a later submit starts a new one."""
+        with self._thread_lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                self._thread = None
+                return
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            thread.join(timeout)
+            if thread.is_alive():
+                # Still draining; it exits on the stop signal and the next
+                # submit replaces it.
+                return
+            self._thread = None
+            # Records submitted while the stop signal was queued.
+            if not self._queue.empty():
+                self._start_thread_locked()
+
+    def _ensure_thread(self) -> None:
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            return
+        with self._thread_lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                self._start_thread_locked()
+
+    def _start_thread_locked(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="car-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _release(self, handler: logging.Handler) -> bool:
+        """Forget one queued record; True when ``handler`` is now due to close."""
+        remaining = self._queued_by_handler.get(handler, 0) - 1
+        if remaining > 0:
+            self._queued_by_handler[handler] = remaining
+            return False
+        self._queued_by_handler.pop(handler, None)
+        if handler in self._closing:
+            self._closing.discard(handler)
+            self._unreported_drops.pop(handler, None)
+            return True
+        return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                handler, record = item
+                try:
+                    handler.handle(record)
+                    self.written += 1
+                    self._report_dropped(handler)
+                finally:
+                    with self._lock:
+                        close = self._release(handler)
+                    if close:
+                        handler.close()
+            except Exception:
+                # Handler.handle already reports its own errors; never let
+                # a bad record kill the writer.
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _report_dropped(self, handler: logging.Handler) -> None:
+        with self._lock:
+            dropped = self._unreported_drops.pop(handler, 0)
+        if dropped <= 0:
+            return
+        message = json.dumps(
+            {"event": "logging.queue_full", "dropped": dropped},
+            separators=(",", ":"),
+        )
+        handler.handle(
+            logging.makeLogRecord(
+                {"msg": message, "levelno": logging.WARNING, "levelname": "WARNING"}
+            )
+        )
+
+
+class _QueuedFileHandler(QueueHandler):
+    """Hands records to the shared :class:`_LogPipeline` for ``target``."""
+
+    def __init__(self, target: logging.Handler, pipeline: _LogPipeline) -> None:
+        super().__init__(queue=None)  # type: ignore[arg-type]
+        self.target = target
+        self._pipeline = pipeline
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self._pipeline.submit(self.target, record)
+
+    def flush(self) -> None:
+        self._pipeline.flush()
+        self.target.flush()
+
+    def close(self) -> None:
+        # Detach only: this runs on logger eviction, often on the event loop,
+        # so the writer closes ``target`` once its queued records are written.
+        self._pipeline.close_when_drained(self.target)
+        super().close()
+
+
+_PIPELINE: Optional[_LogPipeline] = None
+_PIPELINE_LOCK = threading.Lock()
+
+
+def _log_pipeline() -> _LogPipeline:
+    global _PIPELINE
+    with _PIPELINE_LOCK:
+        if _PIPELINE is None:
+            _PIPELINE = _LogPipeline()
+            atexit.register(shutdown_log_pipeline)
+        return _PIPELINE
+
+
+def flush_log_pipeline(timeout: float = _LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+    """Wait for queued log records to reach disk (no-op without queued loggers)."""
+    pipeline = _PIPELINE
+    return pipeline.flush(timeout) if pipeline is not None else True
+
+
+def shutdown_log_pipeline() -> None:
+    pipeline = _PIPELINE
+    if pipeline is not None:
+        pipeline.stop()
+
+
+def log_pipeline_stats() -> dict[str, int]:
+    """Pending, written and dropped record counts for the queued log writer."""
+    pipeline = _PIPELINE
+    if pipeline is None:
+        return {"pending": 0, "written": 0, "dropped": 0}
+    return {
+        "pending": pipeline.pending,
+        "written": pipeline.written,
+        "dropped": pipeline.dropped,
+    }
 
 
 def setup_rotating_logger(name: str, log_config: LogConfig) -> logging.Logger:
     """
     Configure (or retrieve) an isolated rotating logger for the given name.
     Each logger owns a single handler to avoid shared handlers across hub/repos.
+    With ``log_config.queued`` the file is written by the shared background
+    log writer instead of the calling thread.
     """
     existing = _LOGGER_CACHE.get(name)
     if existing is not None:
@@ -46,11 +272,14 @@ def setup_rotating_logger(name: str, log_config: LogConfig) -> logging.Logger:
         encoding="utf-8",
     )
     handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    installed: logging.Handler = handler
+    if log_config.queued:
+        installed = _QueuedFileHandler(handler, _log_pipeline())
 
     logger = logging.getLogger(name)
     logger.handlers.clear()
     logger.setLevel(logging.INFO)
-    logger.addHandler(handler)
+    logger.addHandler(installed)
     logger.propagate = False
 
     _LOGGER_CACHE[name] = logger
@@ -78,6 +307,8 @@ def safe_log(
     exc: Optional[Exception] = None,
     exc_info: bool = False,
 ) -> None:
+    if not logger.isEnabledFor(level):
+        return
     try:
         formatted = message
         if args:
@@ -100,6 +331,10 @@ def log_event(
     exc: Optional[Exception] = None,
     **fields: Any,
 ) -> None:
+    # Sanitizing and serializing the payload is the expensive part; skip it
+    # entirely for disabled levels.
+    if not logger.isEnabledFor(level):
+        return
     payload: dict[str, Any] = {"event": event}
     if "request_id" not in fields:
         request_id = get_request_id()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import shlex
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Collection, Optional, Sequence
 
 from ..bootstrap import (
     ensure_pma_docs,
@@ -13,7 +14,7 @@ from ..bootstrap import (
     pma_doc_path,
     pma_docs_dir,
 )
-from ..tickets.files import safe_relpath
+from ..tickets.files import list_ticket_paths, safe_relpath
 from ..tickets.models import Dispatch
 from ..tickets.outbox import parse_dispatch, resolve_outbox_paths
 from ..tickets.replies import resolve_reply_paths
@@ -22,7 +23,8 @@ from .flows.failure_diagnostics import format_failure_summary, get_failure_paylo
 from .flows.models import FlowRunRecord, FlowRunStatus
 from .flows.store import FlowStore
 from .flows.worker_process import check_worker_health, read_worker_crash_info
-from .hub import HubSupervisor
+from .hub import HubSupervisor, RepoSnapshot
+from .hub_snapshot_cache import CachedRepoState, HubSnapshotCache, RepoJob
 from .state_roots import resolve_hub_templates_root
 from .ticket_flow_summary import build_ticket_flow_summary
 from .utils import atomic_write
@@ -35,6 +37,8 @@ PMA_MAX_TEMPLATE_FIELD_CHARS = 120
 PMA_MAX_PMA_FILES = 50
 PMA_MAX_LIFECYCLE_EVENTS = 20
 PMA_ACTIVE_CONTEXT_STATE_FILENAME = ".active_context_state.json"
+# Flow statuses whose run state includes a worker liveness check.
+_LIVE_FLOW_STATUSES = frozenset({"paused", "running", "stopping"})
 
 # Keep this short and stable; see ticket TICKET-001 for rationale.
 PMA_FASTPATH = """<pma_fastpath>
@@ -384,6 +388,22 @@ def _render_hub_snapshot(
 ) -> str:
     lines: list[str] = []
 
+    changes = snapshot.get("changes") or {}
+    if changes.get("since") is not None:
+        changed = [
+            _truncate(str(repo_id), max_field_chars)
+            for repo_id in list(changes.get("changed_repos") or [])[: max(0, max_repos)]
+        ]
+        removed = [
+            _truncate(str(repo_id), max_field_chars)
+            for repo_id in list(changes.get("removed_repos") or [])[: max(0, max_repos)]
+        ]
+        lines.append("Changes since last prompt:")
+        lines.append(f"- changed_repos: [{', '.join(changed)}]")
+        if removed:
+            lines.append(f"- removed_repos: [{', '.join(removed)}]")
+        lines.append("")
+
     inbox = snapshot.get("inbox") or []
     if inbox:
         lines.append("Run Dispatches (paused runs needing attention):")
@@ -610,10 +630,6 @@ def format_pma_prompt(
     return prompt
 
 
-def _get_ticket_flow_summary(repo_path: Path) -> Optional[dict[str, Any]]:
-    return build_ticket_flow_summary(repo_path, include_failure=False)
-
-
 def _resolve_workspace_and_runs(
     record_input: dict[str, Any], repo_root: Path
 ) -> tuple[Path, Path]:
@@ -983,158 +999,159 @@ def get_latest_ticket_flow_run_state(
         return None
 
 
-def _gather_inbox(
-    supervisor: HubSupervisor, *, max_text_chars: int
+def _gather_repo_inbox(
+    snap: RepoSnapshot,
+    *,
+    max_text_chars: int,
+    watch_paths: Optional[list[Path]] = None,
 ) -> list[dict[str, Any]]:
+    """Inbox items of one repo; run history dirs read are added to ``watch_paths``."""
     messages: list[dict[str, Any]] = []
+    if not (snap.initialized and snap.exists_on_disk):
+        return messages
+    repo_root = snap.path
+    db_path = repo_root / ".codex-autorunner" / "flows.db"
+    if not db_path.exists():
+        return messages
     try:
-        snapshots = supervisor.list_repos()
-    except Exception:
-        return []
-    for snap in snapshots:
-        if not (snap.initialized and snap.exists_on_disk):
-            continue
-        repo_root = snap.path
-        db_path = repo_root / ".codex-autorunner" / "flows.db"
-        if not db_path.exists():
-            continue
-        try:
-            config = load_repo_config(repo_root)
-            with FlowStore(db_path, durable=config.durable_writes) as store:
-                active_statuses = [
-                    FlowRunStatus.PAUSED,
-                    FlowRunStatus.RUNNING,
-                    FlowRunStatus.FAILED,
-                    FlowRunStatus.STOPPED,
-                ]
-                all_runs = store.list_flow_runs(flow_type="ticket_flow")
-                active_run_id: Optional[str] = None
+        config = load_repo_config(repo_root)
+        with FlowStore(db_path, durable=config.durable_writes) as store:
+            active_statuses = [
+                FlowRunStatus.PAUSED,
+                FlowRunStatus.RUNNING,
+                FlowRunStatus.FAILED,
+                FlowRunStatus.STOPPED,
+            ]
+            all_runs = store.list_flow_runs(flow_type="ticket_flow")
+            active_run_id: Optional[str] = None
+            for r in all_runs:
+                if r.status == FlowRunStatus.RUNNING:
+                    active_run_id = str(r.id)
+                    break
+            if active_run_id is None:
                 for r in all_runs:
-                    if r.status == FlowRunStatus.RUNNING:
+                    if r.status == FlowRunStatus.PAUSED:
                         active_run_id = str(r.id)
                         break
-                if active_run_id is None:
-                    for r in all_runs:
-                        if r.status == FlowRunStatus.PAUSED:
-                            active_run_id = str(r.id)
-                            break
-                for record in all_runs:
-                    if record.status not in active_statuses:
-                        continue
-                    if record.status == FlowRunStatus.SUPERSEDED:
-                        continue
-                    record_input = dict(record.input_data or {})
-                    latest = _latest_dispatch(
-                        repo_root,
-                        str(record.id),
-                        record_input,
-                        max_text_chars=max_text_chars,
-                    )
-                    latest_payload = latest if isinstance(latest, dict) else {}
-                    latest_reply_seq = _latest_reply_history_seq(
-                        repo_root, str(record.id), record_input
+            for record in all_runs:
+                if record.status not in active_statuses:
+                    continue
+                if record.status == FlowRunStatus.SUPERSEDED:
+                    continue
+                record_input = dict(record.input_data or {})
+                if watch_paths is not None:
+                    watch_paths.extend(
+                        _run_history_watch_paths(
+                            repo_root, str(record.id), record_input
+                        )
                     )
-                    seq = int(latest_payload.get("seq") or 0)
-                    has_dispatch = bool(
-                        latest_payload.get("dispatch")
-                        and seq > 0
-                        and latest_reply_seq < seq
+                latest = _latest_dispatch(
+                    repo_root,
+                    str(record.id),
+                    record_input,
+                    max_text_chars=max_text_chars,
+                )
+                latest_payload = latest if isinstance(latest, dict) else {}
+                latest_reply_seq = _latest_reply_history_seq(
+                    repo_root, str(record.id), record_input
+                )
+                seq = int(latest_payload.get("seq") or 0)
+                has_dispatch = bool(
+                    latest_payload.get("dispatch")
+                    and seq > 0
+                    and latest_reply_seq < seq
+                )
+                dispatch_state_reason = None
+                if record.status == FlowRunStatus.PAUSED and not has_dispatch:
+                    if latest_payload.get("errors"):
+                        dispatch_state_reason = (
+                            "Paused run has unreadable dispatch metadata"
+                        )
+                    elif seq > 0 and latest_reply_seq >= seq:
+                        dispatch_state_reason = (
+                            "Latest dispatch already replied; run is still paused"
+                        )
+                    else:
+                        dispatch_state_reason = (
+                            "Run is paused without an actionable dispatch"
+                        )
+                elif record.status == FlowRunStatus.FAILED:
+                    dispatch_state_reason = record.error_message or "Run failed"
+                elif record.status == FlowRunStatus.STOPPED:
+                    dispatch_state_reason = "Run was stopped"
+                run_state = build_ticket_flow_run_state(
+                    repo_root=repo_root,
+                    repo_id=snap.id,
+                    record=record,
+                    store=store,
+                    has_pending_dispatch=has_dispatch,
+                    dispatch_state_reason=dispatch_state_reason,
+                )
+                run_state["active_run_id"] = active_run_id
+                is_terminal_failed = record.status in (
+                    FlowRunStatus.FAILED,
+                    FlowRunStatus.STOPPED,
+                )
+                is_superseded = record.status == FlowRunStatus.SUPERSEDED
+                if is_superseded:
+                    continue
+                if not run_state.get("attention_required") and not is_terminal_failed:
+                    if has_dispatch:
+                        pass
+                    else:
+                        continue
+                base_item = {
+                    "repo_id": snap.id,
+                    "repo_display_name": snap.display_name,
+                    "run_id": record.id,
+                    "run_created_at": record.created_at,
+                    "status": record.status.value,
+                    "open_url": f"/repos/{snap.id}/?tab=inbox&run_id={record.id}",
+                    "run_state": run_state,
+                    "active_run_id": active_run_id,
+                }
+                if has_dispatch:
+                    dispatch_payload = latest_payload.get("dispatch")
+                    messages.append(
+                        {
+                            **base_item,
+                            "item_type": "run_dispatch",
+                            "next_action": "reply_and_resume",
+                            "seq": seq,
+                            "dispatch": dispatch_payload,
+                            "files": latest_payload.get("files") or [],
+                        }
                     )
-                    dispatch_state_reason = None
-                    if record.status == FlowRunStatus.PAUSED and not has_dispatch:
-                        if latest_payload.get("errors"):
-                            dispatch_state_reason = (
-                                "Paused run has unreadable dispatch metadata"
-                            )
-                        elif seq > 0 and latest_reply_seq >= seq:
-                            dispatch_state_reason = (
-                                "Latest dispatch already replied; run is still paused"
-                            )
-                        else:
-                            dispatch_state_reason = (
-                                "Run is paused without an actionable dispatch"
-                            )
+                else:
+                    item_type = "run_state_attention"
+                    next_action = "inspect_and_resume"
+                    if record.status == FlowRunStatus.RUNNING:
+                        health = check_worker_health(repo_root, str(record.id))
+                        if health.status in {"dead", "invalid", "mismatch"}:
+                            item_type = "worker_dead"
+                            next_action = "restart_worker"
                     elif record.status == FlowRunStatus.FAILED:
-                        dispatch_state_reason = record.error_message or "Run failed"
+                        item_type = "run_failed"
+                        next_action = "diagnose_or_restart"
                     elif record.status == FlowRunStatus.STOPPED:
-                        dispatch_state_reason = "Run was stopped"
-                    run_state = build_ticket_flow_run_state(
-                        repo_root=repo_root,
-                        repo_id=snap.id,
-                        record=record,
-                        store=store,
-                        has_pending_dispatch=has_dispatch,
-                        dispatch_state_reason=dispatch_state_reason,
-                    )
-                    run_state["active_run_id"] = active_run_id
-                    is_terminal_failed = record.status in (
-                        FlowRunStatus.FAILED,
-                        FlowRunStatus.STOPPED,
+                        item_type = "run_stopped"
+                        next_action = "diagnose_or_restart"
+                    messages.append(
+                        {
+                            **base_item,
+                            "item_type": item_type,
+                            "next_action": next_action,
+                            "seq": seq if seq > 0 else None,
+                            "dispatch": latest_payload.get("dispatch"),
+                            "files": latest_payload.get("files") or [],
+                            "reason": dispatch_state_reason,
+                            "available_actions": run_state.get(
+                                "recommended_actions", []
+                            ),
+                        }
                     )
-                    is_superseded = record.status == FlowRunStatus.SUPERSEDED
-                    if is_superseded:
-                        continue
-                    if (
-                        not run_state.get("attention_required")
-                        and not is_terminal_failed
-                    ):
-                        if has_dispatch:
-                            pass
-                        else:
-                            continue
-                    base_item = {
-                        "repo_id": snap.id,
-                        "repo_display_name": snap.display_name,
-                        "run_id": record.id,
-                        "run_created_at": record.created_at,
-                        "status": record.status.value,
-                        "open_url": f"/repos/{snap.id}/?tab=inbox&run_id={record.id}",
-                        "run_state": run_state,
-                        "active_run_id": active_run_id,
-                    }
-                    if has_dispatch:
-                        dispatch_payload = latest_payload.get("dispatch")
-                        messages.append(
-                            {
-                                **base_item,
-                                "item_type": "run_dispatch",
-                                "next_action": "reply_and_resume",
-                                "seq": seq,
-                                "dispatch": dispatch_payload,
-                                "files": latest_payload.get("files") or [],
-                            }
-                        )
-                    else:
-                        item_type = "run_state_attention"
-                        next_action = "inspect_and_resume"
-                        if record.status == FlowRunStatus.RUNNING:
-                            health = check_worker_health(repo_root, str(record.id))
-                            if health.status in {"dead", "invalid", "mismatch"}:
-                                item_type = "worker_dead"
-                                next_action = "restart_worker"
-                        elif record.status == FlowRunStatus.FAILED:
-                            item_type = "run_failed"
-                            next_action = "diagnose_or_restart"
-                        elif record.status == FlowRunStatus.STOPPED:
-                            item_type = "run_stopped"
-                            next_action = "diagnose_or_restart"
-                        messages.append(
-                            {
-                                **base_item,
-                                "item_type": item_type,
-                                "next_action": next_action,
-                                "seq": seq if seq > 0 else None,
-                                "dispatch": latest_payload.get("dispatch"),
-                                "files": latest_payload.get("files") or [],
-                                "reason": dispatch_state_reason,
-                                "available_actions": run_state.get(
-                                    "recommended_actions", []
-                                ),
-                            }
-                        )
-        except Exception:
-            continue
-    messages.sort(key=lambda m: (m.get("run_created_at") or ""), reverse=True)
+    except Exception:
+        return messages
     return messages
 
 
@@ -1156,22 +1173,142 @@ def _gather_lifecycle_events(
     return result
 
 
-async def build_hub_snapshot(
-    supervisor: Optional[HubSupervisor],
-    hub_root: Optional[Path] = None,
-) -> dict[str, Any]:
-    if supervisor is None:
-        return {
-            "repos": [],
-            "inbox": [],
-            "templates": {"enabled": False, "repos": []},
-            "lifecycle_events": [],
-            "pma_files_detail": {"inbox": [], "outbox": []},
-        }
+def _latest_history_seq_dir(history_dir: Path) -> Optional[Path]:
+    try:
+        names = [
+            child.name
+            for child in history_dir.iterdir()
+            if len(child.name) == 4 and child.name.isdigit()
+        ]
+    except OSError:
+        return None
+    return history_dir / max(names) if names else None
 
-    snapshots = await asyncio.to_thread(supervisor.list_repos)
-    snapshots = sorted(snapshots, key=lambda snap: snap.id)
-    pma_config = supervisor.hub_config.pma if supervisor else None
+
+def _run_history_watch_paths(
+    repo_root: Path, run_id: str, record_input: dict[str, Any]
+) -> list[Path]:
+    """Paths whose mtime changes when a run gets a new dispatch or reply."""
+    try:
+        workspace_root, runs_dir = _resolve_workspace_and_runs(record_input, repo_root)
+    except ValueError:
+        return []
+    dispatch_dir = resolve_outbox_paths(
+        workspace_root=workspace_root, runs_dir=runs_dir, run_id=run_id
+    ).dispatch_history_dir
+    reply_dir = resolve_reply_paths(
+        workspace_root=workspace_root, runs_dir=runs_dir, run_id=run_id
+    ).reply_history_dir
+    paths = [dispatch_dir, reply_dir]
+    # Files written into the newest dispatch dir do not touch its parent.
+    latest = _latest_history_seq_dir(dispatch_dir)
+    if latest is not None:
+        paths.append(latest)
+    return paths
+
+
+def _compute_repo_flow_state(
+    snap: RepoSnapshot,
+    *,
+    include_failure: bool,
+    include_summary: bool,
+    inbox_text_chars: Optional[int],
+) -> CachedRepoState:
+    repo_root = snap.path
+    car_dir = repo_root / ".codex-autorunner"
+    ticket_dir = car_dir / "tickets"
+    watch_paths: list[Path] = [
+        car_dir / "flows.db",
+        car_dir / "flows.db-wal",
+        ticket_dir,
+        *list_ticket_paths(ticket_dir),
+    ]
+    ticket_flow: Optional[dict[str, Any]] = None
+    run_state: Optional[dict[str, Any]] = None
+    if include_summary:
+        ticket_flow = build_ticket_flow_summary(
+            repo_root, include_failure=include_failure
+        )
+        run_state = get_latest_ticket_flow_run_state(repo_root, snap.id)
+        if run_state is not None:
+            # Runs with a custom runs_dir are still covered by flows.db changes.
+            watch_paths.extend(
+                _run_history_watch_paths(repo_root, str(run_state["run_id"]), {})
+            )
+    inbox: list[dict[str, Any]] = []
+    if inbox_text_chars is not None:
+        inbox = _gather_repo_inbox(
+            snap, max_text_chars=inbox_text_chars, watch_paths=watch_paths
+        )
+    run_states = [run_state, *(item.get("run_state") for item in inbox)]
+    return CachedRepoState(
+        payload={"ticket_flow": ticket_flow, "run_state": run_state, "inbox": inbox},
+        watch_paths=tuple(watch_paths),
+        # Worker liveness is checked for live runs and leaves no file trace.
+        volatile=any(
+            isinstance(state, dict) and state.get("flow_status") in _LIVE_FLOW_STATUSES
+            for state in run_states
+        ),
+    )
+
+
+def collect_repo_flow_states(
+    supervisor: HubSupervisor,
+    snapshots: Sequence[RepoSnapshot],
+    *,
+    include_failure: bool = False,
+    summary_repo_ids: Optional[Collection[str]] = None,
+    inbox_text_chars: Optional[int] = None,
+    lifecycle_events: Sequence[dict[str, Any]] = (),
+) -> dict[str, dict[str, Any]]:
+    """Ticket flow summary, latest run state and inbox items per repo id.
+
+    Results come from the supervisor's :class:`HubSnapshotCache` and are
+    shared between callers, so treat them as read-only. Only repos listed in
+    ``summary_repo_ids`` (all when ``None``) get ``ticket_flow``/``run_state``;
+    inbox items are gathered only when ``inbox_text_chars`` is set.
+    """
+    cache = getattr(supervisor, "snapshot_cache", None)
+    owned_cache: Optional[HubSnapshotCache] = None
+    if not isinstance(cache, HubSnapshotCache):
+        cache = owned_cache = HubSnapshotCache()
+    pending_events: dict[str, list[tuple[Any, ...]]] = {}
+    for event in lifecycle_events:
+        pending_events.setdefault(str(event.get("repo_id") or ""), []).append(
+            (event.get("event_type"), event.get("run_id"), event.get("timestamp"))
+        )
+    jobs: dict[str, RepoJob] = {}
+    for snap in snapshots:
+        if not (snap.initialized and snap.exists_on_disk):
+            continue
+        include_summary = summary_repo_ids is None or snap.id in summary_repo_ids
+        token = (
+            str(snap.path),
+            include_failure,
+            include_summary,
+            inbox_text_chars,
+            tuple(pending_events.get(snap.id, ())),
+        )
+        jobs[snap.id] = (
+            token,
+            functools.partial(
+                _compute_repo_flow_state,
+                snap,
+                include_failure=include_failure,
+                include_summary=include_summary,
+                inbox_text_chars=inbox_text_chars,
+            ),
+        )
+    namespace = "pma" if inbox_text_chars is not None else "hub"
+    try:
+        return cache.collect(namespace, jobs)
+    finally:
+        if owned_cache is not None:
+            owned_cache.close()
+
+
+def _pma_limits(supervisor: HubSupervisor) -> tuple[int, int, int]:
+    pma_config = supervisor.hub_config.pma
     max_repos = (
         pma_config.max_repos
         if pma_config and pma_config.max_repos > 0
@@ -1187,32 +1324,73 @@ async def build_hub_snapshot(
         if pma_config and pma_config.max_text_chars > 0
         else PMA_MAX_TEXT
     )
-    repos: list[dict[str, Any]] = []
-    for snap in snapshots[:max_repos]:
-        summary: dict[str, Any] = {
-            "id": snap.id,
-            "display_name": snap.display_name,
-            "status": snap.status.value,
-            "last_run_id": snap.last_run_id,
-            "last_run_started_at": snap.last_run_started_at,
-            "last_run_finished_at": snap.last_run_finished_at,
-            "last_exit_code": snap.last_exit_code,
-            "ticket_flow": None,
-            "run_state": None,
+    return max_repos, max_messages, max_text_chars
+
+
+async def build_hub_snapshot(
+    supervisor: Optional[HubSupervisor],
+    hub_root: Optional[Path] = None,
+    *,
+    changes_for: Optional[str] = None,
+) -> dict[str, Any]:
+    """Build the hub snapshot rendered into PMA prompts.
+
+    Per-repo state is served from the supervisor's snapshot cache. With
+    ``changes_for`` set (the PMA thread key of the conversation the prompt is
+    for), ``snapshot["changes"]`` lists the repos whose state changed since
+    that conversation last acknowledged a snapshot; call
+    :func:`acknowledge_hub_snapshot_changes` once the prompt was delivered.
+    """
+    if supervisor is None:
+        return {
+            "repos": [],
+            "inbox": [],
+            "templates": {"enabled": False, "repos": []},
+            "lifecycle_events": [],
+            "pma_files_detail": {"inbox": [], "outbox": []},
         }
-        if snap.initialized and snap.exists_on_disk:
-            summary["ticket_flow"] = _get_ticket_flow_summary(snap.path)
-            summary["run_state"] = get_latest_ticket_flow_run_state(snap.path, snap.id)
-        repos.append(summary)
 
-    inbox = await asyncio.to_thread(
-        _gather_inbox, supervisor, max_text_chars=max_text_chars
-    )
-    inbox = inbox[:max_messages]
+    snapshots = await asyncio.to_thread(supervisor.list_repos)
+    snapshots = sorted(snapshots, key=lambda snap: snap.id)
+    max_repos, max_messages, max_text_chars = _pma_limits(supervisor)
 
     lifecycle_events = await asyncio.to_thread(
         _gather_lifecycle_events, supervisor, limit=20
     )
+    listed = snapshots[:max_repos]
+    states = await asyncio.to_thread(
+        collect_repo_flow_states,
+        supervisor,
+        snapshots,
+        summary_repo_ids={snap.id for snap in listed},
+        inbox_text_chars=max_text_chars,
+        lifecycle_events=lifecycle_events,
+    )
+
+    repos: list[dict[str, Any]] = []
+    for snap in listed:
+        state = states.get(snap.id) or {}
+        repos.append(
+            {
+                "id": snap.id,
+                "display_name": snap.display_name,
+                "status": snap.status.value,
+                "last_run_id": snap.last_run_id,
+                "last_run_started_at": snap.last_run_started_at,
+                "last_run_finished_at": snap.last_run_finished_at,
+                "last_exit_code": snap.last_exit_code,
+                "ticket_flow": state.get("ticket_flow"),
+                "run_state": state.get("run_state"),
+            }
+        )
+
+    inbox = [
+        item
+        for snap in snapshots
+        for item in (states.get(snap.id) or {}).get("inbox") or []
+    ]
+    inbox.sort(key=lambda m: (m.get("run_created_at") or ""), reverse=True)
+    inbox = inbox[:max_messages]
 
     templates = _build_templates_snapshot(supervisor, hub_root=hub_root)
 
@@ -1245,7 +1423,7 @@ async def build_hub_snapshot(
         except Exception:
             pass
 
-    return {
+    snapshot: dict[str, Any] = {
         "repos": repos,
         "inbox": inbox,
         "templates": templates,
@@ -1258,3 +1436,20 @@ async def build_hub_snapshot(
             "max_text_chars": max_text_chars,
         },
     }
+    cache = getattr(supervisor, "snapshot_cache", None)
+    if changes_for and isinstance(cache, HubSnapshotCache):
+        snapshot["changes"] = cache.peek_changes("pma", changes_for)
+    return snapshot
+
+
+def acknowledge_hub_snapshot_changes(
+    supervisor: Optional[HubSupervisor], snapshot: dict[str, Any], consumer: str
+) -> None:
+    """Mark the changes in ``snapshot`` as seen by PMA thread ``consumer``."""
+    changes = snapshot.get("changes")
+    cache = getattr(supervisor, "snapshot_cache", None)
+    if not isinstance(changes, dict) or not isinstance(cache, HubSnapshotCache):
+        return
+    generation = changes.get("generation")
+    if isinstance(generation, int):
+        cache.acknowledge_changes("pma", consumer, generation)
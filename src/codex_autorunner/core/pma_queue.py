@@ -3,17 +3,25 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 import uuid
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Optional
 
 from .locks import file_lock
 from .time_utils import now_iso
 
 PMA_QUEUE_DIR = ".codex-autorunner/pma/queue"
 QUEUE_FILE_SUFFIX = ".jsonl"
+# Lane logs are rewritten once this many records are superseded or expired.
+COMPACT_AFTER_RECORDS = 256
+DEFAULT_KEEP_FINISHED = 100
+# Bytes at the head of a lane log and just before the cached offset that must
+# still match before resuming an incremental read; a mismatch means the log
+# was rewritten in place.
+FINGERPRINT_BYTES = 64
 
 logger = logging.getLogger(__name__)
 
@@ -73,13 +81,84 @@ class PmaQueueItem:
         return cls(**data)
 
 
+_ACTIVE_STATES = (QueueItemState.PENDING, QueueItemState.RUNNING)
+
+
+def _fingerprint(f: IO[bytes], offset: int) -> bytes:
+    f.seek(0)
+    head = f.read(min(offset, FINGERPRINT_BYTES))
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return head + f.read(offset - start)
+
+
+class _LaneLog:
+    """In-memory index over one lane log, where the last record per item wins."""
+
+    def __init__(self, lane_id: str) -> None:
+        self.lane_id = lane_id
+        self.reset()
+
+    def reset(self) -> None:
+        self.items: dict[str, PmaQueueItem] = {}
+        self.active_by_key: dict[str, str] = {}
+        self.pending: dict[str, None] = {}
+        self.by_state: dict[str, int] = {}
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.fingerprint = b""
+        self.mtime_ns: Optional[int] = None
+        self.records = 0
+
+    @property
+    def dead_records(self) -> int:
+        return self.records - len(self.items)
+
+    def apply(self, item: PmaQueueItem) -> None:
+        previous = self.items.get(item.item_id)
+        if previous is not None:
+            self.by_state[previous.state.value] -= 1
+        self.items[item.item_id] = item
+        self.by_state[item.state.value] = self.by_state.get(item.state.value, 0) + 1
+        self.records += 1
+        if item.state == QueueItemState.PENDING:
+            self.pending[item.item_id] = None
+        else:
+            self.pending.pop(item.item_id, None)
+        key = item.idempotency_key
+        if item.state in _ACTIVE_STATES:
+            self.active_by_key[key] = item.item_id
+        elif self.active_by_key.get(key) == item.item_id:
+            del self.active_by_key[key]
+
+    def find_active(self, idempotency_key: str) -> Optional[PmaQueueItem]:
+        item_id = self.active_by_key.get(idempotency_key)
+        return self.items.get(item_id) if item_id is not None else None
+
+
 class PmaQueue:
-    """PMA queue backed by JSONL state; pending items are replayed into memory."""
+    """PMA queue backed by append-only JSONL lane logs.
+
+    Every state transition appends a full item snapshot; the last record per
+    ``item_id`` wins. Each lane keeps an in-memory index that is advanced from
+    the byte offset it last read, so other processes' writes are picked up
+    without reparsing the log, and the log is compacted once enough records are
+    superseded or belong to finished items beyond ``keep_finished``.
+    """
 
-    def __init__(self, hub_root: Path) -> None:
+    def __init__(
+        self,
+        hub_root: Path,
+        *,
+        keep_finished: int = DEFAULT_KEEP_FINISHED,
+        compact_after_records: int = COMPACT_AFTER_RECORDS,
+    ) -> None:
         self._hub_root = hub_root
         self._queue_dir = hub_root / PMA_QUEUE_DIR
         self._queue_dir.mkdir(parents=True, exist_ok=True)
+        self._keep_finished = max(0, keep_finished)
+        self._compact_after_records = max(1, compact_after_records)
+        self._lane_logs: dict[str, _LaneLog] = {}
         self._lane_queues: dict[str, asyncio.Queue[PmaQueueItem]] = {}
         self._lane_locks: dict[str, asyncio.Lock] = {}
         self._lane_events: dict[str, asyncio.Event] = {}
@@ -140,21 +219,12 @@ class PmaQueue:
     ) -> tuple[PmaQueueItem, Optional[str]]:
         async with self._lock:
             self._record_loop()
-            existing = await self._find_by_idempotency_key(lane_id, idempotency_key)
-            if existing:
-                if existing.state in (QueueItemState.PENDING, QueueItemState.RUNNING):
-                    dedupe_item = PmaQueueItem.create(
-                        lane_id=lane_id,
-                        idempotency_key=idempotency_key,
-                        payload=payload,
-                    )
-                    dedupe_item.state = QueueItemState.DEDUPED
-                    dedupe_item.dedupe_reason = f"duplicate_of_{existing.item_id}"
-                    await self._append_to_file(dedupe_item)
-                    return dedupe_item, f"duplicate of {existing.item_id}"
-
-            item = PmaQueueItem.create(lane_id, idempotency_key, payload)
-            await self._append_to_file(item)
+            async with self._ensure_lane_lock(lane_id):
+                item, dupe_reason = self._enqueue_locked(
+                    lane_id, idempotency_key, payload
+                )
+            if dupe_reason is not None:
+                return item, dupe_reason
             queue = self._ensure_lane_queue(lane_id)
             await queue.put(item)
             self._ensure_lane_known_ids(lane_id).add(item.item_id)
@@ -167,37 +237,50 @@ class PmaQueue:
         idempotency_key: str,
         payload: dict[str, Any],
     ) -> tuple[PmaQueueItem, Optional[str]]:
-        existing = self._find_by_idempotency_key_sync(lane_id, idempotency_key)
-        if existing:
-            if existing.state in (QueueItemState.PENDING, QueueItemState.RUNNING):
-                dedupe_item = PmaQueueItem.create(
-                    lane_id=lane_id,
-                    idempotency_key=idempotency_key,
-                    payload=payload,
-                )
-                dedupe_item.state = QueueItemState.DEDUPED
-                dedupe_item.dedupe_reason = f"duplicate_of_{existing.item_id}"
-                self._append_to_file_sync(dedupe_item)
-                return dedupe_item, f"duplicate of {existing.item_id}"
+        item, dupe_reason = self._enqueue_locked(lane_id, idempotency_key, payload)
+        if dupe_reason is None:
+            self._notify_in_memory_enqueue(item)
+        return item, dupe_reason
 
-        item = PmaQueueItem.create(lane_id, idempotency_key, payload)
-        self._append_to_file_sync(item)
-        self._notify_in_memory_enqueue(item)
-        return item, None
+    def _enqueue_locked(
+        self,
+        lane_id: str,
+        idempotency_key: str,
+        payload: dict[str, Any],
+    ) -> tuple[PmaQueueItem, Optional[str]]:
+        with file_lock(self._lane_queue_lock_path(lane_id)):
+            log = self._sync_lane_log(lane_id)
+            existing = log.find_active(idempotency_key)
+            item = PmaQueueItem.create(lane_id, idempotency_key, payload)
+            if existing is not None:
+                item.state = QueueItemState.DEDUPED
+                item.dedupe_reason = f"duplicate_of_{existing.item_id}"
+                self._append_locked(log, [item])
+                return item, f"duplicate of {existing.item_id}"
+            self._append_locked(log, [item])
+            return item, None
 
     async def dequeue(self, lane_id: str) -> Optional[PmaQueueItem]:
         self._record_loop()
         queue = self._lane_queues.get(lane_id)
-        if queue is None or queue.empty():
+        if queue is None:
             return None
-        try:
-            item = queue.get_nowait()
-            item.state = QueueItemState.RUNNING
-            item.started_at = now_iso()
-            await self._update_in_file(item)
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+            async with self._ensure_lane_lock(lane_id):
+                with file_lock(self._lane_queue_lock_path(lane_id)):
+                    log = self._sync_lane_log(lane_id)
+                    current = log.items.get(item.item_id)
+                    if current is not None and current.state != QueueItemState.PENDING:
+                        # Cancelled or claimed through another queue instance.
+                        continue
+                    item.state = QueueItemState.RUNNING
+                    item.started_at = now_iso()
+                    self._append_locked(log, [item])
             return item
-        except asyncio.QueueEmpty:
-            return None
 
     async def complete_item(
         self, item: PmaQueueItem, result: Optional[dict[str, Any]] = None
@@ -206,26 +289,29 @@ class PmaQueue:
         item.finished_at = now_iso()
         if result is not None:
             item.result = result
-        await self._update_in_file(item)
+        await self._append_transitions(item.lane_id, [item])
 
     async def fail_item(self, item: PmaQueueItem, error: str) -> None:
         item.state = QueueItemState.FAILED
         item.finished_at = now_iso()
         item.error = error
-        await self._update_in_file(item)
+        await self._append_transitions(item.lane_id, [item])
 
     async def cancel_lane(self, lane_id: str) -> int:
-        cancelled = 0
-        cancelled_ids: set[str] = set()
-        items = await self.list_items(lane_id)
-        for item in items:
-            if item.state == QueueItemState.PENDING:
-                item.state = QueueItemState.CANCELLED
-                item.finished_at = now_iso()
-                await self._update_in_file(item)
-                cancelled += 1
-                cancelled_ids.add(item.item_id)
-
+        cancelled: list[PmaQueueItem] = []
+        async with self._ensure_lane_lock(lane_id):
+            with file_lock(self._lane_queue_lock_path(lane_id)):
+                log = self._sync_lane_log(lane_id)
+                finished_at = now_iso()
+                for item_id in list(log.pending):
+                    item = replace(log.items[item_id])
+                    item.state = QueueItemState.CANCELLED
+                    item.finished_at = finished_at
+                    cancelled.append(item)
+                if cancelled:
+                    self._append_locked(log, cancelled)
+
+        cancelled_ids = {item.item_id for item in cancelled}
         queue = self._lane_queues.get(lane_id)
         if queue is not None:
             while not queue.empty():
@@ -239,15 +325,14 @@ class PmaQueue:
                     continue
                 queued_item.state = QueueItemState.CANCELLED
                 queued_item.finished_at = now_iso()
-                await self._update_in_file(queued_item)
-                cancelled += 1
+                await self._append_transitions(lane_id, [queued_item])
                 cancelled_ids.add(queued_item.item_id)
 
         event = self._lane_events.get(lane_id)
         if event is not None:
             event.set()
 
-        return cancelled
+        return len(cancelled_ids)
 
     async def replay_pending(self, lane_id: str) -> int:
         self._record_loop()
@@ -311,150 +396,147 @@ class PmaQueue:
                 return True
 
     async def list_items(self, lane_id: str) -> list[PmaQueueItem]:
-        path = self._lane_queue_path(lane_id)
-        if not path.exists():
-            return []
-
-        items: list[PmaQueueItem] = []
         async with self._ensure_lane_lock(lane_id):
             with file_lock(self._lane_queue_lock_path(lane_id)):
-                try:
-                    content = path.read_text(encoding="utf-8")
-                except OSError:
-                    return []
-
-            for line in content.strip().splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    items.append(PmaQueueItem.from_dict(data))
-                except (json.JSONDecodeError, ValueError):
-                    continue
-
-        return items
+                log = self._sync_lane_log(lane_id)
+                return [replace(item) for item in log.items.values()]
 
     async def _refresh_lane_from_disk(self, lane_id: str) -> int:
-        items = await self.list_items(lane_id)
-        if not items:
-            return 0
-
-        known = self._ensure_lane_known_ids(lane_id)
-        new_pending: list[PmaQueueItem] = []
-        for item in items:
-            if item.item_id in known:
-                continue
-            known.add(item.item_id)
-            if item.state == QueueItemState.PENDING:
-                new_pending.append(item)
+        async with self._ensure_lane_lock(lane_id):
+            with file_lock(self._lane_queue_lock_path(lane_id)):
+                log = self._sync_lane_log(lane_id)
+                known = self._ensure_lane_known_ids(lane_id)
+                new_pending = [
+                    replace(log.items[item_id])
+                    for item_id in log.pending
+                    if item_id not in known
+                ]
 
         if not new_pending:
             return 0
 
+        known.update(item.item_id for item in new_pending)
         queue = self._ensure_lane_queue(lane_id)
         for item in new_pending:
             await queue.put(item)
         self._ensure_lane_event(lane_id).set()
         return len(new_pending)
 
-    async def _find_by_idempotency_key(
-        self, lane_id: str, idempotency_key: str
-    ) -> Optional[PmaQueueItem]:
-        items = await self.list_items(lane_id)
-        for item in items:
-            if item.idempotency_key == idempotency_key and item.state in (
-                QueueItemState.PENDING,
-                QueueItemState.RUNNING,
-            ):
-                return item
-        return None
-
-    async def _append_to_file(self, item: PmaQueueItem) -> None:
-        path = self._lane_queue_path(item.lane_id)
-        async with self._ensure_lane_lock(item.lane_id):
-            with file_lock(self._lane_queue_lock_path(item.lane_id)):
-                path.parent.mkdir(parents=True, exist_ok=True)
-                line = json.dumps(item.to_dict(), separators=(",", ":")) + "\n"
-                with path.open("a", encoding="utf-8") as f:
-                    f.write(line)
-
-    async def _update_in_file(self, item: PmaQueueItem) -> None:
-        path = self._lane_queue_path(item.lane_id)
-        async with self._ensure_lane_lock(item.lane_id):
-            with file_lock(self._lane_queue_lock_path(item.lane_id)):
-                if not path.exists():
-                    return
-
-                try:
-                    content = path.read_text(encoding="utf-8")
-                except OSError:
-                    return
-
-                lines: list[str] = []
-                updated = False
-                for line in content.strip().splitlines():
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                        if data.get("item_id") == item.item_id:
-                            lines.append(
-                                json.dumps(item.to_dict(), separators=(",", ":"))
-                            )
-                            updated = True
-                        else:
-                            lines.append(line)
-                    except (json.JSONDecodeError, ValueError):
-                        lines.append(line)
-
-                if updated:
-                    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-    def _append_to_file_sync(self, item: PmaQueueItem) -> None:
-        path = self._lane_queue_path(item.lane_id)
-        with file_lock(self._lane_queue_lock_path(item.lane_id)):
-            path.parent.mkdir(parents=True, exist_ok=True)
-            line = json.dumps(item.to_dict(), separators=(",", ":")) + "\n"
-            with path.open("a", encoding="utf-8") as f:
-                f.write(line)
-
-    def _read_items_sync(self, lane_id: str) -> list[PmaQueueItem]:
+    async def _append_transitions(
+        self, lane_id: str, items: list[PmaQueueItem]
+    ) -> None:
+        async with self._ensure_lane_lock(lane_id):
+            with file_lock(self._lane_queue_lock_path(lane_id)):
+                log = self._sync_lane_log(lane_id)
+                self._append_locked(log, items)
+
+    def _sync_lane_log(self, lane_id: str) -> _LaneLog:
+        """Apply records appended since the last read; caller holds the file lock."""
+        log = self._lane_logs.get(lane_id)
+        if log is None:
+            log = _LaneLog(lane_id)
+            self._lane_logs[lane_id] = log
         path = self._lane_queue_path(lane_id)
-        if not path.exists():
-            return []
-
-        items: list[PmaQueueItem] = []
-        with file_lock(self._lane_queue_lock_path(lane_id)):
-            try:
-                content = path.read_text(encoding="utf-8")
-            except OSError:
-                return []
-
-        for line in content.strip().splitlines():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            log.reset()
+            return log
+        except OSError:
+            return log
+        if stat.st_ino != log.inode or stat.st_size < log.offset:
+            # First read, or the log was compacted by another process.
+            log.reset()
+            log.inode = stat.st_ino
+        if stat.st_size == log.offset and stat.st_mtime_ns == log.mtime_ns:
+            return log
+        try:
+            with path.open("rb") as f:
+                if log.offset and _fingerprint(f, log.offset) != log.fingerprint:
+                    # Rewritten in place to the same or a larger size.
+                    log.reset()
+                    log.inode = stat.st_ino
+                f.seek(log.offset)
+                chunk = f.read()
+                # A trailing line without a newline is still being written (or
+                # was torn by a crash); leave it for the next read.
+                end = chunk.rfind(b"\n") + 1
+                fingerprint = _fingerprint(f, log.offset + end)
+        except OSError:
+            return log
+        for line in chunk[:end].splitlines():
             line = line.strip()
             if not line:
                 continue
             try:
-                data = json.loads(line)
-                items.append(PmaQueueItem.from_dict(data))
-            except (json.JSONDecodeError, ValueError):
+                log.apply(PmaQueueItem.from_dict(json.loads(line)))
+            except (json.JSONDecodeError, TypeError, ValueError):
                 continue
-
-        return items
-
-    def _find_by_idempotency_key_sync(
-        self, lane_id: str, idempotency_key: str
-    ) -> Optional[PmaQueueItem]:
-        items = self._read_items_sync(lane_id)
+        log.offset += end
+        log.fingerprint = fingerprint
+        log.mtime_ns = stat.st_mtime_ns if end == len(chunk) else None
+        return log
+
+    def _append_locked(self, log: _LaneLog, items: list[PmaQueueItem]) -> None:
+        """Append item snapshots to a synced lane log; caller holds the file lock."""
+        path = self._lane_queue_path(log.lane_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = "".join(
+            json.dumps(item.to_dict(), separators=(",", ":")) + "\n" for item in items
+        )
+        with path.open("a+b") as f:
+            if f.seek(0, os.SEEK_END) > log.offset:
+                # Terminate a torn tail so this record starts on its own line.
+                content = "\n" + content
+            f.write(content.encode("utf-8"))
+            f.flush()
+            end = f.tell()
+            fingerprint = _fingerprint(f, end)
+            stat = os.fstat(f.fileno())
+        if log.inode != stat.st_ino:
+            log.reset()
+            log.inode = stat.st_ino
         for item in items:
-            if item.idempotency_key == idempotency_key and item.state in (
-                QueueItemState.PENDING,
-                QueueItemState.RUNNING,
-            ):
-                return item
-        return None
+            log.apply(replace(item))
+        log.offset = end
+        log.fingerprint = fingerprint
+        log.mtime_ns = stat.st_mtime_ns
+        self._maybe_compact(log)
+
+    def _maybe_compact(self, log: _LaneLog) -> None:
+        finished = len(log.items) - sum(
+            log.by_state.get(state.value, 0) for state in _ACTIVE_STATES
+        )
+        expired = max(0, finished - self._keep_finished)
+        if log.dead_records + expired < self._compact_after_records:
+            return
+        kept: list[PmaQueueItem] = []
+        for item in log.items.values():
+            if item.state not in _ACTIVE_STATES and expired > 0:
+                expired -= 1
+                continue
+            kept.append(item)
+        path = self._lane_queue_path(log.lane_id)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        content = "".join(
+            json.dumps(item.to_dict(), separators=(",", ":")) + "\n" for item in kept
+        )
+        try:
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(path)
+            with path.open("rb") as f:
+                stat = os.fstat(f.fileno())
+                fingerprint = _fingerprint(f, stat.st_size)
+        except OSError as exc:
+            logger.warning("Failed to compact PMA lane %s: %s", log.lane_id, exc)
+            return
+        log.reset()
+        log.inode = stat.st_ino
+        for item in kept:
+            log.apply(item)
+        log.offset = stat.st_size
+        log.fingerprint = fingerprint
+        log.mtime_ns = stat.st_mtime_ns
 
     def _notify_in_memory_enqueue(self, item: PmaQueueItem) -> None:
         self._ensure_lane_known_ids(item.lane_id).add(item.item_id)
@@ -474,15 +556,17 @@ class PmaQueue:
             return
 
     async def get_lane_stats(self, lane_id: str) -> dict[str, Any]:
-        items = await self.list_items(lane_id)
-        by_state: dict[str, int] = {}
-        for item in items:
-            state = item.state.value
-            by_state[state] = by_state.get(state, 0) + 1
+        async with self._ensure_lane_lock(lane_id):
+            with file_lock(self._lane_queue_lock_path(lane_id)):
+                log = self._sync_lane_log(lane_id)
+                by_state = {
+                    state: count for state, count in log.by_state.items() if count
+                }
+                total_items = len(log.items)
 
         return {
             "lane_id": lane_id,
-            "total_items": len(items),
+            "total_items": total_items,
             "by_state": by_state,
         }
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Optional, Union
 
 
 @dataclass(frozen=True)
@@ -17,13 +17,16 @@ class SSEEvent:
     retry: Optional[int] = None
 
 
-def format_sse(event: str, data: object) -> str:
+def format_sse(
+    event: str, data: object, *, event_id: Optional[Union[int, str]] = None
+) -> str:
     """Format a Server-Sent Event message.
 
     Args:
         event: The event name.
         data: The event data. If a string, it's used as-is; otherwise, it's
             JSON-encoded.
+        event_id: Optional SSE ``id`` so clients can resume via Last-Event-ID.
 
     Returns:
         A formatted SSE message string.
@@ -31,6 +34,8 @@ def format_sse(event: str, data: object) -> str:
     payload = data if isinstance(data, str) else json.dumps(data)
     lines = payload.splitlines() or [""]
     parts = [f"event: {event}"]
+    if event_id is not None:
+        parts.append(f"id: {event_id}")
     for line in lines:
         parts.append(f"data: {line}")
     return "\n".join(parts) + "\n\n"
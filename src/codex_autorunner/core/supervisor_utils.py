@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
 import logging
 import time
-from typing import Any, Callable, TypeVar
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Collection, Generic, Iterable, TypeVar
 
+from ..workspace import canonical_workspace_root, workspace_id_for_path
 from .logging_utils import log_event
 
 HandleT = TypeVar("HandleT", bound=Any)
+WarmWorkspaceProvider = Callable[[], Iterable[Path]]
+
+RECENT_WORKSPACE_LIMIT = 32
 
 
 def evict_lru_handle_locked(
@@ -16,12 +24,23 @@ def evict_lru_handle_locked(
     event_prefix: str,
     *,
     last_used_at_getter: Callable[[HandleT], float],
+    is_spare: Callable[[HandleT], bool] | None = None,
 ) -> HandleT | None:
+    """Pop the handle to close when the pool is full.
+
+    Unused warm spares (``is_spare``) go before any handle that served a turn.
+    """
     if not max_handles or max_handles <= 0:
         return None
     if len(handles) < max_handles:
         return None
-    lru_handle = min(handles.values(), key=last_used_at_getter)
+    if is_spare is None:
+        lru_handle = min(handles.values(), key=last_used_at_getter)
+    else:
+        lru_handle = min(
+            handles.values(),
+            key=lambda handle: (not is_spare(handle), last_used_at_getter(handle)),
+        )
     log_event(
         logger,
         logging.INFO,
@@ -65,3 +84,283 @@ def pop_idle_handles_locked(
             handles.pop(handle.workspace_id, None)
             stale.append(handle)
     return stale
+
+
+SPAWN_LATENCY_BUCKETS_SECONDS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class SpawnLatencyStats:
+    """Spawn-to-ready latency histograms, split into cold and warm starts."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, list[int]] = {}
+        self._totals: dict[str, float] = {}
+        self._max: dict[str, float] = {}
+
+    def record(self, seconds: float, *, warm: bool) -> None:
+        kind = "warm" if warm else "cold"
+        histogram = self._histograms.setdefault(
+            kind, [0] * (len(SPAWN_LATENCY_BUCKETS_SECONDS) + 1)
+        )
+        histogram[bisect.bisect_left(SPAWN_LATENCY_BUCKETS_SECONDS, seconds)] += 1
+        self._totals[kind] = self._totals.get(kind, 0.0) + seconds
+        self._max[kind] = max(self._max.get(kind, 0.0), seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        labels = [f"<={bound}s" for bound in SPAWN_LATENCY_BUCKETS_SECONDS]
+        labels.append(f">{SPAWN_LATENCY_BUCKETS_SECONDS[-1]}s")
+        payload: dict[str, Any] = {}
+        for kind, histogram in self._histograms.items():
+            count = sum(histogram)
+            payload[kind] = {
+                "count": count,
+                "avg_seconds": round(self._totals[kind] / count, 3),
+                "max_seconds": round(self._max[kind], 3),
+                "histogram": dict(zip(labels, histogram)),
+            }
+        return payload
+
+
+class RecentWorkspaces:
+    """Most-recently-used workspace roots, keyed by workspace id.
+
+    Workspaces whose handle was pruned for idleness leave the list and stay
+    out of prewarm candidates for a cooldown, so prewarm does not undo the
+    idle TTL.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = max(1, limit)
+        self._roots: OrderedDict[str, Path] = OrderedDict()
+        self._pruned_until: dict[str, float] = {}
+
+    def touch(self, workspace_id: str, workspace_root: Path) -> None:
+        self._pruned_until.pop(workspace_id, None)
+        self._roots[workspace_id] = workspace_root
+        self._roots.move_to_end(workspace_id)
+        while len(self._roots) > self._limit:
+            self._roots.popitem(last=False)
+
+    def mark_pruned(self, workspace_id: str, cooldown_seconds: float) -> None:
+        self._roots.pop(workspace_id, None)
+        self._pruned_until[workspace_id] = time.monotonic() + cooldown_seconds
+
+    def recently_pruned(self) -> set[str]:
+        now = time.monotonic()
+        for workspace_id, until in list(self._pruned_until.items()):
+            if until <= now:
+                del self._pruned_until[workspace_id]
+        return set(self._pruned_until)
+
+    def most_recent(self) -> list[tuple[str, Path]]:
+        return list(reversed(self._roots.items()))
+
+
+def select_warm_workspaces(
+    candidates: Iterable[tuple[str, Path]],
+    live_ids: Collection[str],
+    *,
+    limit: int,
+    max_handles: int | None,
+    excluded_ids: Collection[str] = (),
+) -> list[tuple[str, Path]]:
+    """Pick workspaces to pre-spawn into the pool's free slots.
+
+    Spares never displace a live handle, so a full pool gets none.
+    """
+    if max_handles and max_handles > 0:
+        limit = min(limit, max_handles - len(live_ids))
+    selected: list[tuple[str, Path]] = []
+    seen: set[str] = set(live_ids) | set(excluded_ids)
+    for workspace_id, workspace_root in candidates:
+        if len(selected) >= limit:
+            break
+        if workspace_id in seen:
+            continue
+        seen.add(workspace_id)
+        selected.append((workspace_id, workspace_root))
+    return selected
+
+
+def workspace_candidates(workspace_roots: Iterable[Path]) -> list[tuple[str, Path]]:
+    candidates = []
+    for workspace_root in workspace_roots:
+        canonical_root = canonical_workspace_root(workspace_root)
+        candidates.append((workspace_id_for_path(canonical_root), canonical_root))
+    return candidates
+
+
+class WarmSparePool(Generic[HandleT]):
+    """Warm-spare bookkeeping shared by the workspace handle supervisors.
+
+    Handles carry ``warm`` (pre-spawned and not yet handed out) and
+    ``warmed_at`` (when a spare became ready; its idle clock, kept apart from
+    the ``last_used_at`` LRU rank so spares are evicted before used handles).
+    Subclasses call ``_init_warm_pool`` and provide ``_handles``, ``_logger``,
+    ``_max_handles``, ``_pool_lock``, ``_new_handle_locked`` and
+    ``_ensure_started``.
+    """
+
+    _event_prefix: str
+    _handles: dict[str, HandleT]
+    _logger: logging.Logger
+    _max_handles: int | None
+
+    def _init_warm_pool(
+        self,
+        *,
+        warm_spares: int,
+        warm_workspaces: WarmWorkspaceProvider | None,
+        max_handles: int | None,
+    ) -> None:
+        self._warm_spares = max(0, warm_spares)
+        self._warm_workspaces = warm_workspaces
+        self._recent_workspaces = RecentWorkspaces(
+            max(RECENT_WORKSPACE_LIMIT, max_handles or 0)
+        )
+        self._spawn_latency = SpawnLatencyStats()
+        self._prewarm_lock: asyncio.Lock | None = None
+        self._prewarm_task: asyncio.Task[None] | None = None
+
+    def _pool_lock(self) -> asyncio.Lock:
+        raise NotImplementedError
+
+    def _new_handle_locked(
+        self, workspace_id: str, workspace_root: Path, *, spare: bool
+    ) -> HandleT:
+        raise NotImplementedError
+
+    async def _ensure_started(self, handle: HandleT, *, warm: bool = False) -> None:
+        raise NotImplementedError
+
+    @property
+    def warm_spares(self) -> int:
+        return self._warm_spares
+
+    async def prewarm(self, workspace_roots: Iterable[Path] | None = None) -> int:
+        """Spawn handles ahead of their first turn; returns how many started.
+
+        Without explicit roots this tops the pool up to ``warm_spares`` unused
+        handles, taking predicted workspaces first and then recently active
+        ones. Spares only take free slots; they never evict a live handle.
+        """
+        async with self._get_prewarm_lock():
+            return await self._prewarm_locked(workspace_roots)
+
+    async def _prewarm_locked(self, workspace_roots: Iterable[Path] | None) -> int:
+        if workspace_roots is not None:
+            candidates = workspace_candidates(workspace_roots)
+            limit = len(candidates)
+        else:
+            limit = self._warm_spares - self._spare_count()
+            if limit <= 0:
+                return 0
+            # Providers may hit SQLite; keep that off the event loop.
+            predicted = await asyncio.to_thread(self._predicted_workspaces)
+            candidates = (
+                workspace_candidates(predicted) + self._recent_workspaces.most_recent()
+            )
+        if limit <= 0:
+            return 0
+        async with self._pool_lock():
+            targets = select_warm_workspaces(
+                candidates,
+                self._handles.keys(),
+                limit=limit,
+                max_handles=self._max_handles,
+                excluded_ids=(
+                    ()
+                    if workspace_roots is not None
+                    else self._recent_workspaces.recently_pruned()
+                ),
+            )
+        warmed = 0
+        for workspace_id, workspace_root in targets:
+            try:
+                handle = await self._add_spare(workspace_id, workspace_root)
+                if handle is None:
+                    continue
+                await self._ensure_started(handle, warm=True)
+                if handle.warm:
+                    handle.warmed_at = time.monotonic()
+            except Exception as exc:
+                log_event(
+                    self._logger,
+                    logging.WARNING,
+                    f"{self._event_prefix}.handle.prewarm_failed",
+                    workspace_id=workspace_id,
+                    workspace_root=str(workspace_root),
+                    exc=exc,
+                )
+                continue
+            warmed += 1
+            log_event(
+                self._logger,
+                logging.INFO,
+                f"{self._event_prefix}.handle.prewarmed",
+                workspace_id=workspace_id,
+                workspace_root=str(workspace_root),
+            )
+        return warmed
+
+    async def _add_spare(
+        self, workspace_id: str, workspace_root: Path
+    ) -> HandleT | None:
+        """Register a spare handle, or ``None`` if the slot is gone."""
+        async with self._pool_lock():
+            if workspace_id in self._handles:
+                return None
+            if self._max_handles and len(self._handles) >= self._max_handles:
+                return None
+            handle = self._new_handle_locked(workspace_id, workspace_root, spare=True)
+            self._handles[workspace_id] = handle
+        return handle
+
+    def spawn_stats(self) -> dict[str, Any]:
+        return {
+            "handles": len(self._handles),
+            "warm_spares": self._spare_count(),
+            "spawn_to_ready": self._spawn_latency.to_dict(),
+        }
+
+    def _spare_count(self) -> int:
+        return sum(1 for handle in self._handles.values() if handle.warm)
+
+    def _schedule_prewarm(self) -> None:
+        """Refill warm spares in the background once handles were closed."""
+        if self._warm_spares <= 0:
+            return
+        task = self._prewarm_task
+        if task is not None and not task.done():
+            return
+        self._prewarm_task = asyncio.create_task(self._prewarm_quietly())
+
+    async def _prewarm_quietly(self) -> None:
+        try:
+            await self.prewarm()
+        except Exception as exc:
+            self._logger.debug("Background prewarm failed: %s", exc)
+
+    async def _cancel_prewarm(self) -> None:
+        task = self._prewarm_task
+        self._prewarm_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _get_prewarm_lock(self) -> asyncio.Lock:
+        if self._prewarm_lock is None:
+            self._prewarm_lock = asyncio.Lock()
+        return self._prewarm_lock
+
+    def _predicted_workspaces(self) -> list[Path]:
+        if self._warm_workspaces is None:
+            return []
+        try:
+            return list(self._warm_workspaces())
+        except Exception as exc:
+            self._logger.debug("Failed to predict warm workspaces: %s", exc)
+            return []
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import atexit
 import dataclasses
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from ..config import TemplateRepoConfig
-from ..git_utils import GitError, run_git
+from ..git_utils import GitError, GitObjectReader, run_git
 from ..state_roots import resolve_hub_templates_root
+from ..utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# A mirror fetched this recently is not fetched again; a ref or path that is
+# missing from it still forces a fetch.
+TEMPLATE_FETCH_TTL_SECONDS = 60.0
+BLOB_CACHE_DIRNAME = "blobs"
+_BLOB_CACHE_MAX_ENTRIES = 256
+_FULL_SHA_RE = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
 
 
 class RepoNotConfiguredError(Exception):
@@ -100,16 +118,59 @@ def parse_template_ref(raw: str) -> TemplateRef:
     return TemplateRef(repo_id=repo_id, path=path, ref=ref)
 
 
+class _MirrorState:
+    def __init__(self) -> None:
+        # Serializes fetches so concurrent callers share one fetch.
+        self.lock = threading.Lock()
+        self.remote_url: Optional[str] = None
+        self.fetched_at: Optional[float] = None
+        self.reader: Optional[GitObjectReader] = None
+
+
+_MIRRORS: dict[Path, _MirrorState] = {}
+_MIRRORS_LOCK = threading.Lock()
+_BLOB_CACHE: OrderedDict[str, str] = OrderedDict()
+_BLOB_CACHE_LOCK = threading.Lock()
+
+
+def _mirror_state(mirror_path: Path) -> _MirrorState:
+    with _MIRRORS_LOCK:
+        state = _MIRRORS.get(mirror_path)
+        if state is None:
+            state = _MirrorState()
+            _MIRRORS[mirror_path] = state
+        return state
+
+
+def close_mirror_readers() -> None:
+    """Stop the ``git cat-file`` processes kept for template mirrors."""
+    with _MIRRORS_LOCK:
+        states = list(_MIRRORS.values())
+    for state in states:
+        with state.lock:
+            reader, state.reader = state.reader, None
+        if reader is not None:
+            reader.close()
+
+
+atexit.register(close_mirror_readers)
+
+
 def ensure_git_mirror(repo: TemplateRepoConfig, hub_root: Path) -> Path:
     templates_root = resolve_hub_templates_root(hub_root)
     mirror_path = templates_root / "git" / f"{repo.id}.git"
+    state = _mirror_state(mirror_path)
     if mirror_path.exists():
-        _ensure_origin_remote(mirror_path, repo.url)
+        if state.remote_url != repo.url:
+            _ensure_origin_remote(mirror_path, repo.url)
+            state.remote_url = repo.url
         return mirror_path
 
     mirror_path.parent.mkdir(parents=True, exist_ok=True)
     run_git(["init", "--bare", str(mirror_path)], mirror_path.parent, check=True)
     _ensure_origin_remote(mirror_path, repo.url)
+    state.remote_url = repo.url
+    state.fetched_at = None
     return mirror_path
 
 
@@ -142,7 +203,15 @@ def fetch_template(
     hub_root: Path,
     template_ref: str,
     fetch_timeout_seconds: int = 30,
+    fetch_ttl_seconds: float = TEMPLATE_FETCH_TTL_SECONDS,
 ) -> FetchedTemplate:
+    """Fetch a template blob from the repo's local mirror.
+
+    The mirror is fetched at most once per ``fetch_ttl_seconds`` (never for a
+    commit sha it already has), lookups go through a persistent ``git
+    cat-file`` reader and blob contents are cached by sha in memory and under
+    the hub templates root.
+    """
     parsed = parse_template_ref(template_ref)
     if parsed.repo_id != repo.id:
         raise RepoNotConfiguredError(
@@ -152,32 +221,40 @@ def fetch_template(
 
     ref = parsed.ref or repo.default_ref
     mirror_path = ensure_git_mirror(repo, hub_root)
+    state = _mirror_state(mirror_path)
 
     fetch_error: Optional[str] = None
-    try:
-        run_git(
-            ["fetch", "--prune", "origin"],
-            mirror_path,
-            timeout_seconds=fetch_timeout_seconds,
-            check=True,
+    fetched = False
+    if not (_FULL_SHA_RE.match(ref) and _has_commit(state, mirror_path, ref)):
+        fetched, fetch_error = _fetch_mirror(
+            state, mirror_path, fetch_timeout_seconds, fetch_ttl_seconds
         )
-    except GitError as exc:
-        fetch_error = str(exc)
-
-    try:
-        commit_sha = _resolve_commit(mirror_path, repo.id, ref)
-        blob_sha = _resolve_blob(mirror_path, commit_sha, parsed.path, repo.id, ref)
-        content = _read_blob(mirror_path, blob_sha)
-    except (RefNotFoundError, TemplateNotFoundError) as exc:
-        if fetch_error:
-            raise NetworkUnavailableError(
-                repo.id,
-                ref,
-                parsed.path,
-                detail=fetch_error,
-            ) from exc
-        raise
 
+    while True:
+        try:
+            commit_sha = _resolve_commit(mirror_path, repo.id, ref, state=state)
+            blob_sha = _resolve_blob(
+                mirror_path, commit_sha, parsed.path, repo.id, ref, state=state
+            )
+            break
+        except (RefNotFoundError, TemplateNotFoundError) as exc:
+            if not fetched and fetch_error is None:
+                # The debounced mirror may predate the ref or path.
+                fetched, fetch_error = _fetch_mirror(
+                    state, mirror_path, fetch_timeout_seconds, 0.0
+                )
+                if fetched:
+                    continue
+            if fetch_error:
+                raise NetworkUnavailableError(
+                    repo.id,
+                    ref,
+                    parsed.path,
+                    detail=fetch_error,
+                ) from exc
+            raise
+
+    content = _read_blob(mirror_path, blob_sha, state=state, hub_root=hub_root)
     return FetchedTemplate(
         repo_id=repo.id,
         url=repo.url,
@@ -190,7 +267,83 @@ def fetch_template(
     )
 
 
-def _resolve_commit(mirror_path: Path, repo_id: str, ref: str) -> str:
+def _fetch_mirror(
+    state: _MirrorState,
+    mirror_path: Path,
+    timeout_seconds: int,
+    ttl_seconds: float,
+) -> tuple[bool, Optional[str]]:
+    """Fetch unless fetched within ``ttl_seconds``; return (fetched, error)."""
+    with state.lock:
+        if (
+            state.fetched_at is not None
+            and time.monotonic() - state.fetched_at < ttl_seconds
+        ):
+            return False, None
+        try:
+            run_git(
+                ["fetch", "--prune", "origin"],
+                mirror_path,
+                timeout_seconds=timeout_seconds,
+                check=True,
+            )
+        except GitError as exc:
+            return False, str(exc)
+        state.fetched_at = time.monotonic()
+        # Refs changed under the reader; start fresh processes on next use.
+        reader, state.reader = state.reader, None
+    if reader is not None:
+        reader.close()
+    return True, None
+
+
+def _with_reader(
+    state: Optional[_MirrorState],
+    mirror_path: Path,
+    lookup: Callable[[GitObjectReader], _T],
+) -> _T:
+    """Run ``lookup`` on the mirror's reader; raise ``LookupError`` if unusable."""
+    if state is None:
+        raise LookupError("no mirror reader")
+    for attempt in range(2):
+        with state.lock:
+            if state.reader is None:
+                state.reader = GitObjectReader(mirror_path)
+            reader = state.reader
+        try:
+            return lookup(reader)
+        except (GitError, OSError, ValueError) as exc:
+            # A concurrent fetch closed this reader; take the fresh one.
+            if reader.closed and not attempt:
+                continue
+            logger.debug("git cat-file lookup failed in %s: %s", mirror_path, exc)
+            raise LookupError(str(exc)) from exc
+    raise LookupError("no mirror reader")
+
+
+def _has_commit(state: _MirrorState, mirror_path: Path, sha: str) -> bool:
+    try:
+        info = _with_reader(state, mirror_path, lambda r: r.info(f"{sha}^{{commit}}"))
+    except LookupError:
+        return False
+    return info is not None
+
+
+def _resolve_commit(
+    mirror_path: Path,
+    repo_id: str,
+    ref: str,
+    *,
+    state: Optional[_MirrorState] = None,
+) -> str:
+    try:
+        info = _with_reader(state, mirror_path, lambda r: r.info(f"{ref}^{{commit}}"))
+    except LookupError:
+        pass
+    else:
+        if info is None:
+            raise RefNotFoundError(repo_id, ref)
+        return info[0]
     try:
         proc = run_git(
             ["rev-parse", f"{ref}^{{commit}}"],
@@ -208,7 +361,20 @@ def _resolve_blob(
     path: str,
     repo_id: str,
     ref: str,
+    *,
+    state: Optional[_MirrorState] = None,
 ) -> str:
+    tree_path = path[2:] if path.startswith("./") else path
+    try:
+        info = _with_reader(
+            state, mirror_path, lambda r: r.info(f"{commit_sha}:{tree_path}")
+        )
+    except LookupError:
+        pass
+    else:
+        if info is None or info[1] != "blob":
+            raise TemplateNotFoundError(repo_id, path, ref)
+        return info[0]
     try:
         proc = run_git(
             ["ls-tree", commit_sha, "--", path],
@@ -229,6 +395,61 @@ def _resolve_blob(
     return parts[2]
 
 
-def _read_blob(mirror_path: Path, blob_sha: str) -> str:
+def _blob_cache_path(hub_root: Path, blob_sha: str) -> Path:
+    return (
+        resolve_hub_templates_root(hub_root)
+        / BLOB_CACHE_DIRNAME
+        / blob_sha[:2]
+        / blob_sha[2:]
+    )
+
+
+def _read_blob(
+    mirror_path: Path,
+    blob_sha: str,
+    *,
+    state: Optional[_MirrorState] = None,
+    hub_root: Optional[Path] = None,
+) -> str:
+    with _BLOB_CACHE_LOCK:
+        cached = _BLOB_CACHE.get(blob_sha)
+        if cached is not None:
+            _BLOB_CACHE.move_to_end(blob_sha)
+            return cached
+    cache_path = (
+        _blob_cache_path(hub_root, blob_sha)
+        if hub_root is not None and _FULL_SHA_RE.match(blob_sha)
+        else None
+    )
+    content: Optional[str] = None
+    if cache_path is not None:
+        try:
+            content = cache_path.read_text(encoding="utf-8")
+        except OSError:
+            content = None
+    if content is None:
+        content = _read_blob_from_git(mirror_path, blob_sha, state)
+        if cache_path is not None:
+            try:
+                atomic_write(cache_path, content)
+            except OSError as exc:
+                logger.debug("Failed to cache template blob %s: %s", blob_sha, exc)
+    with _BLOB_CACHE_LOCK:
+        _BLOB_CACHE[blob_sha] = content
+        while len(_BLOB_CACHE) > _BLOB_CACHE_MAX_ENTRIES:
+            _BLOB_CACHE.popitem(last=False)
+    return content
+
+
+def _read_blob_from_git(
+    mirror_path: Path, blob_sha: str, state: Optional[_MirrorState]
+) -> str:
+    try:
+        obj = _with_reader(state, mirror_path, lambda r: r.read(blob_sha))
+    except LookupError:
+        pass
+    else:
+        if obj is not None:
+            return obj[2].decode("utf-8", errors="replace")
     proc = run_git(["cat-file", "-p", blob_sha], mirror_path, check=True)
     return proc.stdout or ""
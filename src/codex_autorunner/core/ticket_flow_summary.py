@@ -4,9 +4,7 @@ import re
 from pathlib import Path
 from typing import Any, Optional
 
-from ..tickets.files import list_ticket_paths
-from ..tickets.frontmatter import parse_markdown_frontmatter
-from ..tickets.lint import parse_ticket_index
+from ..tickets.index import ticket_index_for
 from .config import load_repo_config
 from .flows import FlowStore
 from .flows.failure_diagnostics import format_failure_summary, get_failure_payload
@@ -15,16 +13,12 @@ from .flows.models import FlowRunRecord
 _PR_URL_RE = re.compile(r"https://github\.com/[^/\s]+/[^/\s]+/pull/\d+", re.IGNORECASE)
 
 
-def _extract_pr_url_from_ticket(path: Path) -> Optional[str]:
-    try:
-        raw = path.read_text(encoding="utf-8")
-    except OSError:
-        return None
-    data, body = parse_markdown_frontmatter(raw)
-    if isinstance(data, dict):
-        frontmatter_pr = data.get("pr_url")
-        if isinstance(frontmatter_pr, str) and frontmatter_pr.strip():
-            return frontmatter_pr.strip()
+def _extract_pr_url_from_ticket(
+    data: dict[str, Any], body: Optional[str]
+) -> Optional[str]:
+    frontmatter_pr = data.get("pr_url")
+    if isinstance(frontmatter_pr, str) and frontmatter_pr.strip():
+        return frontmatter_pr.strip()
     match = _PR_URL_RE.search(body or "")
     if match:
         return match.group(0)
@@ -54,24 +48,18 @@ def build_ticket_flow_summary(
         return None
 
     ticket_dir = repo_path / ".codex-autorunner" / "tickets"
-    ticket_paths = list_ticket_paths(ticket_dir)
-    if not ticket_paths:
+    ticket_index = ticket_index_for(ticket_dir)
+    if not ticket_index.total_count:
         return None
 
-    total_count = len(ticket_paths)
+    total_count = ticket_index.total_count
     done_count = 0
     open_pr_ticket_url: Optional[str] = None
     final_review_status: Optional[str] = None
-    for path in ticket_paths:
-        idx = parse_ticket_index(path.name)
-        if idx is None:
-            continue
-        try:
-            raw = path.read_text(encoding="utf-8")
-        except OSError:
-            continue
-        data, _body = parse_markdown_frontmatter(raw)
-        if not isinstance(data, dict):
+    for entry in ticket_index.entries():
+        data = entry.data
+        if entry.body is None:
+            # Unreadable file.
             continue
         done = data.get("done")
         done_flag = bool(done) if isinstance(done, bool) else False
@@ -88,7 +76,7 @@ def build_ticket_flow_summary(
             ticket_kind == "open_pr" or "open pr" in title or "pull request" in title
         )
         if is_open_pr:
-            open_pr_ticket_url = _extract_pr_url_from_ticket(path)
+            open_pr_ticket_url = _extract_pr_url_from_ticket(data, entry.body)
 
     pr_url = open_pr_ticket_url
 
@@ -1,15 +1,36 @@
+import atexit
 import copy
 import dataclasses
 import json
 import logging
+import multiprocessing
 import os
+import sqlite3
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .usage_rollups import UsageRollupStore, usage_rollup_db_path
 
 logger = logging.getLogger("codex_autorunner.core.usage")
 
+_ParsedT = TypeVar("_ParsedT")
+
 
 class UsageError(Exception):
     pass
@@ -309,101 +330,509 @@ def _iter_session_files(codex_home: Path) -> Iterable[Path]:
     return sorted(sessions_dir.glob("**/*.jsonl"))
 
 
-def iter_token_events(
-    codex_home: Optional[Path] = None,
-    *,
-    since: Optional[datetime] = None,
-    until: Optional[datetime] = None,
-) -> Iterable[TokenEvent]:
+# Bytes before the checkpoint offset that must still match before appended
+# bytes are trusted (guards against truncate-and-rewrite with the same inode).
+_CHECKPOINT_TAIL_BYTES = 64
+
+# Upper bound for the automatic parse worker count, and the number of files
+# that must need parsing before handing them to the process pool.
+DEFAULT_MAX_PARSE_WORKERS = 8
+PARALLEL_PARSE_MIN_FILES = 16
+# Parsed OpenCode session files kept by (size, mtime, inode) signature.
+_OPENCODE_CACHE_MAX_FILES = 4096
+# Files modified this recently may change again within the same mtime tick.
+_OPENCODE_RACY_WINDOW_NS = 1_000_000_000
+
+
+@dataclasses.dataclass
+class _SessionCheckpoint:
+    inode: int
+    size: int
+    mtime_ns: int
+    offset: int
+    tail: bytes
+    cwd: Optional[Path]
+    model: Optional[str]
+    last_totals: Optional[TokenTotals]
+    # Events are folded into per-cwd rollups as they are parsed; only their
+    # count and time span are kept to tell whether a query window covers them.
+    event_count: int
+    first_at: Optional[datetime]
+    last_at: Optional[datetime]
+    rollup: Dict[Optional[Path], "_SummaryAccumulator"]
+
+
+def _parse_codex_session_line(
+    session_path: Path, line: bytes, checkpoint: _SessionCheckpoint
+) -> Optional[TokenEvent]:
+    """Apply one session log line to ``checkpoint``; return its token event."""
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        logger.debug("Failed to parse JSON line in %s: %s", session_path, exc)
+        return None
+    if not isinstance(record, dict):
+        return None
+
+    rec_type = record.get("type")
+    payload = record.get("payload", {}) or {}
+    if rec_type == "session_meta":
+        cwd_val = payload.get("cwd")
+        checkpoint.cwd = Path(cwd_val).resolve() if cwd_val else None
+        checkpoint.model = payload.get("model") or payload.get("model_provider")
+        return None
+
+    if rec_type != "event_msg" or payload.get("type") != "token_count":
+        return None
+
+    info = payload.get("info") or {}
+    total_usage = info.get("total_token_usage")
+    last_usage = info.get("last_token_usage")
+    if not total_usage and not last_usage:
+        # No usable token data; still track rate limits but skip usage.
+        rate_limits = payload.get("rate_limits")
+        ts = record.get("timestamp")
+        if not ts or not rate_limits:
+            return None
+        return TokenEvent(
+            timestamp=_parse_timestamp(ts),
+            session_path=session_path,
+            cwd=checkpoint.cwd,
+            model=checkpoint.model,
+            totals=checkpoint.last_totals or TokenTotals(),
+            delta=TokenTotals(),
+            rate_limits=rate_limits,
+            agent=CODEX_AGENT_ID,
+        )
+
+    totals = _coerce_totals(total_usage or last_usage)
+    delta = (
+        _coerce_totals(last_usage)
+        if last_usage
+        else totals.diff(checkpoint.last_totals or TokenTotals())
+    )
+    checkpoint.last_totals = totals
+
+    timestamp_raw = record.get("timestamp")
+    if not timestamp_raw:
+        return None
+    return TokenEvent(
+        timestamp=_parse_timestamp(timestamp_raw),
+        session_path=session_path,
+        cwd=checkpoint.cwd,
+        model=checkpoint.model,
+        totals=totals,
+        delta=delta,
+        rate_limits=payload.get("rate_limits"),
+        agent=CODEX_AGENT_ID,
+    )
+
+
+def _may_carry_usage(line: bytes) -> bool:
+    # Cheap substring check so the bulk of session lines (messages, tool
+    # calls, reasoning) never reach the JSON decoder.
+    return b"token_count" in line or b"session_meta" in line
+
+
+def _empty_session_checkpoint(inode: int) -> _SessionCheckpoint:
+    return _SessionCheckpoint(
+        inode=inode,
+        size=0,
+        mtime_ns=0,
+        offset=0,
+        tail=b"",
+        cwd=None,
+        model=None,
+        last_totals=None,
+        event_count=0,
+        first_at=None,
+        last_at=None,
+        rollup={},
+    )
+
+
+def _session_line_event(
+    session_path: Path, line: bytes, checkpoint: _SessionCheckpoint
+) -> Optional[TokenEvent]:
+    if not _may_carry_usage(line):
+        return None
+    try:
+        return _parse_codex_session_line(session_path, line, checkpoint)
+    except (UsageError, KeyError, TypeError, ValueError) as exc:
+        logger.debug("Failed to process line in %s: %s", session_path, exc)
+        return None
+
+
+def _fold_session_event(
+    rollup: Dict[Optional[Path], "_SummaryAccumulator"],
+    session_path: Path,
+    index: int,
+    event: TokenEvent,
+) -> None:
+    acc = rollup.get(event.cwd)
+    if acc is None:
+        acc = rollup[event.cwd] = _SummaryAccumulator()
+    acc.add_event(event, {"file": str(session_path), "index": index})
+
+
+def _read_session_appended(
+    checkpoint: _SessionCheckpoint, session_path: Path
+) -> _SessionCheckpoint:
+    """Parse the complete lines appended to ``session_path`` since ``checkpoint``."""
+    try:
+        with session_path.open("rb") as handle:
+            if checkpoint.offset:
+                handle.seek(checkpoint.offset - len(checkpoint.tail))
+                if handle.read(len(checkpoint.tail)) != checkpoint.tail:
+                    logger.debug("Session file %s was rewritten", session_path)
+                    return _read_session_appended(
+                        _empty_session_checkpoint(checkpoint.inode), session_path
+                    )
+            data = handle.read()
+    except OSError as exc:
+        logger.debug("Failed to read session file %s: %s", session_path, exc)
+        return checkpoint
+    # Only consume complete lines; a partially flushed record is picked up
+    # on the next refresh.
+    end = data.rfind(b"\n") + 1
+    if end <= 0:
+        return checkpoint
+    for line in data[:end].splitlines():
+        event = _session_line_event(session_path, line, checkpoint)
+        if event is None:
+            continue
+        _fold_session_event(
+            checkpoint.rollup, session_path, checkpoint.event_count, event
+        )
+        checkpoint.event_count += 1
+        if checkpoint.first_at is None or event.timestamp < checkpoint.first_at:
+            checkpoint.first_at = event.timestamp
+        if checkpoint.last_at is None or event.timestamp > checkpoint.last_at:
+            checkpoint.last_at = event.timestamp
+    consumed = data[:end]
+    checkpoint.offset += end
+    checkpoint.tail = (checkpoint.tail + consumed)[-_CHECKPOINT_TAIL_BYTES:]
+    return checkpoint
+
+
+def _iter_session_events(session_path: Path, end: int) -> Iterator[TokenEvent]:
+    """Re-read the first ``end`` bytes of a session log, yielding each event."""
+    checkpoint = _empty_session_checkpoint(0)
+    consumed = 0
+    try:
+        with session_path.open("rb") as handle:
+            for line in handle:
+                consumed += len(line)
+                if consumed > end:
+                    return
+                event = _session_line_event(session_path, line, checkpoint)
+                if event is not None:
+                    yield event
+    except OSError as exc:
+        logger.debug("Failed to read session file %s: %s", session_path, exc)
+
+
+def _parse_session_files(
+    parse: Callable[[Any, Path], _ParsedT],
+    jobs: List[Tuple[Any, Path]],
+    max_workers: Optional[int],
+) -> List[_ParsedT]:
+    """Apply ``parse`` to each ``(state, path)`` job, preserving job order.
+
+    Jobs are sharded per file across the shared parse pool once there are
+    enough of them; otherwise they run in-process.
     """
-    Yield token usage events from Codex CLI session JSONL logs.
-    Events are ordered by file path; per-file ordering matches log order.
+    workers = min(resolve_usage_parse_workers(max_workers), len(jobs))
+    if workers > 1 and len(jobs) >= PARALLEL_PARSE_MIN_FILES:
+        try:
+            pool = _parse_pool(resolve_usage_parse_workers(max_workers))
+            return list(
+                pool.map(
+                    parse,
+                    [state for state, _ in jobs],
+                    [path for _, path in jobs],
+                    chunksize=max(1, len(jobs) // (workers * 4)),
+                )
+            )
+        except (OSError, RuntimeError) as exc:
+            # BrokenProcessPool is a RuntimeError; start a fresh pool next time.
+            logger.warning("Parallel session parsing unavailable: %s", exc)
+            shutdown_usage_parse_pool()
+    return [parse(state, path) for state, path in jobs]
+
+
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+_PARSE_POOL_WORKERS = 0
+_PARSE_POOL_LOCK = threading.Lock()
+
+
+def _parse_pool(workers: int) -> ProcessPoolExecutor:
+    """The process-wide parse pool, started on first use and kept warm."""
+    global _PARSE_POOL, _PARSE_POOL_WORKERS
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is not None and _PARSE_POOL_WORKERS == workers:
+            return _PARSE_POOL
+        previous = _PARSE_POOL
+        if previous is None:
+            atexit.register(shutdown_usage_parse_pool)
+        # Spawned workers do not inherit the caller's threads or locks, which
+        # matters inside the web server.
+        _PARSE_POOL = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _PARSE_POOL_WORKERS = workers
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _PARSE_POOL
+
+
+def shutdown_usage_parse_pool() -> None:
+    """Stop the shared parse pool's workers (a later parse starts a new one)."""
+    global _PARSE_POOL, _PARSE_POOL_WORKERS
+    with _PARSE_POOL_LOCK:
+        pool, _PARSE_POOL = _PARSE_POOL, None
+        _PARSE_POOL_WORKERS = 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def resolve_usage_parse_workers(value: Optional[int] = None) -> int:
+    """Return the worker count for session parsing (``0``/``None`` = automatic)."""
+    if value is not None and value > 0:
+        return int(value)
+    return max(1, min(DEFAULT_MAX_PARSE_WORKERS, os.cpu_count() or 1))
+
+
+class CodexSessionScanner:
+    """Incrementally parses Codex session logs.
+
+    Session logs are append-only, so each file keeps a byte-offset checkpoint
+    (validated by inode, size, mtime and the bytes just before the offset)
+    together with the parser state (``cwd``, ``model``, ``last_totals``) and
+    per-cwd rollups of the events parsed so far. A refresh only decodes newly
+    appended bytes; files that were replaced or truncated are re-parsed from
+    the start. Events themselves are not kept: a query window that splits a
+    file's events re-reads that file and folds them as they stream past.
     """
-    codex_home = (codex_home or _default_codex_home()).expanduser()
-    for session_path in _iter_session_files(codex_home):
-        session_cwd: Optional[Path] = None
-        session_model: Optional[str] = None
-        last_totals: Optional[TokenTotals] = None
 
+    def __init__(self, codex_home: Path):
+        self.codex_home = codex_home
+        self._lock = threading.Lock()
+        self._checkpoints: Dict[str, _SessionCheckpoint] = {}
+
+    def refresh(self, *, max_workers: Optional[int] = None) -> List[Path]:
+        """Bring checkpoints up to date and return the session files in order.
+
+        When many files need parsing (typically the first load of a large
+        ``CODEX_HOME``) they are sharded across a process pool; small
+        incremental refreshes stay in-process.
+        """
+        with self._lock:
+            session_files = list(_iter_session_files(self.codex_home))
+            seen = set()
+            jobs: List[Tuple[_SessionCheckpoint, Path]] = []
+            stats: List[os.stat_result] = []
+            for session_path in session_files:
+                path_key = str(session_path)
+                seen.add(path_key)
+                pending = self._pending_checkpoint(session_path, path_key)
+                if pending is not None:
+                    jobs.append((pending[0], session_path))
+                    stats.append(pending[1])
+            for path_key in list(self._checkpoints):
+                if path_key not in seen:
+                    self._checkpoints.pop(path_key, None)
+            parsed = _parse_session_files(_read_session_appended, jobs, max_workers)
+            for (_, session_path), checkpoint, stat in zip(jobs, parsed, stats):
+                checkpoint.inode = stat.st_ino
+                checkpoint.size = stat.st_size
+                checkpoint.mtime_ns = stat.st_mtime_ns
+                self._checkpoints[str(session_path)] = checkpoint
+            return session_files
+
+    def summarize(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[Optional[Path], "_SummaryAccumulator"]:
+        """Roll up the events within ``[since, until]`` per session cwd."""
+        rollup: Dict[Optional[Path], _SummaryAccumulator] = {}
+        split: List[Tuple[Path, int]] = []
+        selected = self._checkpoints_in_window(since, until, max_workers)
+        with self._lock:
+            # Refreshes update rollups in place, so merge while holding the lock.
+            for session_path, checkpoint in selected:
+                if _window_covers(checkpoint, since, until):
+                    for cwd, acc in checkpoint.rollup.items():
+                        rollup.setdefault(cwd, _SummaryAccumulator()).merge(acc)
+                else:
+                    split.append((session_path, checkpoint.offset))
+        for session_path, end in split:
+            for index, event in enumerate(_iter_session_events(session_path, end)):
+                if _in_window(event, since, until):
+                    _fold_session_event(rollup, session_path, index, event)
+        return rollup
+
+    def iter_events(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterable[TokenEvent]:
+        """Stream the events within ``[since, until]`` from the session logs."""
+        for session_path, checkpoint in self._checkpoints_in_window(
+            since, until, max_workers
+        ):
+            for event in _iter_session_events(session_path, checkpoint.offset):
+                if _in_window(event, since, until):
+                    yield event
+
+    def _checkpoints_in_window(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        max_workers: Optional[int],
+    ) -> List[Tuple[Path, _SessionCheckpoint]]:
+        """Refresh, then return the files whose events may fall in the window."""
+        session_files = self.refresh(max_workers=max_workers)
+        with self._lock:
+            selected = []
+            for session_path in session_files:
+                checkpoint = self._checkpoints.get(str(session_path))
+                if checkpoint is None or checkpoint.last_at is None:
+                    continue
+                if since and checkpoint.last_at < since:
+                    continue
+                if until and checkpoint.first_at and checkpoint.first_at > until:
+                    continue
+                selected.append((session_path, checkpoint))
+            return selected
+
+    def _pending_checkpoint(
+        self, session_path: Path, path_key: str
+    ) -> Optional[Tuple[_SessionCheckpoint, os.stat_result]]:
+        """Return the checkpoint to resume parsing from, or None if current."""
         try:
-            with open(session_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        record = json.loads(line)
-                    except json.JSONDecodeError as exc:
-                        logger.debug(
-                            "Failed to parse JSON line in %s: %s", session_path, exc
-                        )
-                        continue
+            stat = session_path.stat()
+        except OSError as exc:
+            logger.debug("Failed to stat session file %s: %s", session_path, exc)
+            self._checkpoints.pop(path_key, None)
+            return None
+        checkpoint = self._checkpoints.get(path_key)
+        if checkpoint is not None:
+            if (
+                checkpoint.inode == stat.st_ino
+                and checkpoint.size == stat.st_size
+                and checkpoint.mtime_ns == stat.st_mtime_ns
+            ):
+                return None
+            if checkpoint.inode != stat.st_ino or stat.st_size < checkpoint.offset:
+                checkpoint = None
+        if checkpoint is None:
+            checkpoint = _empty_session_checkpoint(stat.st_ino)
+        return checkpoint, stat
 
-                    rec_type = record.get("type")
-                    payload = record.get("payload", {}) or {}
-                    if rec_type == "session_meta":
-                        cwd_val = payload.get("cwd")
-                        session_cwd = Path(cwd_val).resolve() if cwd_val else None
-                        session_model = payload.get("model") or payload.get(
-                            "model_provider"
-                        )
-                        continue
 
-                    if rec_type != "event_msg" or payload.get("type") != "token_count":
-                        continue
+def _in_window(
+    event: TokenEvent, since: Optional[datetime], until: Optional[datetime]
+) -> bool:
+    if since and event.timestamp < since:
+        return False
+    return not (until and event.timestamp > until)
 
-                    info = payload.get("info") or {}
-                    total_usage = info.get("total_token_usage")
-                    last_usage = info.get("last_token_usage")
-                    if not total_usage and not last_usage:
-                        # No usable token data; still track rate limits but skip usage.
-                        last_totals = last_totals
-                        rate_limits = payload.get("rate_limits")
-                        ts = record.get("timestamp")
-                        if ts and rate_limits:
-                            timestamp = _parse_timestamp(ts)
-                            if since and timestamp < since:
-                                continue
-                            if until and timestamp > until:
-                                continue
-                            yield TokenEvent(
-                                timestamp=timestamp,
-                                session_path=session_path,
-                                cwd=session_cwd,
-                                model=session_model,
-                                totals=last_totals or TokenTotals(),
-                                delta=TokenTotals(),
-                                rate_limits=rate_limits,
-                                agent=CODEX_AGENT_ID,
-                            )
-                        continue
 
-                    totals = _coerce_totals(total_usage or last_usage)
-                    delta = (
-                        _coerce_totals(last_usage)
-                        if last_usage
-                        else totals.diff(last_totals or TokenTotals())
-                    )
-                    last_totals = totals
+def _window_covers(
+    checkpoint: _SessionCheckpoint,
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> bool:
+    """Whether every event folded into ``checkpoint`` lies in the window."""
+    if since and (checkpoint.first_at is None or checkpoint.first_at < since):
+        return False
+    return not (until and (checkpoint.last_at is None or checkpoint.last_at > until))
 
-                    timestamp_raw = record.get("timestamp")
-                    if not timestamp_raw:
-                        continue
-                    timestamp = _parse_timestamp(timestamp_raw)
-                    if since and timestamp < since:
-                        continue
-                    if until and timestamp > until:
-                        continue
 
-                    yield TokenEvent(
-                        timestamp=timestamp,
-                        session_path=session_path,
-                        cwd=session_cwd,
-                        model=session_model,
-                        totals=totals,
-                        delta=delta,
-                        rate_limits=payload.get("rate_limits"),
-                        agent=CODEX_AGENT_ID,
-                    )
-        except (OSError, json.JSONDecodeError, KeyError, ValueError) as exc:
-            logger.debug("Failed to process session file %s: %s", session_path, exc)
+_CODEX_SESSION_SCANNERS: Dict[str, CodexSessionScanner] = {}
+_CODEX_SESSION_SCANNERS_LOCK = threading.Lock()
+
+
+def get_codex_session_scanner(codex_home: Optional[Path] = None) -> CodexSessionScanner:
+    codex_home = (codex_home or _default_codex_home()).expanduser()
+    key = str(codex_home)
+    with _CODEX_SESSION_SCANNERS_LOCK:
+        scanner = _CODEX_SESSION_SCANNERS.get(key)
+        if scanner is None:
+            scanner = CodexSessionScanner(codex_home)
+            _CODEX_SESSION_SCANNERS[key] = scanner
+        return scanner
+
+
+def _parse_opencode_session_file(
+    repo_root: Path, session_path: Path
+) -> List[TokenEvent]:
+    """Return every token event recorded in one OpenCode session file."""
+    try:
+        with open(session_path, "r", encoding="utf-8") as f:
+            payload = json.loads(f.read())
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.debug("Failed to read session file %s: %s", session_path, exc)
+        return []
+
+    try:
+        mtime = datetime.fromtimestamp(session_path.stat().st_mtime, tz=timezone.utc)
+    except OSError as exc:
+        logger.debug("Failed to get mtime for %s: %s", session_path, exc)
+        mtime = datetime.now(timezone.utc)
+
+    top_model = payload.get("model") if isinstance(payload, dict) else None
+    top_provider = payload.get("provider") if isinstance(payload, dict) else None
+    entries = _extract_opencode_entries(payload) if isinstance(payload, dict) else []
+
+    events: List[TokenEvent] = []
+    totals = TokenTotals()
+    for container, usage in entries:
+        delta = _coerce_opencode_totals(usage)
+        if not any(
+            (
+                delta.input_tokens,
+                delta.cached_input_tokens,
+                delta.output_tokens,
+                delta.reasoning_output_tokens,
+                delta.total_tokens,
+            )
+        ):
+            continue
+        totals.add(delta)
+        events.append(
+            TokenEvent(
+                timestamp=_extract_opencode_timestamp(container, mtime),
+                session_path=session_path,
+                cwd=repo_root,
+                model=_extract_opencode_model(container, top_model, top_provider),
+                totals=copy.deepcopy(totals),
+                delta=delta,
+                rate_limits=None,
+                agent=OPENCODE_AGENT_ID,
+            )
+        )
+    return events
+
+
+_OPENCODE_CACHE: (
+    "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int, int], List[TokenEvent]]]"
+) = OrderedDict()
+_OPENCODE_CACHE_LOCK = threading.Lock()
+
+
+def _opencode_signature(session_path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = session_path.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
 
 
 def iter_opencode_events(
@@ -411,68 +840,57 @@ def iter_opencode_events(
     *,
     since: Optional[datetime] = None,
     until: Optional[datetime] = None,
+    max_workers: Optional[int] = None,
 ) -> Iterable[TokenEvent]:
     """
     Yield token usage events from OpenCode session JSON files in repos.
     Events are ordered by repo root and file path; per-file ordering matches entry order.
+    Unchanged files are served from a cache keyed by their stat signature; the
+    rest are parsed up front, across the parse pool when there are many.
     """
+    files: List[Tuple[Path, Path, Optional[Tuple[int, int, int]]]] = []
     for repo_root in sorted({path.resolve() for path in repo_roots}):
         for session_path in _iter_opencode_session_files(repo_root):
-            try:
-                with open(session_path, "r", encoding="utf-8") as f:
-                    payload = json.loads(f.read())
-            except (OSError, json.JSONDecodeError) as exc:
-                logger.debug("Failed to read session file %s: %s", session_path, exc)
+            files.append((repo_root, session_path, _opencode_signature(session_path)))
+    parsed: Dict[Tuple[str, str], List[TokenEvent]] = {}
+    jobs: List[Tuple[Any, Path]] = []
+    signatures: List[Optional[Tuple[int, int, int]]] = []
+    with _OPENCODE_CACHE_LOCK:
+        for repo_root, session_path, signature in files:
+            key = (str(repo_root), str(session_path))
+            cached = _OPENCODE_CACHE.get(key)
+            if signature is not None and cached is not None and cached[0] == signature:
+                _OPENCODE_CACHE.move_to_end(key)
+                parsed[key] = cached[1]
+            else:
+                jobs.append((repo_root, session_path))
+                signatures.append(signature)
+    results = _parse_session_files(_parse_opencode_session_file, jobs, max_workers)
+    now_ns = time.time_ns()
+    with _OPENCODE_CACHE_LOCK:
+        for (repo_root, session_path), signature, events in zip(
+            jobs, signatures, results
+        ):
+            key = (str(repo_root), str(session_path))
+            parsed[key] = events
+            if (
+                signature is None
+                or now_ns - signature[1] < _OPENCODE_RACY_WINDOW_NS
+                or _opencode_signature(session_path) != signature
+            ):
+                _OPENCODE_CACHE.pop(key, None)
                 continue
-
-            try:
-                mtime = datetime.fromtimestamp(
-                    session_path.stat().st_mtime, tz=timezone.utc
-                )
-            except OSError as exc:
-                logger.debug("Failed to get mtime for %s: %s", session_path, exc)
-                mtime = datetime.now(timezone.utc)
-
-            top_model = payload.get("model") if isinstance(payload, dict) else None
-            top_provider = (
-                payload.get("provider") if isinstance(payload, dict) else None
-            )
-            entries = (
-                _extract_opencode_entries(payload) if isinstance(payload, dict) else []
-            )
-            if not entries:
+            _OPENCODE_CACHE[key] = (signature, events)
+            _OPENCODE_CACHE.move_to_end(key)
+        while len(_OPENCODE_CACHE) > _OPENCODE_CACHE_MAX_FILES:
+            _OPENCODE_CACHE.popitem(last=False)
+    for repo_root, session_path, _ in files:
+        for event in parsed.get((str(repo_root), str(session_path)), []):
+            if since and event.timestamp < since:
                 continue
-
-            totals = TokenTotals()
-            for container, usage in entries:
-                delta = _coerce_opencode_totals(usage)
-                if not any(
-                    (
-                        delta.input_tokens,
-                        delta.cached_input_tokens,
-                        delta.output_tokens,
-                        delta.reasoning_output_tokens,
-                        delta.total_tokens,
-                    )
-                ):
-                    continue
-                totals.add(delta)
-                timestamp = _extract_opencode_timestamp(container, mtime)
-                if since and timestamp < since:
-                    continue
-                if until and timestamp > until:
-                    continue
-                model = _extract_opencode_model(container, top_model, top_provider)
-                yield TokenEvent(
-                    timestamp=timestamp,
-                    session_path=session_path,
-                    cwd=repo_root,
-                    model=model,
-                    totals=copy.deepcopy(totals),
-                    delta=delta,
-                    rate_limits=None,
-                    agent=OPENCODE_AGENT_ID,
-                )
+            if until and event.timestamp > until:
+                continue
+            yield event
 
 
 def summarize_repo_usage(
@@ -483,21 +901,16 @@ def summarize_repo_usage(
     until: Optional[datetime] = None,
 ) -> UsageSummary:
     repo_root = repo_root.resolve()
-    totals = TokenTotals()
-    events = 0
-    latest_rate_limits: Optional[dict] = None
-
-    for event in iter_token_events(codex_home, since=since, until=until):
-        if event.cwd and (event.cwd == repo_root or repo_root in event.cwd.parents):
-            totals.add(event.delta)
-            events += 1
-            if event.rate_limits:
-                latest_rate_limits = event.rate_limits
+    acc = _SummaryAccumulator()
+    rollup = get_codex_session_scanner(codex_home).summarize(since=since, until=until)
+    for cwd, cwd_acc in rollup.items():
+        if cwd and (cwd == repo_root or repo_root in cwd.parents):
+            acc.merge(cwd_acc)
     for event in iter_opencode_events([repo_root], since=since, until=until):
-        totals.add(event.delta)
-        events += 1
+        acc.totals.add(event.delta)
+        acc.events += 1
     return UsageSummary(
-        totals=totals, events=events, latest_rate_limits=latest_rate_limits
+        totals=acc.totals, events=acc.events, latest_rate_limits=acc.latest_rate_limits
     )
 
 
@@ -507,6 +920,7 @@ def summarize_hub_usage(
     *,
     since: Optional[datetime] = None,
     until: Optional[datetime] = None,
+    max_workers: Optional[int] = None,
 ) -> Tuple[Dict[str, UsageSummary], UsageSummary]:
     repo_map = [(repo_id, path.resolve()) for repo_id, path in repo_map]
     per_repo: Dict[str, UsageSummary] = {
@@ -547,28 +961,34 @@ def summarize_hub_usage(
                     return repo_id
         return None
 
-    for event in iter_token_events(codex_home, since=since, until=until):
-        repo_id = _match_repo(event.cwd)
-        if repo_id is None:
-            repo_id = _heuristic_match_base(event.cwd)
-        if repo_id is None:
-            unmatched.totals.add(event.delta)
-            unmatched.events += 1
-            if event.rate_limits:
-                unmatched.latest_rate_limits = event.rate_limits
-            continue
-        summary = per_repo[repo_id]
-        summary.totals.add(event.delta)
-        summary.events += 1
-        if event.rate_limits:
-            summary.latest_rate_limits = event.rate_limits
+    matches: Dict[Optional[Path], Optional[str]] = {}
+
+    def _resolve_repo(cwd: Optional[Path]) -> Optional[str]:
+        if cwd not in matches:
+            matches[cwd] = _match_repo(cwd) or _heuristic_match_base(cwd)
+        return matches[cwd]
+
+    # Rollups keyed by cwd, merged per repo.
+    rollup = get_codex_session_scanner(codex_home).summarize(
+        since=since, until=until, max_workers=max_workers
+    )
+    per_repo_acc: Dict[Optional[str], _SummaryAccumulator] = {}
+    for cwd, cwd_acc in rollup.items():
+        acc = per_repo_acc.setdefault(_resolve_repo(cwd), _SummaryAccumulator())
+        acc.merge(cwd_acc)
+    for repo_id, acc in per_repo_acc.items():
+        summary = per_repo[repo_id] if repo_id is not None else unmatched
+        summary.totals.add(acc.totals)
+        summary.events += acc.events
+        summary.latest_rate_limits = acc.latest_rate_limits
 
     for event in iter_opencode_events(
-        [path for _, path in repo_map], since=since, until=until
+        [path for _, path in repo_map],
+        since=since,
+        until=until,
+        max_workers=max_workers,
     ):
-        repo_id = _match_repo(event.cwd)
-        if repo_id is None:
-            repo_id = _heuristic_match_base(event.cwd)
+        repo_id = _resolve_repo(event.cwd)
         if repo_id is None:
             continue
         summary = per_repo[repo_id]
@@ -597,6 +1017,7 @@ def summarize_opencode_hub_usage(
     *,
     since: Optional[datetime] = None,
     until: Optional[datetime] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, UsageSummary]:
     repo_map = [(repo_id, path.resolve()) for repo_id, path in repo_map]
     per_repo: Dict[str, UsageSummary] = {
@@ -612,7 +1033,10 @@ def summarize_opencode_hub_usage(
         return None
 
     for event in iter_opencode_events(
-        [path for _, path in repo_map], since=since, until=until
+        [path for _, path in repo_map],
+        since=since,
+        until=until,
+        max_workers=max_workers,
     ):
         repo_id = _match_repo(event.cwd)
         if repo_id is None:
@@ -694,22 +1118,18 @@ def _parse_bucket_label(value: str, bucket: str) -> Optional[datetime]:
         return None
 
 
-def _empty_rollup_bucket() -> Dict[str, Any]:
-    return {
-        "total": 0,
-        "models": {},
-        "token_types": {},
-        "model_token": {},
-    }
+# Series labels for the per-type token columns of the rollup store.
+_ROLLUP_TOKEN_FIELDS = [
+    ("input", "input_tokens"),
+    ("cached", "cached_input_tokens"),
+    ("output", "output_tokens"),
+    ("reasoning", "reasoning_output_tokens"),
+]
 
 
-def _empty_summary_entry() -> Dict[str, Any]:
-    return {
-        "events": 0,
-        "totals": TokenTotals().to_dict(),
-        "latest_rate_limits": None,
-        "latest_rate_limits_pos": None,
-    }
+def _add_token_columns(entry: Dict[str, Any], delta: TokenTotals) -> None:
+    for column, value in delta.to_dict().items():
+        entry[column] = int(entry.get(column, 0)) + value
 
 
 def _rate_limits_pos_key(pos: Optional[Dict[str, Any]]) -> Optional[Tuple[str, int]]:
@@ -754,63 +1174,56 @@ class _SummaryAccumulator:
             self.latest_rate_limits = entry.get("latest_rate_limits")
             self.latest_rate_limits_pos = pos
 
+    def add_event(self, event: TokenEvent, pos: Dict[str, Any]) -> None:
+        self.totals.add(event.delta)
+        self.events += 1
+        if event.rate_limits and _is_rate_limits_newer(
+            pos, self.latest_rate_limits_pos
+        ):
+            self.latest_rate_limits = event.rate_limits
+            self.latest_rate_limits_pos = pos
+
+    def merge(self, other: "_SummaryAccumulator") -> None:
+        self.totals.add(other.totals)
+        self.events += other.events
+        pos = other.latest_rate_limits_pos
+        if pos and _is_rate_limits_newer(pos, self.latest_rate_limits_pos):
+            self.latest_rate_limits = other.latest_rate_limits
+            self.latest_rate_limits_pos = pos
+
 
 class UsageSeriesCache:
+    """Codex usage rollups persisted in a per-file SQLite store.
+
+    A background refresh parses only the bytes appended to each session log
+    since its recorded offset and adds the resulting deltas to that file's
+    rows; queries aggregate the rows for the requested cwd subtree and range.
+    """
+
     def __init__(self, codex_home: Path, cache_path: Path):
         self.codex_home = codex_home
         self.cache_path = cache_path
+        self.db_path = usage_rollup_db_path(cache_path)
+        self._store = UsageRollupStore(self.db_path)
         self._lock = threading.Lock()
         self._updating = False
-        self._cache: Optional[Dict[str, Any]] = None
-
-    def _load_cache(self) -> Dict[str, Any]:
-        if self._cache is not None:
-            return self._cache
-        if not self.cache_path.exists():
-            self._cache = {
-                "version": 3,
-                "files": {},
-                "file_rollups": {},
-                "file_summaries": {},
-                "rollups": {"by_cwd": {}},
-                "summary": {"by_cwd": {}},
-            }
-            return self._cache
-        try:
-            payload = cast(
-                Dict[str, Any], json.loads(self.cache_path.read_text(encoding="utf-8"))
-            )
-            if payload.get("version") != 3:
-                raise ValueError("Unsupported cache version")
-            payload.setdefault("files", {})
-            payload.setdefault("file_rollups", {})
-            payload.setdefault("file_summaries", {})
-            payload.setdefault("rollups", {}).setdefault("by_cwd", {})
-            payload.setdefault("summary", {}).setdefault("by_cwd", {})
-            self._cache = payload
-            return payload
-        except (OSError, json.JSONDecodeError, ValueError) as exc:
-            logger.debug("Failed to load usage cache: %s", exc)
-            self._cache = {
-                "version": 3,
-                "files": {},
-                "file_rollups": {},
-                "file_summaries": {},
-                "rollups": {"by_cwd": {}},
-                "summary": {"by_cwd": {}},
-            }
-            return self._cache
-
-    def _save_cache(self, payload: Dict[str, Any]) -> None:
-        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.cache_path.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
-        tmp_path.replace(self.cache_path)
+        self._initialized = False
+
+    def _ensure_store(self) -> UsageRollupStore:
+        if not self._initialized:
+            self._store.initialize()
+            self._initialized = True
+            if self.cache_path != self.db_path and self.cache_path.exists():
+                # Pre-SQLite JSON cache; everything in it is rebuilt from logs.
+                try:
+                    self.cache_path.unlink()
+                except OSError as exc:
+                    logger.debug("Failed to remove legacy usage cache: %s", exc)
+        return self._store
 
-    def _needs_update(self, payload: Dict[str, Any]) -> bool:
-        files = cast(Dict[str, Any], payload.get("files", {}))
+    def _needs_update(self, files: Dict[str, Dict[str, Any]]) -> bool:
         existing_paths = {str(path) for path in _iter_session_files(self.codex_home)}
-        for path_key in list(files.keys()):
+        for path_key in files:
             if path_key not in existing_paths:
                 return True
         for session_path in _iter_session_files(self.codex_home):
@@ -828,24 +1241,22 @@ class UsageSeriesCache:
                 return True
         return False
 
-    def _start_update(self, payload: Dict[str, Any]) -> None:
+    def _start_update(self) -> None:
         if self._updating:
             return
-        cache_snapshot = copy.deepcopy(payload)
         self._updating = True
-        thread = threading.Thread(
-            target=self._update_cache, args=(cache_snapshot,), daemon=True
-        )
+        thread = threading.Thread(target=self._update_cache, daemon=True)
         thread.start()
 
     def request_update(self) -> str:
         with self._lock:
-            payload = self._load_cache()
-            needs_update = self._needs_update(payload)
-            if needs_update:
-                self._start_update(payload)
+            if self._updating:
+                return "loading"
+            files = self._ensure_store().file_states()
+            if self._needs_update(files):
+                self._start_update()
                 return "loading"
-            return "loading" if self._updating else "ready"
+            return "ready"
 
     def get_repo_series(
         self,
@@ -857,16 +1268,13 @@ class UsageSeriesCache:
         segment: str = "none",
     ) -> Tuple[Dict[str, object], str]:
         status = self.request_update()
-        with self._lock:
-            payload = self._load_cache()
-            series = self._build_repo_series(
-                payload,
-                repo_root,
-                since=since,
-                until=until,
-                bucket=bucket,
-                segment=segment,
-            )
+        series = self._build_repo_series(
+            repo_root,
+            since=since,
+            until=until,
+            bucket=bucket,
+            segment=segment,
+        )
         return series, status
 
     def get_hub_series(
@@ -879,16 +1287,13 @@ class UsageSeriesCache:
         segment: str = "none",
     ) -> Tuple[Dict[str, object], str]:
         status = self.request_update()
-        with self._lock:
-            payload = self._load_cache()
-            series = self._build_hub_series(
-                payload,
-                repo_map,
-                since=since,
-                until=until,
-                bucket=bucket,
-                segment=segment,
-            )
+        series = self._build_hub_series(
+            repo_map,
+            since=since,
+            until=until,
+            bucket=bucket,
+            segment=segment,
+        )
         return series, status
 
     def get_repo_summary(
@@ -899,11 +1304,7 @@ class UsageSeriesCache:
         until: Optional[datetime] = None,
     ) -> Tuple[UsageSummary, str]:
         status = self.request_update()
-        with self._lock:
-            payload = self._load_cache()
-            summary = self._build_repo_summary(
-                payload, repo_root, since=since, until=until
-            )
+        summary = self._build_repo_summary(repo_root, since=since, until=until)
         return summary, status
 
     def get_hub_summary(
@@ -912,81 +1313,55 @@ class UsageSeriesCache:
         *,
         since: Optional[datetime] = None,
         until: Optional[datetime] = None,
+        max_workers: Optional[int] = None,
     ) -> Tuple[Dict[str, UsageSummary], UsageSummary, str]:
         status = self.request_update()
-        with self._lock:
-            payload = self._load_cache()
-            per_repo, unmatched = self._build_hub_summary(
-                payload, repo_map, since=since, until=until
-            )
+        per_repo, unmatched = self._build_hub_summary(
+            repo_map,
+            since=since,
+            until=until,
+            max_workers=max_workers,
+        )
         return per_repo, unmatched, status
 
-    def _update_cache(self, payload: Dict[str, Any]) -> None:
+    def _update_cache(self) -> None:
         try:
-            files = cast(Dict[str, Any], payload.setdefault("files", {}))
-            file_rollups = cast(Dict[str, Any], payload.setdefault("file_rollups", {}))
-            file_summaries = cast(
-                Dict[str, Any], payload.setdefault("file_summaries", {})
-            )
-            rollups = cast(
-                Dict[str, Any],
-                payload.setdefault("rollups", {}).setdefault("by_cwd", {}),
-            )
-            summary_rollups = cast(
-                Dict[str, Any],
-                payload.setdefault("summary", {}).setdefault("by_cwd", {}),
-            )
-            rebuild_rollups = False
-            rebuild_summary = False
-            existing_paths = {
-                str(path) for path in _iter_session_files(self.codex_home)
-            }
-            for path_key in list(files.keys()):
-                if path_key not in existing_paths:
-                    files.pop(path_key, None)
-                    file_rollups.pop(path_key, None)
-                    file_summaries.pop(path_key, None)
-                    rebuild_rollups = True
-                    rebuild_summary = True
-
-            for session_path in _iter_session_files(self.codex_home):
+            store = self._ensure_store()
+            files = store.file_states()
+            session_files = list(_iter_session_files(self.codex_home))
+            existing_paths = {str(path) for path in session_files}
+            store.forget_files([key for key in files if key not in existing_paths])
+
+            for session_path in session_files:
                 path_key = str(session_path)
                 file_state = files.get(path_key, {})
                 offset = int(file_state.get("offset", 0) or 0)
+                expected_state = (
+                    (file_state.get("inode"), offset) if path_key in files else None
+                )
                 try:
-                    size = session_path.stat().st_size
+                    stat = session_path.stat()
                 except OSError as exc:
                     logger.debug(
                         "Failed to stat session file %s: %s", session_path, exc
                     )
                     continue
-                if size < offset:
+                size = stat.st_size
+                known_inode = file_state.get("inode")
+                replaced = known_inode is not None and known_inode != stat.st_ino
+                reset = size < offset or replaced
+                if reset:
                     offset = 0
                     file_state = {}
-                    file_rollups.pop(path_key, None)
-                    file_summaries.pop(path_key, None)
-                    rebuild_rollups = True
-                    rebuild_summary = True
                 if size == offset:
                     continue
-                updated_state = self._ingest_session_file(
+                self._ingest_session_file(
                     session_path,
                     offset,
-                    file_state,
-                    rollups,
-                    file_rollups,
-                    summary_rollups,
-                    file_summaries,
+                    {**file_state, "inode": stat.st_ino},
+                    expected_state=expected_state,
+                    reset=reset,
                 )
-                files[path_key] = updated_state
-            if rebuild_rollups:
-                payload["rollups"]["by_cwd"] = self._rebuild_rollups(file_rollups)
-            if rebuild_summary:
-                payload["summary"]["by_cwd"] = self._rebuild_summary(file_summaries)
-            payload["version"] = 3
-            self._save_cache(payload)
-            with self._lock:
-                self._cache = payload
         finally:
             with self._lock:
                 self._updating = False
@@ -996,11 +1371,10 @@ class UsageSeriesCache:
         session_path: Path,
         offset: int,
         state: Dict[str, Any],
-        rollups: Dict[str, Any],
-        file_rollups: Dict[str, Any],
-        summary_rollups: Dict[str, Any],
-        file_summaries: Dict[str, Any],
-    ) -> Dict[str, Any]:
+        *,
+        expected_state: Optional[Tuple[Optional[int], int]],
+        reset: bool = False,
+    ) -> None:
         cwd = state.get("cwd")
         model = state.get("model")
         last_totals_raw = state.get("last_totals")
@@ -1011,7 +1385,6 @@ class UsageSeriesCache:
             with session_path.open("rb") as handle:
                 handle.seek(offset)
                 data = handle.read()
-                new_offset = handle.tell()
         except OSError as exc:
             logger.debug(
                 "Failed to read session file %s at offset %d: %s",
@@ -1019,11 +1392,13 @@ class UsageSeriesCache:
                 offset,
                 exc,
             )
-            return state
+            return
 
-        if not data:
-            state["offset"] = offset
-            return state
+        # Leave a partially written trailing record for the next refresh.
+        data = data[: data.rfind(b"\n") + 1]
+        new_offset = offset + len(data)
+        if not data and not reset:
+            return
 
         try:
             text = data.decode("utf-8")
@@ -1034,20 +1409,12 @@ class UsageSeriesCache:
             text = data.decode("utf-8", errors="ignore")
         lines = text.splitlines()
 
-        token_fields = [
-            ("input", "input_tokens"),
-            ("cached", "cached_input_tokens"),
-            ("output", "output_tokens"),
-            ("reasoning", "reasoning_output_tokens"),
-        ]
-
-        path_key = str(session_path)
-        file_entry = file_rollups.setdefault(path_key, {}).setdefault("by_cwd", {})
-        file_summary_entry = file_summaries.setdefault(path_key, {}).setdefault(
-            "by_cwd", {}
-        )
+        rollups: Dict[Tuple[str, str, str, str], Dict[str, int]] = {}
+        summaries: Dict[str, Dict[str, Any]] = {}
 
         for line in lines:
+            if "token_count" not in line and "session_meta" not in line:
+                continue
             try:
                 record = json.loads(line)
             except json.JSONDecodeError as exc:
@@ -1092,165 +1459,45 @@ class UsageSeriesCache:
                 )
                 last_totals = totals
                 for bucket_name in ("hour", "day", "week"):
-                    bucket_start = _bucket_start(timestamp, bucket_name)
-                    bucket_label = _bucket_label(bucket_start, bucket_name)
-                    self._apply_rollup_delta(
-                        rollups,
-                        cwd_key,
-                        bucket_name,
-                        bucket_label,
-                        model_key,
-                        delta,
-                        token_fields,
+                    bucket_label = _bucket_label(
+                        _bucket_start(timestamp, bucket_name), bucket_name
                     )
-                    self._apply_rollup_delta(
-                        file_entry,
-                        cwd_key,
-                        bucket_name,
-                        bucket_label,
-                        model_key,
-                        delta,
-                        token_fields,
+                    entry = rollups.setdefault(
+                        (cwd_key, bucket_name, bucket_label, model_key), {}
                     )
+                    _add_token_columns(entry, delta)
             else:
                 delta = TokenTotals()
 
             event_index += 1
-            pos = {"file": path_key, "index": event_index}
-            self._apply_summary_delta(
-                summary_rollups,
-                file_summary_entry,
-                cwd_key,
-                delta,
-                rate_limits,
-                pos,
-            )
+            summary = summaries.setdefault(cwd_key, {"events": 0})
+            summary["events"] += 1
+            _add_token_columns(summary, delta)
+            if rate_limits is not None:
+                summary["rate_limits"] = rate_limits
+                summary["rate_limits_index"] = event_index
 
         state["offset"] = new_offset
         state["cwd"] = cwd
         state["model"] = model
         state["last_totals"] = last_totals.to_dict() if last_totals else None
         state["event_index"] = event_index
-        return state
-
-    def _apply_rollup_delta(
-        self,
-        rollups: Dict[str, Any],
-        cwd_key: str,
-        bucket_name: str,
-        bucket_label: str,
-        model_key: str,
-        delta: TokenTotals,
-        token_fields: List[Tuple[str, str]],
-    ) -> None:
-        cwd_rollups = rollups.setdefault(cwd_key, {})
-        bucket_rollups = cwd_rollups.setdefault(bucket_name, {})
-        entry = bucket_rollups.get(bucket_label)
-        if entry is None:
-            entry = _empty_rollup_bucket()
-            bucket_rollups[bucket_label] = entry
-
-        entry["total"] = int(entry.get("total", 0)) + delta.total_tokens
-
-        models = entry.setdefault("models", {})
-        models[model_key] = int(models.get(model_key, 0)) + delta.total_tokens
-
-        token_types = entry.setdefault("token_types", {})
-        model_token = entry.setdefault("model_token", {}).setdefault(model_key, {})
-        for label, field in token_fields:
-            value = getattr(delta, field)
-            if not value:
-                continue
-            token_types[label] = int(token_types.get(label, 0)) + value
-            model_token[label] = int(model_token.get(label, 0)) + value
-
-    def _apply_summary_delta(
-        self,
-        summary_rollups: Dict[str, Any],
-        file_summary_entry: Dict[str, Any],
-        cwd_key: str,
-        delta: TokenTotals,
-        rate_limits: Optional[Dict[str, Any]],
-        pos: Dict[str, Any],
-    ) -> None:
-        summary_entry = summary_rollups.setdefault(cwd_key, _empty_summary_entry())
-        file_entry = file_summary_entry.setdefault(cwd_key, _empty_summary_entry())
-
-        for entry in (summary_entry, file_entry):
-            totals = _coerce_totals(entry.get("totals"))
-            totals.add(delta)
-            entry["totals"] = totals.to_dict()
-            entry["events"] = int(entry.get("events", 0) or 0) + 1
-            if rate_limits is not None and _is_rate_limits_newer(
-                pos, entry.get("latest_rate_limits_pos")
-            ):
-                entry["latest_rate_limits"] = rate_limits
-                entry["latest_rate_limits_pos"] = pos
-
-    def _rebuild_rollups(self, file_rollups: Dict[str, Any]) -> Dict[str, Any]:
-        merged: Dict[str, Any] = {}
-        for file_entry in file_rollups.values():
-            cwd_rollups = file_entry.get("by_cwd", {})
-            for cwd_key, buckets in cwd_rollups.items():
-                target = merged.setdefault(cwd_key, {})
-                for bucket_name, bucket_map in buckets.items():
-                    target_bucket = target.setdefault(bucket_name, {})
-                    for bucket_label, entry in (bucket_map or {}).items():
-                        merged_entry = target_bucket.get(bucket_label)
-                        if merged_entry is None:
-                            merged_entry = _empty_rollup_bucket()
-                            target_bucket[bucket_label] = merged_entry
-                        merged_entry["total"] = int(merged_entry.get("total", 0)) + int(
-                            entry.get("total", 0)
-                        )
-                        for model_key, total in (entry.get("models") or {}).items():
-                            models = merged_entry.setdefault("models", {})
-                            models[model_key] = int(models.get(model_key, 0)) + int(
-                                total
-                            )
-                        for token_key, total in (
-                            entry.get("token_types") or {}
-                        ).items():
-                            token_types = merged_entry.setdefault("token_types", {})
-                            token_types[token_key] = int(
-                                token_types.get(token_key, 0)
-                            ) + int(total)
-                        for model_key, token_map in (
-                            entry.get("model_token") or {}
-                        ).items():
-                            model_token = merged_entry.setdefault(
-                                "model_token", {}
-                            ).setdefault(model_key, {})
-                            for token_key, total in (token_map or {}).items():
-                                model_token[token_key] = int(
-                                    model_token.get(token_key, 0)
-                                ) + int(total)
-        return merged
-
-    def _rebuild_summary(self, file_summaries: Dict[str, Any]) -> Dict[str, Any]:
-        merged: Dict[str, Any] = {}
-        for path_key in sorted(file_summaries.keys()):
-            file_entry = file_summaries.get(path_key, {})
-            cwd_map = file_entry.get("by_cwd", {})
-            for cwd_key, entry in (cwd_map or {}).items():
-                target = merged.setdefault(cwd_key, _empty_summary_entry())
-                target_totals = _coerce_totals(target.get("totals"))
-                target_totals.add(_coerce_totals(entry.get("totals")))
-                target["totals"] = target_totals.to_dict()
-                target["events"] = int(target.get("events", 0) or 0) + int(
-                    entry.get("events", 0) or 0
-                )
-                pos = entry.get("latest_rate_limits_pos")
-                if pos and _is_rate_limits_newer(
-                    pos, target.get("latest_rate_limits_pos")
-                ):
-                    target["latest_rate_limits"] = entry.get("latest_rate_limits")
-                    target["latest_rate_limits_pos"] = pos
-        return merged
+        applied = self._ensure_store().apply_file_update(
+            str(session_path),
+            state,
+            rollups,
+            summaries,
+            expected_state=expected_state,
+            reset=reset,
+        )
+        if not applied:
+            # Another process ingested this file concurrently; its deltas
+            # already cover this range and the next refresh resumes from there.
+            logger.debug("Skipped concurrent usage update for %s", session_path)
 
     def _buckets_for_range(
         self,
-        bucket_rollups: Dict[str, Any],
+        labels: Iterable[str],
         *,
         since: Optional[datetime],
         until: Optional[datetime],
@@ -1264,7 +1511,7 @@ class UsageSeriesCache:
             ]
 
         times: List[datetime] = []
-        for label in bucket_rollups.keys():
+        for label in labels:
             dt = _parse_bucket_label(label, bucket)
             if dt:
                 times.append(dt)
@@ -1296,7 +1543,6 @@ class UsageSeriesCache:
 
     def _build_repo_summary(
         self,
-        payload: Dict[str, Any],
         repo_root: Path,
         *,
         since: Optional[datetime],
@@ -1310,16 +1556,9 @@ class UsageSeriesCache:
                 until=until,
             )
         repo_root = repo_root.resolve()
-        rollups = cast(Dict[str, Any], payload.get("summary", {}).get("by_cwd", {}))
+        entries = self._ensure_store().query_summaries(cwd_prefix=str(repo_root))
         acc = _SummaryAccumulator()
-        for cwd, entry in rollups.items():
-            try:
-                cwd_path = Path(cwd)
-            except (TypeError, ValueError, OSError) as exc:
-                logger.debug("Failed to create Path from cwd %r: %s", cwd, exc)
-                continue
-            if cwd_path != repo_root and repo_root not in cwd_path.parents:
-                continue
+        for entry in entries.values():
             acc.add_entry(entry)
         return UsageSummary(
             totals=acc.totals,
@@ -1329,11 +1568,11 @@ class UsageSeriesCache:
 
     def _build_hub_summary(
         self,
-        payload: Dict[str, Any],
         repo_map: List[Tuple[str, Path]],
         *,
         since: Optional[datetime],
         until: Optional[datetime],
+        max_workers: Optional[int] = None,
     ) -> Tuple[Dict[str, UsageSummary], UsageSummary]:
         if since or until:
             return summarize_hub_usage(
@@ -1341,6 +1580,7 @@ class UsageSeriesCache:
                 codex_home=self.codex_home,
                 since=since,
                 until=until,
+                max_workers=max_workers,
             )
         repo_map = [(repo_id, path.resolve()) for repo_id, path in repo_map]
 
@@ -1377,7 +1617,7 @@ class UsageSeriesCache:
                         return repo_id
             return None
 
-        rollups = cast(Dict[str, Any], payload.get("summary", {}).get("by_cwd", {}))
+        rollups = self._ensure_store().query_summaries()
         per_repo: Dict[str, _SummaryAccumulator] = {
             repo_id: _SummaryAccumulator() for repo_id, _ in repo_map
         }
@@ -1414,7 +1654,6 @@ class UsageSeriesCache:
 
     def _build_repo_series(
         self,
-        payload: Dict[str, Any],
         repo_root: Path,
         *,
         since: Optional[datetime],
@@ -1429,64 +1668,42 @@ class UsageSeriesCache:
         if segment not in allowed_segments:
             raise UsageError(f"Unsupported segment: {segment}")
         repo_root = repo_root.resolve()
-        rollups = cast(Dict[str, Any], payload.get("rollups", {}).get("by_cwd", {}))
+        rows = self._ensure_store().query_rollups(
+            bucket,
+            cwd_prefix=str(repo_root),
+            label_range=self._label_range(since, until, bucket),
+        )
 
         series_map: Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, int]] = {}
-        bucket_union: Dict[str, Any] = {}
 
-        for cwd, cwd_data in rollups.items():
-            try:
-                cwd_path = Path(cwd)
-            except (TypeError, ValueError, OSError) as exc:
-                logger.debug("Failed to create Path from cwd %r: %s", cwd, exc)
-                continue
-            if cwd_path != repo_root and repo_root not in cwd_path.parents:
-                continue
-            bucket_rollups = cwd_data.get(bucket, {})
-            if not bucket_rollups:
-                continue
-            bucket_union.update(bucket_rollups)
-            for bucket_label, entry in bucket_rollups.items():
-                if segment == "none":
-                    key = ("total", None, None)
-                    series_map.setdefault(key, {})
-                    series_map[key][bucket_label] = series_map[key].get(
-                        bucket_label, 0
-                    ) + int(entry.get("total", 0))
-                    continue
+        def _add(
+            key: Tuple[str, Optional[str], Optional[str]], label: str, value: int
+        ) -> None:
+            values = series_map.setdefault(key, {})
+            values[label] = values.get(label, 0) + value
 
-                if segment == "model":
-                    for model_key, total in (entry.get("models") or {}).items():
-                        key = (model_key, model_key, None)
-                        series_map.setdefault(key, {})
-                        series_map[key][bucket_label] = series_map[key].get(
-                            bucket_label, 0
-                        ) + int(total)
-                    continue
-
-                if segment == "token_type":
-                    for token_key, total in (entry.get("token_types") or {}).items():
-                        key = (token_key, None, token_key)
-                        series_map.setdefault(key, {})
-                        series_map[key][bucket_label] = series_map[key].get(
-                            bucket_label, 0
-                        ) + int(total)
-                    continue
-
-                for model_key, token_map in (entry.get("model_token") or {}).items():
-                    for token_key, total in (token_map or {}).items():
-                        key = (
-                            f"{model_key}:{token_key}",
-                            model_key,
-                            token_key,
-                        )
-                        series_map.setdefault(key, {})
-                        series_map[key][bucket_label] = series_map[key].get(
-                            bucket_label, 0
-                        ) + int(total)
+        for row in rows:
+            bucket_label = row["label"]
+            model_key = row["model"]
+            if segment == "none":
+                _add(("total", None, None), bucket_label, int(row["total_tokens"]))
+            elif segment == "model":
+                _add(
+                    (model_key, model_key, None), bucket_label, int(row["total_tokens"])
+                )
+            else:
+                for token_key, column in _ROLLUP_TOKEN_FIELDS:
+                    value = int(row[column])
+                    if not value:
+                        continue
+                    if segment == "token_type":
+                        _add((token_key, None, token_key), bucket_label, value)
+                    else:
+                        key = (f"{model_key}:{token_key}", model_key, token_key)
+                        _add(key, bucket_label, value)
 
         buckets = self._buckets_for_range(
-            bucket_union, since=since, until=until, bucket=bucket
+            {row["label"] for row in rows}, since=since, until=until, bucket=bucket
         )
         series = self._build_series_from_map(buckets, series_map)
         return {
@@ -1496,9 +1713,20 @@ class UsageSeriesCache:
             "series": series,
         }
 
+    def _label_range(
+        self, since: Optional[datetime], until: Optional[datetime], bucket: str
+    ) -> Optional[Tuple[str, str]]:
+        # Rows outside the range only matter when the range is open-ended
+        # (the bucket axis then spans the data itself).
+        if not (since and until):
+            return None
+        return (
+            _bucket_label(_bucket_start(since, bucket), bucket),
+            _bucket_label(_bucket_start(until, bucket), bucket),
+        )
+
     def _build_hub_series(
         self,
-        payload: Dict[str, Any],
         repo_map: List[Tuple[str, Path]],
         *,
         since: Optional[datetime],
@@ -1520,45 +1748,28 @@ class UsageSeriesCache:
                     return repo_id
             return None
 
-        rollups = cast(Dict[str, Any], payload.get("rollups", {}).get("by_cwd", {}))
+        rows = self._ensure_store().query_rollups(
+            bucket, label_range=self._label_range(since, until, bucket)
+        )
         series_map: Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, int]] = {}
-        bucket_union: Dict[str, Any] = {}
-
-        for cwd, cwd_data in rollups.items():
-            bucket_rollups = cwd_data.get(bucket, {})
-            if not bucket_rollups:
-                continue
-            bucket_union.update(bucket_rollups)
-            try:
-                cwd_path = Path(cwd)
-            except (TypeError, ValueError, OSError) as exc:
-                logger.debug("Failed to create Path from cwd %r: %s", cwd, exc)
-                cwd_path = None
+        matches: Dict[str, Optional[str]] = {}
 
+        for row in rows:
+            cwd = row["cwd"]
             if segment == "none":
-                for bucket_label, entry in bucket_rollups.items():
-                    key = ("total", None, None)
-                    series_map.setdefault(key, {})
-                    series_map[key][bucket_label] = series_map[key].get(
-                        bucket_label, 0
-                    ) + int(entry.get("total", 0))
-                continue
-
-            repo_id = _match_repo(cwd_path) if cwd_path else None
-            label = repo_id or "other"
-            for bucket_label, entry in bucket_rollups.items():
-                repo_key: Tuple[str, Optional[str], Optional[str]] = (
-                    label,
-                    repo_id,
-                    None,
-                )
-                series_map.setdefault(repo_key, {})
-                series_map[repo_key][bucket_label] = series_map[repo_key].get(
-                    bucket_label, 0
-                ) + int(entry.get("total", 0))
+                key: Tuple[str, Optional[str], Optional[str]] = ("total", None, None)
+            else:
+                if cwd not in matches:
+                    matches[cwd] = _match_repo(Path(cwd))
+                repo_id = matches[cwd]
+                key = (repo_id or "other", repo_id, None)
+            values = series_map.setdefault(key, {})
+            values[row["label"]] = values.get(row["label"], 0) + int(
+                row["total_tokens"]
+            )
 
         buckets = self._buckets_for_range(
-            bucket_union, since=since, until=until, bucket=bucket
+            {row["label"] for row in rows}, since=since, until=until, bucket=bucket
         )
         series = self._build_series_from_map(buckets, series_map)
         return {
@@ -1776,6 +1987,7 @@ def _build_hub_opencode_series(
     until: Optional[datetime],
     bucket: str,
     segment: str,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, object]:
     allowed_buckets = {"hour", "day", "week"}
     allowed_segments = {"none", "repo", "agent"}
@@ -1796,11 +2008,17 @@ def _build_hub_opencode_series(
 
     series_map: Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, int]] = {}
     timestamps: List[datetime] = []
+    matches: Dict[Optional[Path], Optional[str]] = {}
     events = iter_opencode_events(
-        [path for _, path in repo_map], since=since, until=until
+        [path for _, path in repo_map],
+        since=since,
+        until=until,
+        max_workers=max_workers,
     )
     for event in events:
-        repo_id = _match_repo(event.cwd)
+        if event.cwd not in matches:
+            matches[event.cwd] = _match_repo(event.cwd)
+        repo_id = matches[event.cwd]
         if repo_id is None:
             continue
         bucket_label = _bucket_label(_bucket_start(event.timestamp, bucket), bucket)
@@ -1880,29 +2098,33 @@ def _resolve_usage_cache_paths(
     return codex_root, cache_path, cache_scope, Path(global_cache_root)
 
 
+def _resolve_usage_parse_workers(config: Optional[Any]) -> Optional[int]:
+    usage_cfg = getattr(config, "usage", None) if config is not None else None
+    workers = getattr(usage_cfg, "parse_workers", None)
+    return int(workers) if workers else None
+
+
 def _maybe_migrate_usage_cache(cache_path: Path, global_cache_path: Path) -> None:
     cache_key = str(cache_path)
     if cache_key in _REPO_USAGE_CACHE_MIGRATED:
         return
     _REPO_USAGE_CACHE_MIGRATED.add(cache_key)
-    if cache_path.exists() or not global_cache_path.exists():
+    db_path = usage_rollup_db_path(cache_path)
+    global_db_path = usage_rollup_db_path(global_cache_path)
+    if db_path.exists() or not global_db_path.exists():
         return
     try:
-        payload = global_cache_path.read_text(encoding="utf-8")
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = cache_path.with_suffix(".tmp")
-        tmp_path.write_text(payload, encoding="utf-8")
-        tmp_path.replace(cache_path)
+        UsageRollupStore(global_db_path).copy_to(db_path)
         logger.warning(
             "Imported global usage cache into repo cache at %s from %s",
-            cache_path,
-            global_cache_path,
+            db_path,
+            global_db_path,
         )
-    except OSError as exc:
+    except (OSError, sqlite3.Error) as exc:
         logger.warning(
             "Failed to import global usage cache from %s to %s: %s",
-            global_cache_path,
-            cache_path,
+            global_db_path,
+            db_path,
             exc,
         )
 
@@ -2005,12 +2227,18 @@ def get_hub_usage_series_cached(
         global_cache_path = _default_usage_series_cache_path(global_cache_root)
         _maybe_migrate_usage_cache(cache_path, global_cache_path)
     cache = get_usage_series_cache(codex_root, cache_path=cache_path)
+    parse_workers = _resolve_usage_parse_workers(config)
     if segment == "agent":
         codex_series, status = cache.get_hub_series(
             repo_map, since=since, until=until, bucket=bucket, segment="none"
         )
         opencode_series = _build_hub_opencode_series(
-            repo_map, since=since, until=until, bucket=bucket, segment="agent"
+            repo_map,
+            since=since,
+            until=until,
+            bucket=bucket,
+            segment="agent",
+            max_workers=parse_workers,
         )
         codex_series["segment"] = "agent"
         codex_series["series"] = [
@@ -2023,7 +2251,12 @@ def get_hub_usage_series_cached(
         repo_map, since=since, until=until, bucket=bucket, segment=segment
     )
     opencode_series = _build_hub_opencode_series(
-        repo_map, since=since, until=until, bucket=bucket, segment=segment
+        repo_map,
+        since=since,
+        until=until,
+        bucket=bucket,
+        segment=segment,
+        max_workers=parse_workers,
     )
     return _merge_usage_series(codex_series, opencode_series, bucket=bucket), status
 
@@ -2043,10 +2276,13 @@ def get_hub_usage_summary_cached(
         global_cache_path = _default_usage_series_cache_path(global_cache_root)
         _maybe_migrate_usage_cache(cache_path, global_cache_path)
     cache = get_usage_series_cache(codex_root, cache_path=cache_path)
+    parse_workers = _resolve_usage_parse_workers(config)
     per_repo, unmatched, status = cache.get_hub_summary(
-        repo_map, since=since, until=until
+        repo_map, since=since, until=until, max_workers=parse_workers
+    )
+    opencode_per_repo = summarize_opencode_hub_usage(
+        repo_map, since=since, until=until, max_workers=parse_workers
     )
-    opencode_per_repo = summarize_opencode_hub_usage(repo_map, since=since, until=until)
     merged_per_repo: Dict[str, UsageSummary] = {}
     for repo_id, summary in per_repo.items():
         extra = opencode_per_repo.get(repo_id)
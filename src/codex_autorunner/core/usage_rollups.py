@@ -0,0 +1,343 @@
+"""SQLite store for incremental Codex usage rollups.
+
+Rows are kept per session file so an incremental refresh only touches the
+rows of files that grew, and a replaced or deleted file is dropped with a
+single ``DELETE``. Queries aggregate across files at read time and can be
+restricted to one cwd subtree and bucket range through the indexes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .sqlite_utils import open_sqlite
+
+_logger = logging.getLogger(__name__)
+
+USAGE_ROLLUP_SCHEMA_VERSION = 1
+
+TOKEN_COLUMNS = (
+    "input_tokens",
+    "cached_input_tokens",
+    "output_tokens",
+    "reasoning_output_tokens",
+    "total_tokens",
+)
+
+# (cwd, bucket kind, bucket label, model)
+RollupKey = Tuple[str, str, str, str]
+
+
+def usage_rollup_db_path(cache_path: Path) -> Path:
+    """Map a configured usage cache path onto the rollup database path."""
+    if cache_path.suffix == ".json":
+        return cache_path.with_suffix(".sqlite3")
+    return cache_path
+
+
+def _cwd_clause(cwd_prefix: Optional[str]) -> Tuple[str, Tuple[Any, ...]]:
+    """Match ``cwd_prefix`` itself and everything below it, index-friendly."""
+    if cwd_prefix is None:
+        return "", ()
+    base = cwd_prefix.rstrip("/")
+    # "/" sorts directly before "0", so [base/, base0) is exactly the subtree.
+    return (
+        " AND (cwd = ? OR (cwd >= ? AND cwd < ?))",
+        (cwd_prefix, base + "/", base + "0"),
+    )
+
+
+class UsageRollupStore:
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with open_sqlite(self.db_path) as conn:
+            yield conn
+
+    def initialize(self) -> None:
+        with self._connect() as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_info (version INTEGER NOT NULL)"
+            )
+            row = conn.execute("SELECT version FROM schema_info").fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO schema_info (version) VALUES (?)",
+                    (USAGE_ROLLUP_SCHEMA_VERSION,),
+                )
+            elif row["version"] != USAGE_ROLLUP_SCHEMA_VERSION:
+                # Everything here is derived from the session logs, so an
+                # incompatible layout is simply rebuilt.
+                _logger.info(
+                    "Rebuilding usage rollups (schema %s -> %s)",
+                    row["version"],
+                    USAGE_ROLLUP_SCHEMA_VERSION,
+                )
+                for table in ("usage_files", "usage_rollups", "usage_summaries"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(
+                    "UPDATE schema_info SET version = ?",
+                    (USAGE_ROLLUP_SCHEMA_VERSION,),
+                )
+            token_columns = ", ".join(
+                f"{column} INTEGER NOT NULL DEFAULT 0" for column in TOKEN_COLUMNS
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS usage_files (
+                    path TEXT PRIMARY KEY,
+                    inode INTEGER,
+                    offset INTEGER NOT NULL DEFAULT 0,
+                    cwd TEXT,
+                    model TEXT,
+                    last_totals TEXT,
+                    event_index INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS usage_rollups (
+                    path TEXT NOT NULL,
+                    cwd TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    {token_columns},
+                    PRIMARY KEY (path, cwd, bucket, label, model)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_usage_rollups_range
+                    ON usage_rollups(bucket, cwd, label)
+                """
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS usage_summaries (
+                    path TEXT NOT NULL,
+                    cwd TEXT NOT NULL,
+                    events INTEGER NOT NULL DEFAULT 0,
+                    {token_columns},
+                    rate_limits TEXT,
+                    rate_limits_index INTEGER,
+                    PRIMARY KEY (path, cwd)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_usage_summaries_cwd
+                    ON usage_summaries(cwd)
+                """
+            )
+
+    def file_states(self) -> Dict[str, Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM usage_files").fetchall()
+        states: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            state = dict(row)
+            raw_totals = state.pop("last_totals", None)
+            state["last_totals"] = json.loads(raw_totals) if raw_totals else None
+            states[state.pop("path")] = state
+        return states
+
+    def forget_files(self, paths: Sequence[str]) -> None:
+        if not paths:
+            return
+        with self._connect() as conn, conn:
+            for table in ("usage_files", "usage_rollups", "usage_summaries"):
+                conn.executemany(
+                    f"DELETE FROM {table} WHERE path = ?", [(p,) for p in paths]
+                )
+
+    def apply_file_update(
+        self,
+        path: str,
+        state: Dict[str, Any],
+        rollups: Dict[RollupKey, Dict[str, int]],
+        summaries: Dict[str, Dict[str, Any]],
+        *,
+        expected_state: Optional[Tuple[Optional[int], int]],
+        reset: bool = False,
+    ) -> bool:
+        """Add one file's new deltas and record its parse state atomically.
+
+        ``expected_state`` is the stored ``(inode, offset)`` the parse started
+        from, or ``None`` when the file had no row. If another writer has moved
+        the row since, nothing is applied and ``False`` is returned, so deltas
+        parsed concurrently by two processes are only counted once.
+        """
+        columns = ", ".join(TOKEN_COLUMNS)
+        placeholders = ", ".join("?" for _ in TOKEN_COLUMNS)
+        increments = ", ".join(
+            f"{column} = {column} + excluded.{column}" for column in TOKEN_COLUMNS
+        )
+        with self._connect() as conn, conn:
+            # Take the write lock before reading the row, so the check and the
+            # update cannot interleave with another writer.
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT inode, offset FROM usage_files WHERE path = ?", (path,)
+            ).fetchone()
+            current = (row["inode"], int(row["offset"])) if row is not None else None
+            if current != expected_state:
+                return False
+            if reset:
+                conn.execute("DELETE FROM usage_rollups WHERE path = ?", (path,))
+                conn.execute("DELETE FROM usage_summaries WHERE path = ?", (path,))
+            conn.executemany(
+                f"""
+                INSERT INTO usage_rollups (path, cwd, bucket, label, model, {columns})
+                VALUES (?, ?, ?, ?, ?, {placeholders})
+                ON CONFLICT (path, cwd, bucket, label, model)
+                DO UPDATE SET {increments}
+                """,
+                [
+                    (path, *key, *(int(values.get(c, 0)) for c in TOKEN_COLUMNS))
+                    for key, values in rollups.items()
+                ],
+            )
+            conn.executemany(
+                f"""
+                INSERT INTO usage_summaries (
+                    path, cwd, events, {columns}, rate_limits, rate_limits_index
+                )
+                VALUES (?, ?, ?, {placeholders}, ?, ?)
+                ON CONFLICT (path, cwd) DO UPDATE SET
+                    events = events + excluded.events,
+                    {increments},
+                    rate_limits = COALESCE(excluded.rate_limits, rate_limits),
+                    rate_limits_index = COALESCE(
+                        excluded.rate_limits_index, rate_limits_index
+                    )
+                """,
+                [
+                    (
+                        path,
+                        cwd,
+                        int(entry.get("events", 0)),
+                        *(int(entry.get(c, 0)) for c in TOKEN_COLUMNS),
+                        (
+                            json.dumps(entry["rate_limits"])
+                            if entry.get("rate_limits") is not None
+                            else None
+                        ),
+                        entry.get("rate_limits_index"),
+                    )
+                    for cwd, entry in summaries.items()
+                ],
+            )
+            last_totals = state.get("last_totals")
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO usage_files (
+                    path, inode, offset, cwd, model, last_totals, event_index
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    path,
+                    state.get("inode"),
+                    int(state.get("offset", 0) or 0),
+                    state.get("cwd"),
+                    state.get("model"),
+                    json.dumps(last_totals) if last_totals else None,
+                    int(state.get("event_index", 0) or 0),
+                ),
+            )
+        return True
+
+    def query_rollups(
+        self,
+        bucket: str,
+        *,
+        cwd_prefix: Optional[str] = None,
+        label_range: Optional[Tuple[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return rollup rows summed across files per (cwd, label, model)."""
+        clause, params = _cwd_clause(cwd_prefix)
+        if label_range is not None:
+            clause += " AND label >= ? AND label <= ?"
+            params += label_range
+        sums = ", ".join(f"SUM({column}) AS {column}" for column in TOKEN_COLUMNS)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT cwd, label, model, {sums}
+                  FROM usage_rollups
+                 WHERE bucket = ?{clause}
+                 GROUP BY cwd, label, model
+                 ORDER BY cwd, label, model
+                """,
+                (bucket, *params),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query_summaries(
+        self, *, cwd_prefix: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return summary entries per cwd in the ``_SummaryAccumulator`` shape."""
+        clause, params = _cwd_clause(cwd_prefix)
+        sums = ", ".join(f"SUM({column}) AS {column}" for column in TOKEN_COLUMNS)
+        with self._connect() as conn:
+            totals = conn.execute(
+                f"""
+                SELECT cwd, SUM(events) AS events, {sums}
+                  FROM usage_summaries
+                 WHERE 1 = 1{clause}
+                 GROUP BY cwd
+                 ORDER BY cwd
+                """,
+                params,
+            ).fetchall()
+            limits = conn.execute(
+                f"""
+                SELECT cwd, path, rate_limits, rate_limits_index
+                  FROM usage_summaries
+                 WHERE rate_limits IS NOT NULL{clause}
+                 ORDER BY path, rate_limits_index
+                """,
+                params,
+            ).fetchall()
+        entries: Dict[str, Dict[str, Any]] = {}
+        for row in totals:
+            entries[row["cwd"]] = {
+                "events": int(row["events"] or 0),
+                "totals": {column: int(row[column] or 0) for column in TOKEN_COLUMNS},
+                "latest_rate_limits": None,
+                "latest_rate_limits_pos": None,
+            }
+        for row in limits:
+            entry = entries.get(row["cwd"])
+            if entry is None:
+                continue
+            entry["latest_rate_limits"] = json.loads(row["rate_limits"])
+            entry["latest_rate_limits_pos"] = {
+                "file": row["path"],
+                "index": int(row["rate_limits_index"] or 0),
+            }
+        return entries
+
+    def copy_to(self, target: Path) -> None:
+        """Snapshot this store into ``target`` (used to seed repo-scoped caches)."""
+        with self._connect() as source, open_sqlite(target) as dest:
+            source.backup(dest)
+
+
+__all__ = [
+    "TOKEN_COLUMNS",
+    "USAGE_ROLLUP_SCHEMA_VERSION",
+    "UsageRollupStore",
+    "usage_rollup_db_path",
+]
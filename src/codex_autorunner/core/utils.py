@@ -10,6 +10,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
     Iterable,
     Mapping,
@@ -324,6 +325,8 @@ def build_opencode_supervisor(
     max_text_chars: Optional[int] = None,
     base_env: Optional[MutableMapping[str, str]] = None,
     subagent_models: Optional[Mapping[str, str]] = None,
+    warm_spares: int = 0,
+    warm_workspaces: Optional[Callable[[], Iterable[Path]]] = None,
 ) -> Optional[Any]:
     """
     Unified factory for building OpenCodeSupervisor instances.
@@ -384,6 +387,8 @@ def build_opencode_supervisor(
         password=password if password else None,
         base_env=base_env,
         subagent_models=subagent_models,
+        warm_spares=warm_spares,
+        warm_workspaces=warm_workspaces,
     )
     return cast(Any, supervisor)
 
@@ -339,7 +339,7 @@ class OpenCodeBackend(AgentBackend):
             raise RuntimeError("Session not started. Call start_session() first.")
 
         client = await self._ensure_client()
-        async for sse in client.stream_events(directory=None):
+        async for sse in client.subscribe_events(directory=None):
             for agent_event in self._convert_sse_to_agent_event(sse):
                 yield agent_event
 
@@ -362,14 +362,10 @@ class OpenCodeBackend(AgentBackend):
         raise NotImplementedError("Approvals not implemented for OpenCodeBackend")
 
     async def _yield_events_until_completion(self) -> AsyncGenerator[AgentEvent, None]:
-        paths = ["/event", "/global/event"]
-        if self._session_id:
-            paths.insert(0, f"/session/{self._session_id}/event")
         try:
             client = await self._ensure_client()
-            async for sse in client.stream_events(
-                directory=None,
-                paths=paths,
+            async for sse in client.subscribe_events(
+                directory=None, session_ids=self._session_filter()
             ):
                 if not self._sse_matches_session(sse):
                     continue
@@ -391,14 +387,10 @@ class OpenCodeBackend(AgentBackend):
     async def _yield_run_events_until_completion(
         self,
     ) -> AsyncGenerator[RunEvent, None]:
-        paths = ["/event", "/global/event"]
-        if self._session_id:
-            paths.insert(0, f"/session/{self._session_id}/event")
         try:
             client = await self._ensure_client()
-            async for sse in client.stream_events(
-                directory=None,
-                paths=paths,
+            async for sse in client.subscribe_events(
+                directory=None, session_ids=self._session_filter()
             ):
                 if not self._sse_matches_session(sse):
                     continue
@@ -539,6 +531,9 @@ class OpenCodeBackend(AgentBackend):
                 return value
         return None
 
+    def _session_filter(self) -> Optional[set[str]]:
+        return {self._session_id} if self._session_id else None
+
     def _sse_matches_session(self, sse: SSEEvent) -> bool:
         if not self._session_id:
             return True
@@ -4,7 +4,7 @@ import logging
 from pathlib import Path
 from typing import MutableMapping, Optional, cast
 
-from ...agents.opencode.supervisor import OpenCodeSupervisor
+from ...agents.opencode.supervisor import OpenCodeSupervisor, WarmWorkspaceProvider
 from ...core.config import RepoConfig
 from ...core.utils import build_opencode_supervisor
 
@@ -15,6 +15,7 @@ def build_opencode_supervisor_from_repo_config(
     workspace_root: Path,
     logger: logging.Logger,
     base_env: Optional[MutableMapping[str, str]] = None,
+    warm_workspaces: Optional[WarmWorkspaceProvider] = None,
 ) -> Optional[OpenCodeSupervisor]:
     opencode_command = config.agent_serve_command("opencode")
     opencode_binary = None
@@ -38,5 +39,7 @@ def build_opencode_supervisor_from_repo_config(
         max_text_chars=config.opencode.max_text_chars,
         base_env=base_env,
         subagent_models=subagent_models,
+        warm_spares=config.app_server.warm_spares,
+        warm_workspaces=warm_workspaces,
     )
     return cast(Optional[OpenCodeSupervisor], supervisor)
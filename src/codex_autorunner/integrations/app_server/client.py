@@ -1,4 +1,5 @@
 import asyncio
+import bisect
 import json
 import logging
 import os
@@ -65,10 +66,38 @@ _INVALID_JSON_PREVIEW_BYTES = 200
 _DEFAULT_OUTPUT_POLICY = "final_only"
 _OUTPUT_POLICIES = {"final_only", "all_agent_messages"}
 
+# Upper bounds (bytes) of the message-size histogram buckets; the last bucket
+# is open-ended.
+_MESSAGE_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+# Notifications serialized with ``method`` first can be routed before decoding.
+_NOTIFICATION_PREFIX = b'{"method":"'
+# Delta notifications the client itself folds into turn state.
+_CONSUMED_DELTA_METHODS = frozenset({"item/agentMessage/delta"})
+
 # Track live clients so tests/cleanup can cancel any background restart tasks.
 _CLIENT_INSTANCES: weakref.WeakSet = weakref.WeakSet()
 
 
+def _load_json_decoder() -> tuple[str, Callable[[bytes], Any]]:
+    """Pick the fastest available decoder that parses bytes directly."""
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return "orjson", orjson.loads
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        return "msgspec", cast(Callable[[bytes], Any], msgspec.json.Decoder().decode)
+    return "json", json.loads
+
+
+_JSON_DECODER_NAME, _decode_json_bytes = _load_json_decoder()
+
+
 class CodexAppServerError(AppServerError):
     """Base error for app-server client failures."""
 
@@ -146,6 +175,54 @@ class _TurnState:
     agent_message_deltas: Dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class _DecodeStats:
+    """Counters for inbound stdout messages, exposed via ``decode_stats()``."""
+
+    messages: int = 0
+    bytes_total: int = 0
+    max_bytes: int = 0
+    decode_seconds: float = 0.0
+    max_decode_seconds: float = 0.0
+    invalid: int = 0
+    fast_path_skipped: int = 0
+    fast_path_bytes: int = 0
+    skipped_by_method: Dict[str, int] = field(default_factory=dict)
+    size_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(_MESSAGE_SIZE_BUCKETS) + 1)
+    )
+
+    def record(self, size: int, seconds: float) -> None:
+        self.messages += 1
+        self.bytes_total += size
+        self.max_bytes = max(self.max_bytes, size)
+        self.decode_seconds += seconds
+        self.max_decode_seconds = max(self.max_decode_seconds, seconds)
+        self.size_histogram[bisect.bisect_left(_MESSAGE_SIZE_BUCKETS, size)] += 1
+
+    def record_skipped(self, method: str, size: int) -> None:
+        self.fast_path_skipped += 1
+        self.fast_path_bytes += size
+        self.skipped_by_method[method] = self.skipped_by_method.get(method, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in _MESSAGE_SIZE_BUCKETS]
+        labels.append(f">{_MESSAGE_SIZE_BUCKETS[-1]}")
+        return {
+            "decoder": _JSON_DECODER_NAME,
+            "messages": self.messages,
+            "bytes_total": self.bytes_total,
+            "max_bytes": self.max_bytes,
+            "decode_ms_total": round(self.decode_seconds * 1000, 3),
+            "decode_ms_max": round(self.max_decode_seconds * 1000, 3),
+            "invalid": self.invalid,
+            "fast_path_skipped": self.fast_path_skipped,
+            "fast_path_bytes": self.fast_path_bytes,
+            "skipped_by_method": dict(self.skipped_by_method),
+            "size_histogram": dict(zip(labels, self.size_histogram)),
+        }
+
+
 class CodexAppServerClient:
     def __init__(
         self,
@@ -168,6 +245,7 @@ class CodexAppServerClient:
         restart_backoff_jitter_ratio: Optional[float] = None,
         output_policy: str = _DEFAULT_OUTPUT_POLICY,
         notification_handler: Optional[NotificationHandler] = None,
+        notification_filter: Optional[Callable[[str], bool]] = None,
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self._command = [str(arg) for arg in command]
@@ -186,6 +264,9 @@ class CodexAppServerClient:
             self._auto_restart = auto_restart
         self._request_timeout = request_timeout
         self._notification_handler = notification_handler
+        # None means the handler wants every notification.
+        self._notification_filter = notification_filter
+        self._decode_stats = _DecodeStats()
         self._logger = logger or logging.getLogger(__name__)
         self._circuit_breaker = CircuitBreaker("App-Server", logger=self._logger)
         self._max_message_bytes = (
@@ -290,6 +371,10 @@ class CodexAppServerClient:
         self._fail_pending(CodexAppServerDisconnected("Client closed"))
         _CLIENT_INSTANCES.discard(self)
 
+    def decode_stats(self) -> Dict[str, Any]:
+        """Return inbound message size and decode-time counters for profiling."""
+        return self._decode_stats.to_dict()
+
     async def wait_for_disconnect(self, *, timeout: Optional[float] = None) -> None:
         disconnected = self._ensure_disconnect_event()
         if timeout is None:
@@ -839,25 +924,64 @@ class CodexAppServerClient:
     async def _handle_payload_line(self, line: bytes) -> None:
         if not line:
             return
-        payload = line.decode("utf-8", errors="ignore").strip()
-        if not payload:
+        method = _peek_notification_method(line)
+        if method is not None and self._skips_notification(method):
+            self._decode_stats.record_skipped(method, len(line))
+            await self._touch_turn_from_raw(method, line)
             return
+        started = time.perf_counter()
         try:
-            message = json.loads(payload)
-        except json.JSONDecodeError as exc:
-            log_event(
-                self._logger,
-                logging.WARNING,
-                "app_server.read.invalid_json",
-                preview=payload[:_INVALID_JSON_PREVIEW_BYTES],
-                length=len(payload),
-                exc=exc,
-            )
-            return
+            message = _decode_json_bytes(line)
+        except Exception:
+            # Slow path keeps the lenient handling of stray whitespace and
+            # invalid UTF-8 that the accelerated decoders reject.
+            message = None
+        if message is None:
+            payload = line.decode("utf-8", errors="ignore").strip()
+            if not payload:
+                return
+            try:
+                message = json.loads(payload)
+            except json.JSONDecodeError as exc:
+                self._decode_stats.invalid += 1
+                log_event(
+                    self._logger,
+                    logging.WARNING,
+                    "app_server.read.invalid_json",
+                    preview=payload[:_INVALID_JSON_PREVIEW_BYTES],
+                    length=len(payload),
+                    exc=exc,
+                )
+                return
+        self._decode_stats.record(len(line), time.perf_counter() - started)
         if not isinstance(message, dict):
             return
         await self._handle_message(message)
 
+    def _skips_notification(self, method: str) -> bool:
+        """Whether a notification only matters for stall tracking here."""
+        if method in _CONSUMED_DELTA_METHODS:
+            return False
+        if not (method.endswith("Delta") or method.endswith("/delta")):
+            return False
+        if self._notification_handler is None:
+            return True
+        return self._notification_filter is not None and not (
+            self._notification_filter(method)
+        )
+
+    async def _touch_turn_from_raw(self, method: str, line: bytes) -> None:
+        metadata = _infer_metadata_from_preview(line[: self._oversize_preview_bytes])
+        turn_id = metadata.get("turn_id")
+        if not turn_id:
+            return
+        _key, state = await self._find_turn_state(
+            turn_id, thread_id=metadata.get("thread_id")
+        )
+        if state is not None:
+            state.last_event_at = time.monotonic()
+            state.last_method = method
+
     async def _emit_oversize_warning(
         self,
         *,
@@ -1589,6 +1713,23 @@ def _infer_metadata_from_preview(preview: bytes) -> Dict[str, Optional[str]]:
     }
 
 
+def _peek_notification_method(line: bytes) -> Optional[str]:
+    """Return the method of a line that starts with ``{"method":"...``."""
+    if not line.startswith(_NOTIFICATION_PREFIX):
+        return None
+    start = len(_NOTIFICATION_PREFIX)
+    end = line.find(b'"', start)
+    if end == -1:
+        return None
+    raw = bytes(line[start:end])
+    if b"\\" in raw:
+        return None
+    try:
+        return raw.decode("ascii")
+    except UnicodeDecodeError:
+        return None
+
+
 def _preview_excerpt(text: str, limit: int = 256) -> str:
     normalized = " ".join(text.split()).strip()
     if not normalized:
@@ -3,7 +3,7 @@ import logging
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, cast
 
 from ...core.app_server_ids import (
     extract_thread_id,
@@ -15,17 +15,69 @@ from ...core.sse import format_sse
 TurnKey = tuple[str, str]
 LOGGER = logging.getLogger("codex_autorunner.app_server")
 
+GAP_EVENT_NAME = "app-server-gap"
+
+
+class EventRing:
+    """Fixed-capacity ring of formatted SSE frames addressed by event id.
+
+    Ids start at 1 and are contiguous, so the frame for an id lives in slot
+    ``id % capacity`` and reading everything after a cursor costs only the
+    frames returned.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._frames: list[Optional[str]] = [None] * self.capacity
+        self.next_id = 1
+        self.bytes = 0
+        self.dropped = 0
+
+    @property
+    def first_id(self) -> int:
+        return max(1, self.next_id - self.capacity)
+
+    def __len__(self) -> int:
+        return self.next_id - self.first_id
+
+    def append(self, frame: str) -> int:
+        event_id = self.next_id
+        slot = event_id % self.capacity
+        evicted = self._frames[slot]
+        if evicted is not None:
+            self.bytes -= len(evicted)
+            self.dropped += 1
+        self._frames[slot] = frame
+        self.bytes += len(frame)
+        self.next_id += 1
+        return event_id
+
+    def read_after(self, last_id: int) -> tuple[int, int, list[str]]:
+        """Return ``(missed, last_id, frames)`` for events after ``last_id``.
+
+        ``missed`` counts events that were evicted before this reader got to
+        them. A cursor from the future (e.g. from before a restart) starts over.
+        """
+        if last_id >= self.next_id:
+            last_id = 0
+        start = max(last_id + 1, self.first_id)
+        frames = [
+            cast(str, self._frames[event_id % self.capacity])
+            for event_id in range(start, self.next_id)
+        ]
+        return start - last_id - 1, self.next_id - 1, frames
+
 
 @dataclass
 class TurnEventEntry:
     thread_id: str
     turn_id: str
-    events: list[dict] = field(default_factory=list)
+    ring: EventRing
     condition: asyncio.Condition = field(default_factory=asyncio.Condition)
     created_at: float = field(default_factory=time.monotonic)
     last_event_at: float = field(default_factory=time.monotonic)
-    next_id: int = 1
     active_streams: int = 0
+    gaps: int = 0
     context: dict[str, Any] = field(default_factory=dict)
 
 
@@ -44,6 +96,9 @@ class AppServerEventBuffer:
         self._max_events_per_turn = max_events_per_turn
         self._max_turns = max_turns
         self._turn_ttl_seconds = turn_ttl_seconds
+        # Totals for turns that were already pruned.
+        self._pruned_dropped = 0
+        self._pruned_gaps = 0
 
     def _ensure_lock(self) -> asyncio.Lock:
         if self._lock is None:
@@ -72,16 +127,15 @@ class AppServerEventBuffer:
         if not thread_id or not turn_id:
             return
         entry = await self._ensure_entry(thread_id, turn_id)
-        event = {
-            "id": entry.next_id,
-            "received_at": int(time.time() * 1000),
-            "message": message,
-        }
-        entry.next_id += 1
         async with entry.condition:
-            entry.events.append(event)
-            if len(entry.events) > self._max_events_per_turn:
-                entry.events = entry.events[-self._max_events_per_turn :]
+            event_id = entry.ring.next_id
+            event = {
+                "id": event_id,
+                "received_at": int(time.time() * 1000),
+                "message": message,
+            }
+            # Formatted once here and shared by every subscriber.
+            entry.ring.append(format_sse("app-server", event, event_id=event_id))
             entry.last_event_at = time.monotonic()
             entry.condition.notify_all()
         context = dict(entry.context) if entry.context else {}
@@ -96,17 +150,26 @@ class AppServerEventBuffer:
         turn_id: str,
         *,
         heartbeat_interval: float = 15.0,
+        after_id: Optional[int] = None,
     ) -> AsyncIterator[str]:
+        """Stream buffered and live events, resuming after ``after_id``.
+
+        A reader that falls behind the ring gets a ``GAP_EVENT_NAME`` event
+        describing the skipped ids instead of stalling the producer. Only
+        resumed or already-streaming readers count towards ``gaps``; a late
+        joiner starting past the ring's head is not a slow reader.
+        """
         entry = await self._ensure_entry(thread_id, turn_id)
         async with self._ensure_lock():
             entry.active_streams += 1
             self._turn_index[turn_id] = thread_id
-        last_id = 0
+        last_id = max(0, after_id or 0)
+        streaming = after_id is not None
         try:
             while True:
                 async with entry.condition:
-                    events = [e for e in entry.events if e["id"] > last_id]
-                    if not events:
+                    missed, next_last_id, frames = entry.ring.read_after(last_id)
+                    if not frames:
                         try:
                             await asyncio.wait_for(
                                 entry.condition.wait(), timeout=heartbeat_interval
@@ -114,9 +177,21 @@ class AppServerEventBuffer:
                         except asyncio.TimeoutError:
                             yield ": ping\n\n"
                         continue
-                for event in events:
-                    last_id = event["id"]
-                    yield format_sse("app-server", event)
+                    if missed and streaming:
+                        entry.gaps += 1
+                streaming = True
+                if missed:
+                    yield format_sse(
+                        GAP_EVENT_NAME,
+                        {
+                            "after_id": last_id,
+                            "missed": missed,
+                            "resume_id": next_last_id - len(frames) + 1,
+                        },
+                    )
+                last_id = next_last_id
+                for frame in frames:
+                    yield frame
         finally:
             async with self._ensure_lock():
                 entry.active_streams = max(0, entry.active_streams - 1)
@@ -126,11 +201,39 @@ class AppServerEventBuffer:
         async with self._ensure_lock():
             entry = self._entries.get(key)
             if entry is None:
-                entry = TurnEventEntry(thread_id=thread_id, turn_id=turn_id)
+                entry = TurnEventEntry(
+                    thread_id=thread_id,
+                    turn_id=turn_id,
+                    ring=EventRing(self._max_events_per_turn),
+                )
                 self._entries[key] = entry
                 self._turn_index[turn_id] = thread_id
             return entry
 
+    def stats(self) -> dict[str, Any]:
+        """Return buffer occupancy, dropped-event and per-turn memory counters."""
+        turns: list[dict[str, Any]] = [
+            {
+                "thread_id": entry.thread_id,
+                "turn_id": entry.turn_id,
+                "events": len(entry.ring),
+                "bytes": entry.ring.bytes,
+                "dropped": entry.ring.dropped,
+                "gaps": entry.gaps,
+                "active_streams": entry.active_streams,
+            }
+            for entry in list(self._entries.values())
+        ]
+        return {
+            "turns": len(turns),
+            "buffered_events": sum(turn["events"] for turn in turns),
+            "buffered_bytes": sum(turn["bytes"] for turn in turns),
+            "dropped_events": self._pruned_dropped
+            + sum(turn["dropped"] for turn in turns),
+            "gaps": self._pruned_gaps + sum(turn["gaps"] for turn in turns),
+            "per_turn": turns,
+        }
+
     def _extract_turn_ids(
         self, message: Dict[str, Any]
     ) -> tuple[Optional[str], Optional[str]]:
@@ -155,8 +258,7 @@ class AppServerEventBuffer:
                 if entry.active_streams:
                     continue
                 if (now - entry.last_event_at) > self._turn_ttl_seconds:
-                    self._entries.pop(key, None)
-                    self._turn_index.pop(entry.turn_id, None)
+                    self._drop_entry_locked(key, entry)
         if self._max_turns > 0 and len(self._entries) > self._max_turns:
             inactive = [
                 (key, entry)
@@ -166,8 +268,13 @@ class AppServerEventBuffer:
             inactive.sort(key=lambda item: item[1].last_event_at)
             while len(self._entries) > self._max_turns and inactive:
                 key, entry = inactive.pop(0)
-                self._entries.pop(key, None)
-                self._turn_index.pop(entry.turn_id, None)
+                self._drop_entry_locked(key, entry)
+
+    def _drop_entry_locked(self, key: TurnKey, entry: TurnEventEntry) -> None:
+        self._entries.pop(key, None)
+        self._turn_index.pop(entry.turn_id, None)
+        self._pruned_dropped += entry.ring.dropped
+        self._pruned_gaps += entry.gaps
 
     def _emit_log_lines(self, context: dict[str, Any], message: Dict[str, Any]) -> None:
         emit = context.get("emit")
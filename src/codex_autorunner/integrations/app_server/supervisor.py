@@ -6,10 +6,15 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, Optional, Sequence
+from typing import Any, Callable, Dict, Optional, Sequence
 
 from ...core.logging_utils import log_event
-from ...core.supervisor_utils import evict_lru_handle_locked, pop_idle_handles_locked
+from ...core.supervisor_utils import (
+    WarmSparePool,
+    WarmWorkspaceProvider,
+    evict_lru_handle_locked,
+    pop_idle_handles_locked,
+)
 from ...workspace import canonical_workspace_root, workspace_id_for_path
 from .client import ApprovalHandler, CodexAppServerClient, NotificationHandler
 
@@ -24,9 +29,14 @@ class AppServerHandle:
     start_lock: asyncio.Lock
     started: bool = False
     last_used_at: float = 0.0
+    # Warm-spare state; see WarmSparePool.
+    warm: bool = False
+    warmed_at: float = 0.0
 
 
-class WorkspaceAppServerSupervisor:
+class WorkspaceAppServerSupervisor(WarmSparePool[AppServerHandle]):
+    _event_prefix = "app_server"
+
     def __init__(
         self,
         command: Sequence[str],
@@ -35,6 +45,7 @@ class WorkspaceAppServerSupervisor:
         env_builder: EnvBuilder,
         approval_handler: Optional[ApprovalHandler] = None,
         notification_handler: Optional[NotificationHandler] = None,
+        notification_filter: Optional[Callable[[str], bool]] = None,
         logger: Optional[logging.Logger] = None,
         auto_restart: Optional[bool] = None,
         request_timeout: Optional[float] = None,
@@ -51,12 +62,15 @@ class WorkspaceAppServerSupervisor:
         default_approval_decision: str = "cancel",
         max_handles: Optional[int] = None,
         idle_ttl_seconds: Optional[float] = None,
+        warm_spares: int = 0,
+        warm_workspaces: Optional[WarmWorkspaceProvider] = None,
     ) -> None:
         self._command = [str(arg) for arg in command]
         self._state_root = state_root
         self._env_builder = env_builder
         self._approval_handler = approval_handler
         self._notification_handler = notification_handler
+        self._notification_filter = notification_filter
         self._logger = logger or logging.getLogger(__name__)
         disable_restart_env = os.environ.get(
             "CODEX_DISABLE_APP_SERVER_AUTORESTART_FOR_TESTS"
@@ -83,6 +97,11 @@ class WorkspaceAppServerSupervisor:
         self._default_approval_decision = default_approval_decision
         self._max_handles = max_handles
         self._idle_ttl_seconds = idle_ttl_seconds
+        self._init_warm_pool(
+            warm_spares=warm_spares,
+            warm_workspaces=warm_workspaces,
+            max_handles=max_handles,
+        )
         self._handles: dict[str, AppServerHandle] = {}
         self._lock = asyncio.Lock()
 
@@ -92,9 +111,20 @@ class WorkspaceAppServerSupervisor:
         handle = await self._ensure_handle(workspace_id, canonical_root)
         await self._ensure_started(handle)
         handle.last_used_at = time.monotonic()
+        handle.warm = False
+        self._recent_workspaces.touch(workspace_id, canonical_root)
         return handle.client
 
+    def spawn_stats(self) -> dict[str, Any]:
+        stats = super().spawn_stats()
+        stats["decode"] = {
+            handle.workspace_id: handle.client.decode_stats()
+            for handle in self._handles.values()
+        }
+        return stats
+
     async def close_all(self) -> None:
+        await self._cancel_prewarm()
         async with self._lock:
             handles = list(self._handles.values())
             self._handles = {}
@@ -153,78 +183,99 @@ class WorkspaceAppServerSupervisor:
             if evicted is not None:
                 evicted_id = evicted.workspace_id
                 handles_to_close.append(evicted)
-            state_dir = self._state_root / workspace_id
-            env = self._env_builder(workspace_root, workspace_id, state_dir)
-            client = CodexAppServerClient(
-                self._command,
-                cwd=workspace_root,
-                env=env,
-                approval_handler=self._approval_handler,
-                default_approval_decision=self._default_approval_decision,
-                auto_restart=self._auto_restart,
-                request_timeout=self._request_timeout,
-                turn_stall_timeout_seconds=self._turn_stall_timeout_seconds,
-                turn_stall_poll_interval_seconds=self._turn_stall_poll_interval_seconds,
-                turn_stall_recovery_min_interval_seconds=self._turn_stall_recovery_min_interval_seconds,
-                max_message_bytes=self._max_message_bytes,
-                oversize_preview_bytes=self._oversize_preview_bytes,
-                max_oversize_drain_bytes=self._max_oversize_drain_bytes,
-                restart_backoff_initial_seconds=self._restart_backoff_initial_seconds,
-                restart_backoff_max_seconds=self._restart_backoff_max_seconds,
-                restart_backoff_jitter_ratio=self._restart_backoff_jitter_ratio,
-                output_policy=self._output_policy,
-                notification_handler=self._notification_handler,
-                logger=self._logger,
-            )
-            handle = AppServerHandle(
-                workspace_id=workspace_id,
-                workspace_root=workspace_root,
-                client=client,
-                start_lock=asyncio.Lock(),
-                last_used_at=time.monotonic(),
-            )
+            handle = self._new_handle_locked(workspace_id, workspace_root, spare=False)
             self._handles[workspace_id] = handle
-        for handle in handles_to_close:
+        for closing in handles_to_close:
             try:
                 reason = (
-                    "max_handles" if handle.workspace_id == evicted_id else "idle_ttl"
+                    "max_handles" if closing.workspace_id == evicted_id else "idle_ttl"
                 )
                 log_event(
                     self._logger,
                     logging.INFO,
                     "app_server.handle.closing",
                     reason=reason,
-                    workspace_id=handle.workspace_id,
-                    workspace_root=str(handle.workspace_root),
+                    workspace_id=closing.workspace_id,
+                    workspace_root=str(closing.workspace_root),
                     idle_ttl_seconds=self._idle_ttl_seconds,
                     max_handles=self._max_handles,
-                    last_used_at=handle.last_used_at,
+                    last_used_at=closing.last_used_at,
                 )
-                await handle.client.close()
+                await closing.client.close()
             except Exception as exc:
                 self._logger.debug("Failed to close handle: %s", exc)
                 continue
+        if handles_to_close:
+            self._schedule_prewarm()
         return handle
 
-    async def _ensure_started(self, handle: AppServerHandle) -> None:
+    def _pool_lock(self) -> asyncio.Lock:
+        return self._lock
+
+    def _new_handle_locked(
+        self, workspace_id: str, workspace_root: Path, *, spare: bool
+    ) -> AppServerHandle:
+        state_dir = self._state_root / workspace_id
+        env = self._env_builder(workspace_root, workspace_id, state_dir)
+        client = CodexAppServerClient(
+            self._command,
+            cwd=workspace_root,
+            env=env,
+            approval_handler=self._approval_handler,
+            default_approval_decision=self._default_approval_decision,
+            auto_restart=self._auto_restart,
+            request_timeout=self._request_timeout,
+            turn_stall_timeout_seconds=self._turn_stall_timeout_seconds,
+            turn_stall_poll_interval_seconds=self._turn_stall_poll_interval_seconds,
+            turn_stall_recovery_min_interval_seconds=self._turn_stall_recovery_min_interval_seconds,
+            max_message_bytes=self._max_message_bytes,
+            oversize_preview_bytes=self._oversize_preview_bytes,
+            max_oversize_drain_bytes=self._max_oversize_drain_bytes,
+            restart_backoff_initial_seconds=self._restart_backoff_initial_seconds,
+            restart_backoff_max_seconds=self._restart_backoff_max_seconds,
+            restart_backoff_jitter_ratio=self._restart_backoff_jitter_ratio,
+            output_policy=self._output_policy,
+            notification_handler=self._notification_handler,
+            notification_filter=self._notification_filter,
+            logger=self._logger,
+        )
+        return AppServerHandle(
+            workspace_id=workspace_id,
+            workspace_root=workspace_root,
+            client=client,
+            start_lock=asyncio.Lock(),
+            last_used_at=0.0 if spare else time.monotonic(),
+            warm=spare,
+        )
+
+    async def _ensure_started(
+        self, handle: AppServerHandle, *, warm: bool = False
+    ) -> None:
         async with handle.start_lock:
             if handle.started:
                 return
+            started_at = time.monotonic()
             await handle.client.start()
             handle.started = True
+            self._spawn_latency.record(time.monotonic() - started_at, warm=warm)
 
     async def _pop_idle_handles(self) -> list[AppServerHandle]:
         async with self._lock:
             return self._pop_idle_handles_locked()
 
     def _pop_idle_handles_locked(self) -> list[AppServerHandle]:
-        return pop_idle_handles_locked(
+        handles = pop_idle_handles_locked(
             self._handles,
             self._idle_ttl_seconds,
             self._logger,
             "app_server",
-            last_used_at_getter=lambda h: h.last_used_at,
+            last_used_at_getter=lambda h: h.warmed_at if h.warm else h.last_used_at,
         )
+        for handle in handles:
+            self._recent_workspaces.mark_pruned(
+                handle.workspace_id, self._idle_ttl_seconds or 0.0
+            )
+        return handles
 
     def _evict_lru_handle_locked(self) -> Optional[AppServerHandle]:
         return evict_lru_handle_locked(
@@ -233,4 +284,5 @@ class WorkspaceAppServerSupervisor:
             self._logger,
             "app_server",
             last_used_at_getter=lambda h: h.last_used_at or 0.0,
+            is_spare=lambda h: h.warm,
         )
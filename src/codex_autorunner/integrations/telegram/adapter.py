@@ -33,6 +33,7 @@ from .api_schemas import (
     parse_update_payload,
 )
 from .constants import TELEGRAM_CALLBACK_DATA_LIMIT, TELEGRAM_MAX_MESSAGE_LENGTH
+from .rate_limiter import TelegramRequestScheduler
 from .retry import _extract_retry_after_seconds
 
 _RATE_LIMIT_BUFFER_SECONDS = 0.0
@@ -1182,6 +1183,7 @@ class TelegramBotClient:
         timeout_seconds: float = 30.0,
         logger: Optional[logging.Logger] = None,
         client: Optional[httpx.AsyncClient] = None,
+        scheduler: Optional[TelegramRequestScheduler] = None,
     ) -> None:
         self._bot_token = bot_token
         self._base_url = "https://api.telegram.org"
@@ -1197,6 +1199,10 @@ class TelegramBotClient:
         self._rate_limit_lock: Optional[asyncio.Lock] = None
         self._rate_limit_lock_loop: Optional[asyncio.AbstractEventLoop] = None
         self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._scheduler = scheduler or TelegramRequestScheduler()
+
+    def rate_limit_stats(self) -> dict[str, Any]:
+        return self._scheduler.stats()
 
     async def close(self) -> None:
         if self._owns_client:
@@ -1587,7 +1593,12 @@ class TelegramBotClient:
         async def send() -> httpx.Response:
             return await self._client.post(url, json=payload)
 
-        return await self._request_with_retry(method, send)
+        return await self._request_with_retry(
+            method,
+            send,
+            chat_id=payload.get("chat_id"),
+            message_id=payload.get("message_id"),
+        )
 
     async def _request_multipart(
         self, method: str, data: dict[str, Any], files: dict[str, Any]
@@ -1597,14 +1608,31 @@ class TelegramBotClient:
         async def send() -> httpx.Response:
             return await self._client.post(url, data=data, files=files)
 
-        return await self._request_with_retry(method, send)
+        return await self._request_with_retry(method, send, chat_id=data.get("chat_id"))
 
     @retry_transient(max_attempts=5, base_wait=1.0, max_wait=60.0)
     async def _request_with_retry(
-        self, method: str, send: Callable[[], Awaitable[httpx.Response]]
+        self,
+        method: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        *,
+        chat_id: Optional[Union[int, str]] = None,
+        message_id: Optional[int] = None,
     ) -> Any:
         async with self._resilience_guard(method):
             await self._wait_for_rate_limit(method)
+            if not await self._scheduler.acquire(
+                method, chat_id, message_id=message_id
+            ):
+                log_event(
+                    self._logger,
+                    logging.DEBUG,
+                    "telegram.request.superseded",
+                    method=method,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                )
+                return None
             try:
                 response = await send()
                 response.raise_for_status()
@@ -1613,7 +1641,7 @@ class TelegramBotClient:
                 retry_after = _extract_retry_after_seconds(exc)
                 status_code = exc.response.status_code
                 if retry_after is not None:
-                    await self._apply_rate_limit(method, retry_after)
+                    await self._apply_rate_limit(method, retry_after, chat_id=chat_id)
                 log_event(
                     self._logger,
                     logging.WARNING,
@@ -1635,7 +1663,7 @@ class TelegramBotClient:
             except httpx.RequestError as exc:
                 retry_after = _extract_retry_after_seconds(exc)
                 if retry_after is not None:
-                    await self._apply_rate_limit(method, retry_after)
+                    await self._apply_rate_limit(method, retry_after, chat_id=chat_id)
                 log_event(
                     self._logger,
                     logging.WARNING,
@@ -1651,7 +1679,7 @@ class TelegramBotClient:
             except Exception as exc:
                 retry_after = _extract_retry_after_seconds(exc)
                 if retry_after is not None:
-                    await self._apply_rate_limit(method, retry_after)
+                    await self._apply_rate_limit(method, retry_after, chat_id=chat_id)
                 log_event(
                     self._logger,
                     logging.WARNING,
@@ -1676,7 +1704,7 @@ class TelegramBotClient:
                 if not isinstance(error_code, int) or isinstance(error_code, bool):
                     error_code = None
                 if retry_after is not None:
-                    await self._apply_rate_limit(method, retry_after)
+                    await self._apply_rate_limit(method, retry_after, chat_id=chat_id)
                 log_event(
                     self._logger,
                     logging.WARNING,
@@ -1760,8 +1788,16 @@ class TelegramBotClient:
         async with breaker.call():
             yield
 
-    async def _apply_rate_limit(self, method: str, retry_after: int) -> None:
+    async def _apply_rate_limit(
+        self,
+        method: str,
+        retry_after: int,
+        *,
+        chat_id: Optional[Union[int, str]] = None,
+    ) -> None:
         delay = float(retry_after)
+        if chat_id is not None and self._scheduler.applies_to(method):
+            self._scheduler.penalize(chat_id, delay)
         loop = asyncio.get_running_loop()
         until = loop.time() + delay + _RATE_LIMIT_BUFFER_SECONDS
         scope = self._resilience_scope(method)
@@ -43,6 +43,7 @@ UPDATE_ID_PERSIST_INTERVAL_SECONDS = 60.0
 OUTBOX_RETRY_INTERVAL_SECONDS = 10.0
 OUTBOX_IMMEDIATE_RETRY_DELAYS = (0.5, 2.0, 5.0)
 OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_MAX_PARALLEL_CHATS = 8
 VOICE_RETRY_INTERVAL_SECONDS = 5.0
 VOICE_RETRY_INITIAL_SECONDS = 2.0
 VOICE_RETRY_MAX_SECONDS = 300.0
@@ -37,7 +37,12 @@ from .....core.config import load_repo_config
 from .....core.context_awareness import CAR_AWARENESS_BLOCK
 from .....core.injected_context import wrap_injected_context
 from .....core.logging_utils import log_event
-from .....core.pma_context import build_hub_snapshot, format_pma_prompt, load_pma_prompt
+from .....core.pma_context import (
+    acknowledge_hub_snapshot_changes,
+    build_hub_snapshot,
+    format_pma_prompt,
+    load_pma_prompt,
+)
 from .....core.state import now_iso
 from .....core.utils import canonicalize_path
 from .....integrations.github.service import GitHubService
@@ -2502,14 +2507,26 @@ class ExecutionCommands(SharedHelpers):
             return f"{base_key}.{topic_key}"
         return base_key
 
-    async def _prepare_pma_prompt(self, message_text: str) -> Optional[str]:
+    async def _prepare_pma_prompt(
+        self, message_text: str, *, pma_thread_key: str
+    ) -> Optional[tuple[str, dict[str, Any]]]:
+        """Return the PMA prompt and the hub snapshot it was rendered from.
+
+        Hub changes are tracked per PMA thread, so every topic/agent
+        conversation sees the changes since its own last delivered prompt.
+        """
         hub_root = getattr(self, "_hub_root", None)
         if hub_root is None:
             return None
         supervisor = getattr(self, "_hub_supervisor", None)
-        snapshot = await build_hub_snapshot(supervisor, hub_root=Path(hub_root))
+        snapshot = await build_hub_snapshot(
+            supervisor, hub_root=Path(hub_root), changes_for=pma_thread_key
+        )
         base_prompt = load_pma_prompt(hub_root)
-        return format_pma_prompt(base_prompt, snapshot, message_text, hub_root=hub_root)
+        prompt = format_pma_prompt(
+            base_prompt, snapshot, message_text, hub_root=hub_root
+        )
+        return prompt, snapshot
 
     async def _prepare_turn_context(
         self,
@@ -2694,8 +2711,11 @@ class ExecutionCommands(SharedHelpers):
         prompt_text = self._prepare_turn_prompt(
             prompt_text, transcript_text=transcript_text
         )
+        pma_snapshot: Optional[dict[str, Any]] = None
         if pma_enabled:
-            pma_prompt = await self._prepare_pma_prompt(prompt_text)
+            pma_prompt = await self._prepare_pma_prompt(
+                prompt_text, pma_thread_key=pma_thread_key or PMA_KEY
+            )
             if pma_prompt is None:
                 failure_message = "PMA unavailable; hub snapshot failed."
                 if send_failure_response:
@@ -2708,7 +2728,7 @@ class ExecutionCommands(SharedHelpers):
                 return _TurnRunFailure(
                     failure_message, None, transcript_message_id, transcript_text
                 )
-            prompt_text = pma_prompt
+            prompt_text, pma_snapshot = pma_prompt
         else:
             prompt_text, key = await self._prepare_turn_context(
                 message, prompt_text, record
@@ -2725,8 +2745,9 @@ class ExecutionCommands(SharedHelpers):
         )
 
         agent = self._effective_agent(record)
+        result: _TurnRunResult | _TurnRunFailure
         if agent == "opencode":
-            return await self._execute_opencode_turn(
+            result = await self._execute_opencode_turn(
                 message,
                 runtime,
                 record,
@@ -2744,23 +2765,30 @@ class ExecutionCommands(SharedHelpers):
                 pma_thread_registry=pma_thread_registry,
                 pma_thread_key=pma_thread_key,
             )
-
-        return await self._execute_codex_turn(
-            message,
-            runtime,
-            record,
-            prompt_text,
-            thread_id,
-            key,
-            turn_semaphore,
-            input_items,
-            placeholder_id=placeholder_id,
-            placeholder_text=placeholder_text,
-            send_failure_response=send_failure_response,
-            allow_new_thread=allow_new_thread,
-            missing_thread_message=missing_thread_message,
-            transcript_message_id=transcript_message_id,
-            transcript_text=transcript_text,
-            pma_thread_registry=pma_thread_registry,
-            pma_thread_key=pma_thread_key,
-        )
+        else:
+            result = await self._execute_codex_turn(
+                message,
+                runtime,
+                record,
+                prompt_text,
+                thread_id,
+                key,
+                turn_semaphore,
+                input_items,
+                placeholder_id=placeholder_id,
+                placeholder_text=placeholder_text,
+                send_failure_response=send_failure_response,
+                allow_new_thread=allow_new_thread,
+                missing_thread_message=missing_thread_message,
+                transcript_message_id=transcript_message_id,
+                transcript_text=transcript_text,
+                pma_thread_registry=pma_thread_registry,
+                pma_thread_key=pma_thread_key,
+            )
+        if pma_snapshot is not None and isinstance(result, _TurnRunResult):
+            acknowledge_hub_snapshot_changes(
+                getattr(self, "_hub_supervisor", None),
+                pma_snapshot,
+                pma_thread_key or PMA_KEY,
+            )
+        return result
@@ -123,6 +123,21 @@ def format_codex_features(
     return "\n".join(lines)
 
 
+def _is_output_delta_method(method: Any) -> bool:
+    return isinstance(method, str) and "outputDelta" in method
+
+
+def _wants_app_server_notification(method: str) -> bool:
+    """Streaming deltas the Telegram notification handlers render.
+
+    The app-server client skips decoding every other ``*Delta`` notification,
+    so this must stay in step with the checks in ``notifications.py``.
+    """
+    return method == "item/reasoning/summaryTextDelta" or _is_output_delta_method(
+        method
+    )
+
+
 def _extract_thread_id(payload: Any) -> Optional[str]:
     if not isinstance(payload, dict):
         return None
@@ -23,6 +23,7 @@ from .helpers import (
     _extract_files,
     _extract_first_bold_span,
     _extract_turn_thread_id,
+    _is_output_delta_method,
     _truncate_text,
     is_interrupt_status,
 )
@@ -186,7 +187,7 @@ class TelegramNotificationHandlers:
             if method == "error":
                 await self._note_progress_error(params)
                 return
-            if isinstance(method, str) and "outputDelta" in method:
+            if _is_output_delta_method(method):
                 await self._note_progress_output_delta(params)
                 return
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import math
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from enum import Enum
 from typing import Any, Awaitable, Callable, Optional
 
 from ...core.logging_utils import log_event
@@ -13,6 +15,7 @@ from ...core.state import now_iso
 from .constants import (
     OUTBOX_IMMEDIATE_RETRY_DELAYS,
     OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_PARALLEL_CHATS,
     OUTBOX_RETRY_INTERVAL_SECONDS,
 )
 from .retry import _extract_retry_after_seconds
@@ -49,6 +52,27 @@ def _parse_next_attempt_at(next_at_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
+def _record_due_at(record: OutboxRecord) -> Optional[datetime]:
+    """When ``record`` may be attempted again (``None`` means right away)."""
+    next_at = _parse_next_attempt_at(record.next_attempt_at)
+    if next_at is not None:
+        return next_at
+    if record.attempts > 0:
+        last_at = _parse_next_attempt_at(record.last_attempt_at)
+        if last_at is not None:
+            return last_at + timedelta(seconds=OUTBOX_RETRY_INTERVAL_SECONDS)
+    return None
+
+
+class _SendOutcome(Enum):
+    DELIVERED = "delivered"
+    # The record is gone (delivered or dropped elsewhere); later records of
+    # the chat may proceed.
+    GONE = "gone"
+    # The send failed or is in flight elsewhere; later records must wait.
+    HELD = "held"
+
+
 class TelegramOutboxManager:
     def __init__(
         self,
@@ -67,11 +91,26 @@ class TelegramOutboxManager:
         self._inflight: set[str] = set()
         self._inflight_outbox_keys: set[str] = set()
         self._lock: Optional[asyncio.Lock] = None
+        # Records currently driven by send_message_with_outbox; the background
+        # loop leaves them alone until that call gives up.
+        self._owned_records: set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._chat_tasks: dict[int, asyncio.Task[bool]] = {}
+        self._chat_slots: Optional[asyncio.Semaphore] = None
 
     def start(self) -> None:
         self._inflight = set()
         self._inflight_outbox_keys = set()
+        self._owned_records = set()
+        self._chat_tasks = {}
         self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._chat_slots = asyncio.Semaphore(OUTBOX_MAX_PARALLEL_CHATS)
+
+    def notify(self) -> None:
+        """Wake the delivery loop so it re-reads the outbox."""
+        if self._wakeup is not None:
+            self._wakeup.set()
 
     async def restore(self) -> None:
         records = await self._store.list_outbox()
@@ -117,26 +156,55 @@ class TelegramOutboxManager:
         await self._flush(records)
 
     async def run_loop(self) -> None:
-        while True:
-            await asyncio.sleep(OUTBOX_RETRY_INTERVAL_SECONDS)
-            records = []
-            try:
-                records = await self._store.list_outbox()
-                if records:
-                    await self._flush(records)
-            except Exception as exc:
-                log_event(
-                    self._logger,
-                    logging.WARNING,
-                    "telegram.outbox.flush_failed",
-                    exc=exc,
-                    record_count=len(records) if records else 0,
-                )
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        wakeup = self._wakeup
+        try:
+            while True:
+                # Cleared before reading so a wakeup during the read is kept.
+                wakeup.clear()
+                records = []
+                timeout: Optional[float] = OUTBOX_RETRY_INTERVAL_SECONDS
+                try:
+                    records = await self._store.list_outbox()
+                    next_due, _tasks = self._dispatch(records)
+                    if next_due is None:
+                        # Nothing deferred: sleep until an enqueue or a chat
+                        # task finishing wakes us.
+                        timeout = None
+                    else:
+                        now = datetime.now(timezone.utc)
+                        timeout = max(0.0, (next_due - now).total_seconds())
+                except Exception as exc:
+                    log_event(
+                        self._logger,
+                        logging.WARNING,
+                        "telegram.outbox.flush_failed",
+                        exc=exc,
+                        record_count=len(records) if records else 0,
+                    )
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(self._chat_tasks.values()):
+                task.cancel()
 
     async def send_message_with_outbox(
         self,
         record: OutboxRecord,
     ) -> bool:
+        self._owned_records.add(record.record_id)
+        try:
+            return await self._send_owned(record)
+        finally:
+            self._owned_records.discard(record.record_id)
+            # Anything left undelivered (or held back behind this record) is
+            # now the delivery loop's job.
+            self.notify()
+
+    async def _send_owned(self, record: OutboxRecord) -> bool:
         await self._store.enqueue_outbox(record)
         conversation_id = None
         try:
@@ -165,7 +233,7 @@ class TelegramOutboxManager:
                 sleep_duration = (next_at - now).total_seconds()
                 if sleep_duration > 0.01:
                     await asyncio.sleep(sleep_duration)
-            if await self._attempt_send(current):
+            if await self._attempt_send(current) is _SendOutcome.DELIVERED:
                 return True
             current = await self._store.get_outbox(record.record_id)
             if current is None:
@@ -193,28 +261,90 @@ class TelegramOutboxManager:
                 await asyncio.sleep(delay)
         return False
 
-    async def _flush(self, records: list[OutboxRecord]) -> None:
+    async def _flush(self, records: list[OutboxRecord]) -> Optional[datetime]:
+        """Deliver ready records, wait for them, and return the next due time."""
+        next_due, tasks = self._dispatch(records)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return next_due
+
+    def _dispatch(
+        self, records: list[OutboxRecord]
+    ) -> tuple[Optional[datetime], list[asyncio.Task[bool]]]:
+        """Start one delivery task per chat that has ready records.
+
+        Chats are delivered concurrently; records within a chat go out in
+        ``created_at`` order. A record that is not yet due, or is being sent
+        elsewhere, holds back every later record of its chat. Chats that
+        already have a task in flight are skipped: the task wakes the loop
+        when it finishes.
+        """
         now = datetime.now(timezone.utc)
-        ready_records: list[OutboxRecord] = []
+        next_due: Optional[datetime] = None
+        ready_by_chat: dict[int, list[OutboxRecord]] = {}
+        held_chats: set[int] = set()
         for record in records:
-            next_at = _parse_next_attempt_at(record.next_attempt_at)
-            if next_at is None or now >= next_at:
-                ready_records.append(record)
-
-        # Keep only the last ready record per outbox_key, but do not drop deferred
-        # future records; we leave them for later flush cycles. Latest wins to avoid
-        # delivering stale edits.
-        coalesced_ready: dict[str, OutboxRecord] = {}
-        for record in ready_records:
+            if record.chat_id in self._chat_tasks or record.chat_id in held_chats:
+                continue
+            if (
+                record.record_id in self._owned_records
+                or (record.outbox_key or record.record_id) in self._inflight_outbox_keys
+            ):
+                held_chats.add(record.chat_id)
+                continue
+            due_at = _record_due_at(record)
+            if due_at is not None and now < due_at:
+                if next_due is None or due_at < next_due:
+                    next_due = due_at
+                held_chats.add(record.chat_id)
+                continue
+            ready_by_chat.setdefault(record.chat_id, []).append(record)
+        tasks: list[asyncio.Task[bool]] = []
+        for chat_id, chat_records in ready_by_chat.items():
+            task = asyncio.create_task(self._deliver_chat(chat_records))
+            self._chat_tasks[chat_id] = task
+            task.add_done_callback(functools.partial(self._chat_task_done, chat_id))
+            tasks.append(task)
+        return next_due, tasks
+
+    async def _deliver_chat(self, chat_records: list[OutboxRecord]) -> bool:
+        # Keep only the last ready record per outbox_key (latest wins to avoid
+        # delivering stale edits), at the position of that record.
+        latest: dict[str, OutboxRecord] = {}
+        for record in chat_records:
             if record.outbox_key is not None:
-                coalesced_ready[record.outbox_key] = record
-            else:
-                await self._process_record(record)
+                latest[record.outbox_key] = record
+        if self._chat_slots is None:
+            self._chat_slots = asyncio.Semaphore(OUTBOX_MAX_PARALLEL_CHATS)
+        async with self._chat_slots:
+            for record in chat_records:
+                if (
+                    record.outbox_key is not None
+                    and latest[record.outbox_key] is not record
+                ):
+                    continue
+                if not await self._process_record(record):
+                    return False
+        return True
 
-        for record in coalesced_ready.values():
-            await self._process_record(record)
+    def _chat_task_done(self, chat_id: int, task: asyncio.Task[bool]) -> None:
+        if self._chat_tasks.get(chat_id) is task:
+            self._chat_tasks.pop(chat_id, None)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            log_event(
+                self._logger,
+                logging.WARNING,
+                "telegram.outbox.flush_failed",
+                exc=exc if isinstance(exc, Exception) else None,
+                chat_id=chat_id,
+            )
+        self.notify()
 
-    async def _process_record(self, record: OutboxRecord) -> None:
+    async def _process_record(self, record: OutboxRecord) -> bool:
+        """Attempt ``record``; ``False`` means later records must wait."""
         with self._conversation_context(record.chat_id, record.thread_id):
             conversation_id = None
             try:
@@ -247,18 +377,18 @@ class TelegramOutboxManager:
                         "Delivery failed after retries. Please resend.",
                         message_thread_id=record.thread_id,
                     )
-                return
-            await self._attempt_send(record)
+                return True
+            return await self._attempt_send(record) is not _SendOutcome.HELD
 
-    async def _attempt_send(self, record: OutboxRecord) -> bool:
+    async def _attempt_send(self, record: OutboxRecord) -> _SendOutcome:
         current = await self._store.get_outbox(record.record_id)
         if current is None:
-            return False
+            return _SendOutcome.GONE
         record = current
         if not await self._mark_inflight(
             record.outbox_key if record.outbox_key else record.record_id
         ):
-            return False
+            return _SendOutcome.HELD
         conversation_id = None
         try:
             conversation_id = topic_key(record.chat_id, record.thread_id)
@@ -300,7 +430,7 @@ class TelegramOutboxManager:
                     exc=exc,
                     conversation_id=conversation_id,
                 )
-                return False
+                return _SendOutcome.HELD
             finally:
                 await self._clear_inflight(
                     record.outbox_key if record.outbox_key else record.record_id
@@ -333,7 +463,7 @@ class TelegramOutboxManager:
                 message_id=record.message_id,
                 conversation_id=conversation_id,
             )
-            return True
+            return _SendOutcome.DELIVERED
 
     async def _mark_inflight(self, key: str) -> bool:
         if self._lock is None:
@@ -0,0 +1,312 @@
+"""Client-side token buckets for outgoing Telegram Bot API calls.
+
+Telegram enforces roughly 30 messages per second per bot, about one message
+per second per chat and 20 messages per minute per group. Instead of waiting
+for a 429, :class:`TelegramRequestScheduler` grants each chat-bound call a
+token from the global bucket and from the bucket of its chat. Sends and
+callback answers are granted before queued ``editMessageText`` calls, and a
+queued edit is dropped as soon as a newer edit of the same message arrives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Hashable, Optional, Union
+
+ChatId = Union[int, str]
+
+GLOBAL_RATE_PER_SECOND = 30.0
+GLOBAL_BURST = 30.0
+CHAT_RATE_PER_SECOND = 1.0
+CHAT_BURST = 3.0
+GROUP_RATE_PER_SECOND = 20.0 / 60.0
+GROUP_BURST = 5.0
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+# Methods that do not produce chat traffic and are never throttled here.
+_UNSCHEDULED_METHODS = frozenset(
+    {"getUpdates", "getFile", "getMe", "setMyCommands", "deleteMyCommands"}
+)
+_LOW_PRIORITY_METHODS = frozenset({"editMessageText"})
+# Callback answers only count against the global budget.
+_GLOBAL_ONLY_METHODS = frozenset({"answerCallbackQuery"})
+_MAX_IDLE_CHAT_BUCKETS = 1024
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, *, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 when one is ready)."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1.0
+
+    def drain(self, seconds: float, now: float) -> None:
+        """Empty the bucket so the next token appears after ``seconds``."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1.0 - seconds * self.rate)
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass(eq=False)
+class _Waiter:
+    seq: int
+    chat_key: Optional[ChatId]
+    supersede_key: Optional[Hashable]
+    future: asyncio.Future[bool]
+    enqueued_at: float
+
+
+@dataclass
+class SchedulerStats:
+    granted: int = 0
+    superseded: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    by_method: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "granted": self.granted,
+            "superseded": self.superseded,
+            "waited": self.waited,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "by_method": dict(self.by_method),
+        }
+
+
+def _is_group_chat(chat_id: ChatId) -> bool:
+    if isinstance(chat_id, int):
+        return chat_id < 0
+    # Public channel/supergroup usernames.
+    return str(chat_id).startswith(("-", "@"))
+
+
+class TelegramRequestScheduler:
+    def __init__(
+        self,
+        *,
+        global_rate: float = GLOBAL_RATE_PER_SECOND,
+        global_burst: float = GLOBAL_BURST,
+        chat_rate: float = CHAT_RATE_PER_SECOND,
+        chat_burst: float = CHAT_BURST,
+        group_rate: float = GROUP_RATE_PER_SECOND,
+        group_burst: float = GROUP_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._group_rate = group_rate
+        self._group_burst = group_burst
+        self._global = TokenBucket(global_rate, global_burst, now=clock())
+        self._chats: dict[ChatId, TokenBucket] = {}
+        self._queues: tuple[Deque[_Waiter], Deque[_Waiter]] = (deque(), deque())
+        self._pending_edits: dict[Hashable, _Waiter] = {}
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = SchedulerStats()
+
+    @staticmethod
+    def applies_to(method: str) -> bool:
+        return method not in _UNSCHEDULED_METHODS
+
+    async def acquire(
+        self,
+        method: str,
+        chat_id: Optional[ChatId] = None,
+        *,
+        message_id: Optional[int] = None,
+    ) -> bool:
+        """Wait for a slot for ``method``.
+
+        Returns ``False`` when the call was superseded by a newer edit of the
+        same message and should not be sent at all.
+        """
+        if not self.applies_to(method):
+            return True
+        chat_key: Optional[ChatId] = None
+        if chat_id is not None and method not in _GLOBAL_ONLY_METHODS:
+            chat_key = chat_id
+        priority = PRIORITY_LOW if method in _LOW_PRIORITY_METHODS else PRIORITY_HIGH
+        supersede_key: Optional[Hashable] = None
+        if method in _LOW_PRIORITY_METHODS and message_id is not None:
+            supersede_key = (chat_id, message_id)
+        loop = self._bind_loop()
+        now = self._clock()
+        waiter = _Waiter(
+            seq=next(self._seq),
+            chat_key=chat_key,
+            supersede_key=supersede_key,
+            future=loop.create_future(),
+            enqueued_at=now,
+        )
+        if supersede_key is not None:
+            previous = self._pending_edits.get(supersede_key)
+            if previous is not None and not previous.future.done():
+                previous.future.set_result(False)
+                self._stats.superseded += 1
+            self._pending_edits[supersede_key] = waiter
+        self._queues[priority].append(waiter)
+        self._pump()
+        try:
+            granted = await waiter.future
+        finally:
+            if (
+                supersede_key is not None
+                and self._pending_edits.get(supersede_key) is waiter
+            ):
+                self._pending_edits.pop(supersede_key, None)
+            if waiter.future.cancelled():
+                # Cancelled while queued: let the pump discard it.
+                self._pump()
+        if granted:
+            self._stats.by_method[method] = self._stats.by_method.get(method, 0) + 1
+            waited = self._clock() - waiter.enqueued_at
+            if waited > 0.001:
+                self._stats.waited += 1
+                self._stats.wait_seconds += waited
+                self._stats.max_wait_seconds = max(self._stats.max_wait_seconds, waited)
+        return granted
+
+    def penalize(self, chat_id: ChatId, retry_after: float) -> None:
+        """Feed a flood wait reported for ``chat_id`` back into its bucket."""
+        now = self._clock()
+        self._chat_bucket(chat_id, now).drain(retry_after, now)
+
+    def stats(self) -> dict[str, Any]:
+        payload = self._stats.to_dict()
+        payload["queued"] = sum(
+            1 for queue in self._queues for w in queue if not w.future.done()
+        )
+        payload["chat_buckets"] = len(self._chats)
+        return payload
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Waiters and timers cannot outlive their event loop.
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for queue in self._queues:
+                queue.clear()
+            self._pending_edits.clear()
+            self._loop = loop
+        return loop
+
+    def _chat_bucket(self, chat_key: ChatId, now: float) -> TokenBucket:
+        bucket = self._chats.get(chat_key)
+        if bucket is None:
+            if len(self._chats) >= _MAX_IDLE_CHAT_BUCKETS:
+                self._prune_chat_buckets(now)
+            if _is_group_chat(chat_key):
+                bucket = TokenBucket(self._group_rate, self._group_burst, now=now)
+            else:
+                bucket = TokenBucket(self._chat_rate, self._chat_burst, now=now)
+            self._chats[chat_key] = bucket
+        return bucket
+
+    def _prune_chat_buckets(self, now: float) -> None:
+        busy = {w.chat_key for queue in self._queues for w in queue}
+        for key in [
+            key
+            for key, bucket in self._chats.items()
+            if key not in busy and bucket.is_full(now)
+        ]:
+            self._chats.pop(key, None)
+
+    def _pump(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = self._clock()
+        next_delay: Optional[float] = None
+        global_blocked = False
+        # Chats whose head waiter is blocked; later waiters for the same chat
+        # must not overtake it, even from a lower priority queue.
+        blocked_chats: set[ChatId] = set()
+        for queue in self._queues:
+            remaining: Deque[_Waiter] = deque()
+            while queue:
+                waiter = queue.popleft()
+                if waiter.future.done():
+                    continue
+                if global_blocked or (
+                    waiter.chat_key is not None and waiter.chat_key in blocked_chats
+                ):
+                    remaining.append(waiter)
+                    continue
+                chat_bucket = (
+                    self._chat_bucket(waiter.chat_key, now)
+                    if waiter.chat_key is not None
+                    else None
+                )
+                chat_delay = chat_bucket.delay(now) if chat_bucket else 0.0
+                if chat_delay > 0 and waiter.chat_key is not None:
+                    blocked_chats.add(waiter.chat_key)
+                    remaining.append(waiter)
+                    next_delay = (
+                        chat_delay
+                        if next_delay is None
+                        else min(next_delay, chat_delay)
+                    )
+                    continue
+                global_delay = self._global.delay(now)
+                if global_delay > 0:
+                    # Head-of-line: lower priority calls must not take the
+                    # next global token from this one.
+                    global_blocked = True
+                    remaining.append(waiter)
+                    next_delay = (
+                        global_delay
+                        if next_delay is None
+                        else min(next_delay, global_delay)
+                    )
+                    continue
+                self._global.take(now)
+                if chat_bucket is not None:
+                    chat_bucket.take(now)
+                self._stats.granted += 1
+                waiter.future.set_result(True)
+            queue.extend(remaining)
+        if next_delay is not None and self._loop is not None:
+            self._timer = self._loop.call_later(next_delay, self._pump)
+
+
+__all__ = [
+    "PRIORITY_HIGH",
+    "PRIORITY_LOW",
+    "SchedulerStats",
+    "TelegramRequestScheduler",
+    "TokenBucket",
+]
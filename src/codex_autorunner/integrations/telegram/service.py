@@ -71,6 +71,7 @@ from .helpers import (
     _read_lock_payload,
     _split_topic_key,
     _telegram_lock_path,
+    _wants_app_server_notification,
     _with_conversation_id,
 )
 from .notifications import TelegramNotificationHandlers
@@ -219,6 +220,7 @@ class TelegramBotService(
             env_builder=self._build_workspace_env,
             approval_handler=self._handle_approval_request,
             notification_handler=self._handle_app_server_notification,
+            notification_filter=_wants_app_server_notification,
             logger=self._logger,
             auto_restart=self._app_server_auto_restart,
             max_handles=config.app_server_max_handles,
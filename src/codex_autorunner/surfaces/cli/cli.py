@@ -38,6 +38,11 @@ from ...core.config import (
 )
 from ...core.flows import FlowController, FlowStore
 from ...core.flows.models import FlowEventType, FlowRunRecord, FlowRunStatus
+from ...core.flows.retention import (
+    FlowEventRetentionPolicy,
+    apply_flow_event_retention,
+)
+from ...core.flows.store import DEFAULT_EVENT_BATCH_SIZE
 from ...core.flows.ux_helpers import build_flow_status_snapshot, ensure_worker
 from ...core.flows.worker_process import (
     check_worker_health,
@@ -1434,6 +1439,7 @@ def usage(
             codex_root,
             since=since_dt,
             until=until_dt,
+            max_workers=config.usage.parse_workers,
         )
         if output_json:
             payload = {
@@ -2668,6 +2674,62 @@ def hub_runs_cleanup(
         _raise_exit("hub runs cleanup encountered errors.")
 
 
+@hub_runs_app.command("compact")
+def hub_runs_compact(
+    archive_after: Optional[str] = typer.Option(
+        "14d",
+        "--archive-after",
+        help="Archive events of runs finished longer ago than this (e.g. 7d); 'never' disables",
+    ),
+    vacuum: bool = typer.Option(
+        False, "--vacuum", help="VACUUM flows.db afterwards to shrink the file"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Preview only"),
+    path: Optional[Path] = typer.Option(None, "--path", "--hub", help="Hub root path"),
+    pretty: bool = typer.Option(False, "--pretty", help="Pretty-print JSON output"),
+):
+    """Compact and archive flow events of finished runs across hub repos."""
+    config = _require_hub_config(path)
+    manifest = load_manifest(config.manifest_path, config.root)
+    archive_after_days: Optional[float] = None
+    if archive_after and archive_after.strip().lower() != "never":
+        archive_after_days = _parse_duration(archive_after).total_seconds() / 86400
+    policy = FlowEventRetentionPolicy(
+        archive_after_days=archive_after_days, vacuum=vacuum, dry_run=dry_run
+    )
+
+    results: list[dict[str, Any]] = []
+    errors: list[dict[str, Any]] = []
+    for entry in manifest.repos:
+        repo_root = (config.root / entry.path).resolve()
+        db_path = repo_root / ".codex-autorunner" / "flows.db"
+        if not db_path.exists():
+            continue
+        try:
+            repo_config = load_repo_config(repo_root, hub_path=config.root)
+            with FlowStore(db_path, durable=repo_config.durable_writes) as store:
+                report = apply_flow_event_retention(store, policy)
+        except Exception as exc:
+            errors.append({"repo_id": entry.id, "error": str(exc)})
+            continue
+        summary = report.to_dict()
+        summary["repo_id"] = entry.id
+        results.append(summary)
+        errors.extend({"repo_id": entry.id, **err} for err in report.errors)
+
+    payload = {
+        "dry_run": dry_run,
+        "archive_after": archive_after,
+        "vacuum": vacuum,
+        "reclaimed_bytes": sum(item["reclaimed_bytes"] for item in results),
+        "results": results,
+        "errors": errors,
+    }
+    typer.echo(json.dumps(payload, indent=2 if pretty else None))
+    if errors:
+        raise typer.Exit(code=1)
+
+
 def _print_ticket_import_report(report) -> None:
     typer.echo(f"Repo: {report.repo_id}")
     typer.echo(f"Ticket dir: {report.ticket_dir}")
@@ -4183,6 +4245,8 @@ def flow_worker(
             db_path=db_path,
             artifacts_root=artifacts_root,
             durable=engine.config.durable_writes,
+            # Workers emit many small events per turn; group-commit them.
+            event_batch_size=DEFAULT_EVENT_BATCH_SIZE,
         )
         controller.initialize()
 
@@ -4239,6 +4303,7 @@ def flow_worker(
                     await agent_pool.close()
                 except Exception:
                     typer.echo("Failed to close agent pool cleanly", err=True)
+            controller.shutdown()
 
     asyncio.run(_run_worker())
 
@@ -6,7 +6,11 @@ from typing import Any, Optional
 import typer
 import yaml
 
-from ...core.config import CONFIG_FILENAME, load_hub_config
+from ...core.config import (
+    CONFIG_FILENAME,
+    invalidate_config_cache,
+    load_hub_config,
+)
 from ...core.locks import file_lock
 
 
@@ -48,6 +52,7 @@ class TemplateReposManager:
             self.hub_config_path.write_text(
                 yaml.safe_dump(self._data, sort_keys=False), encoding="utf-8"
             )
+        invalidate_config_cache()
 
     def list_repos(self) -> list[dict[str, Any]]:
         """List all configured template repos."""
@@ -9,7 +9,7 @@ from contextlib import ExitStack, asynccontextmanager
 from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Callable, Dict, Mapping, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import HTMLResponse
@@ -46,16 +46,19 @@ from ...core.flows.models import FlowRunStatus
 from ...core.flows.reconciler import reconcile_flow_runs
 from ...core.flows.store import FlowStore
 from ...core.hub import HubSupervisor
-from ...core.logging_utils import safe_log, setup_rotating_logger
+from ...core.logging_utils import (
+    flush_log_pipeline,
+    safe_log,
+    setup_rotating_logger,
+)
 from ...core.optional_dependencies import require_optional_dependencies
 from ...core.pma_context import (
     build_ticket_flow_run_state,
-    get_latest_ticket_flow_run_state,
+    collect_repo_flow_states,
 )
 from ...core.request_context import get_request_id
 from ...core.runtime import LockError, RuntimeContext
 from ...core.state import load_state, persist_session_registry
-from ...core.ticket_flow_summary import build_ticket_flow_summary
 from ...core.usage import (
     UsageError,
     default_codex_home,
@@ -353,6 +356,44 @@ def _app_server_prune_interval(idle_ttl_seconds: Optional[int]) -> Optional[floa
     return float(min(600.0, max(60.0, idle_ttl_seconds / 2)))
 
 
+# Warm spares are topped up on their own cadence (independent of idle pruning)
+# and immediately after an eviction by the supervisors themselves.
+_PREWARM_INTERVAL_SECONDS = 15.0
+
+
+async def _prewarm_loop(supervisor: Any, *, logger: logging.Logger, label: str) -> None:
+    try:
+        while True:
+            try:
+                await supervisor.prewarm()
+            except Exception as exc:
+                safe_log(logger, logging.WARNING, f"{label} prewarm task failed", exc)
+            await asyncio.sleep(_PREWARM_INTERVAL_SECONDS)
+    except asyncio.CancelledError:
+        return
+
+
+def _start_prewarm_loops(app: FastAPI, *, label_prefix: str = "") -> list[asyncio.Task]:
+    tasks: list[asyncio.Task] = []
+    for attr, label in (
+        ("app_server_supervisor", "App-server"),
+        ("opencode_supervisor", "OpenCode"),
+    ):
+        supervisor = getattr(app.state, attr, None)
+        if supervisor is None or getattr(supervisor, "warm_spares", 0) <= 0:
+            continue
+        tasks.append(
+            asyncio.create_task(
+                _prewarm_loop(
+                    supervisor,
+                    logger=app.state.logger,
+                    label=f"{label_prefix}{label}",
+                )
+            )
+        )
+    return tasks
+
+
 def _normalize_approval_path(path: str, repo_root: Path) -> str:
     raw = (path or "").strip()
     if not raw:
@@ -450,6 +491,7 @@ def _build_app_server_supervisor(
     base_env: Optional[Mapping[str, str]] = None,
     notification_handler: Optional[NotificationHandler] = None,
     approval_handler: Optional[ApprovalHandler] = None,
+    warm_workspaces: Optional[Callable[[], list[Path]]] = None,
 ) -> tuple[Optional[WorkspaceAppServerSupervisor], Optional[float]]:
     if not config.command:
         return None, None
@@ -493,10 +535,52 @@ def _build_app_server_supervisor(
         output_policy=config.output.policy,
         notification_handler=notification_handler,
         approval_handler=approval_handler,
+        warm_spares=config.warm_spares,
+        warm_workspaces=warm_workspaces,
     )
     return supervisor, _app_server_prune_interval(config.idle_ttl_seconds)
 
 
+def _has_paused_ticket_flow(repo_root: Path) -> bool:
+    db_path = repo_root / ".codex-autorunner" / "flows.db"
+    if not db_path.exists():
+        return False
+    with FlowStore(db_path) as store:
+        paused = store.list_flow_runs(
+            flow_type="ticket_flow", status=FlowRunStatus.PAUSED
+        )
+    return bool(paused)
+
+
+def _paused_ticket_flow_workspaces(repo_root: Path) -> Callable[[], list[Path]]:
+    """Predict the repo needs an app-server soon while a ticket flow is paused."""
+
+    def _predict() -> list[Path]:
+        return [repo_root] if _has_paused_ticket_flow(repo_root) else []
+
+    return _predict
+
+
+def _hub_paused_ticket_flow_workspaces(
+    supervisor: HubSupervisor, logger: logging.Logger
+) -> Callable[[], list[Path]]:
+    """Predict which hub repos need an app-server soon (paused ticket flows)."""
+
+    def _predict() -> list[Path]:
+        workspaces: list[Path] = []
+        for snapshot in supervisor.list_repos():
+            if not snapshot.exists_on_disk or not snapshot.initialized:
+                continue
+            try:
+                if _has_paused_ticket_flow(snapshot.path):
+                    workspaces.append(snapshot.path)
+            except Exception as exc:
+                logger.debug("Failed to read ticket flows for %s: %s", snapshot.id, exc)
+        return workspaces
+
+    return _predict
+
+
 def _parse_command(raw: Optional[str]) -> list[str]:
     if not raw:
         return []
@@ -637,6 +721,7 @@ def _build_app_context(
         base_env=env,
         notification_handler=app_server_events.handle_notification,
         approval_handler=_file_write_approval_handler,
+        warm_workspaces=_paused_ticket_flow_workspaces(engine.repo_root),
     )
     app_server_threads = AppServerThreadRegistry(
         default_app_server_threads_path(engine.repo_root)
@@ -646,6 +731,7 @@ def _build_app_context(
         workspace_root=engine.repo_root,
         logger=logger,
         base_env=env,
+        warm_workspaces=_paused_ticket_flow_workspaces(engine.repo_root),
     )
     if opencode_supervisor is None:
         safe_log(
@@ -879,11 +965,13 @@ def _build_hub_context(
             exc=exc,
         )
     app_server_events = AppServerEventBuffer()
+    warm_workspaces = _hub_paused_ticket_flow_workspaces(supervisor, logger)
     app_server_supervisor, app_server_prune_interval = _build_app_server_supervisor(
         config.app_server,
         logger=logger,
         event_prefix="hub.app_server",
         notification_handler=app_server_events.handle_notification,
+        warm_workspaces=warm_workspaces,
     )
     app_server_threads = AppServerThreadRegistry(
         default_app_server_threads_path(config.root)
@@ -893,6 +981,7 @@ def _build_hub_context(
         workspace_root=config.root,
         logger=logger,
         base_env=resolve_env_for_root(config.root),
+        warm_workspaces=warm_workspaces,
     )
     if opencode_supervisor is None:
         safe_log(
@@ -1076,6 +1165,8 @@ def _app_lifespan(context: AppContext):
 
             tasks.append(asyncio.create_task(_opencode_prune_loop()))
 
+        tasks.extend(_start_prewarm_loops(app))
+
         if (
             context.tui_idle_seconds is not None
             and context.tui_idle_check_seconds is not None
@@ -1184,6 +1275,8 @@ def _app_lifespan(context: AppContext):
             static_context = getattr(app.state, "static_assets_context", None)
             if static_context is not None:
                 static_context.close()
+            # Shutdown messages above may still be queued for the log writer.
+            await asyncio.to_thread(flush_log_pipeline)
 
     return lifespan
 
@@ -1574,12 +1667,26 @@ def create_hub_app(
             repo_dict["mounted"] = False
         return repo_dict
 
-    def _get_ticket_flow_summary(repo_path: Path) -> Optional[dict]:
-        """Get ticket flow summary for a repo (status, done/total, step).
+    async def _repo_dicts(snapshots) -> list[dict]:
+        """Repo payloads with ticket flow summary (status, done/total, step)
+        and latest run state, served from the hub snapshot cache.
 
-        Returns None if no ticket flow exists or repo is not initialized.
+        Both are None if no ticket flow exists or the repo is not initialized.
         """
-        return build_ticket_flow_summary(repo_path, include_failure=True)
+        states = await asyncio.to_thread(
+            collect_repo_flow_states,
+            context.supervisor,
+            snapshots,
+            include_failure=True,
+        )
+        repos = []
+        for snap in snapshots:
+            repo_dict = _add_mount_info(snap.to_dict(context.config.root))
+            state = states.get(snap.id) or {}
+            repo_dict["ticket_flow"] = state.get("ticket_flow")
+            repo_dict["run_state"] = state.get("run_state")
+            repos.append(repo_dict)
+        return repos
 
     initial_snapshots = context.supervisor.scan()
     for snap in initial_snapshots:
@@ -1649,6 +1756,7 @@ def create_hub_app(
                         )
 
             asyncio.create_task(_opencode_prune_loop())
+        _start_prewarm_loops(app, label_prefix="Hub ")
         pma_cfg = getattr(app.state.config, "pma", None)
         if pma_cfg is not None and pma_cfg.enabled:
             starter = getattr(app.state, "pma_lane_worker_start", None)
@@ -2238,48 +2346,28 @@ def create_hub_app(
         snapshots = await asyncio.to_thread(context.supervisor.list_repos)
         await _refresh_mounts(snapshots)
 
-        def _enrich_repo(snap):
-            repo_dict = _add_mount_info(snap.to_dict(context.config.root))
-            if snap.initialized and snap.exists_on_disk:
-                repo_dict["ticket_flow"] = _get_ticket_flow_summary(snap.path)
-                repo_dict["run_state"] = get_latest_ticket_flow_run_state(
-                    snap.path, snap.id
-                )
-            else:
-                repo_dict["ticket_flow"] = None
-                repo_dict["run_state"] = None
-            return repo_dict
-
         return {
             "last_scan_at": context.supervisor.state.last_scan_at,
-            "repos": [_enrich_repo(snap) for snap in snapshots],
+            "repos": await _repo_dicts(snapshots),
         }
 
     @app.get("/hub/version")
     def hub_version():
         return {"asset_version": app.state.asset_version}
 
+    @app.get("/hub/lifecycle/stats")
+    def hub_lifecycle_stats():
+        return context.supervisor.lifecycle_metrics()
+
     @app.post("/hub/repos/scan")
     async def scan_repos():
         safe_log(app.state.logger, logging.INFO, "Hub scan_repos")
         snapshots = await asyncio.to_thread(context.supervisor.scan)
         await _refresh_mounts(snapshots)
 
-        def _enrich_repo(snap):
-            repo_dict = _add_mount_info(snap.to_dict(context.config.root))
-            if snap.initialized and snap.exists_on_disk:
-                repo_dict["ticket_flow"] = _get_ticket_flow_summary(snap.path)
-                repo_dict["run_state"] = get_latest_ticket_flow_run_state(
-                    snap.path, snap.id
-                )
-            else:
-                repo_dict["ticket_flow"] = None
-                repo_dict["run_state"] = None
-            return repo_dict
-
         return {
             "last_scan_at": context.supervisor.state.last_scan_at,
-            "repos": [_enrich_repo(snap) for snap in snapshots],
+            "repos": await _repo_dicts(snapshots),
         }
 
     @app.post("/hub/jobs/scan", response_model=HubJobResponse)
@@ -14,6 +14,9 @@ from ptyprocess import PtyProcess
 logger = logging.getLogger("codex_autorunner.web.pty_session")
 
 REPLAY_END = object()
+# Sent to a subscriber whose queue overflowed; it should re-subscribe from the
+# last offset it delivered.
+RESYNC = object()
 
 ALT_SCREEN_ENTER_SEQS = (
     b"\x1b[?1049h",
@@ -34,6 +37,16 @@ PTY_WRITE_CHUNK_BYTES = 16 * 1024
 PTY_WRITE_FLUSH_MAX_BYTES = 256 * 1024
 # Hard cap to prevent unbounded buffering when the PTY can't accept input.
 PTY_PENDING_MAX_BYTES = 1024 * 1024
+# Reads grow while the PTY keeps filling them and shrink back when it idles.
+PTY_READ_MIN_BYTES = 4 * 1024
+PTY_READ_MAX_BYTES = 64 * 1024
+# Output is coalesced for this long before fan-out, so a noisy TUI produces a
+# few large websocket frames instead of many 4 KB ones.
+PTY_OUTPUT_COALESCE_SECONDS = 0.005
+PTY_OUTPUT_FRAME_MAX_BYTES = 64 * 1024
+PTY_SCROLLBACK_MAX_BYTES = 512 * 1024
+# Frames a subscriber may fall behind before it is dropped and told to resync.
+PTY_SUBSCRIBER_QUEUE_MAX_FRAMES = 64
 
 
 def default_env(env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
@@ -132,9 +145,18 @@ class ActiveSession:
         self.pty = pty
         # Keep a bounded scrollback buffer for reconnects.
         # This is sized in bytes (not chunks) so behavior is predictable.
-        self._buffer_max_bytes = 512 * 1024  # 512KB
+        # Chunks are addressed by absolute output offset so reconnecting
+        # clients can resume where they stopped instead of replaying it all.
+        self._buffer_max_bytes = PTY_SCROLLBACK_MAX_BYTES
         self._buffer_bytes = 0
+        self._buffer_start_offset = 0
+        self.output_offset = 0
         self.buffer: collections.deque[bytes] = collections.deque()
+        self._read_size = PTY_READ_MIN_BYTES
+        self._pending_output = bytearray()
+        self._output_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+        self.subscribers_dropped = 0
         self.subscribers: set[asyncio.Queue[object]] = set()
         self.lock = asyncio.Lock()
         self.loop = loop
@@ -237,43 +259,113 @@ class ActiveSession:
             if self.pty.closed:
                 return
             try:
-                data = os.read(self.pty.fd, 4096)
+                data = os.read(self.pty.fd, self._read_size)
             except BlockingIOError:
                 return
             if data:
+                if len(data) >= self._read_size:
+                    self._read_size = min(self._read_size * 2, PTY_READ_MAX_BYTES)
+                elif len(data) < self._read_size // 4:
+                    self._read_size = max(self._read_size // 2, PTY_READ_MIN_BYTES)
                 self._update_alt_screen_state(data)
                 now = time.time()
                 self.pty.last_active = now
                 self.last_output_at = now
                 self._output_since_idle = True
                 self._idle_notified_at = None
-                self.buffer.append(data)
-                self._buffer_bytes += len(data)
-                while self._buffer_bytes > self._buffer_max_bytes and self.buffer:
-                    dropped = self.buffer.popleft()
-                    self._buffer_bytes -= len(dropped)
-                for queue in list(self.subscribers):
-                    try:
-                        queue.put_nowait(data)
-                    except asyncio.QueueFull:
-                        logger.debug(
-                            "Subscriber queue full, dropping data for session %s",
-                            self.id,
-                        )
+                self._pending_output.extend(data)
+                if len(self._pending_output) >= PTY_OUTPUT_FRAME_MAX_BYTES:
+                    self._flush_output()
+                elif self._output_flush_handle is None:
+                    self._output_flush_handle = self.loop.call_later(
+                        PTY_OUTPUT_COALESCE_SECONDS, self._flush_output
+                    )
             else:
                 self.close()
         except OSError:
             self.close()
 
+    def _flush_output(self) -> None:
+        """Append coalesced output to the scrollback and fan it out."""
+        if self._output_flush_handle is not None:
+            self._output_flush_handle.cancel()
+            self._output_flush_handle = None
+        if not self._pending_output:
+            return
+        data = bytes(self._pending_output)
+        self._pending_output.clear()
+        self.buffer.append(data)
+        self._buffer_bytes += len(data)
+        self.output_offset += len(data)
+        while self._buffer_bytes > self._buffer_max_bytes and self.buffer:
+            dropped = self.buffer.popleft()
+            self._buffer_bytes -= len(dropped)
+            self._buffer_start_offset += len(dropped)
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self._drop_subscriber(queue)
+
+    def _drop_subscriber(self, queue: asyncio.Queue[object]) -> None:
+        # A stalled consumer must not pin memory: discard what it has not
+        # read yet and let it catch up from the scrollback.
+        self.subscribers.discard(queue)
+        self.subscribers_dropped += 1
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        queue.put_nowait(RESYNC)
+        logger.debug("Subscriber fell behind; requested resync for session %s", self.id)
+
+    def resume_offset(self, offset: Optional[int]) -> int:
+        """Offset a subscriber starting at ``offset`` will actually replay from.
+
+        Offsets that already left the scrollback (or that this session never
+        produced) fall back to a full replay.
+        """
+        if offset is None or not (
+            self._buffer_start_offset <= offset <= self.output_offset
+        ):
+            return self._buffer_start_offset
+        return offset
+
+    def _replay_frames(self, offset: int) -> list[bytes]:
+        skip = offset - self._buffer_start_offset
+        frames: list[bytes] = []
+        current = bytearray()
+        for chunk in self.buffer:
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            current.extend(chunk[skip:] if skip else chunk)
+            skip = 0
+            while len(current) >= PTY_OUTPUT_FRAME_MAX_BYTES:
+                frames.append(bytes(current[:PTY_OUTPUT_FRAME_MAX_BYTES]))
+                del current[:PTY_OUTPUT_FRAME_MAX_BYTES]
+        if current:
+            frames.append(bytes(current))
+        return frames
+
     def add_subscriber(
-        self, *, include_replay_end: bool = True
+        self, *, include_replay_end: bool = True, offset: Optional[int] = None
     ) -> asyncio.Queue[object]:
-        q: asyncio.Queue[object] = asyncio.Queue()
-        for chunk in self.buffer:
-            q.put_nowait(chunk)
+        """Subscribe to output, replaying scrollback from ``offset`` first."""
+        self._flush_output()
+        q: asyncio.Queue[object] = asyncio.Queue(
+            maxsize=PTY_SUBSCRIBER_QUEUE_MAX_FRAMES
+        )
+        # The scrollback is bounded, so the replay always fits in the queue.
+        for frame in self._replay_frames(self.resume_offset(offset)):
+            q.put_nowait(frame)
         if include_replay_end:
             q.put_nowait(REPLAY_END)
-        self.subscribers.add(q)
+        if self._closed:
+            q.put_nowait(None)
+        else:
+            self.subscribers.add(q)
         return q
 
     def refresh_alt_screen_state(self) -> None:
@@ -326,6 +418,8 @@ class ActiveSession:
         except (OSError, IOError) as exc:
             logger.debug("Failed to disable writer during close: %s", exc)
         self._pending_input.clear()
+        self._flush_output()
+        self._closed = True
         if not self.pty.closed:
             try:
                 self.loop.remove_reader(self.pty.fd)
@@ -339,7 +433,8 @@ class ActiveSession:
             try:
                 queue.put_nowait(None)
             except asyncio.QueueFull:
-                pass
+                # It will resync from the scrollback and then see the close.
+                self._drop_subscriber(queue)
         self.subscribers.clear()
 
     def mark_input_activity(self) -> None:
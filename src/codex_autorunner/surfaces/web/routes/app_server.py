@@ -3,6 +3,7 @@ App-server support routes (thread registry).
 """
 
 from pathlib import Path
+from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import FileResponse, StreamingResponse
@@ -31,19 +32,43 @@ def build_app_server_routes() -> APIRouter:
 
     @router.get("/api/app-server/turns/{turn_id}/events")
     async def stream_app_server_turn_events(
-        turn_id: str, request: Request, thread_id: str
+        turn_id: str, request: Request, thread_id: str, after: Optional[int] = None
     ):
         events = getattr(request.app.state, "app_server_events", None)
         if events is None:
             raise HTTPException(status_code=404, detail="App-server events unavailable")
         if not thread_id:
             raise HTTPException(status_code=400, detail="thread_id is required")
+        resume_after = after
+        if resume_after is None:
+            last_event_id = request.headers.get("Last-Event-ID")
+            if last_event_id:
+                try:
+                    resume_after = int(last_event_id)
+                except ValueError:
+                    resume_after = None
         return StreamingResponse(
-            events.stream(thread_id, turn_id),
+            events.stream(thread_id, turn_id, after_id=resume_after),
             media_type="text/event-stream",
             headers=SSE_HEADERS,
         )
 
+    @router.get("/api/app-server/events/stats")
+    def app_server_event_stats(request: Request):
+        events = getattr(request.app.state, "app_server_events", None)
+        if events is None:
+            raise HTTPException(status_code=404, detail="App-server events unavailable")
+        return events.stats()
+
+    @router.get("/api/app-server/supervisor/stats")
+    def app_server_supervisor_stats(request: Request):
+        payload = {}
+        for key in ("app_server", "opencode"):
+            supervisor = getattr(request.app.state, f"{key}_supervisor", None)
+            if supervisor is not None:
+                payload[key] = supervisor.spawn_stats()
+        return payload
+
     @router.get("/api/app-server/threads", response_model=AppServerThreadsResponse)
     def app_server_threads(request: Request):
         registry = request.app.state.app_server_threads
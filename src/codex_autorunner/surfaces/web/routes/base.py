@@ -19,7 +19,7 @@ from fastapi.responses import (
 from ....core.config import HubConfig
 from ....core.logging_utils import safe_log
 from ....core.state import SessionRecord, now_iso, persist_session_registry
-from ..pty_session import REPLAY_END, ActiveSession, PTYSession
+from ..pty_session import REPLAY_END, RESYNC, ActiveSession, PTYSession
 from ..schemas import VersionResponse
 from ..static_assets import index_response_headers, render_index_html
 from ..static_refresh import refresh_static_assets
@@ -380,15 +380,41 @@ def build_base_routes(static_dir: Path) -> APIRouter:
         if active_session is None:
             await ws.close()
             return
-        queue = active_session.add_subscriber(include_replay_end=include_replay_end)
+        # Clients always get the full scrollback; the offset only lets this
+        # socket re-subscribe where it left off after a RESYNC.
+        replay_offset = active_session.resume_offset(None)
+        queue = active_session.add_subscriber(
+            include_replay_end=include_replay_end, offset=replay_offset
+        )
 
         async def pty_to_ws():
+            nonlocal queue
+            sent_offset = replay_offset
             try:
                 while True:
                     data = await queue.get()
                     if data is REPLAY_END:
                         await ws.send_text(json.dumps({"type": "replay_end"}))
                         continue
+                    if data is RESYNC:
+                        # We fell behind and were dropped; pick up from the
+                        # scrollback at the last byte this socket sent.
+                        resumed = active_session.resume_offset(sent_offset)
+                        queue = active_session.add_subscriber(
+                            include_replay_end=False, offset=sent_offset
+                        )
+                        if resumed != sent_offset:
+                            await ws.send_text(
+                                json.dumps(
+                                    {
+                                        "type": "resync",
+                                        "offset": resumed,
+                                        "missed_bytes": max(0, resumed - sent_offset),
+                                    }
+                                )
+                            )
+                        sent_offset = resumed
+                        continue
                     if data is None:
                         if active_session:
                             exit_code = active_session.pty.exit_code()
@@ -419,6 +445,7 @@ def build_base_routes(static_dir: Path) -> APIRouter:
                             )
                         break
                     await ws.send_bytes(data)
+                    sent_offset += len(data)
                     if session_id:
                         _touch_session(session_id)
             except Exception:
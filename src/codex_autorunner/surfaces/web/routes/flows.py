@@ -19,7 +19,6 @@ from ....core.file_chat_keys import ticket_chat_scope
 from ....core.flows import (
     FlowController,
     FlowDefinition,
-    FlowEventType,
     FlowRunRecord,
     FlowRunStatus,
     FlowStore,
@@ -54,7 +53,8 @@ from ....tickets.files import (
     safe_relpath,
 )
 from ....tickets.frontmatter import parse_markdown_frontmatter
-from ....tickets.lint import lint_ticket_directory, lint_ticket_frontmatter
+from ....tickets.index import ticket_index_for
+from ....tickets.lint import lint_ticket_frontmatter
 from ....tickets.outbox import parse_dispatch, resolve_outbox_paths
 from ..schemas import (
     TicketBulkClearModelRequest,
@@ -102,11 +102,8 @@ def _ticket_dir(repo_root: Path) -> Path:
 
 
 def _find_ticket_path_by_index(ticket_dir: Path, index: int) -> Optional[Path]:
-    for path in list_ticket_paths(ticket_dir):
-        idx = parse_ticket_index(path.name)
-        if idx == index:
-            return path
-    return None
+    entry = ticket_index_for(ticket_dir).by_index(index)
+    return entry.path if entry is not None else None
 
 
 _TICKET_NAME_RE = re.compile(r"^TICKET-(\d+)([^/]*)\.md$", re.IGNORECASE)
@@ -344,15 +341,14 @@ def _validate_tickets(ticket_dir: Path) -> list[str]:
     if not ticket_dir.exists():
         return errors
 
+    ticket_index = ticket_index_for(ticket_dir)
     # Check for directory-level errors (duplicate indices)
-    dir_errors = lint_ticket_directory(ticket_dir)
-    errors.extend(dir_errors)
+    errors.extend(ticket_index.duplicate_errors())
 
     # Check each ticket file for frontmatter errors
-    ticket_paths = list_ticket_paths(ticket_dir)
-    for path in ticket_paths:
-        _, ticket_errors = read_ticket(path)
-        for err in ticket_errors:
+    for entry in ticket_index.entries():
+        path = entry.path
+        for err in entry.errors:
             errors.append(f"{path.relative_to(path.parent.parent)}: {err}")
 
     return errors
@@ -614,31 +610,15 @@ def build_flow_routes() -> APIRouter:
         if store is None:
             return {}
         try:
-            events = store.get_events_by_type(run_id, FlowEventType.DIFF_UPDATED)
+            return store.get_diff_stats_by_dispatch_seq(run_id)
         except Exception:
-            events = []
+            return {}
         finally:
             try:
                 store.close()
             except Exception:
                 pass
 
-        by_seq: dict[int, dict[str, int]] = {}
-        for ev in events:
-            data = ev.data or {}
-            try:
-                seq_val = int(data.get("dispatch_seq") or 0)
-            except Exception:
-                continue
-            if seq_val <= 0:
-                continue
-            by_seq[seq_val] = {
-                "insertions": int(data.get("insertions") or 0),
-                "deletions": int(data.get("deletions") or 0),
-                "files_changed": int(data.get("files_changed") or 0),
-            }
-        return by_seq
-
     @router.get("")
     async def list_flow_definitions(request: Request):
         state = _ensure_state_in_app(request)
@@ -930,41 +910,18 @@ You are the first ticket in a new ticket_flow run.
             store = _require_flow_store(repo_root)
             if store is not None:
                 try:
-                    events = store.get_events_by_type(
-                        latest_run.id, FlowEventType.DIFF_UPDATED
-                    )
+                    diff_by_ticket = store.get_diff_stats_by_ticket(latest_run.id)
                 except Exception:
-                    events = []
+                    diff_by_ticket = {}
                 finally:
                     try:
                         store.close()
                     except Exception:
                         pass
-                for ev in events:
-                    data = ev.data or {}
-                    ticket_id = data.get("ticket_id")
-                    if not isinstance(ticket_id, str) or not ticket_id.strip():
-                        continue
-                    stats = diff_by_ticket.setdefault(
-                        ticket_id,
-                        {"insertions": 0, "deletions": 0, "files_changed": 0},
-                    )
-                    stats["insertions"] += int(data.get("insertions") or 0)
-                    stats["deletions"] += int(data.get("deletions") or 0)
-                    stats["files_changed"] += int(data.get("files_changed") or 0)
 
         tickets = []
-        for path in list_ticket_paths(ticket_dir):
-            doc, errors = read_ticket(path)
-            idx = getattr(doc, "index", None) or parse_ticket_index(path.name)
-            # When frontmatter is broken, still surface the raw ticket body so
-            # the user can inspect and fix the file in the UI instead of seeing
-            # an empty card.
-            try:
-                raw_body = path.read_text(encoding="utf-8")
-                _, parsed_body = parse_markdown_frontmatter(raw_body)
-            except Exception:
-                parsed_body = None
+        for entry in ticket_index_for(ticket_dir).entries():
+            path, doc, idx = entry.path, entry.doc, entry.index
             rel_path = safe_relpath(path, repo_root)
             tickets.append(
                 {
@@ -972,8 +929,11 @@ You are the first ticket in a new ticket_flow run.
                     "index": idx,
                     "chat_key": ticket_chat_scope(idx, path) if idx else None,
                     "frontmatter": asdict(doc.frontmatter) if doc else None,
-                    "body": doc.body if doc else parsed_body,
-                    "errors": errors,
+                    # When frontmatter is broken, still surface the raw ticket
+                    # body so the user can inspect and fix the file in the UI
+                    # instead of seeing an empty card.
+                    "body": doc.body if doc else entry.body,
+                    "errors": list(entry.errors),
                     "diff_stats": diff_by_ticket.get(rel_path),
                 }
             )
@@ -987,13 +947,13 @@ You are the first ticket in a new ticket_flow run.
         """Fetch a single ticket by index; return raw body even if frontmatter is invalid."""
         repo_root = find_repo_root()
         ticket_dir = repo_root / ".codex-autorunner" / "tickets"
-        ticket_path = _find_ticket_path_by_index(ticket_dir, index)
+        entry = ticket_index_for(ticket_dir).by_index(index)
 
-        if not ticket_path:
+        if entry is None:
             raise HTTPException(status_code=404, detail=f"Ticket {index:03d} not found")
 
-        doc, errors = read_ticket(ticket_path)
-        if doc and not errors:
+        ticket_path, doc = entry.path, entry.doc
+        if doc and not entry.errors:
             return TicketResponse(
                 path=safe_relpath(ticket_path, repo_root),
                 index=doc.index,
@@ -1003,18 +963,12 @@ You are the first ticket in a new ticket_flow run.
             )
 
         # Mirror list endpoint: surface raw body for repair when frontmatter is broken.
-        try:
-            raw_body = ticket_path.read_text(encoding="utf-8")
-            parsed_frontmatter, parsed_body = parse_markdown_frontmatter(raw_body)
-        except Exception:
-            parsed_frontmatter, parsed_body = {}, None
-
         return TicketResponse(
             path=safe_relpath(ticket_path, repo_root),
-            index=parse_ticket_index(ticket_path.name),
+            index=entry.index,
             chat_key=ticket_chat_scope(index, ticket_path),
-            frontmatter=parsed_frontmatter or {},
-            body=parsed_body,
+            frontmatter=entry.data or {},
+            body=entry.body,
         )
 
     @router.post("/ticket_flow/tickets", response_model=TicketResponse)
@@ -37,6 +37,7 @@ from ....core.logging_utils import log_event
 from ....core.pma_audit import PmaActionType, PmaAuditLog
 from ....core.pma_context import (
     PMA_MAX_TEXT,
+    acknowledge_hub_snapshot_changes,
     build_hub_snapshot,
     format_pma_prompt,
     get_active_context_auto_prune_meta,
@@ -745,10 +746,13 @@ def build_pma_routes() -> APIRouter:
         if not reasoning and defaults.get("reasoning"):
             reasoning = defaults["reasoning"]
 
+        pma_thread_key = PMA_OPENCODE_KEY if agent_id == "opencode" else PMA_KEY
+        hub_supervisor = getattr(request.app.state, "hub_supervisor", None)
         try:
             prompt_base = load_pma_prompt(hub_root)
-            supervisor = getattr(request.app.state, "hub_supervisor", None)
-            snapshot = await build_hub_snapshot(supervisor, hub_root=hub_root)
+            snapshot = await build_hub_snapshot(
+                hub_supervisor, hub_root=hub_root, changes_for=pma_thread_key
+            )
             prompt = format_pma_prompt(
                 prompt_base, snapshot, message, hub_root=hub_root
             )
@@ -817,6 +821,9 @@ def build_pma_routes() -> APIRouter:
                 thread_id=thread_id,
                 turn_id=turn_id,
             )
+            # The turn started, so the prompt reached the agent; only now do
+            # its hub changes count as seen by this PMA thread.
+            acknowledge_hub_snapshot_changes(hub_supervisor, snapshot, pma_thread_key)
             if not meta_future.done():
                 meta_future.set_result((thread_id, turn_id))
 
@@ -855,7 +862,7 @@ def build_pma_routes() -> APIRouter:
                     model=model,
                     reasoning=reasoning,
                     thread_registry=registry,
-                    thread_key=PMA_OPENCODE_KEY,
+                    thread_key=pma_thread_key,
                     stall_timeout_seconds=stall_timeout_seconds,
                     on_meta=_meta,
                 )
@@ -882,7 +889,7 @@ def build_pma_routes() -> APIRouter:
                     model=model,
                     reasoning=reasoning,
                     thread_registry=registry,
-                    thread_key=PMA_KEY,
+                    thread_key=pma_thread_key,
                     on_meta=_meta,
                 )
         except Exception as exc:
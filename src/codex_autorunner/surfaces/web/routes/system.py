@@ -8,6 +8,7 @@ from fastapi.responses import JSONResponse
 
 from ....core import update as update_core
 from ....core.config import HubConfig
+from ....core.logging_utils import log_pipeline_stats
 from ....core.update import (
     UpdateInProgressError,
     _normalize_update_ref,
@@ -93,6 +94,10 @@ def build_system_routes() -> APIRouter:
             "asset_version": asset_version,
         }
 
+    @router.get("/system/logging/stats")
+    def system_logging_stats():
+        return log_pipeline_stats()
+
     @router.get("/system/update/check", response_model=SystemUpdateCheckResponse)
     async def system_update_check(request: Request):
         """
@@ -83,15 +83,17 @@ class AgentPool:
 
         if method in ("item/agentMessage/delta", "turn/streamDelta"):
             delta = None
+            item_id = None
             if isinstance(params, dict):
                 raw = params.get("delta") or params.get("text")
                 if isinstance(raw, str):
                     delta = raw
+                item_id = params.get("itemId") or params.get("item_id")
             if delta:
-                emitter(
-                    FlowEventType.AGENT_STREAM_DELTA,
-                    {"delta": delta, "turn_id": turn_id, "method": method},
-                )
+                payload = {"delta": delta, "turn_id": turn_id, "method": method}
+                if item_id:
+                    payload["item_id"] = item_id
+                emitter(FlowEventType.AGENT_STREAM_DELTA, payload)
 
     def _ensure_app_server_supervisor(self) -> WorkspaceAppServerSupervisor:
         if self._app_server_supervisor is not None:
@@ -316,7 +318,12 @@ class AgentPool:
             if part_type == "text" and isinstance(delta, str) and delta:
                 req.emit_event(
                     FlowEventType.AGENT_STREAM_DELTA,
-                    {"delta": delta, "turn_id": turn_id, "part_type": part_type},
+                    {
+                        "delta": delta,
+                        "turn_id": turn_id,
+                        "part_type": part_type,
+                        "item_id": text_item_id,
+                    },
                 )
                 # Also emit app-server event for summary view
                 message = {
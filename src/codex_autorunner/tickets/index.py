@@ -0,0 +1,263 @@
+"""Cached view of a ticket directory.
+
+:class:`TicketIndex` keeps the parsed :class:`TicketDoc` and lint errors of
+every ticket file keyed by ``(mtime_ns, size, inode)`` and, on refresh, only
+re-reads files whose signature changed. Aggregates used on hot paths (next
+pending ticket, done count, duplicate indices) are computed once per refresh.
+
+Use :func:`ticket_index_for` so the ticket runner, web routes, Telegram
+commands and hub summaries share one index per directory.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .frontmatter import parse_markdown_frontmatter
+from .lint import lint_ticket_frontmatter, parse_ticket_index
+from .models import TicketDoc
+
+# A file modified this shortly before it was read may be rewritten again
+# within the same timestamp tick without changing its signature, so such
+# entries are re-read until they are older than this (as git does for its
+# "racily clean" index entries).
+_RACY_WINDOW_NS = 1_000_000_000
+_MAX_INDEXES = 256
+
+FileSignature = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class TicketEntry:
+    path: Path
+    index: int
+    signature: FileSignature
+    read_at_ns: int
+    # Parsed document; ``None`` when the file is unreadable or fails lint.
+    doc: Optional[TicketDoc]
+    errors: list[str] = field(default_factory=list)
+    # Raw frontmatter mapping and body, available even when lint fails.
+    data: dict[str, Any] = field(default_factory=dict)
+    body: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return bool(self.doc is not None and self.doc.frontmatter.done)
+
+
+def _signature(st: os.stat_result) -> FileSignature:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _read_entry(path: Path, index: int, signature: FileSignature) -> TicketEntry:
+    read_at_ns = time.time_ns()
+    try:
+        raw = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        return TicketEntry(
+            path=path,
+            index=index,
+            signature=signature,
+            read_at_ns=read_at_ns,
+            doc=None,
+            errors=[f"Failed to read ticket: {exc}"],
+        )
+    data, body = parse_markdown_frontmatter(raw)
+    frontmatter, errors = lint_ticket_frontmatter(data)
+    doc = None
+    if not errors and frontmatter is not None:
+        doc = TicketDoc(path=path, index=index, frontmatter=frontmatter, body=body)
+    return TicketEntry(
+        path=path,
+        index=index,
+        signature=signature,
+        read_at_ns=read_at_ns,
+        doc=doc,
+        errors=list(errors),
+        data=data if isinstance(data, dict) else {},
+        body=body,
+    )
+
+
+class TicketIndex:
+    def __init__(self, ticket_dir: Path) -> None:
+        self.ticket_dir = ticket_dir
+        self._lock = threading.Lock()
+        self._dir_signature: Optional[FileSignature] = None
+        self._dir_listed_at_ns = 0
+        self._entries: dict[Path, TicketEntry] = {}
+        self._ordered: list[TicketEntry] = []
+        self._by_index: dict[int, TicketEntry] = {}
+        self._next_pending: Optional[TicketEntry] = None
+        self._done_count = 0
+        self._duplicate_errors: list[str] = []
+        self.reads = 0
+
+    def refresh(self) -> TicketIndex:
+        """Bring the index up to date, re-reading only changed files."""
+        with self._lock:
+            try:
+                dir_stat: Optional[os.stat_result] = os.stat(self.ticket_dir)
+            except OSError:
+                dir_stat = None
+            dir_signature = _signature(dir_stat) if dir_stat is not None else None
+            if dir_stat is None or not stat.S_ISDIR(dir_stat.st_mode):
+                changed = bool(self._entries)
+                self._entries = {}
+            elif (
+                dir_signature == self._dir_signature
+                and self._dir_listed_at_ns - dir_stat.st_mtime_ns >= _RACY_WINDOW_NS
+            ):
+                # No file was added, removed or renamed; only stat known ones.
+                changed = self._refresh_entries(list(self._entries))
+            else:
+                self._dir_listed_at_ns = time.time_ns()
+                candidates = [
+                    self.ticket_dir / name
+                    for name in os.listdir(self.ticket_dir)
+                    if parse_ticket_index(name) is not None
+                ]
+                changed = self._refresh_entries(candidates)
+            self._dir_signature = dir_signature
+            if changed or dir_signature is None:
+                self._rebuild_aggregates()
+        return self
+
+    def _refresh_entries(self, paths: list[Path]) -> bool:
+        entries: dict[Path, TicketEntry] = {}
+        changed = False
+        for path in paths:
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                changed = True
+                continue
+            if not stat.S_ISREG(file_stat.st_mode):
+                continue
+            signature = _signature(file_stat)
+            previous = self._entries.get(path)
+            if (
+                previous is not None
+                and previous.signature == signature
+                and previous.read_at_ns - file_stat.st_mtime_ns >= _RACY_WINDOW_NS
+            ):
+                entries[path] = previous
+                continue
+            index = parse_ticket_index(path.name)
+            assert index is not None
+            entry = _read_entry(path, index, signature)
+            self.reads += 1
+            if previous is None or (
+                previous.doc,
+                previous.errors,
+                previous.body,
+            ) != (entry.doc, entry.errors, entry.body):
+                changed = True
+            entries[path] = entry
+        if len(entries) != len(self._entries):
+            changed = True
+        self._entries = entries
+        return changed
+
+    def _rebuild_aggregates(self) -> None:
+        ordered = sorted(
+            self._entries.values(), key=lambda entry: (entry.index, entry.path.name)
+        )
+        names_by_index: dict[int, list[str]] = defaultdict(list)
+        by_index: dict[int, TicketEntry] = {}
+        for entry in ordered:
+            names_by_index[entry.index].append(entry.path.name)
+            by_index.setdefault(entry.index, entry)
+        self._ordered = ordered
+        self._by_index = by_index
+        self._done_count = sum(1 for entry in ordered if entry.done)
+        self._next_pending = next((e for e in ordered if not e.done), None)
+        self._duplicate_errors = [
+            f"Duplicate ticket index {idx:03d}: multiple files share the same index "
+            f"({', '.join(repr(name) for name in names)}). "
+            "Rename or remove duplicates to ensure deterministic ordering."
+            for idx, names in sorted(names_by_index.items())
+            if len(names) > 1
+        ]
+
+    def entries(self) -> list[TicketEntry]:
+        """Entries ordered by ticket index, like ``list_ticket_paths``."""
+        return list(self._ordered)
+
+    def paths(self) -> list[Path]:
+        return [entry.path for entry in self._ordered]
+
+    def get(self, path: Path) -> Optional[TicketEntry]:
+        return self._entries.get(path)
+
+    def by_index(self, index: int) -> Optional[TicketEntry]:
+        return self._by_index.get(index)
+
+    def read(self, path: Path) -> tuple[Optional[TicketDoc], list[str]]:
+        """``read_ticket`` served from the index for files inside the dir."""
+        entry = self._entries.get(path)
+        if entry is None:
+            from .files import read_ticket
+
+            return read_ticket(path)
+        return entry.doc, list(entry.errors)
+
+    def is_done(self, path: Path) -> bool:
+        entry = self._entries.get(path)
+        if entry is None:
+            from .files import ticket_is_done
+
+            return ticket_is_done(path)
+        return entry.done
+
+    @property
+    def next_pending(self) -> Optional[TicketEntry]:
+        """First ticket (by index) that is not done."""
+        return self._next_pending
+
+    @property
+    def done_count(self) -> int:
+        return self._done_count
+
+    @property
+    def total_count(self) -> int:
+        return len(self._ordered)
+
+    def duplicate_errors(self) -> list[str]:
+        """Same messages as ``lint_ticket_directory``."""
+        return list(self._duplicate_errors)
+
+
+_INDEXES: OrderedDict[tuple[Path, Path], TicketIndex] = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+
+
+def ticket_index_for(ticket_dir: Path) -> TicketIndex:
+    """Shared, refreshed :class:`TicketIndex` for ``ticket_dir``.
+
+    Indexes are keyed by the path as given (plus its absolute form, so a
+    relative path is not shared across working directories). Entry paths
+    therefore keep the caller's form and compare equal to paths it derives
+    itself; a resolved and an unresolved spelling get separate indexes.
+    """
+    key = (ticket_dir, ticket_dir.absolute())
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = TicketIndex(ticket_dir)
+            _INDEXES[key] = index
+            while len(_INDEXES) > _MAX_INDEXES:
+                _INDEXES.popitem(last=False)
+        else:
+            _INDEXES.move_to_end(key)
+    return index.refresh()
+
+
+__all__ = ["TicketEntry", "TicketIndex", "ticket_index_for"]
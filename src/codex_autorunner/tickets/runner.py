@@ -8,11 +8,19 @@ from typing import Any, Callable, Optional
 from ..contextspace.paths import contextspace_doc_path
 from ..integrations.bitbucket import BitbucketPRClient, PullRequestResult
 from ..core.flows.models import FlowEventType
-from ..core.git_utils import git_diff_stats, run_git
+from ..core.git_utils import (
+    GIT_STATUS_REUSE_SECONDS,
+    GitError,
+    GitStatus,
+    git_diff_stats,
+    git_query_service,
+    run_git,
+)
 from .agent_pool import AgentPool, AgentTurnRequest
-from .files import list_ticket_paths, read_ticket, safe_relpath, ticket_is_done
+from .files import safe_relpath
 from .frontmatter import parse_markdown_frontmatter
-from .lint import lint_ticket_directory, lint_ticket_frontmatter
+from .index import ticket_index_for
+from .lint import lint_ticket_frontmatter
 from .models import TicketFrontmatter, TicketResult, TicketRunConfig
 from .outbox import (
     archive_dispatch,
@@ -171,6 +179,14 @@ def _shrink_prompt(
     return prompt
 
 
+def _format_repo_fingerprint(
+    head: Optional[str], status: Optional[GitStatus]
+) -> Optional[str]:
+    if not head or status is None:
+        return None
+    return f"{head}\n{status.porcelain}"
+
+
 class TicketRunner:
     """Execute a ticket directory one agent turn at a time.
 
@@ -270,7 +286,8 @@ class TicketRunner:
                     reason_code="needs_user_fix",
                 )
 
-        ticket_paths = list_ticket_paths(ticket_dir)
+        ticket_index = ticket_index_for(ticket_dir)
+        ticket_paths = ticket_index.paths()
         if not ticket_paths:
             return self._pause(
                 state,
@@ -282,7 +299,7 @@ class TicketRunner:
             )
 
         # Check for duplicate ticket indices before proceeding.
-        dir_lint_errors = lint_ticket_directory(ticket_dir)
+        dir_lint_errors = ticket_index.duplicate_errors()
         if dir_lint_errors:
             return self._pause(
                 state,
@@ -317,7 +334,7 @@ class TicketRunner:
 
         # If current ticket is done, clear it unless we're in the middle of a
         # bounded "commit required" follow-up loop.
-        if current_path and ticket_is_done(current_path) and not commit_pending:
+        if current_path and ticket_index.is_done(current_path) and not commit_pending:
             current_path = None
             state.pop("current_ticket", None)
             state.pop("ticket_turns", None)
@@ -326,7 +343,8 @@ class TicketRunner:
             state.pop("commit", None)
 
         if current_path is None:
-            next_path = self._find_next_ticket(ticket_paths)
+            next_entry = ticket_index.next_pending
+            next_path = next_entry.path if next_entry is not None else None
             if next_path is None:
                 state["status"] = "completed"
                 return TicketResult(
@@ -434,7 +452,7 @@ class TicketRunner:
                 },
             )()
         else:
-            ticket_doc, ticket_errors = read_ticket(current_path)
+            ticket_doc, ticket_errors = ticket_index.read(current_path)
             if ticket_errors or ticket_doc is None:
                 return self._pause(
                     state,
@@ -534,15 +552,10 @@ class TicketRunner:
         state["total_turns"] = total_turns
         state["ticket_turns"] = ticket_turns
 
-        repo_fingerprint_before_turn = self._repo_fingerprint()
-        head_before_turn: Optional[str] = None
-        try:
-            head_proc = run_git(
-                ["rev-parse", "HEAD"], cwd=self._workspace_root, check=True
-            )
-            head_before_turn = (head_proc.stdout or "").strip() or None
-        except Exception:
-            head_before_turn = None
+        head_before_turn, status_before_turn = self._git_snapshot()
+        repo_fingerprint_before_turn = _format_repo_fingerprint(
+            head_before_turn, status_before_turn
+        )
 
         result = await self._agent_pool.run_turn(req)
         if result.error:
@@ -592,31 +605,22 @@ class TicketRunner:
         state["last_agent_id"] = result.agent_id
         state["last_agent_conversation_id"] = result.conversation_id
         state["last_agent_turn_id"] = result.turn_id
-        repo_fingerprint_after_turn = self._repo_fingerprint()
-
         # Best-effort: check whether the agent created a commit and whether the
         # working tree is clean, before any runner-driven checkpoint commit.
-        head_after_agent: Optional[str] = None
+        head_after_agent, git_status_after_agent = self._git_snapshot()
+        repo_fingerprint_after_turn = _format_repo_fingerprint(
+            head_after_agent, git_status_after_agent
+        )
         clean_after_agent: Optional[bool] = None
         status_after_agent: Optional[str] = None
         agent_committed_this_turn: Optional[bool] = None
-        try:
-            head_proc = run_git(
-                ["rev-parse", "HEAD"], cwd=self._workspace_root, check=True
-            )
-            head_after_agent = (head_proc.stdout or "").strip() or None
-            status_proc = run_git(
-                ["status", "--porcelain"], cwd=self._workspace_root, check=True
-            )
-            status_after_agent = (status_proc.stdout or "").strip()
-            clean_after_agent = not bool(status_after_agent)
+        if git_status_after_agent is None:
+            head_after_agent = None
+        else:
+            status_after_agent = git_status_after_agent.porcelain
+            clean_after_agent = git_status_after_agent.is_clean
             if head_before_turn and head_after_agent:
                 agent_committed_this_turn = head_after_agent != head_before_turn
-        except Exception:
-            head_after_agent = None
-            clean_after_agent = None
-            status_after_agent = None
-            agent_committed_this_turn = None
 
         # Post-turn: archive outbox if DISPATCH.md exists.
         dispatch_seq = int(state.get("dispatch_seq") or 0)
@@ -938,13 +942,6 @@ class TicketRunner:
             agent_turn_id=result.turn_id,
         )
 
-    def _find_next_ticket(self, ticket_paths: list[Path]) -> Optional[Path]:
-        for path in ticket_paths:
-            if ticket_is_done(path):
-                continue
-            return path
-        return None
-
     def _recheck_ticket_frontmatter(self, ticket_path: Path):
         try:
             raw = ticket_path.read_text(encoding="utf-8")
@@ -1155,10 +1152,14 @@ class TicketRunner:
         """
 
         try:
-            status_proc = run_git(
-                ["status", "--porcelain"], cwd=self._workspace_root, check=True
+            # Reuses the snapshot taken right after the agent turn; the runner's
+            # own writes since then are under the git-ignored .codex-autorunner.
+            status = git_query_service().status(
+                self._workspace_root, max_age=GIT_STATUS_REUSE_SECONDS
             )
-            if not (status_proc.stdout or "").strip():
+            if status is None:
+                raise GitError("git status failed")
+            if status.is_clean:
                 return None
             run_git(["add", "-A"], cwd=self._workspace_root, check=True)
             msg = self._config.checkpoint_message_template.format(
@@ -1210,22 +1211,24 @@ class TicketRunner:
             ),
         )
 
-    def _repo_fingerprint(self) -> Optional[str]:
-        """Return a stable snapshot of HEAD + porcelain status."""
+    def _git_snapshot(
+        self, *, max_age: float = 0.0
+    ) -> tuple[Optional[str], Optional[GitStatus]]:
+        """HEAD and status of the workspace; HEAD comes from the ref cache."""
+        service = git_query_service()
         try:
-            head_proc = run_git(
-                ["rev-parse", "HEAD"], cwd=self._workspace_root, check=True
-            )
-            status_proc = run_git(
-                ["status", "--porcelain"], cwd=self._workspace_root, check=True
+            return (
+                service.head_sha(self._workspace_root),
+                service.status(self._workspace_root, max_age=max_age),
             )
-            head = (head_proc.stdout or "").strip()
-            status = (status_proc.stdout or "").strip()
-            if not head:
-                return None
-            return f"{head}\n{status}"
         except Exception:
-            return None
+            return None, None
+
+    def _repo_fingerprint(self) -> Optional[str]:
+        """Return a stable snapshot of HEAD + porcelain status."""
+        return _format_repo_fingerprint(
+            *self._git_snapshot(max_age=GIT_STATUS_REUSE_SECONDS)
+        )
 
     def _create_runner_pause_dispatch(
         self,
@@ -0,0 +1,78 @@
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+
+from codex_autorunner.core.flows import FlowEventType, FlowRunStatus, FlowStore
+from codex_autorunner.core.flows.event_broadcaster import FlowEventBroadcaster
+
+
+def _seed_run(db_path: Path, run_id: str) -> FlowStore:
+    store = FlowStore(db_path)
+    store.initialize()
+    store.create_flow_run(run_id=run_id, flow_type="ticket_flow", input_data={})
+    store.update_flow_run_status(run_id, FlowRunStatus.RUNNING)
+    return store
+
+
+def _emit(store: FlowStore, run_id: str, n: int = 1) -> None:
+    for _ in range(n):
+        store.create_event(
+            event_id=str(uuid.uuid4()),
+            run_id=run_id,
+            event_type=FlowEventType.STEP_PROGRESS,
+            data={},
+        )
+
+
+async def _collect(broadcaster, run_id, store, after_seq=None):
+    return [
+        event.seq
+        async for event in broadcaster.stream(run_id, store=store, after_seq=after_seq)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_writes_from_another_connection(tmp_path: Path):
+    db_path = tmp_path / "flows.db"
+    writer = _seed_run(db_path, "run-1")
+    _emit(writer, "run-1", 2)
+    broadcaster = FlowEventBroadcaster(db_path, poll_interval=0.02)
+    reader = FlowStore(db_path)
+
+    tasks = [
+        asyncio.create_task(_collect(broadcaster, "run-1", reader)) for _ in range(3)
+    ]
+    for _ in range(50):
+        if broadcaster.subscriber_count("run-1") == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    # A separate writer connection stands in for the worker subprocess.
+    await asyncio.to_thread(_emit, writer, "run-1", 3)
+    await asyncio.to_thread(
+        writer.update_flow_run_status, "run-1", FlowRunStatus.COMPLETED
+    )
+
+    results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=5)
+    assert all(seqs == [1, 2, 3, 4, 5] for seqs in results)
+    assert broadcaster.subscriber_count("run-1") == 0
+    writer.close()
+    reader.close()
+
+
+@pytest.mark.asyncio
+async def test_subscriber_behind_the_tail_catches_up_from_store(tmp_path: Path):
+    db_path = tmp_path / "flows.db"
+    store = _seed_run(db_path, "run-1")
+    _emit(store, "run-1", 7)
+    store.update_flow_run_status("run-1", FlowRunStatus.PAUSED)
+    broadcaster = FlowEventBroadcaster(db_path, poll_interval=0.02, tail_size=2)
+
+    seqs = await asyncio.wait_for(
+        _collect(broadcaster, "run-1", store, after_seq=3), timeout=5
+    )
+
+    assert seqs == [4, 5, 6, 7]
+    store.close()
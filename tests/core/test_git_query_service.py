@@ -0,0 +1,172 @@
+import threading
+import time
+from pathlib import Path
+
+from codex_autorunner.core import git_utils
+from codex_autorunner.core.git_utils import (
+    GitQueryService,
+    git_upstream_status,
+    parse_git_status,
+    run_git,
+)
+
+
+def _init_repo(repo_path: Path) -> None:
+    repo_path.mkdir(parents=True, exist_ok=True)
+    run_git(["init"], repo_path, check=True)
+    run_git(["config", "user.email", "test@example.com"], repo_path, check=True)
+    run_git(["config", "user.name", "Test User"], repo_path, check=True)
+
+
+def _commit(repo_path: Path, name: str) -> str:
+    (repo_path / name).write_text(name, encoding="utf-8")
+    run_git(["add", name], repo_path, check=True)
+    run_git(["commit", "-m", name], repo_path, check=True)
+    return (run_git(["rev-parse", "HEAD"], repo_path).stdout or "").strip()
+
+
+def test_parse_git_status_branch_header() -> None:
+    status = parse_git_status("## main...origin/main [ahead 2, behind 1]\n M a.py\n")
+    assert (status.branch, status.upstream, status.ahead, status.behind) == (
+        "main",
+        "origin/main",
+        2,
+        1,
+    )
+    assert status.porcelain == "M a.py"
+    assert not status.is_clean
+
+    assert parse_git_status("## HEAD (no branch)\n").branch is None
+    gone = parse_git_status("## feature...origin/feature [gone]\n")
+    assert gone.branch == "feature"
+    assert gone.upstream is None
+    unborn = parse_git_status("## No commits yet on main\n?? new.txt\n")
+    assert unborn.branch == "main"
+    assert unborn.porcelain == "?? new.txt"
+
+
+def test_head_sha_is_cached_until_refs_change(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    first = _commit(repo, "a.txt")
+    service = GitQueryService()
+
+    assert service.head_sha(repo) == first
+    assert service.head_sha(repo) == first
+    stats = service.stats()["rev-parse HEAD"]
+    assert (stats.calls, stats.runs, stats.cache_hits) == (2, 1, 1)
+
+    second = _commit(repo, "b.txt")
+    assert service.head_sha(repo) == second
+    assert service.stats()["rev-parse HEAD"].runs == 2
+
+
+def test_status_reuse_is_bounded_by_max_age(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    _commit(repo, "a.txt")
+    service = GitQueryService()
+
+    status = service.status(repo)
+    assert status is not None and status.is_clean
+    # Unstaged edits leave no trace in the git dir; a fresh query sees them.
+    (repo / "a.txt").write_text("changed", encoding="utf-8")
+    cached = service.status(repo, max_age=60)
+    assert cached is not None and cached.is_clean
+    fresh = service.status(repo)
+    assert fresh is not None and fresh.porcelain == "M a.txt"
+    assert service.stats()["status"].runs == 2
+
+    assert git_upstream_status(repo) == {
+        "has_upstream": False,
+        "ahead": 0,
+        "behind": 0,
+    }
+
+
+def test_concurrent_identical_queries_share_one_run(
+    tmp_path: Path, monkeypatch
+) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    _commit(repo, "a.txt")
+    started = threading.Event()
+    release = threading.Event()
+    real_run_head_sha = git_utils._run_head_sha
+
+    def _slow_run_head_sha(repo_root: Path):
+        started.set()
+        release.wait(5)
+        return real_run_head_sha(repo_root)
+
+    monkeypatch.setattr(git_utils, "_run_head_sha", _slow_run_head_sha)
+    service = GitQueryService()
+    results: list = []
+    first = threading.Thread(target=lambda: results.append(service.head_sha(repo)))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=lambda: results.append(service.head_sha(repo)))
+    second.start()
+    while service.stats()["rev-parse HEAD"].calls < 2:
+        time.sleep(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(results) == 2 and results[0] == results[1]
+    stats = service.stats()["rev-parse HEAD"]
+    assert (stats.runs, stats.coalesced) == (1, 1)
+
+
+def test_back_to_back_status_checks_run_git_once(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    _commit(repo, "a.txt")
+    service = GitQueryService()
+    monkeypatch.setattr(git_utils, "_SERVICE", service)
+
+    # The clean check and upstream lookup of one hub operation.
+    assert git_utils.git_is_clean(repo)
+    assert git_upstream_status(repo, max_age=git_utils.GIT_STATUS_REUSE_SECONDS) == {
+        "has_upstream": False,
+        "ahead": 0,
+        "behind": 0,
+    }
+    stats = service.stats()["status"]
+    assert (stats.calls, stats.runs, stats.cache_hits) == (2, 1, 1)
+
+
+def test_concurrent_status_calls_share_one_run(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    _commit(repo, "a.txt")
+    started = threading.Event()
+    release = threading.Event()
+    real_run_status = git_utils._run_status
+
+    def _slow_run_status(repo_root: Path):
+        started.set()
+        release.wait(5)
+        return real_run_status(repo_root)
+
+    monkeypatch.setattr(git_utils, "_run_status", _slow_run_status)
+    service = GitQueryService()
+    results: list = []
+
+    def _status() -> None:
+        results.append(service.status(repo, max_age=5))
+
+    first = threading.Thread(target=_status)
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=_status)
+    second.start()
+    while service.stats()["status"].calls < 2:
+        time.sleep(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(results) == 2 and results[0] == results[1]
+    stats = service.stats()["status"]
+    assert (stats.runs, stats.coalesced) == (1, 1)
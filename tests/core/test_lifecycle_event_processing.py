@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import time
 from pathlib import Path
 
+from fastapi.testclient import TestClient
+
+from codex_autorunner.bootstrap import seed_hub_files
 from codex_autorunner.core.config import load_hub_config
 from codex_autorunner.core.flows.models import FlowRunStatus
 from codex_autorunner.core.flows.store import FlowStore
 from codex_autorunner.core.hub import HubSupervisor
-from codex_autorunner.core.lifecycle_events import LifecycleEventStore
+from codex_autorunner.core.lifecycle_events import (
+    LifecycleEvent,
+    LifecycleEventStore,
+    LifecycleEventType,
+)
 from codex_autorunner.manifest import load_manifest, save_manifest
+from codex_autorunner.server import create_hub_app
 
 
 def _write_hub_config(
@@ -296,3 +306,74 @@ def test_lifecycle_reactive_circuit_breaker(tmp_path: Path) -> None:
         assert _read_queue_items(hub_root) == []
     finally:
         supervisor.shutdown()
+
+
+def _wait_until_processed(store: LifecycleEventStore, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not store.get_unprocessed():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_lifecycle_processor_wakes_on_emit_and_foreign_writes(
+    tmp_path: Path,
+) -> None:
+    hub_root = tmp_path / "hub"
+    _write_hub_config(hub_root, dispatch_interception=False)
+    supervisor = HubSupervisor(load_hub_config(hub_root))
+
+    try:
+        store = LifecycleEventStore(hub_root)
+        supervisor.lifecycle_emitter.emit_flow_completed("repo-1", "run-1")
+        assert _wait_until_processed(store, timeout=2.0)
+
+        # A raw insert stands in for a flow worker subprocess: no in-process
+        # wakeup fires, so only the data_version watch can notice it.
+        event = LifecycleEvent(
+            event_type=LifecycleEventType.FLOW_FAILED,
+            repo_id="repo-1",
+            run_id="run-2",
+        )
+        with sqlite3.connect(store.path) as conn:
+            conn.execute(
+                """
+                INSERT INTO lifecycle_events (
+                    event_id, event_type, repo_id, run_id, data, origin,
+                    timestamp, processed
+                )
+                VALUES (?, ?, ?, ?, '{}', 'runner', ?, 0)
+                """,
+                (
+                    event.event_id,
+                    event.event_type.value,
+                    event.repo_id,
+                    event.run_id,
+                    event.timestamp,
+                ),
+            )
+        assert _wait_until_processed(store, timeout=2.0)
+
+        metrics = supervisor.lifecycle_metrics()
+        assert metrics["count"] == 2
+        assert metrics["max_seconds"] < 2.0
+    finally:
+        supervisor.shutdown()
+
+
+def test_hub_lifecycle_stats_route_reports_processing_latency(
+    tmp_path: Path,
+) -> None:
+    seed_hub_files(tmp_path, force=True)
+    app = create_hub_app(tmp_path)
+    with TestClient(app) as client:
+        supervisor = app.state.hub_supervisor
+        supervisor.lifecycle_emitter.emit_flow_completed("repo-1", "run-1")
+        assert _wait_until_processed(supervisor.lifecycle_store, timeout=2.0)
+
+        res = client.get("/hub/lifecycle/stats")
+        assert res.status_code == 200
+        payload = res.json()
+        assert payload["count"] == 1
+        assert payload == supervisor.lifecycle_metrics()
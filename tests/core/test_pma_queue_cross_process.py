@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
 from pathlib import Path
 
 import pytest
@@ -106,3 +107,80 @@ async def test_enqueue_sync_idempotency_dedupe(tmp_path: Path) -> None:
     states = [item.state for item in items]
     assert states.count(QueueItemState.PENDING) == 1
     assert states.count(QueueItemState.DEDUPED) == 1
+
+
+@pytest.mark.anyio
+async def test_lane_log_compacts_finished_items_and_recovers(tmp_path: Path) -> None:
+    lane_id = "pma:default"
+    queue = PmaQueue(tmp_path, keep_finished=2, compact_after_records=1)
+    path = queue._lane_queue_path(lane_id)
+
+    for idx in range(6):
+        await queue.enqueue(lane_id, f"key-{idx}", {"n": idx})
+    for _ in range(5):
+        item = await queue.dequeue(lane_id)
+        assert item is not None
+        await queue.complete_item(item, {"status": "ok"})
+
+    # Compaction keeps only the latest record of the live item plus the
+    # newest finished items.
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+    items = await queue.list_items(lane_id)
+    assert [item.payload["n"] for item in items] == [3, 4, 5]
+    assert [item.state for item in items] == [
+        QueueItemState.COMPLETED,
+        QueueItemState.COMPLETED,
+        QueueItemState.PENDING,
+    ]
+
+    recovered = PmaQueue(tmp_path)
+    assert [item.item_id for item in await recovered.list_items(lane_id)] == [
+        item.item_id for item in items
+    ]
+    _, reason = recovered.enqueue_sync(lane_id, "key-5", {"n": 6})
+    assert reason is not None
+    assert await recovered.replay_pending(lane_id) == 1
+    stats = await recovered.get_lane_stats(lane_id)
+    assert stats["by_state"] == {"completed": 2, "pending": 1, "deduped": 1}
+
+
+@pytest.mark.anyio
+async def test_dequeue_skips_items_cancelled_elsewhere(tmp_path: Path) -> None:
+    lane_id = "pma:default"
+    worker_queue = PmaQueue(tmp_path)
+    await worker_queue.enqueue(lane_id, "key-1", {"message": "a"})
+
+    assert await PmaQueue(tmp_path).cancel_lane(lane_id) == 1
+    assert await worker_queue.dequeue(lane_id) is None
+
+
+@pytest.mark.anyio
+async def test_in_place_rewrite_of_lane_log_forces_full_reload(
+    tmp_path: Path,
+) -> None:
+    lane_id = "pma:default"
+    queue = PmaQueue(tmp_path)
+    path = queue._lane_queue_path(lane_id)
+    await queue.enqueue(lane_id, "key-1", {"n": 1})
+    assert [item.payload for item in await queue.list_items(lane_id)] == [{"n": 1}]
+    inode = path.stat().st_ino
+
+    # Same size, same inode: the record was swapped for another item.
+    [original] = await queue.list_items(lane_id)
+    replacement_id = str(uuid.uuid4())
+    path.write_text(
+        path.read_text(encoding="utf-8").replace(original.item_id, replacement_id)
+    )
+    assert path.stat().st_ino == inode
+    assert [item.item_id for item in await queue.list_items(lane_id)] == [
+        replacement_id
+    ]
+
+    # Larger, same inode: resuming at the old offset would misread the tail.
+    other = PmaQueue(tmp_path / "other")
+    await other.enqueue(lane_id, "key-a", {"n": "a"})
+    await other.enqueue(lane_id, "key-b", {"n": "bb"})
+    path.write_bytes(other._lane_queue_path(lane_id).read_bytes())
+    assert path.stat().st_ino == inode
+    items = await queue.list_items(lane_id)
+    assert [item.payload for item in items] == [{"n": "a"}, {"n": "bb"}]
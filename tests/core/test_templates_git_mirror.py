@@ -6,7 +6,9 @@ import pytest
 
 from codex_autorunner.core.config import TemplateRepoConfig
 from codex_autorunner.core.git_utils import run_git
+from codex_autorunner.core.templates import git_mirror
 from codex_autorunner.core.templates.git_mirror import (
+    BLOB_CACHE_DIRNAME,
     NetworkUnavailableError,
     TemplateNotFoundError,
     fetch_template,
@@ -171,10 +173,12 @@ def test_fetch_template_content_change_changes_blob_sha(tmp_path: Path) -> None:
         repo_path, "tickets/TICKET-CHANGE.md", modified_content
     )
 
+    # Fetches are debounced per mirror; ask for a fresh one.
     fetched_modified = fetch_template(
         repo=repo,
         hub_root=hub_root,
         template_ref="local:tickets/TICKET-CHANGE.md",
+        fetch_ttl_seconds=0,
     )
 
     assert fetched_modified.commit_sha == modified_commit
@@ -245,3 +249,86 @@ def test_fetch_template_with_explicit_ref(tmp_path: Path) -> None:
     assert fetched.blob_sha == blob_sha
     assert fetched.content == content
     assert fetched.ref == "main"
+
+
+def test_fetch_template_debounces_fetches_and_caches_blobs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = tmp_path / "repo"
+    branch = _init_repo(repo_path)
+    _commit_file(repo_path, "tickets/TICKET-ONE.md", "one")
+    _, blob_two = _commit_file(repo_path, "tickets/TICKET-TWO.md", "two")
+
+    repo = TemplateRepoConfig(
+        id="local",
+        url=str(repo_path),
+        trusted=True,
+        default_ref=branch,
+    )
+    hub_root = tmp_path / "hub"
+    hub_root.mkdir()
+
+    git_calls: list[list[str]] = []
+    real_run_git = git_mirror.run_git
+
+    def _recording_run_git(args, cwd, **kwargs):
+        git_calls.append(list(args))
+        return real_run_git(args, cwd, **kwargs)
+
+    monkeypatch.setattr(git_mirror, "run_git", _recording_run_git)
+
+    fetch_template(
+        repo=repo, hub_root=hub_root, template_ref="local:tickets/TICKET-ONE.md"
+    )
+    git_calls.clear()
+    fetched = fetch_template(
+        repo=repo, hub_root=hub_root, template_ref="local:tickets/TICKET-TWO.md"
+    )
+    assert fetched.content == "two"
+    # No fetch and no per-lookup git processes: the cat-file reader answers.
+    assert git_calls == []
+
+    cache_path = (
+        hub_root
+        / ".codex-autorunner"
+        / "templates"
+        / BLOB_CACHE_DIRNAME
+        / blob_two[:2]
+        / blob_two[2:]
+    )
+    assert cache_path.read_text(encoding="utf-8") == "two"
+
+    # A path missing from the debounced mirror still triggers a fetch.
+    _commit_file(repo_path, "tickets/TICKET-NEW.md", "new")
+    fetched_new = fetch_template(
+        repo=repo, hub_root=hub_root, template_ref="local:tickets/TICKET-NEW.md"
+    )
+    assert fetched_new.content == "new"
+    assert [call[0] for call in git_calls] == ["fetch"]
+
+
+def test_reader_closed_by_concurrent_fetch_is_not_restarted(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    commit, _ = _commit_file(repo_path, "tickets/TICKET-ONE.md", "one")
+    state = git_mirror._MirrorState()
+    readers = []
+
+    def _lookup(reader):
+        readers.append(reader)
+        if len(readers) == 1:
+            # A fetch lands between taking the reader and using it.
+            with state.lock:
+                state.reader = None
+            reader.close()
+        return reader.info(f"{commit}^{{commit}}")
+
+    info = git_mirror._with_reader(state, repo_path, _lookup)
+
+    assert info is not None and info[0] == commit
+    stale, fresh = readers
+    assert stale is not fresh
+    assert state.reader is fresh
+    # The closed reader did not respawn cat-file processes nothing would stop.
+    assert stale._check_proc is None and stale._batch_proc is None
+    fresh.close()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sqlite3
+
+from codex_autorunner.core.flows.models import FlowEventType
+from codex_autorunner.core.flows.store import FlowStore
+
+
+def _emit_diffs(store: FlowStore, run_id: str = "run-1") -> None:
+    store.create_flow_run(run_id, "ticket_flow", input_data={})
+    diffs = [
+        ("TICKET-001.md", 1, 10, 2, 1),
+        ("TICKET-001.md", 2, 5, 5, 2),
+        ("TICKET-002.md", 3, 1, 0, 1),
+        # Re-emitted stats for a dispatch replace the earlier ones.
+        ("TICKET-002.md", 3, 4, 1, 1),
+        ("", 0, 7, 0, 1),
+    ]
+    for n, (ticket_id, seq, ins, dels, files) in enumerate(diffs):
+        store.create_event(
+            f"{run_id}-{n}",
+            run_id,
+            FlowEventType.DIFF_UPDATED,
+            {
+                "ticket_id": ticket_id,
+                "dispatch_seq": seq,
+                "insertions": ins,
+                "deletions": dels,
+                "files_changed": files,
+            },
+        )
+
+
+def test_diff_stats_are_aggregated_on_write(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        _emit_diffs(store)
+
+        assert store.get_diff_stats("run-1") == {
+            "insertions": 27,
+            "deletions": 8,
+            "files_changed": 6,
+        }
+        assert store.get_diff_stats_by_ticket("run-1") == {
+            "TICKET-001.md": {"insertions": 15, "deletions": 7, "files_changed": 3},
+            "TICKET-002.md": {"insertions": 5, "deletions": 1, "files_changed": 2},
+        }
+        assert store.get_diff_stats_by_dispatch_seq("run-1") == {
+            1: {"insertions": 10, "deletions": 2, "files_changed": 1},
+            2: {"insertions": 5, "deletions": 5, "files_changed": 2},
+            3: {"insertions": 4, "deletions": 1, "files_changed": 1},
+        }
+        assert store.get_diff_stats("missing") == {
+            "insertions": 0,
+            "deletions": 0,
+            "files_changed": 0,
+        }
+
+        store.delete_flow_run("run-1")
+        assert store.get_diff_stats_by_ticket("run-1") == {}
+
+
+def test_batched_diff_events_are_visible_to_reads(tmp_path):
+    with FlowStore(tmp_path / "flows.db", event_batch_size=100) as store:
+        store.create_flow_run("run-1", "ticket_flow", input_data={})
+        store.enqueue_event(
+            "e1",
+            "run-1",
+            FlowEventType.DIFF_UPDATED,
+            {"ticket_id": "TICKET-001.md", "dispatch_seq": 1, "insertions": 3},
+        )
+        assert store.get_diff_stats("run-1")["insertions"] == 3
+
+
+def test_schema_migration_backfills_diff_stats(tmp_path):
+    db_path = tmp_path / "flows.db"
+    with FlowStore(db_path) as store:
+        _emit_diffs(store)
+        expected = store.get_diff_stats_by_ticket("run-1")
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE flow_diff_stats")
+    conn.execute("UPDATE schema_info SET version = 3")
+    conn.commit()
+    conn.close()
+
+    with FlowStore(db_path) as store:
+        assert store.get_diff_stats_by_ticket("run-1") == expected
+        assert store.get_diff_stats_by_dispatch_seq("run-1")[3]["insertions"] == 4
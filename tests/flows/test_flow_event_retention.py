@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from codex_autorunner.core.flows.definition import FlowDefinition, StepOutcome
+from codex_autorunner.core.flows.models import FlowEventType, FlowRunStatus
+from codex_autorunner.core.flows.retention import (
+    FlowEventRetentionPolicy,
+    apply_flow_event_retention,
+)
+from codex_autorunner.core.flows.runtime import FlowRuntime
+from codex_autorunner.core.flows.store import EVENT_ARCHIVE_DIRNAME, FlowStore
+
+
+def _seed_finished_run(store: FlowStore, run_id: str = "run-1") -> None:
+    store.create_flow_run(run_id, "ticket_flow", input_data={})
+    n = 0
+
+    def emit(event_type: FlowEventType, data: dict) -> None:
+        nonlocal n
+        n += 1
+        store.create_event(f"{run_id}-{n}", run_id, event_type, data, step_id="s")
+
+    emit(FlowEventType.STEP_STARTED, {})
+    emit(FlowEventType.STEP_PROGRESS, {"current_ticket": "TICKET-001.md"})
+    emit(FlowEventType.STEP_PROGRESS, {"current_ticket": "TICKET-001.md"})
+    for chunk in ("Hel", "lo", " world"):
+        emit(FlowEventType.AGENT_STREAM_DELTA, {"delta": chunk, "turn_id": "t1"})
+        emit(
+            FlowEventType.APP_SERVER_EVENT,
+            {
+                "turn_id": "t1",
+                "message": {
+                    "method": "outputDelta",
+                    "params": {"delta": chunk, "turnId": "t1", "itemId": "i1"},
+                },
+            },
+        )
+    emit(
+        FlowEventType.APP_SERVER_EVENT,
+        {"turn_id": "t1", "message": {"method": "turn/completed", "params": {}}},
+    )
+    emit(FlowEventType.STEP_PROGRESS, {"current_ticket": "TICKET-002.md"})
+    emit(FlowEventType.FLOW_COMPLETED, {})
+    store.update_flow_run_status(
+        run_id, FlowRunStatus.COMPLETED, finished_at="2024-01-01T00:00:00Z"
+    )
+
+
+def test_compaction_folds_deltas_and_progress(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        _seed_finished_run(store)
+
+        folded = store.compact_run_events("run-1")
+        events = store.get_events("run-1")
+
+    assert folded == 5
+    deltas = [e for e in events if e.event_type == FlowEventType.AGENT_STREAM_DELTA]
+    assert [e.data["delta"] for e in deltas] == ["Hello world"]
+    assert deltas[0].data["compacted_count"] == 3
+    app_events = [e for e in events if e.event_type == FlowEventType.APP_SERVER_EVENT]
+    assert app_events[0].data["message"]["params"]["delta"] == "Hello world"
+    assert app_events[1].data["message"]["method"] == "turn/completed"
+    progress = [e for e in events if e.event_type == FlowEventType.STEP_PROGRESS]
+    assert [e.data["current_ticket"] for e in progress] == [
+        "TICKET-001.md",
+        "TICKET-002.md",
+    ]
+    assert [e.seq for e in events] == sorted(e.seq for e in events)
+
+
+def test_archived_runs_stay_readable(tmp_path):
+    db_path = tmp_path / "flows.db"
+    with FlowStore(db_path) as store:
+        _seed_finished_run(store)
+        store.create_flow_run("live", "ticket_flow", input_data={})
+        before = store.get_events("run-1")
+
+        report = apply_flow_event_retention(
+            store,
+            FlowEventRetentionPolicy(archive_after_days=7, vacuum=True),
+            now=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        )
+
+        assert report.runs_compacted == 1
+        assert report.runs_archived == 1
+        assert report.events_archived == len(before) - report.events_folded
+        assert (db_path.parent / EVENT_ARCHIVE_DIRNAME / "run-1.jsonl.gz").exists()
+        assert store.get_event_retention("run-1")["archive_path"] == "run-1.jsonl.gz"
+
+        archived = store.get_events("run-1")
+        assert [e.seq for e in archived] == [1, 3, 8, 9, 10, 11, 12]
+        assert store.get_events("run-1", after_seq=archived[-2].seq) == archived[-1:]
+        assert store.get_last_event_meta("run-1")[0] == archived[-1].seq
+        last_delta = store.get_last_event_by_type(
+            "run-1", FlowEventType.AGENT_STREAM_DELTA
+        )
+        assert last_delta is not None
+        assert last_delta.data["delta"] == "Hello world"
+        assert store.get_latest_step_progress_current_ticket("run-1") == "TICKET-002.md"
+
+        # Already archived runs are skipped on the next pass.
+        again = apply_flow_event_retention(
+            store,
+            FlowEventRetentionPolicy(archive_after_days=7),
+            now=datetime(2024, 2, 1, tzinfo=timezone.utc) + timedelta(days=1),
+        )
+        assert again.runs_archived == 0
+
+        store.delete_flow_run("run-1")
+        assert not (db_path.parent / EVENT_ARCHIVE_DIRNAME / "run-1.jsonl.gz").exists()
+
+
+def test_resumed_run_keeps_archived_history(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        _seed_finished_run(store)
+        history = store.get_events("run-1")
+        assert store.archive_run_events("run-1") == len(history)
+
+        # The run is resumed and records more events.
+        store.create_event(
+            "run-1-resumed-1",
+            "run-1",
+            FlowEventType.STEP_PROGRESS,
+            {"current_ticket": "TICKET-003.md"},
+            step_id="s",
+        )
+        store.create_event(
+            "run-1-resumed-2", "run-1", FlowEventType.FLOW_COMPLETED, {}, step_id="s"
+        )
+        merged = store.get_events("run-1")
+        assert [e.id for e in merged] == [e.id for e in history] + [
+            "run-1-resumed-1",
+            "run-1-resumed-2",
+        ]
+        assert store.get_events("run-1", limit=2) == merged[:2]
+        assert store.get_events("run-1", after_seq=history[-1].seq) == merged[-2:]
+        progress = store.get_events_by_type("run-1", FlowEventType.STEP_PROGRESS)
+        assert [e.data["current_ticket"] for e in progress] == [
+            "TICKET-001.md",
+            "TICKET-001.md",
+            "TICKET-002.md",
+            "TICKET-003.md",
+        ]
+
+        store.update_flow_run_status(
+            "run-1", FlowRunStatus.COMPLETED, finished_at="2099-01-01T00:00:00Z"
+        )
+        report = apply_flow_event_retention(
+            store,
+            FlowEventRetentionPolicy(archive_after_days=7),
+            now=datetime(2099, 2, 1, tzinfo=timezone.utc),
+        )
+        assert (report.runs_archived, report.events_archived) == (1, 2)
+        assert store.archive_run_events("run-1") == 0
+        assert store.get_events("run-1") == merged
+        assert store.get_event_retention("run-1")["archived_events"] == len(merged)
+        assert store.get_latest_step_progress_current_ticket("run-1") == "TICKET-003.md"
+
+
+def test_retention_dry_run_changes_nothing(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        _seed_finished_run(store)
+        count = len(store.get_events("run-1"))
+
+        report = apply_flow_event_retention(
+            store,
+            FlowEventRetentionPolicy(archive_after_days=0, dry_run=True),
+        )
+
+        assert report.runs_compacted == 1
+        assert report.runs_archived == 1
+        assert len(store.get_events("run-1")) == count
+        assert store.get_event_retention("run-1") is None
+
+
+def test_compaction_keeps_deltas_on_either_side_of_other_events(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        store.create_flow_run("run-1", "ticket_flow", input_data={})
+        n = 0
+
+        def emit(event_type: FlowEventType, data: dict) -> None:
+            nonlocal n
+            n += 1
+            store.create_event(f"e{n}", "run-1", event_type, data, step_id="s")
+
+        def delta(text: str, item_id: str = "i1") -> None:
+            emit(
+                FlowEventType.AGENT_STREAM_DELTA,
+                {"delta": text, "turn_id": "t1", "item_id": item_id},
+            )
+
+        delta("a")
+        delta("b")
+        emit(FlowEventType.TOOL_CALL, {"tool": "shell"})
+        delta("c")
+        delta("d")
+        delta("e", item_id="i2")
+        delta("f", item_id="i2")
+
+        assert store.compact_run_events("run-1") == 3
+        events = store.get_events("run-1")
+
+    assert [e.data.get("delta") or e.event_type.value for e in events] == [
+        "ab",
+        "tool_call",
+        "cd",
+        "ef",
+    ]
+
+
+def test_runtime_compacts_events_when_run_finishes(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        store.create_flow_run("run-1", "ticket_flow", input_data={})
+        compact_threads = []
+        compact_run_events = store.compact_run_events
+
+        def recording_compact(run_id):
+            compact_threads.append(threading.current_thread())
+            return compact_run_events(run_id)
+
+        store.compact_run_events = recording_compact
+
+        async def step(record, input_data, emit):
+            for chunk in ("Hel", "lo"):
+                emit(FlowEventType.AGENT_STREAM_DELTA, {"delta": chunk, "turn_id": "t"})
+            return StepOutcome.complete(output={})
+
+        definition = FlowDefinition(
+            flow_type="ticket_flow", initial_step="work", steps={"work": step}
+        )
+        definition.validate()
+        record = asyncio.run(FlowRuntime(definition, store).run_flow("run-1"))
+
+        assert record.status == FlowRunStatus.COMPLETED
+        deltas = [
+            e
+            for e in store.get_events("run-1")
+            if e.event_type == FlowEventType.AGENT_STREAM_DELTA
+        ]
+        assert [e.data["delta"] for e in deltas] == ["Hello"]
+        assert store.get_event_retention("run-1")["folded_events"] == 1
+        # The rewrite runs off the event loop thread.
+        assert compact_threads and compact_threads[0] is not threading.main_thread()
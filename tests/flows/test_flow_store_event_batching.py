@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+from codex_autorunner.core.flows.models import FlowEventType, FlowRunStatus
+from codex_autorunner.core.flows.store import FlowStore
+
+
+def _seed(store: FlowStore) -> None:
+    store.initialize()
+    store.create_flow_run("run-1", "ticket_flow", input_data={})
+
+
+def test_create_event_returns_seq_without_batching(tmp_path):
+    with FlowStore(tmp_path / "flows.db") as store:
+        _seed(store)
+        first = store.create_event("e1", "run-1", FlowEventType.STEP_STARTED)
+        second = store.create_event(
+            "e2", "run-1", FlowEventType.STEP_PROGRESS, data={"n": 1}
+        )
+
+        assert (first.seq, second.seq) == (1, 2)
+        assert store.get_events("run-1")[1].data == {"n": 1}
+
+
+def test_enqueued_events_are_group_committed_in_order(tmp_path):
+    db_path = tmp_path / "flows.db"
+    persisted = []
+    with FlowStore(db_path, event_batch_size=100, event_batch_interval=60) as store:
+        _seed(store)
+        for idx in range(3):
+            store.enqueue_event(
+                f"delta-{idx}",
+                "run-1",
+                FlowEventType.AGENT_STREAM_DELTA,
+                data={"idx": idx},
+                on_persisted=persisted.append,
+            )
+        with FlowStore(db_path) as other:
+            assert other.get_events("run-1") == []
+
+        # Synchronous writes commit the pending batch first.
+        store.create_event("done", "run-1", FlowEventType.STEP_COMPLETED)
+
+        with FlowStore(db_path) as other:
+            events = other.get_events("run-1")
+        assert [e.id for e in events] == ["delta-0", "delta-1", "delta-2", "done"]
+        assert [e.seq for e in persisted] == [1, 2, 3]
+
+
+def test_batched_events_flush_on_interval_and_status_change(tmp_path):
+    db_path = tmp_path / "flows.db"
+    with FlowStore(db_path, event_batch_size=100, event_batch_interval=0.01) as store:
+        _seed(store)
+        store.enqueue_event("p1", "run-1", FlowEventType.STEP_PROGRESS)
+        deadline = time.monotonic() + 5
+        with FlowStore(db_path) as other:
+            while not other.get_events("run-1") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert [e.id for e in other.get_events("run-1")] == ["p1"]
+
+        store.enqueue_event("p2", "run-1", FlowEventType.STEP_PROGRESS)
+        store.update_flow_run_status("run-1", FlowRunStatus.COMPLETED)
+        with FlowStore(db_path) as other:
+            assert [e.id for e in other.get_events("run-1")] == ["p1", "p2"]
+
+
+def test_failed_group_commit_is_retried_in_order(tmp_path, monkeypatch):
+    db_path = tmp_path / "flows.db"
+    persisted = []
+    with FlowStore(db_path, event_batch_size=100, event_batch_interval=0.01) as store:
+        _seed(store)
+        real_write = store._write_events
+        failures = {"left": 2}
+
+        def _flaky_write(batch):
+            if failures["left"] > 0:
+                failures["left"] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return real_write(batch)
+
+        monkeypatch.setattr(store, "_write_events", _flaky_write)
+        for idx in range(3):
+            store.enqueue_event(
+                f"p{idx}",
+                "run-1",
+                FlowEventType.STEP_PROGRESS,
+                on_persisted=persisted.append,
+            )
+        deadline = time.monotonic() + 5
+        while len(persisted) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert failures["left"] == 0
+        assert [e.id for e in persisted] == ["p0", "p1", "p2"]
+        with FlowStore(db_path) as other:
+            assert [e.id for e in other.get_events("run-1")] == ["p0", "p1", "p2"]
+
+
+def test_flush_failure_keeps_batch_and_bad_events_are_dropped_alone(
+    tmp_path, monkeypatch
+):
+    db_path = tmp_path / "flows.db"
+    persisted = []
+    store = FlowStore(db_path, event_batch_size=100, event_batch_interval=60)
+    _seed(store)
+    real_write = store._write_events
+
+    def _write_rejecting_bad(batch):
+        # Every write containing "bad" fails, as a constraint violation would.
+        if any(pending[0] == "bad" for pending in batch):
+            raise sqlite3.IntegrityError("rejected")
+        return real_write(batch)
+
+    monkeypatch.setattr(store, "_write_events", _write_rejecting_bad)
+    store.enqueue_event("ok-1", "run-1", FlowEventType.STEP_PROGRESS)
+    store.enqueue_event("bad", "run-1", FlowEventType.STEP_PROGRESS)
+    store.enqueue_event(
+        "ok-2", "run-1", FlowEventType.STEP_PROGRESS, on_persisted=persisted.append
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        store.flush_events()
+    assert [pending[0] for pending in store._pending_events] == ["ok-1", "bad", "ok-2"]
+
+    store.close()
+    assert [e.id for e in persisted] == ["ok-2"]
+    with FlowStore(db_path) as other:
+        assert [e.id for e in other.get_events("run-1")] == ["ok-1", "ok-2"]
+
+
+def test_unserializable_payload_fails_its_own_enqueue(tmp_path):
+    db_path = tmp_path / "flows.db"
+    persisted = []
+    with FlowStore(db_path, event_batch_size=100, event_batch_interval=60) as store:
+        _seed(store)
+        store.enqueue_event(
+            "ok-1", "run-1", FlowEventType.STEP_PROGRESS, on_persisted=persisted.append
+        )
+        with pytest.raises(TypeError):
+            store.enqueue_event(
+                "bad", "run-1", FlowEventType.STEP_PROGRESS, data={"value": object()}
+            )
+        store.enqueue_event(
+            "ok-2",
+            "run-1",
+            FlowEventType.STEP_PROGRESS,
+            data={"n": 2},
+            on_persisted=persisted.append,
+        )
+
+        events = store.flush_events()
+        assert [e.id for e in events] == ["ok-1", "ok-2"]
+        assert events[1].data == {"n": 2}
+        assert [e.id for e in persisted] == ["ok-1", "ok-2"]
+
+
+def test_every_synchronous_run_write_flushes_pending_events(tmp_path):
+    db_path = tmp_path / "flows.db"
+    with FlowStore(db_path, event_batch_size=100, event_batch_interval=60) as store:
+        _seed(store)
+        writes = [
+            lambda: store.set_stop_requested("run-1", True),
+            lambda: store.create_artifact("a1", "run-1", "log", "out.log"),
+            lambda: store.mark_run_superseded("run-1", "run-2"),
+            lambda: store.create_flow_run("run-2", "ticket_flow", input_data={}),
+        ]
+        for idx, write in enumerate(writes):
+            store.enqueue_event(f"p{idx}", "run-1", FlowEventType.STEP_PROGRESS)
+            write()
+            with FlowStore(db_path) as other:
+                assert len(other.get_events("run-1")) == idx + 1
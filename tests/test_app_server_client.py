@@ -9,6 +9,9 @@ from codex_autorunner.integrations.app_server.client import (
     CodexAppServerClient,
     _extract_agent_message_text,
 )
+from codex_autorunner.integrations.telegram.helpers import (
+    _wants_app_server_notification,
+)
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures" / "app_server_fixture.py"
 
@@ -319,3 +322,81 @@ async def test_oversize_line_drops_and_preserves_tail(
         assert result["value"] == "ok"
     finally:
         await client.close()
+
+
+@pytest.mark.anyio
+async def test_unsubscribed_delta_notifications_skip_decoding(tmp_path: Path) -> None:
+    received: list[str] = []
+
+    async def handler(message):
+        received.append(message["method"])
+
+    client = CodexAppServerClient(
+        fixture_command("basic"),
+        cwd=tmp_path,
+        notification_handler=handler,
+        notification_filter=lambda method: method == "turn/completed",
+    )
+    try:
+        state = client._ensure_turn_state("turn-1", "thread-1")
+        state.last_event_at = 0.0
+        await client._handle_payload_line(
+            b'{"method":"item/reasoning/textDelta","params":'
+            b'{"threadId":"thread-1","turnId":"turn-1","delta":"x"}}'
+        )
+        assert state.last_event_at > 0.0
+        assert state.last_method == "item/reasoning/textDelta"
+
+        await client._handle_payload_line(
+            b'{"method":"item/agentMessage/delta","params":{"threadId":"thread-1",'
+            b'"turnId":"turn-1","itemId":"i1","delta":"hi \xff"}}\r'
+        )
+        assert state.agent_message_deltas == {"i1": "hi "}
+        await client._handle_payload_line(
+            b'{"method":"turn/completed","params":{"threadId":"thread-1",'
+            b'"turnId":"turn-1","status":"completed"}}'
+        )
+        assert received == ["item/agentMessage/delta", "turn/completed"]
+
+        stats = client.decode_stats()
+        assert stats["messages"] == 2
+        assert stats["fast_path_skipped"] == 1
+        assert stats["skipped_by_method"] == {"item/reasoning/textDelta": 1}
+        assert sum(stats["size_histogram"].values()) == 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.anyio
+async def test_telegram_filter_keeps_every_output_delta(tmp_path: Path) -> None:
+    received: list[str] = []
+
+    async def handler(message):
+        received.append(message["method"])
+
+    client = CodexAppServerClient(
+        fixture_command("basic"),
+        cwd=tmp_path,
+        notification_handler=handler,
+        notification_filter=_wants_app_server_notification,
+    )
+    try:
+        for method in (
+            "item/mcpToolCall/outputDelta",
+            "item/commandExecution/outputDelta",
+            "item/reasoning/summaryTextDelta",
+            "item/reasoning/textDelta",
+        ):
+            await client._handle_payload_line(
+                b'{"method":"%s","params":{"turnId":"turn-1"}}' % method.encode()
+            )
+        assert received == [
+            "item/mcpToolCall/outputDelta",
+            "item/commandExecution/outputDelta",
+            "item/reasoning/summaryTextDelta",
+        ]
+        assert client.decode_stats()["skipped_by_method"] == {
+            "item/reasoning/textDelta": 1
+        }
+    finally:
+        await client.close()
@@ -42,3 +42,45 @@ async def test_event_buffer_maps_turn_to_thread() -> None:
     payload = await asyncio.wait_for(_next_event(stream), timeout=1.0)
     assert '"turnId": "turn-2"' in payload
     await stream.aclose()
+
+
+@pytest.mark.anyio
+async def test_event_buffer_resumes_from_cursor_and_marks_gaps() -> None:
+    buffer = AppServerEventBuffer(max_events_per_turn=3)
+    await buffer.register_turn("thread-3", "turn-3")
+    for idx in range(5):
+        await buffer.handle_notification(
+            {
+                "method": "item/agentMessage/delta",
+                "params": {"turnId": "turn-3", "threadId": "thread-3", "n": idx},
+            }
+        )
+
+    # Events 1-2 were evicted, so a fresh reader is told about the gap (but
+    # a late join is not counted as a slow-reader gap).
+    stream = buffer.stream("thread-3", "turn-3", heartbeat_interval=0.01)
+    gap = await asyncio.wait_for(_next_event(stream), timeout=1.0)
+    assert gap.startswith("event: app-server-gap")
+    assert '"missed": 2' in gap
+    first = await asyncio.wait_for(_next_event(stream), timeout=1.0)
+    assert "id: 3\n" in first
+    await stream.aclose()
+    assert buffer.stats()["gaps"] == 0
+
+    # A reader resuming from an evicted id did fall behind.
+    behind = buffer.stream("thread-3", "turn-3", heartbeat_interval=0.01, after_id=1)
+    gap = await asyncio.wait_for(_next_event(behind), timeout=1.0)
+    assert '"missed": 1' in gap
+    await behind.aclose()
+
+    resumed = buffer.stream("thread-3", "turn-3", heartbeat_interval=0.01, after_id=4)
+    payload = await asyncio.wait_for(_next_event(resumed), timeout=1.0)
+    assert "id: 5\n" in payload
+    assert '"n": 4' in payload
+    await resumed.aclose()
+
+    stats = buffer.stats()
+    assert stats["buffered_events"] == 3
+    assert stats["dropped_events"] == 2
+    assert stats["gaps"] == 1
+    assert stats["per_turn"][0]["bytes"] > 0
@@ -51,3 +51,164 @@ async def test_get_client_touches_handle_before_prune(tmp_path: Path) -> None:
 
     assert closed == 0
     assert workspace_id in supervisor._handles
+
+
+@pytest.mark.anyio
+async def test_prewarm_spawns_predicted_workspace_spares(tmp_path: Path) -> None:
+    fixture = Path(__file__).parent / "fixtures" / "app_server_fixture.py"
+
+    def env_builder(
+        _workspace_root: Path, _workspace_id: str, _state_dir: Path
+    ) -> dict:
+        return {}
+
+    predicted = tmp_path / "predicted"
+    other = tmp_path / "other"
+    predicted.mkdir()
+    other.mkdir()
+    supervisor = WorkspaceAppServerSupervisor(
+        [sys.executable, "-u", str(fixture), "--scenario", "basic"],
+        state_root=tmp_path / "state",
+        env_builder=env_builder,
+        max_handles=2,
+        warm_spares=1,
+        warm_workspaces=lambda: [predicted],
+    )
+    try:
+        assert await supervisor.prewarm() == 1
+        stats = supervisor.spawn_stats()
+        assert stats["warm_spares"] == 1
+        assert stats["spawn_to_ready"]["warm"]["count"] == 1
+
+        # The spare is handed out without another spawn and stops counting
+        # as a spare; a full pool gets no new spare.
+        client = await supervisor.get_client(predicted)
+        assert (await client.request("fixture/status"))["initialized"] is True
+        assert "cold" not in supervisor.spawn_stats()["spawn_to_ready"]
+        await supervisor.get_client(other)
+        assert await supervisor.prewarm() == 0
+        assert supervisor.spawn_stats()["handles"] == 2
+    finally:
+        await supervisor.close_all()
+
+
+@pytest.mark.anyio
+async def test_idle_warm_spares_are_pruned_and_not_respawned(tmp_path: Path) -> None:
+    fixture = Path(__file__).parent / "fixtures" / "app_server_fixture.py"
+
+    def env_builder(
+        _workspace_root: Path, _workspace_id: str, _state_dir: Path
+    ) -> dict:
+        return {}
+
+    predicted = tmp_path / "predicted"
+    predicted.mkdir()
+    supervisor = WorkspaceAppServerSupervisor(
+        [sys.executable, "-u", str(fixture), "--scenario", "basic"],
+        state_root=tmp_path / "state",
+        env_builder=env_builder,
+        idle_ttl_seconds=60,
+        warm_spares=1,
+        warm_workspaces=lambda: [predicted],
+    )
+    try:
+        assert await supervisor.prewarm() == 1
+        (handle,) = supervisor._handles.values()
+        assert handle.warmed_at > 0
+        assert handle.last_used_at == 0.0
+        assert await supervisor.prune_idle() == 0
+
+        handle.warmed_at = time.monotonic() - 120
+        assert await supervisor.prune_idle() == 1
+        # The pruned workspace stays out of the pool until it is used again.
+        assert await supervisor.prewarm() == 0
+        assert supervisor.spawn_stats()["handles"] == 0
+
+        await supervisor.get_client(predicted)
+        assert supervisor._recent_workspaces.recently_pruned() == set()
+    finally:
+        await supervisor.close_all()
+
+
+@pytest.mark.anyio
+async def test_eviction_takes_spares_first_and_never_refills_full_pool(
+    tmp_path: Path,
+) -> None:
+    fixture = Path(__file__).parent / "fixtures" / "app_server_fixture.py"
+
+    def env_builder(
+        _workspace_root: Path, _workspace_id: str, _state_dir: Path
+    ) -> dict:
+        return {}
+
+    roots = {}
+    for name in ("predicted", "first", "second", "third"):
+        roots[name] = tmp_path / name
+        roots[name].mkdir()
+    supervisor = WorkspaceAppServerSupervisor(
+        [sys.executable, "-u", str(fixture), "--scenario", "basic"],
+        state_root=tmp_path / "state",
+        env_builder=env_builder,
+        max_handles=3,
+        warm_spares=1,
+        warm_workspaces=lambda: [roots["predicted"]],
+    )
+    try:
+        await supervisor.get_client(roots["first"])
+        await supervisor.get_client(roots["second"])
+        assert await supervisor.prewarm() == 1
+
+        # A turn for a new workspace evicts the idle spare rather than the
+        # least recently used live handle, and the refill that follows finds
+        # no free slot, so no live handle is displaced for a spare.
+        await supervisor.get_client(roots["third"])
+        assert supervisor._prewarm_task is not None
+        await supervisor._prewarm_task
+        assert await supervisor.prewarm() == 0
+        stats = supervisor.spawn_stats()
+        assert stats["spawn_to_ready"]["warm"]["count"] == 1
+        assert stats["warm_spares"] == 0
+        assert {h.workspace_root.name for h in supervisor._handles.values()} == {
+            "first",
+            "second",
+            "third",
+        }
+    finally:
+        await supervisor.close_all()
+
+
+@pytest.mark.anyio
+async def test_clients_get_notification_filter_and_report_decode_stats(
+    tmp_path: Path,
+) -> None:
+    def env_builder(
+        _workspace_root: Path, _workspace_id: str, _state_dir: Path
+    ) -> dict:
+        return {}
+
+    async def handler(_message) -> None:
+        return None
+
+    supervisor = WorkspaceAppServerSupervisor(
+        [sys.executable, "-c", "print('noop')"],
+        state_root=tmp_path / "state",
+        env_builder=env_builder,
+        notification_handler=handler,
+        notification_filter=lambda method: method == "item/reasoning/summaryTextDelta",
+    )
+    canonical_root = canonical_workspace_root(tmp_path)
+    workspace_id = workspace_id_for_path(canonical_root)
+    handle = await supervisor._ensure_handle(workspace_id, canonical_root)
+    try:
+        await handle.client._handle_payload_line(
+            b'{"method":"item/reasoning/textDelta","params":{"turnId":"t1"}}'
+        )
+        await handle.client._handle_payload_line(
+            b'{"method":"item/reasoning/summaryTextDelta","params":{"turnId":"t1"}}'
+        )
+        decode = supervisor.spawn_stats()["decode"][workspace_id]
+        assert decode["fast_path_skipped"] == 1
+        assert decode["skipped_by_method"] == {"item/reasoning/textDelta": 1}
+        assert decode["messages"] == 1
+    finally:
+        await supervisor.close_all()
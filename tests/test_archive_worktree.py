@@ -1,6 +1,11 @@
+import gzip
 import os
+import shutil
+import sqlite3
+import threading
 from pathlib import Path
 
+from codex_autorunner.core import archive as archive_module
 from codex_autorunner.core.archive import archive_worktree_snapshot
 
 
@@ -119,3 +124,103 @@ def test_archive_summary_counts_files_and_flows(tmp_path: Path) -> None:
         if path.is_file() and path.name != "META.json":
             total_bytes += path.stat().st_size
     assert result.total_bytes == total_bytes
+
+
+def test_repeated_snapshots_share_unchanged_blobs(tmp_path: Path) -> None:
+    base_repo, worktree_repo = _setup_worktree(tmp_path)
+    car_root = worktree_repo / ".codex-autorunner"
+    (car_root / "flows.db").unlink()
+    with sqlite3.connect(car_root / "flows.db") as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE runs (id TEXT)")
+        conn.execute("INSERT INTO runs VALUES ('run-1')")
+
+    def archive(snapshot_id: str, **kwargs):
+        return archive_worktree_snapshot(
+            base_repo_root=base_repo,
+            base_repo_id="base",
+            worktree_repo_root=worktree_repo,
+            worktree_repo_id="worktree",
+            branch="feature/archive-viewer",
+            worktree_of="base",
+            snapshot_id=snapshot_id,
+            **kwargs,
+        )
+
+    first = archive("first")
+    _write(car_root / "workspace" / "notes.txt", "changed")
+    second = archive("second", compress_logs=True)
+
+    assert first.deduplicated_files == 0
+    # Everything except the edited note and the newly compressed logs.
+    assert second.deduplicated_files == 7
+    assert second.stored_bytes < first.stored_bytes
+
+    ticket = "tickets/TICKET-001.md"
+    assert (first.snapshot_path / ticket).samefile(second.snapshot_path / ticket)
+    assert (second.snapshot_path / "workspace" / "notes.txt").read_text(
+        encoding="utf-8"
+    ) == "changed"
+    assert (first.snapshot_path / "workspace" / "notes.txt").read_text(
+        encoding="utf-8"
+    ) == "hello"
+
+    with sqlite3.connect(second.snapshot_path / "flows.db") as conn:
+        assert conn.execute("SELECT id FROM runs").fetchall() == [("run-1",)]
+
+    compressed = second.snapshot_path / "logs" / "codex-autorunner.log.gz"
+    assert gzip.decompress(compressed.read_bytes()) == b"log-a"
+
+
+def test_prune_waits_for_an_archive_in_progress(tmp_path: Path, monkeypatch) -> None:
+    base_repo, worktree_repo = _setup_worktree(tmp_path)
+    other_repo = tmp_path / "other"
+    (other_repo / ".codex-autorunner").mkdir(parents=True)
+
+    def archive(repo: Path, repo_id: str, snapshot_id: str):
+        return archive_worktree_snapshot(
+            base_repo_root=base_repo,
+            base_repo_id="base",
+            worktree_repo_root=repo,
+            worktree_repo_id=repo_id,
+            branch="feature/archive-viewer",
+            worktree_of="base",
+            snapshot_id=snapshot_id,
+        )
+
+    # Leave every stored blob unreferenced and old enough to prune.
+    shutil.rmtree(archive(worktree_repo, "worktree", "first").snapshot_path)
+    monkeypatch.setattr(archive_module, "_BLOB_PRUNE_MIN_AGE_SECONDS", -1.0)
+
+    placing = threading.Event()
+    resume = threading.Event()
+    real_place = archive_module._place
+
+    def _paused_place(blob: Path, dest: Path) -> None:
+        # The blob was found in the store; a prune now would delete it.
+        placing.set()
+        resume.wait(5)
+        real_place(blob, dest)
+
+    monkeypatch.setattr(archive_module, "_place", _paused_place)
+    results: dict = {}
+    first = threading.Thread(
+        target=lambda: results.update(
+            first=archive(worktree_repo, "worktree", "second")
+        )
+    )
+    first.start()
+    assert placing.wait(5)
+    other = threading.Thread(
+        target=lambda: results.update(other=archive(other_repo, "other", "third"))
+    )
+    other.start()
+    other.join(0.5)
+    assert other.is_alive()
+
+    resume.set()
+    first.join(5)
+    other.join(5)
+    assert results["first"].status == "complete"
+    assert results["first"].file_count == 10
+    assert (results["first"].snapshot_path / "workspace" / "notes.txt").exists()
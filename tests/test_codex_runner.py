@@ -1,3 +1,4 @@
+import dataclasses
 import sys
 
 import pytest
@@ -13,19 +14,22 @@ from codex_autorunner.core.runtime import RuntimeContext
 
 def test_build_codex_command_missing_binary(repo):
     engine = RuntimeContext(repo)
-    engine.config.codex_binary = "codex-missing-binary"
+    config = dataclasses.replace(engine.config, codex_binary="codex-missing-binary")
     with pytest.raises(ConfigError):
-        build_codex_command(engine.config, "hello")
+        build_codex_command(config, "hello")
 
 
 @pytest.mark.anyio
 async def test_run_codex_capture_async_times_out(repo):
     engine = RuntimeContext(repo)
-    engine.config.codex_binary = sys.executable
-    engine.config.codex_args = ["-c", "import time; time.sleep(1)"]
+    config = dataclasses.replace(
+        engine.config,
+        codex_binary=sys.executable,
+        codex_args=["-c", "import time; time.sleep(1)"],
+    )
     with pytest.raises(CodexTimeoutError):
         await run_codex_capture_async(
-            engine.config,
+            config,
             engine.repo_root,
             "hello",
             timeout_seconds=0.01,
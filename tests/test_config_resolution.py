@@ -1,15 +1,19 @@
+import dataclasses
 import json
 import os
+import time
 from pathlib import Path
 
 import pytest
 import yaml
 
+from codex_autorunner.core import config as config_module
 from codex_autorunner.core.config import (
     CONFIG_FILENAME,
     DEFAULT_REPO_CONFIG,
     REPO_OVERRIDE_FILENAME,
     ConfigError,
+    invalidate_config_cache,
     load_hub_config,
     load_repo_config,
     resolve_env_for_root,
@@ -435,3 +439,97 @@ def test_housekeeping_validation_rejects_negative_min_file_age_seconds(
         ConfigError, match="housekeeping.min_file_age_seconds must be >= 0"
     ):
         load_hub_config(hub_root)
+
+
+def _age(path: Path, seconds: float = 10.0) -> None:
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_configs_are_cached_until_inputs_change(tmp_path: Path, monkeypatch) -> None:
+    hub_root = tmp_path / "hub"
+    hub_config_path = hub_root / CONFIG_FILENAME
+    _write_yaml(hub_config_path, {"mode": "hub", "server": {"port": 7000}})
+    repo_root = hub_root / "repo"
+    (repo_root / ".git").mkdir(parents=True)
+    _age(hub_config_path)
+    builds: list = []
+    for name in ("_build_hub_config", "_build_repo_config"):
+        real = getattr(config_module, name)
+        monkeypatch.setattr(
+            config_module,
+            name,
+            lambda *args, _real=real, _name=name: builds.append(_name) or _real(*args),
+        )
+
+    hub = load_hub_config(hub_root)
+    assert load_hub_config(hub_root) == hub
+    repo = load_repo_config(repo_root, hub_path=hub_root)
+    assert load_repo_config(repo_root, hub_path=hub_root) == repo
+    assert builds == ["_build_hub_config", "_build_repo_config"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        hub.server_port = 1  # type: ignore[misc]
+
+    # A fresh edit is never cached; once aged the new config is served.
+    _write_yaml(hub_config_path, {"mode": "hub", "server": {"port": 7001}})
+    assert load_hub_config(hub_root).server_port == 7001
+    _age(hub_config_path, 5.0)
+    builds.clear()
+    assert load_hub_config(hub_root).server_port == 7001
+    assert load_hub_config(hub_root).server_port == 7001
+    assert builds == ["_build_hub_config"]
+
+    override = repo_root / REPO_OVERRIDE_FILENAME
+    _write_yaml(override, {"runner": {"sleep_seconds": 42}})
+    _age(override)
+    repo = load_repo_config(repo_root, hub_path=hub_root)
+    assert repo.runner_sleep_seconds == 42
+
+    invalidate_config_cache()
+    builds.clear()
+    load_hub_config(hub_root)
+    assert builds == ["_build_hub_config"]
+
+
+def test_cached_config_raw_is_private_to_each_caller(tmp_path: Path) -> None:
+    hub_root = tmp_path / "hub"
+    hub_config_path = hub_root / CONFIG_FILENAME
+    _write_yaml(hub_config_path, {"mode": "hub", "server": {"port": 7000}})
+    repo_root = hub_root / "repo"
+    (repo_root / ".git").mkdir(parents=True)
+    _age(hub_config_path)
+
+    hub = load_hub_config(hub_root)
+    hub.raw["server"]["port"] = 1
+    assert load_hub_config(hub_root).raw["server"]["port"] == 7000
+    repo = load_repo_config(repo_root, hub_path=hub_root)
+    repo.raw["runner"] = None
+    assert load_repo_config(repo_root, hub_path=hub_root).raw["runner"] is not None
+
+
+def test_cache_hit_reapplies_dotenv(tmp_path: Path, monkeypatch) -> None:
+    hub_root = tmp_path / "hub"
+    hub_config_path = hub_root / CONFIG_FILENAME
+    _write_yaml(hub_config_path, {"mode": "hub"})
+    env_path = hub_root / ".env"
+    env_path.write_text("CAR_TEST_CACHED_DOTENV=from-file\n", encoding="utf-8")
+    repo_root = hub_root / "repo"
+    (repo_root / ".git").mkdir(parents=True)
+    (repo_root / ".env").write_text(
+        "CAR_TEST_CACHED_REPO_DOTENV=repo\n", encoding="utf-8"
+    )
+    _age(hub_config_path)
+    _age(env_path)
+    _age(repo_root / ".env")
+    monkeypatch.delenv("CAR_TEST_CACHED_DOTENV", raising=False)
+    monkeypatch.delenv("CAR_TEST_CACHED_REPO_DOTENV", raising=False)
+
+    load_repo_config(repo_root, hub_path=hub_root)
+    assert os.environ["CAR_TEST_CACHED_DOTENV"] == "from-file"
+    assert os.environ["CAR_TEST_CACHED_REPO_DOTENV"] == "repo"
+
+    os.environ.pop("CAR_TEST_CACHED_DOTENV")
+    os.environ.pop("CAR_TEST_CACHED_REPO_DOTENV")
+    load_repo_config(repo_root, hub_path=hub_root)
+    assert os.environ["CAR_TEST_CACHED_DOTENV"] == "from-file"
+    assert os.environ["CAR_TEST_CACHED_REPO_DOTENV"] == "repo"
@@ -162,6 +162,62 @@ def test_hub_api_lists_repos(tmp_path: Path):
     assert data["repos"][0]["id"] == "demo"
 
 
+def test_list_repos_only_reprobes_changed_repos(tmp_path: Path, monkeypatch):
+    import codex_autorunner.core.git_utils as git_utils_module
+
+    hub_root = tmp_path / "hub"
+    _write_config(
+        hub_root / CONFIG_FILENAME, json.loads(json.dumps(DEFAULT_HUB_CONFIG))
+    )
+    _init_git_repo(hub_root / "alpha")
+    _init_git_repo(hub_root / "beta")
+
+    supervisor = HubSupervisor.from_path(hub_root)
+    try:
+        supervisor.scan()
+        probed: list[Path] = []
+        real_run_status = git_utils_module._run_status
+
+        def _counting_run_status(repo_root: Path):
+            probed.append(repo_root)
+            return real_run_status(repo_root)
+
+        monkeypatch.setattr(git_utils_module, "_run_status", _counting_run_status)
+
+        repos = {snap.id: snap for snap in supervisor.list_repos(use_cache=False)}
+        assert probed == []
+        assert repos["alpha"].is_clean is True
+
+        (hub_root / "alpha" / "new.txt").write_text("x\n", encoding="utf-8")
+        run_git(["add", "new.txt"], hub_root / "alpha", check=True)
+        repos = {snap.id: snap for snap in supervisor.list_repos(use_cache=False)}
+        assert [path.name for path in probed] == ["alpha"]
+        assert repos["alpha"].is_clean is False
+        assert repos["beta"].is_clean is True
+    finally:
+        supervisor.shutdown()
+
+
+def test_snapshot_for_repo_rechecks_git_status_after_worktree_edit(tmp_path: Path):
+    hub_root = tmp_path / "hub"
+    _write_config(
+        hub_root / CONFIG_FILENAME, json.loads(json.dumps(DEFAULT_HUB_CONFIG))
+    )
+    _init_git_repo(hub_root / "alpha")
+
+    supervisor = HubSupervisor.from_path(hub_root)
+    try:
+        supervisor.scan()
+        repos = {snap.id: snap for snap in supervisor.list_repos(use_cache=False)}
+        assert repos["alpha"].is_clean is True
+
+        # An untracked file changes neither the index nor HEAD.
+        (hub_root / "alpha" / "scratch.txt").write_text("x\n", encoding="utf-8")
+        assert supervisor._snapshot_for_repo("alpha").is_clean is False
+    finally:
+        supervisor.shutdown()
+
+
 def test_list_repos_thread_safety(tmp_path: Path):
     """Test that list_repos is thread-safe and doesn't return None or inconsistent state."""
     hub_root = tmp_path / "hub"
@@ -215,6 +271,35 @@ def test_list_repos_thread_safety(tmp_path: Path):
             ), f"Result {i} has different repo IDs: {ids} vs {first_ids}"
 
 
+def test_repo_probes_survive_concurrent_list_and_refresh(tmp_path: Path):
+    hub_root = tmp_path / "hub"
+    _write_config(
+        hub_root / CONFIG_FILENAME, json.loads(json.dumps(DEFAULT_HUB_CONFIG))
+    )
+    repo_ids = [f"repo{i}" for i in range(6)]
+    for repo_id in repo_ids:
+        (hub_root / repo_id / ".git").mkdir(parents=True, exist_ok=True)
+
+    supervisor = HubSupervisor.from_path(hub_root)
+    try:
+        supervisor.scan()
+
+        def _exercise(i: int) -> set[str]:
+            if i % 2 == 0:
+                return {snap.id for snap in supervisor.list_repos(use_cache=False)}
+            # Drops one probe while the others are being refreshed.
+            supervisor._snapshot_for_repo(repo_ids[i % len(repo_ids)])
+            return set(repo_ids)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(_exercise, range(24)))
+    finally:
+        supervisor.shutdown()
+
+    assert all(ids == set(repo_ids) for ids in results)
+    assert set(supervisor._repo_probes) == set(repo_ids)
+
+
 def test_hub_home_served_and_repo_mounted(tmp_path: Path):
     hub_root = tmp_path / "hub"
     cfg = json.loads(json.dumps(DEFAULT_HUB_CONFIG))
@@ -663,6 +748,36 @@ def test_cleanup_worktree_without_archive_allows_dirty_worktree(tmp_path: Path):
     assert not worktree.path.exists()
 
 
+def test_archive_worktree_compresses_logs_when_configured(tmp_path: Path):
+    hub_root = tmp_path / "hub"
+    cfg = json.loads(json.dumps(DEFAULT_HUB_CONFIG))
+    cfg["hub"]["archive_compress_logs"] = True
+    _write_config(hub_root / CONFIG_FILENAME, cfg)
+
+    supervisor = HubSupervisor(
+        load_hub_config(hub_root),
+        backend_factory_builder=build_agent_backend_factory,
+        app_server_supervisor_factory_builder=build_app_server_supervisor_factory,
+        backend_orchestrator_builder=build_backend_orchestrator,
+    )
+    base = supervisor.create_repo("base")
+    _init_git_repo(base.path)
+    worktree = supervisor.create_worktree(
+        base_repo_id="base",
+        branch="feature/compressed-logs",
+        start_point="HEAD",
+    )
+    log_path = worktree.path / ".codex-autorunner" / "codex-autorunner.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log_path.write_text("log line\n", encoding="utf-8")
+
+    result = supervisor.archive_worktree(worktree_repo_id=worktree.id)
+
+    snapshot_logs = Path(str(result["snapshot_path"])) / "logs"
+    assert (snapshot_logs / "codex-autorunner.log.gz").exists()
+    assert not (snapshot_logs / "codex-autorunner.log").exists()
+
+
 def test_set_worktree_setup_commands_route_updates_manifest(tmp_path: Path):
     hub_root = tmp_path / "hub"
     cfg = json.loads(json.dumps(DEFAULT_HUB_CONFIG))
@@ -1,5 +1,6 @@
 """Test lifecycle events system."""
 
+import json
 import tempfile
 from pathlib import Path
 
@@ -8,6 +9,7 @@ from codex_autorunner.core.lifecycle_events import (
     LifecycleEventEmitter,
     LifecycleEventStore,
     LifecycleEventType,
+    default_lifecycle_events_path,
 )
 
 
@@ -127,9 +129,64 @@ def test_lifecycle_event_store_prune():
         assert len(pruned) == 5
 
 
+def test_lifecycle_event_store_bulk_mark_and_auto_prune():
+    """Test batch marking and pruning of old processed events."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = LifecycleEventStore(Path(tmpdir), keep_processed=2)
+        events = [
+            LifecycleEvent(
+                event_type=LifecycleEventType.FLOW_COMPLETED,
+                repo_id="repo",
+                run_id=f"run-{i}",
+            )
+            for i in range(6)
+        ]
+        for event in events:
+            store.append(event)
+
+        marked = store.mark_processed_many([e.event_id for e in events[:4]])
+
+        assert marked == 4
+        assert [e.run_id for e in store.get_unprocessed()] == ["run-4", "run-5"]
+        assert [e.run_id for e in store.load() if e.processed] == ["run-2", "run-3"]
+        assert store.mark_processed_many([events[0].event_id]) == 0
+
+
+def test_lifecycle_event_store_imports_legacy_json():
+    """Test that events from the old JSON file are imported once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        hub_root = Path(tmpdir)
+        legacy = default_lifecycle_events_path(hub_root)
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text(
+            json.dumps(
+                [
+                    {
+                        "event_id": "old-1",
+                        "event_type": "flow_paused",
+                        "repo_id": "repo",
+                        "run_id": "run-1",
+                        "data": {"k": 1},
+                        "timestamp": "2025-01-01T00:00:00+00:00",
+                        "processed": False,
+                    }
+                ]
+            )
+        )
+
+        store = LifecycleEventStore(hub_root)
+        unprocessed = store.get_unprocessed()
+
+        assert [e.event_id for e in unprocessed] == ["old-1"]
+        assert unprocessed[0].data == {"k": 1}
+        assert not legacy.exists()
+
+
 if __name__ == "__main__":
     test_lifecycle_event_store_load_save()
     test_lifecycle_event_store_get_unprocessed()
     test_lifecycle_event_emitter()
     test_lifecycle_event_store_prune()
+    test_lifecycle_event_store_bulk_mark_and_auto_prune()
+    test_lifecycle_event_store_imports_legacy_json()
     print("All tests passed!")
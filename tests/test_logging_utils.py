@@ -1,5 +1,7 @@
 import json
 import logging
+import threading
+import time
 from io import StringIO
 from pathlib import Path
 from uuid import uuid4
@@ -92,3 +94,178 @@ def test_log_event_redacts_sensitive_fields() -> None:
     assert payload["nested"]["value"] == "ok"
     assert payload["items"][0]["password"] == "<redacted>"
     assert payload["text"] == "hello"
+
+
+def test_queued_logger_writes_in_background_and_counts_drops(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from codex_autorunner.core import logging_utils
+
+    pipeline = logging_utils._LogPipeline(max_records=2)
+    monkeypatch.setattr(logging_utils, "_PIPELINE", pipeline)
+    log_path = tmp_path / "queued.log"
+    cfg = LogConfig(path=log_path, max_bytes=10_000, backup_count=1, queued=True)
+    logger = setup_rotating_logger(f"repo:queued:{uuid4()}", cfg)
+
+    log_event(logger, logging.INFO, "queued.event", value=1)
+    assert logging_utils.flush_log_pipeline()
+    assert '"event":"queued.event"' in log_path.read_text(encoding="utf-8")
+
+    # Block the writer so the bounded queue fills up.
+    target = logger.handlers[0].target  # type: ignore[attr-defined]
+    gate = threading.Event()
+    real_handle = target.handle
+
+    def _slow_handle(record: logging.LogRecord) -> bool:
+        gate.wait(5)
+        return real_handle(record)
+
+    monkeypatch.setattr(target, "handle", _slow_handle)
+    for n in range(10):
+        logger.info("burst %s", n)
+    gate.set()
+    assert logging_utils.flush_log_pipeline()
+    stats = logging_utils.log_pipeline_stats()
+    assert stats["dropped"] >= 7
+    assert stats["pending"] == 0
+    assert stats["written"] >= 3
+    assert '"event":"logging.queue_full"' in log_path.read_text(encoding="utf-8")
+    pipeline.stop()
+
+
+def test_closing_queued_handler_does_not_wait_for_writer(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from codex_autorunner.core import logging_utils
+
+    pipeline = logging_utils._LogPipeline()
+    monkeypatch.setattr(logging_utils, "_PIPELINE", pipeline)
+    log_path = tmp_path / "evicted.log"
+    cfg = LogConfig(path=log_path, max_bytes=10_000, backup_count=1, queued=True)
+    logger = setup_rotating_logger(f"repo:evicted:{uuid4()}", cfg)
+    handler = logger.handlers[0]
+    target = handler.target  # type: ignore[attr-defined]
+    gate = threading.Event()
+    real_handle = target.handle
+
+    def _slow_handle(record: logging.LogRecord) -> bool:
+        gate.wait(5)
+        return real_handle(record)
+
+    monkeypatch.setattr(target, "handle", _slow_handle)
+    for n in range(3):
+        logger.info("pending %s", n)
+
+    started = time.monotonic()
+    handler.close()
+    assert time.monotonic() - started < 1.0
+    assert target.stream is not None
+
+    gate.set()
+    assert logging_utils.flush_log_pipeline()
+    assert "pending 2" in log_path.read_text(encoding="utf-8")
+    assert target.stream is None
+    pipeline.stop()
+
+
+def test_queue_full_warning_goes_to_the_dropping_log(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from codex_autorunner.core import logging_utils
+
+    pipeline = logging_utils._LogPipeline(max_records=2)
+    monkeypatch.setattr(logging_utils, "_PIPELINE", pipeline)
+    paths = {name: tmp_path / f"{name}.log" for name in ("noisy", "quiet")}
+    loggers = {
+        name: setup_rotating_logger(
+            f"repo:{name}:{uuid4()}",
+            LogConfig(path=path, max_bytes=10_000, backup_count=1, queued=True),
+        )
+        for name, path in paths.items()
+    }
+    # The writer is busy on the quiet log while the noisy one overflows.
+    target = loggers["quiet"].handlers[0].target  # type: ignore[attr-defined]
+    gate = threading.Event()
+    real_handle = target.handle
+
+    def _slow_handle(record: logging.LogRecord) -> bool:
+        gate.wait(5)
+        return real_handle(record)
+
+    monkeypatch.setattr(target, "handle", _slow_handle)
+    loggers["quiet"].info("unrelated")
+    deadline = time.monotonic() + 5
+    while pipeline.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for n in range(10):
+        loggers["noisy"].info("burst %s", n)
+    gate.set()
+    assert logging_utils.flush_log_pipeline()
+
+    assert '"event":"logging.queue_full"' in paths["noisy"].read_text(encoding="utf-8")
+    assert "logging.queue_full" not in paths["quiet"].read_text(encoding="utf-8")
+    pipeline.stop()
+
+
+def test_records_submitted_during_stop_are_still_written(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from codex_autorunner.core import logging_utils
+
+    pipeline = logging_utils._LogPipeline()
+    monkeypatch.setattr(logging_utils, "_PIPELINE", pipeline)
+    log_path = tmp_path / "stopping.log"
+    cfg = LogConfig(path=log_path, max_bytes=10_000, backup_count=1, queued=True)
+    logger = setup_rotating_logger(f"repo:stopping:{uuid4()}", cfg)
+    target = logger.handlers[0].target  # type: ignore[attr-defined]
+    gate = threading.Event()
+    real_handle = target.handle
+
+    def _slow_handle(record: logging.LogRecord) -> bool:
+        gate.wait(5)
+        return real_handle(record)
+
+    monkeypatch.setattr(target, "handle", _slow_handle)
+    logger.info("before stop")
+    stopper = threading.Thread(target=pipeline.stop)
+    stopper.start()
+    deadline = time.monotonic() + 5
+    # The first record is in the writer and the stop signal is queued.
+    while pipeline._queue.unfinished_tasks < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Lands behind the stop signal while the old writer is still busy.
+    logger.info("during stop")
+    gate.set()
+    stopper.join(5)
+
+    assert logging_utils.flush_log_pipeline()
+    text = log_path.read_text(encoding="utf-8")
+    assert "before stop" in text and "during stop" in text
+    logger.info("after stop")
+    assert logging_utils.flush_log_pipeline()
+    assert "after stop" in log_path.read_text(encoding="utf-8")
+    pipeline.stop()
+
+
+def test_log_pipeline_stats_without_queued_loggers(monkeypatch) -> None:
+    from codex_autorunner.core import logging_utils
+
+    monkeypatch.setattr(logging_utils, "_PIPELINE", None)
+    assert logging_utils.log_pipeline_stats() == {
+        "pending": 0,
+        "written": 0,
+        "dropped": 0,
+    }
+
+
+def test_log_event_skips_payload_for_disabled_levels() -> None:
+    logger, stream, handler = _make_buffer_logger()
+
+    class _Exploding:
+        def __str__(self) -> str:
+            raise AssertionError("payload built for a disabled level")
+
+    log_event(logger, logging.DEBUG, "test.debug", value=_Exploding())
+    handler.flush()
+
+    assert stream.getvalue() == ""
@@ -14,7 +14,9 @@ class _FakeOpenCodeClient:
     def __init__(self, events: list[SSEEvent]):
         self._events = events
 
-    async def stream_events(self, *, directory=None, ready_event=None, paths=None):
+    async def subscribe_events(
+        self, *, directory=None, session_ids=None, ready_event=None, **_kwargs
+    ):
         if ready_event is not None:
             ready_event.set()
         for event in self._events:
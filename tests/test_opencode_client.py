@@ -1,7 +1,7 @@
 import json
 
 from codex_autorunner.agents.opencode.client import (
-    _normalize_sse_event,
+    _normalize_sse_payload,
     _normalize_template_path,
 )
 from codex_autorunner.agents.opencode.events import SSEEvent
@@ -15,7 +15,7 @@ def test_normalize_sse_event_unwraps_payload() -> None:
             '{"sessionID":"s1"}}}'
         ),
     )
-    normalized = _normalize_sse_event(event)
+    normalized, _ = _normalize_sse_payload(event)
     assert normalized.event == "message.part.updated"
     assert json.loads(normalized.data) == {
         "type": "message.part.updated",
@@ -28,14 +28,14 @@ def test_normalize_sse_event_uses_payload_type() -> None:
         event="message",
         data='{"type":"session.idle","sessionID":"s1"}',
     )
-    normalized = _normalize_sse_event(event)
+    normalized, _ = _normalize_sse_payload(event)
     assert normalized.event == "session.idle"
     assert json.loads(normalized.data) == {"type": "session.idle", "sessionID": "s1"}
 
 
 def test_normalize_sse_event_keeps_non_json() -> None:
     event = SSEEvent(event="message", data="ping")
-    normalized = _normalize_sse_event(event)
+    normalized, _ = _normalize_sse_payload(event)
     assert normalized.event == "message"
     assert normalized.data == "ping"
 
@@ -45,7 +45,7 @@ def test_normalize_sse_event_preserves_wrapper_metadata() -> None:
         event="message",
         data='{"type":"session.status","sessionID":"s42","payload":{"state":"running"}}',
     )
-    normalized = _normalize_sse_event(event)
+    normalized, _ = _normalize_sse_payload(event)
     payload = json.loads(normalized.data)
     assert payload["sessionID"] == "s42"
     assert payload.get("state") == "running"
@@ -0,0 +1,100 @@
+import asyncio
+import json
+from typing import Optional
+
+import pytest
+
+import codex_autorunner.agents.opencode.event_hub as event_hub
+from codex_autorunner.agents.opencode.event_hub import OpenCodeEventHub
+from codex_autorunner.agents.opencode.events import SSEEvent
+
+
+def _event(seq: int, session_id: str) -> tuple[SSEEvent, dict]:
+    payload = {"type": "message.part.updated", "sessionID": session_id, "n": seq}
+    return (
+        SSEEvent(event=payload["type"], data=json.dumps(payload), id=str(seq)),
+        payload,
+    )
+
+
+class _FakeServer:
+    """Serves one batch of events per connection, then waits or closes."""
+
+    def __init__(self, batches: list[list[tuple[SSEEvent, dict]]]) -> None:
+        self.batches = batches
+        self.resumed_from: list[Optional[str]] = []
+        self.release = asyncio.Event()
+
+    def open(self, ready: asyncio.Event, last_event_id: Optional[str]):
+        async def _gen():
+            self.resumed_from.append(last_event_id)
+            ready.set()
+            if not self.batches:
+                await asyncio.sleep(3600)
+            batch = self.batches.pop(0)
+            await self.release.wait()
+            for item in batch:
+                yield item
+
+        return _gen()
+
+
+async def _take(stream, count: int) -> list[int]:
+    seen = []
+    async for sse in stream:
+        seen.append(json.loads(sse.data)["n"])
+        if len(seen) == count:
+            break
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_hub_shares_one_connection_and_routes_by_session(monkeypatch):
+    monkeypatch.setattr(event_hub, "_RECONNECT_BACKOFF_SECONDS", (0.0,))
+    server = _FakeServer(
+        [
+            [_event(1, "a"), _event(2, "b"), _event(3, "a")],
+            [_event(4, "b"), _event(5, "a")],
+        ]
+    )
+    hub = OpenCodeEventHub(server.open)
+    ready_a, ready_b = asyncio.Event(), asyncio.Event()
+    task_a = asyncio.create_task(
+        _take(hub.subscribe(session_ids={"a"}, ready_event=ready_a), 3)
+    )
+    task_b = asyncio.create_task(
+        _take(hub.subscribe(session_ids={"b"}, ready_event=ready_b), 2)
+    )
+    await asyncio.wait_for(ready_a.wait(), 1)
+    await asyncio.wait_for(ready_b.wait(), 1)
+    assert hub.subscriber_count == 2
+    server.release.set()
+
+    assert await asyncio.wait_for(task_a, 1) == [1, 3, 5]
+    assert await asyncio.wait_for(task_b, 1) == [2, 4]
+    # The server closed the first stream; the hub resumed after event 3.
+    assert server.resumed_from == [None, "3"]
+    assert hub.connections == 2
+    await asyncio.sleep(0)
+    assert hub.subscriber_count == 0
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hub_fails_subscribers_when_stream_cannot_reconnect(monkeypatch):
+    monkeypatch.setattr(event_hub, "_RECONNECT_BACKOFF_SECONDS", (0.0,))
+    attempts = 0
+
+    def _open(ready: asyncio.Event, last_event_id: Optional[str]):
+        async def _gen():
+            nonlocal attempts
+            attempts += 1
+            raise ConnectionError("refused")
+            yield  # pragma: no cover
+
+        return _gen()
+
+    hub = OpenCodeEventHub(_open)
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(_take(hub.subscribe(), 1), 1)
+    assert attempts == event_hub._MAX_FAILED_CONNECTIONS
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from codex_autorunner.agents.opencode.supervisor import OpenCodeSupervisor
+
+# Reports a listening URL like `opencode serve` and idles; nothing answers on
+# the port, so the OpenAPI fetch fails fast and the handle still starts.
+FAKE_SERVE = [
+    sys.executable,
+    "-u",
+    "-c",
+    "import time; print('listening on http://127.0.0.1:9'); time.sleep(60)",
+]
+
+
+@pytest.mark.anyio
+async def test_prewarm_spawns_predicted_workspace_spares(tmp_path: Path) -> None:
+    predicted = tmp_path / "predicted"
+    predicted.mkdir()
+    supervisor = OpenCodeSupervisor(
+        FAKE_SERVE,
+        request_timeout=1.0,
+        max_handles=2,
+        warm_spares=1,
+        warm_workspaces=lambda: [predicted],
+    )
+    try:
+        assert await supervisor.prewarm() == 1
+        assert await supervisor.prewarm() == 0
+        stats = supervisor.spawn_stats()
+        assert stats["warm_spares"] == 1
+        assert stats["spawn_to_ready"]["warm"]["count"] == 1
+
+        await supervisor.get_client(predicted)
+        stats = supervisor.spawn_stats()
+        assert stats["warm_spares"] == 0
+        assert "cold" not in stats["spawn_to_ready"]
+    finally:
+        await supervisor.close_all()
+
+
+@pytest.mark.anyio
+async def test_eviction_takes_spare_and_spares_never_evict_live_turns(
+    tmp_path: Path,
+) -> None:
+    roots = {}
+    for name in ("predicted", "busy", "other"):
+        roots[name] = tmp_path / name
+        roots[name].mkdir()
+    supervisor = OpenCodeSupervisor(
+        FAKE_SERVE,
+        request_timeout=1.0,
+        max_handles=2,
+        warm_spares=1,
+        warm_workspaces=lambda: [roots["predicted"]],
+    )
+    try:
+        await supervisor.get_client(roots["busy"])
+        await supervisor.mark_turn_started(roots["busy"])
+        assert await supervisor.prewarm() == 1
+
+        # The cold request takes the spare's slot, not the busy handle's.
+        await supervisor.get_client(roots["other"])
+        if supervisor._prewarm_task is not None:
+            await supervisor._prewarm_task
+        assert await supervisor.prewarm() == 0
+        handles = {h.workspace_root.name: h for h in supervisor._handles.values()}
+        assert set(handles) == {"busy", "other"}
+        assert handles["busy"].active_turns == 1
+        assert handles["busy"].process is not None
+        assert handles["busy"].process.returncode is None
+    finally:
+        await supervisor.close_all()
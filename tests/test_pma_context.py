@@ -8,6 +8,7 @@ from codex_autorunner.core.flows.models import FlowRunStatus
 from codex_autorunner.core.flows.store import FlowStore
 from codex_autorunner.core.hub import HubSupervisor
 from codex_autorunner.core.pma_context import (
+    acknowledge_hub_snapshot_changes,
     build_hub_snapshot,
     format_pma_prompt,
     get_active_context_auto_prune_meta,
@@ -499,3 +500,46 @@ def test_build_hub_snapshot_surfaces_unreadable_latest_dispatch(hub_env) -> None
     assert "unreadable dispatch metadata" in (item.get("reason") or "").lower()
     run_state = item.get("run_state") or {}
     assert run_state.get("state") == "blocked"
+
+
+def test_build_hub_snapshot_reuses_cached_repo_state(hub_env) -> None:
+    run_id = "77777777-7777-7777-7777-777777777777"
+    _seed_paused_run(hub_env.repo_root, run_id)
+    _write_dispatch_history(hub_env.repo_root, run_id, seq=1)
+
+    supervisor = HubSupervisor.from_path(hub_env.hub_root)
+
+    def _build(consumer: str = "pma") -> dict:
+        return asyncio.run(
+            build_hub_snapshot(
+                supervisor, hub_root=hub_env.hub_root, changes_for=consumer
+            )
+        )
+
+    try:
+        first = _build()
+        # Changes stay pending until the prompt carrying them is acknowledged.
+        undelivered = _build()
+        acknowledge_hub_snapshot_changes(supervisor, first, "pma")
+        second = _build()
+        other_thread = _build("pma.-100:7")
+        stats = supervisor.snapshot_cache.stats()
+        _write_dispatch_history(hub_env.repo_root, run_id, seq=2)
+        third = _build()
+    finally:
+        supervisor.shutdown()
+
+    assert first["changes"]["since"] is None
+    assert first["changes"]["changed_repos"] == [hub_env.repo_id]
+    assert undelivered["changes"]["changed_repos"] == [hub_env.repo_id]
+    assert [item["seq"] for item in second["inbox"]] == [1]
+    assert second["changes"]["changed_repos"] == []
+    # Each PMA thread keeps its own cursor.
+    assert other_thread["changes"]["changed_repos"] == [hub_env.repo_id]
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+    assert [item["seq"] for item in third["inbox"]] == [2]
+    assert third["changes"]["changed_repos"] == [hub_env.repo_id]
+    prompt = format_pma_prompt("Base", third, "hi", hub_root=hub_env.hub_root)
+    assert f"- changed_repos: [{hub_env.repo_id}]" in prompt
@@ -0,0 +1,110 @@
+import asyncio
+import os
+
+import codex_autorunner.surfaces.web.pty_session as pty_session
+from codex_autorunner.surfaces.web.pty_session import RESYNC, ActiveSession
+
+
+class DummyHandle:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class DummyLoop:
+    def __init__(self):
+        self.scheduled = []
+
+    def add_reader(self, _fd, _cb):
+        return None
+
+    def remove_reader(self, _fd):
+        return None
+
+    def remove_writer(self, _fd):
+        return None
+
+    def call_later(self, delay, cb):
+        self.scheduled.append((delay, cb))
+        return DummyHandle()
+
+
+class DummyPTY:
+    def __init__(self, fd):
+        self.fd = fd
+        self.closed = False
+        self.last_active = 0.0
+
+    def terminate(self):
+        self.closed = True
+
+
+def _drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_output_is_coalesced_and_resumable_by_offset():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    read_fd, write_fd = os.pipe()
+    try:
+        session = ActiveSession(
+            "s", DummyPTY(read_fd), DummyLoop()  # type: ignore[arg-type]
+        )
+        queue = session.add_subscriber(include_replay_end=False)
+
+        for chunk in (b"hello ", b"world"):
+            os.write(write_fd, chunk)
+            session._read_callback()
+        assert queue.empty()
+        assert len(session.loop.scheduled) == 1
+
+        session._flush_output()
+        assert _drain(queue) == [b"hello world"]
+        assert session.output_offset == 11
+
+        os.write(write_fd, b"!")
+        session._read_callback()
+        session._flush_output()
+
+        resumed = session.add_subscriber(include_replay_end=False, offset=6)
+        assert _drain(resumed) == [b"world!"]
+        # Unknown offsets fall back to a full replay.
+        full = session.add_subscriber(include_replay_end=False, offset=99)
+        assert _drain(full) == [b"hello world!"]
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+        loop.close()
+
+
+def test_slow_subscriber_is_dropped_with_resync(monkeypatch):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    monkeypatch.setattr(pty_session, "PTY_SUBSCRIBER_QUEUE_MAX_FRAMES", 2)
+    try:
+        session = ActiveSession(
+            "s", DummyPTY(-1), DummyLoop()  # type: ignore[arg-type]
+        )
+        slow = session.add_subscriber(include_replay_end=False)
+        fast = session.add_subscriber(include_replay_end=False)
+
+        for frame in (b"a", b"b", b"c"):
+            session._pending_output.extend(frame)
+            session._flush_output()
+            _drain(fast)
+
+        assert _drain(slow) == [RESYNC]
+        assert slow not in session.subscribers
+        assert fast in session.subscribers
+        assert session.subscribers_dropped == 1
+
+        caught_up = session.add_subscriber(include_replay_end=False, offset=0)
+        assert _drain(caught_up) == [b"abc"]
+    finally:
+        loop.close()
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import types
 
 import httpx
@@ -69,6 +70,9 @@ from codex_autorunner.integrations.telegram.api_schemas import (
     parse_message_payload,
     parse_update_payload,
 )
+from codex_autorunner.integrations.telegram.rate_limiter import (
+    TelegramRequestScheduler,
+)
 
 
 def test_parse_command_basic() -> None:
@@ -586,6 +590,51 @@ async def test_rate_limit_scope_does_not_block_other_methods(
     assert sleeps == []
 
 
+@pytest.mark.anyio
+async def test_scheduler_prioritizes_sends_and_drops_superseded_edits() -> None:
+    sent: list[tuple[str, object]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit("/", 1)[-1]
+        body = json.loads(request.content)
+        sent.append((method, body.get("text")))
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": 5}})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scheduler = TelegramRequestScheduler(chat_rate=20.0, chat_burst=1.0)
+    bot = TelegramBotClient("test-token", client=http_client, scheduler=scheduler)
+
+    def enqueued() -> int:
+        stats = scheduler.stats()
+        return stats["queued"] + stats["superseded"]
+
+    async def queue(coro) -> asyncio.Task:
+        before = enqueued()
+        task = asyncio.create_task(coro)
+        while enqueued() == before and not task.done():
+            await asyncio.sleep(0)
+        return task
+
+    try:
+        await bot.send_message(123, "first")
+        edits = [
+            await queue(bot.edit_message_text(123, 5, text))
+            for text in ("one", "two", "three")
+        ]
+        send = await queue(bot.send_message(123, "second"))
+        results = await asyncio.gather(*edits, send)
+    finally:
+        await bot.close()
+
+    assert sent == [
+        ("sendMessage", "first"),
+        ("sendMessage", "second"),
+        ("editMessageText", "three"),
+    ]
+    assert results[:2] == [{}, {}]
+    assert scheduler.stats()["superseded"] == 2
+
+
 @pytest.mark.anyio
 async def test_circuit_breaker_scope_isolated_per_method() -> None:
     async def handler(request: httpx.Request) -> httpx.Response:
@@ -605,7 +654,9 @@ async def test_circuit_breaker_scope_isolated_per_method() -> None:
 
     transport = httpx.MockTransport(handler)
     http_client = httpx.AsyncClient(transport=transport)
-    bot = TelegramBotClient("test-token", client=http_client)
+    # Chat budgets are not under test here.
+    scheduler = TelegramRequestScheduler(chat_rate=1000.0, chat_burst=1000.0)
+    bot = TelegramBotClient("test-token", client=http_client, scheduler=scheduler)
     try:
         for _ in range(6):
             with pytest.raises((TelegramAPIError, CircuitOpenError)):
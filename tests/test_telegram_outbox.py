@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import logging
 import time
 from pathlib import Path
@@ -301,3 +302,145 @@ async def test_outbox_per_chat_scheduling(
         assert len(chat2_times) >= 1
     finally:
         await store.close()
+
+
+@pytest.mark.anyio
+async def test_outbox_loop_delivers_chats_concurrently_in_order(
+    tmp_path: Path,
+) -> None:
+    store = TelegramStateStore(tmp_path / "telegram_state.sqlite3")
+    loop_task: Optional[asyncio.Task] = None
+    try:
+        delivered: list[tuple[int, str]] = []
+        release_slow_chat = asyncio.Event()
+
+        async def send_message(
+            chat_id: int,
+            text: str,
+            *,
+            thread_id: Optional[int] = None,
+            reply_to: Optional[int] = None,
+        ) -> None:
+            if chat_id == 123:
+                await release_slow_chat.wait()
+            delivered.append((chat_id, text))
+
+        async def edit_message_text(*_args, **_kwargs) -> bool:
+            return False
+
+        async def delete_message(*_args, **_kwargs) -> bool:
+            return False
+
+        manager = TelegramOutboxManager(
+            store,
+            send_message=send_message,
+            edit_message_text=edit_message_text,
+            delete_message=delete_message,
+            logger=logging.getLogger("test"),
+        )
+        manager.start()
+        loop_task = asyncio.create_task(manager.run_loop())
+
+        for idx, (chat_id, text) in enumerate(
+            [(123, "slow-1"), (123, "slow-2"), (456, "fast")]
+        ):
+            await store.enqueue_outbox(
+                OutboxRecord(
+                    record_id=f"r{idx}",
+                    chat_id=chat_id,
+                    thread_id=None,
+                    reply_to_message_id=None,
+                    placeholder_message_id=None,
+                    text=text,
+                    created_at=f"2024-01-01T00:00:0{idx}Z",
+                )
+            )
+        manager.notify()
+
+        async def wait_for(count: int) -> None:
+            while len(delivered) < count:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for(1), timeout=2.0)
+        assert delivered == [(456, "fast")]
+
+        release_slow_chat.set()
+        await asyncio.wait_for(wait_for(3), timeout=2.0)
+        assert delivered[1:] == [(123, "slow-1"), (123, "slow-2")]
+        assert await store.list_outbox() == []
+    finally:
+        if loop_task is not None:
+            loop_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await loop_task
+        await store.close()
+
+
+@pytest.mark.anyio
+async def test_outbox_loop_keeps_chat_order_after_a_failed_send(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(outbox_module, "OUTBOX_RETRY_INTERVAL_SECONDS", 1)
+    store = TelegramStateStore(tmp_path / "telegram_state.sqlite3")
+    loop_task: Optional[asyncio.Task] = None
+    try:
+        delivered: list[str] = []
+        failures = {"first": 1}
+
+        async def send_message(
+            chat_id: int,
+            text: str,
+            *,
+            thread_id: Optional[int] = None,
+            reply_to: Optional[int] = None,
+        ) -> None:
+            if failures.get(text):
+                failures[text] -= 1
+                raise RuntimeError("telegram unavailable")
+            delivered.append(text)
+
+        async def edit_message_text(*_args, **_kwargs) -> bool:
+            return False
+
+        async def delete_message(*_args, **_kwargs) -> bool:
+            return False
+
+        manager = TelegramOutboxManager(
+            store,
+            send_message=send_message,
+            edit_message_text=edit_message_text,
+            delete_message=delete_message,
+            logger=logging.getLogger("test"),
+        )
+        manager.start()
+        for idx, text in enumerate(["first", "second"]):
+            await store.enqueue_outbox(
+                OutboxRecord(
+                    record_id=f"r{idx}",
+                    chat_id=123,
+                    thread_id=None,
+                    reply_to_message_id=None,
+                    placeholder_message_id=None,
+                    text=text,
+                    created_at=f"2024-01-01T00:00:0{idx}Z",
+                )
+            )
+        loop_task = asyncio.create_task(manager.run_loop())
+
+        # "second" must wait behind the retried "first".
+        await asyncio.sleep(0.5)
+        assert delivered in ([], ["first"])
+
+        async def wait_for(count: int) -> None:
+            while len(delivered) < count:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for(2), timeout=5.0)
+        assert delivered == ["first", "second"]
+        assert await store.list_outbox() == []
+    finally:
+        if loop_task is not None:
+            loop_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await loop_task
+        await store.close()
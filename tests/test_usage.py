@@ -1,8 +1,14 @@
 import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from codex_autorunner.core import usage as usage_module
 from codex_autorunner.core.usage import (
+    get_codex_session_scanner,
     get_hub_usage_series_cached,
     get_hub_usage_summary_cached,
     get_repo_usage_series_cached,
@@ -33,8 +39,7 @@ def _write_session(
 
 def _refresh_usage_cache(codex_home: Path) -> None:
     cache = get_usage_series_cache(codex_home)
-    payload = cache._load_cache()
-    cache._update_cache(payload)
+    cache._update_cache()
 
 
 def test_summarize_repo_usage_reads_token_deltas(tmp_path):
@@ -564,3 +569,263 @@ def test_hub_usage_summary_cache_matches_baseline(tmp_path):
         == baseline_per_repo["repo-two"].totals.total_tokens
     )
     assert cached_unmatched.events == baseline_unmatched.events
+
+
+def _token_count_line(timestamp: str, total: int) -> str:
+    usage = {
+        "input_tokens": total,
+        "cached_input_tokens": 0,
+        "output_tokens": 0,
+        "reasoning_output_tokens": 0,
+        "total_tokens": total,
+    }
+    return json.dumps(
+        {
+            "timestamp": timestamp,
+            "type": "event_msg",
+            "payload": {"type": "token_count", "info": {"total_token_usage": usage}},
+        }
+    )
+
+
+def test_codex_session_scanner_parses_only_appended_bytes(tmp_path, monkeypatch):
+    repo_root = tmp_path / "repo"
+    repo_root.mkdir()
+    codex_home = tmp_path / "codex"
+    _write_session(codex_home, repo_root, [])
+    session_path = next((codex_home / "sessions").glob("**/*.jsonl"))
+    with session_path.open("a") as handle:
+        handle.write(_token_count_line("2025-12-01T00:01:00Z", 10) + "\n")
+
+    scanner = get_codex_session_scanner(codex_home)
+    assert [e.delta.total_tokens for e in scanner.iter_events()] == [10]
+
+    parsed_lines: list[bytes] = []
+    original = usage_module._parse_codex_session_line
+
+    def _tracking(path, line, checkpoint):
+        parsed_lines.append(line)
+        return original(path, line, checkpoint)
+
+    monkeypatch.setattr(usage_module, "_parse_codex_session_line", _tracking)
+
+    # A trailing partial record is left for the next refresh.
+    second = _token_count_line("2025-12-01T00:02:00Z", 25)
+    with session_path.open("a") as handle:
+        handle.write(second[:20])
+    summary = summarize_repo_usage(repo_root, codex_home=codex_home)
+    assert summary.totals.total_tokens == 10
+    assert parsed_lines == []
+
+    with session_path.open("a") as handle:
+        handle.write(second[20:] + "\n")
+    summary = summarize_repo_usage(repo_root, codex_home=codex_home)
+
+    # last_totals carried across refreshes: the delta is 25 - 10.
+    assert summary.totals.total_tokens == 25
+    assert summary.events == 2
+    assert len(parsed_lines) == 1
+    assert [e.delta.total_tokens for e in scanner.iter_events()] == [10, 15]
+
+    # A window that splits the file re-reads it instead of keeping events.
+    since = datetime(2025, 12, 1, 0, 1, 30, tzinfo=timezone.utc)
+    windowed = summarize_repo_usage(repo_root, codex_home=codex_home, since=since)
+    assert windowed.totals.total_tokens == 15
+    assert windowed.events == 1
+    assert [e.delta.total_tokens for e in scanner.iter_events(since=since)] == [15]
+
+
+def test_codex_session_scanner_reparses_rewritten_file(tmp_path):
+    repo_root = tmp_path / "repo"
+    repo_root.mkdir()
+    codex_home = tmp_path / "codex"
+    _write_session(codex_home, repo_root, [])
+    session_path = next((codex_home / "sessions").glob("**/*.jsonl"))
+    header = session_path.read_text()
+    session_path.write_text(
+        header + _token_count_line("2025-12-01T00:01:00Z", 10) + "\n"
+    )
+
+    scanner = get_codex_session_scanner(codex_home)
+    assert [e.delta.total_tokens for e in scanner.iter_events()] == [10]
+
+    replacement = session_path.with_suffix(".tmp")
+    replacement.write_text(
+        header
+        + _token_count_line("2025-12-01T00:01:00Z", 7)
+        + "\n"
+        + _token_count_line("2025-12-01T00:02:00Z", 9)
+        + "\n"
+    )
+    replacement.replace(session_path)
+
+    assert [e.delta.total_tokens for e in scanner.iter_events()] == [7, 2]
+
+
+def test_hub_usage_parallel_parse_matches_serial(tmp_path, monkeypatch):
+    repo_one = tmp_path / "repo-one"
+    repo_two = tmp_path / "repo-two"
+    repo_one.mkdir()
+    repo_two.mkdir()
+    serial_home = tmp_path / "codex-serial"
+    for idx in range(6):
+        events = [
+            {"timestamp": "2025-12-01T00:00:30Z", "type": "response_item"},
+            json.loads(_token_count_line("2025-12-01T00:01:00Z", 10 + idx)),
+            json.loads(_token_count_line("2025-12-01T00:02:00Z", 30 + idx)),
+        ]
+        _write_session(serial_home, repo_one if idx % 2 else repo_two, events)
+    parallel_home = tmp_path / "codex-parallel"
+    shutil.copytree(serial_home, parallel_home)
+    repo_map = [("repo-one", repo_one), ("repo-two", repo_two)]
+
+    decoded: list[bytes] = []
+    original = usage_module._parse_codex_session_line
+
+    def _tracking(path, line, checkpoint):
+        decoded.append(line)
+        return original(path, line, checkpoint)
+
+    monkeypatch.setattr(usage_module, "_parse_codex_session_line", _tracking)
+    serial, _ = summarize_hub_usage(repo_map, serial_home, max_workers=1)
+    # Lines without token_count/session_meta never reach the JSON decoder.
+    assert len(decoded) == 6 * 3
+
+    monkeypatch.setattr(usage_module, "PARALLEL_PARSE_MIN_FILES", 2)
+    try:
+        parallel, unmatched = summarize_hub_usage(
+            repo_map, parallel_home, max_workers=2
+        )
+
+        for repo_id in ("repo-one", "repo-two"):
+            assert parallel[repo_id].events == serial[repo_id].events == 6
+            assert (
+                parallel[repo_id].totals.total_tokens
+                == serial[repo_id].totals.total_tokens
+            )
+        assert unmatched.events == 0
+
+        # Later refreshes reuse the warm pool instead of spawning a new one.
+        pool = usage_module._PARSE_POOL
+        assert pool is not None
+        for session_path in (parallel_home / "sessions").glob("**/*.jsonl"):
+            with session_path.open("a") as handle:
+                handle.write(_token_count_line("2025-12-01T00:03:00Z", 100) + "\n")
+        again, _ = summarize_hub_usage(repo_map, parallel_home, max_workers=2)
+        assert again["repo-one"].events == 9
+        assert usage_module._PARSE_POOL is pool
+    finally:
+        usage_module.shutdown_usage_parse_pool()
+    assert usage_module._PARSE_POOL is None
+
+
+def test_usage_rollup_store_updates_only_changed_files(tmp_path):
+    repo = tmp_path / "repo"
+    sibling = tmp_path / "repo-two"
+    repo.mkdir()
+    sibling.mkdir()
+    codex_home = tmp_path / "codex"
+    _write_session(
+        codex_home, repo, [json.loads(_token_count_line("2025-12-01T00:01:00Z", 10))]
+    )
+    _write_session(
+        codex_home,
+        sibling,
+        [json.loads(_token_count_line("2025-12-01T00:01:00Z", 100))],
+    )
+    cache = get_usage_series_cache(codex_home)
+    cache._update_cache()
+    assert cache.db_path.suffix == ".sqlite3"
+    assert not cache.cache_path.exists()
+
+    # Prefix queries keep "repo" and "repo-two" apart.
+    summary, status = cache.get_repo_summary(repo)
+    assert status == "ready"
+    assert (summary.events, summary.totals.total_tokens) == (1, 10)
+
+    sessions = sorted((codex_home / "sessions").glob("**/*.jsonl"))
+    with sessions[0].open("a") as handle:
+        handle.write(_token_count_line("2025-12-01T02:00:00Z", 25) + "\n")
+    sessions[1].unlink()
+    assert cache.request_update() == "loading"
+    deadline = time.monotonic() + 5
+    while cache.request_update() != "ready" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    summary, _ = cache.get_repo_summary(repo)
+    assert (summary.events, summary.totals.total_tokens) == (2, 25)
+    series, _ = cache.get_repo_series(repo, bucket="hour")
+    assert series["buckets"] == [
+        "2025-12-01T00:00Z",
+        "2025-12-01T01:00Z",
+        "2025-12-01T02:00Z",
+    ]
+    assert series["series"][0]["values"] == [10, 0, 15]
+    sibling_summary, _ = cache.get_repo_summary(sibling)
+    assert sibling_summary.events == 0
+
+
+def test_usage_rollup_store_counts_a_concurrent_parse_once(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    codex_home = tmp_path / "codex"
+    _write_session(
+        codex_home, repo, [json.loads(_token_count_line("2025-12-01T00:01:00Z", 10))]
+    )
+    session_path = next((codex_home / "sessions").glob("**/*.jsonl"))
+    cache = get_usage_series_cache(codex_home)
+    cache._ensure_store()
+
+    # Two scanners (e.g. the hub and a CLI) parse the same bytes from the
+    # same starting state; only the first update may land.
+    for _ in range(2):
+        cache._ingest_session_file(
+            session_path,
+            0,
+            {"inode": session_path.stat().st_ino},
+            expected_state=None,
+        )
+
+    summary, _ = cache.get_repo_summary(repo)
+    assert (summary.events, summary.totals.total_tokens) == (1, 10)
+    state = cache._ensure_store().file_states()[str(session_path)]
+    assert state["offset"] == session_path.stat().st_size
+
+
+def test_opencode_events_reparse_only_changed_files(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    sessions = repo / ".opencode" / "sessions"
+    sessions.mkdir(parents=True)
+    stamp = time.time() - 10
+
+    def write(name: str, tokens: int) -> None:
+        path = sessions / name
+        message = {
+            "timestamp": "2025-12-01T00:00:00Z",
+            "usage": {"total_tokens": tokens},
+        }
+        path.write_text(json.dumps({"messages": [message]}), encoding="utf-8")
+        os.utime(path, (stamp, stamp))
+
+    write("a.json", 5)
+    write("b.json", 7)
+    parsed: list[str] = []
+    original = usage_module._parse_opencode_session_file
+
+    def _tracking(repo_root, session_path):
+        parsed.append(session_path.name)
+        return original(repo_root, session_path)
+
+    monkeypatch.setattr(usage_module, "_parse_opencode_session_file", _tracking)
+
+    def totals() -> list[int]:
+        return [e.delta.total_tokens for e in usage_module.iter_opencode_events([repo])]
+
+    assert totals() == [5, 7]
+    assert totals() == [5, 7]
+    assert parsed == ["a.json", "b.json"]
+
+    stamp += 1
+    write("b.json", 11)
+    assert totals() == [5, 11]
+    assert parsed == ["a.json", "b.json", "b.json"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from codex_autorunner.tickets.index import TicketIndex, ticket_index_for
+from codex_autorunner.tickets.lint import lint_ticket_directory
+
+
+def _write(path: Path, done: bool, *, age_seconds: float = 10.0) -> None:
+    path.write_text(
+        f"---\nagent: codex\ndone: {'true' if done else 'false'}\n---\nBody",
+        encoding="utf-8",
+    )
+    # Age the file (and its directory) past the racy window so unchanged
+    # entries are served from the index.
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    os.utime(path.parent, (stamp, stamp))
+
+
+def test_ticket_index_only_rereads_changed_files(tmp_path: Path) -> None:
+    tickets = tmp_path / "tickets"
+    tickets.mkdir()
+    _write(tickets / "TICKET-001.md", done=True)
+    _write(tickets / "TICKET-002.md", done=False)
+    _write(tickets / "TICKET-003.md", done=False)
+
+    index = TicketIndex(tickets).refresh()
+    assert index.reads == 3
+    assert index.done_count == 1
+    assert index.total_count == 3
+    assert index.next_pending is not None
+    assert index.next_pending.path.name == "TICKET-002.md"
+
+    index.refresh()
+    assert index.reads == 3
+
+    _write(tickets / "TICKET-002.md", done=True, age_seconds=5.0)
+    index.refresh()
+    assert index.reads == 4
+    assert index.done_count == 2
+    assert index.next_pending is not None
+    assert index.next_pending.path.name == "TICKET-003.md"
+
+    (tickets / "TICKET-003.md").unlink()
+    index.refresh()
+    assert index.reads == 4
+    assert index.next_pending is None
+    assert [p.name for p in index.paths()] == ["TICKET-001.md", "TICKET-002.md"]
+
+
+def test_ticket_index_reports_duplicates_and_broken_frontmatter(
+    tmp_path: Path,
+) -> None:
+    tickets = tmp_path / "tickets"
+    tickets.mkdir()
+    _write(tickets / "TICKET-001-a.md", done=False)
+    _write(tickets / "TICKET-001-b.md", done=False)
+    (tickets / "TICKET-002.md").write_text(
+        "---\ndone: maybe\n---\nFix me", encoding="utf-8"
+    )
+
+    index = TicketIndex(tickets).refresh()
+    assert index.duplicate_errors() == lint_ticket_directory(tickets)
+
+    broken = index.by_index(2)
+    assert broken is not None
+    assert broken.doc is None
+    assert broken.errors
+    assert (broken.body or "").strip() == "Fix me"
+    assert not index.is_done(broken.path)
+
+
+def test_shared_index_keeps_the_callers_path_form(tmp_path: Path, monkeypatch) -> None:
+    tickets = tmp_path / "tickets"
+    tickets.mkdir()
+    _write(tickets / "TICKET-001.md", done=False)
+    monkeypatch.chdir(tmp_path)
+
+    absolute = ticket_index_for(tickets)
+    relative = ticket_index_for(Path("tickets"))
+    assert absolute is not relative
+    assert ticket_index_for(tickets) is absolute
+    assert absolute.next_pending is not None
+    assert absolute.next_pending.path == tickets / "TICKET-001.md"
+    assert relative.next_pending is not None
+    assert relative.next_pending.path == Path("tickets") / "TICKET-001.md"